@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__all__ = ['ClockState']
+
+class ClockState():
+    """
+    Immutable clock state (timezone and sun times)
+
+    State is never updated in place: a new state is built with replace and swapped in a single
+    reference assignment, so a reader keeping a state always sees a consistent set of values (sun times
+    and ephemeris of the same computation, timezone and transitions of the same zone). Suns dict is
+    shared and must not be modified.
+    """
+
+    __slots__ = (
+        'timezone_name',
+        'timezone',
+        'timezone_transitions',
+        'sunrise',
+        'sunset',
+        'suns',
+        'sun_ephemeris',
+        'sun_day',
+    )
+
+    def __init__(self, timezone_name=None, timezone=None, timezone_transitions=None, sunrise=None, sunset=None,
+            suns=None, sun_ephemeris=None, sun_day=None):
+        """
+        Constructor
+
+        Args:
+            timezone_name (string): timezone name
+            timezone (tzinfo): pytz timezone
+            timezone_transitions (ZoneTransitions): timezone transitions
+            sunrise (datetime): today sunrise
+            sunset (datetime): today sunset
+            suns (dict): sun times as returned by Parameters.get_sun. No sun times if None
+            sun_ephemeris (SunEphemeris): next days sun events
+            sun_day (tuple): local day (year, month, day) of sun times
+        """
+        set_field = super(ClockState, self).__setattr__
+        set_field('timezone_name', timezone_name)
+        set_field('timezone', timezone)
+        set_field('timezone_transitions', timezone_transitions)
+        set_field('sunrise', sunrise)
+        set_field('sunset', sunset)
+        set_field('suns', suns if suns is not None else {
+            'sunset': 0,
+            'sunset_iso': '',
+            'sunrise': 0,
+            'sunrise_iso': '',
+        })
+        set_field('sun_ephemeris', sun_ephemeris)
+        set_field('sun_day', sun_day)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('ClockState is immutable, use replace')
+
+    def __delattr__(self, name):
+        raise AttributeError('ClockState is immutable, use replace')
+
+    def replace(self, **fields):
+        """
+        Return new state with specified fields replaced
+
+        Args:
+            fields (dict): fields to replace (see constructor)
+
+        Returns:
+            ClockState: new state
+
+        Raises:
+            TypeError: if a field is unknown
+        """
+        values = {name: getattr(self, name) for name in self.__slots__}
+        for name in fields:
+            if name not in values:
+                raise TypeError('Unknown ClockState field "%s"' % name)
+        values.update(fields)
+
+        return ClockState(**values)
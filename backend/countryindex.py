@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import mmap
+import struct
+import logging
+from threading import Lock
+
+__all__ = ['CountryIndex']
+
+class CountryIndex():
+    """
+    Compact offline country lookup index
+
+    Index is a run-length encoded latitude/longitude grid of country indexes (see scripts/build_countryindex.py)
+    memory-mapped from file, so lookup is a binary search in a grid row with a small fixed memory footprint.
+
+    File format (little endian)::
+
+        header: magic (4s) version (H) cells per degree (H) rows (H) cols (H) countries count (H)
+        countries: alpha2 (2s) name length (B) name (utf-8) for each country
+        row offsets: first run index of each row (I), rows + 1 values
+        runs: end column exclusive (H) country index (H)
+
+    """
+
+    MAGIC = b'CIDX'
+    VERSION = 1
+    DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'countryindex.dat')
+    HEADER = struct.Struct('<4sHHHHH')
+    OFFSET = struct.Struct('<I')
+    RUN = struct.Struct('<HH')
+    NO_COUNTRY = 0xFFFF
+
+    def __init__(self, path=DEFAULT_PATH, logger=None):
+        """
+        Constructor
+
+        Args:
+            path (string): index file path
+            logger (Logger): logger instance
+        """
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.path = path
+        self.cells_per_degree = None
+        self.rows = None
+        self.cols = None
+        self.__countries = None
+        self.__map = None
+        self.__offsets_start = None
+        self.__runs_start = None
+        self.__lock = Lock()
+
+    def is_available(self):
+        """
+        Return True if index file exists
+
+        Returns:
+            bool: True if index can be used
+        """
+        return self.__map is not None or os.path.isfile(self.path)
+
+    def __open(self):
+        """
+        Map index file and read its header
+
+        Raises:
+            ValueError: if index file is invalid
+        """
+        with self.__lock:
+            if self.__map is not None:
+                return
+
+            with open(self.path, 'rb') as fd:
+                index_map = mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                magic, version, cells_per_degree, rows, cols, countries_count = self.HEADER.unpack_from(index_map, 0)
+                if magic != self.MAGIC or version != self.VERSION:
+                    raise ValueError('Invalid country index file "%s"' % self.path)
+
+                position = self.HEADER.size
+                countries = []
+                for _ in range(countries_count):
+                    alpha2 = index_map[position:position + 2].decode('ascii')
+                    name_length = index_map[position + 2]
+                    countries.append((alpha2, index_map[position + 3:position + 3 + name_length].decode('utf-8')))
+                    position += 3 + name_length
+
+                offsets_start = position
+                runs_start = offsets_start + (rows + 1) * self.OFFSET.size
+                runs_count = self.OFFSET.unpack_from(index_map, offsets_start + rows * self.OFFSET.size)[0]
+                if len(index_map) != runs_start + runs_count * self.RUN.size:
+                    raise ValueError('Invalid country index file "%s"' % self.path)
+            except Exception:
+                index_map.close()
+                raise
+
+            self.cells_per_degree = cells_per_degree
+            self.rows = rows
+            self.cols = cols
+            self.__countries = tuple(countries)
+            self.__offsets_start = offsets_start
+            self.__runs_start = runs_start
+            self.__map = index_map
+            self.logger.debug('Country index loaded: %d countries, %d runs' % (countries_count, runs_count))
+
+    def close(self):
+        """
+        Unmap index file
+        """
+        with self.__lock:
+            if self.__map is not None:
+                self.__map.close()
+                self.__map = None
+
+    def lookup(self, latitude, longitude):
+        """
+        Return country at specified position
+
+        Args:
+            latitude (float): latitude
+            longitude (float): longitude
+
+        Returns:
+            tuple: (alpha2 (string), country name (string)) or None if no country found
+
+        Raises:
+            ValueError: if coordinates are out of bounds or index file is invalid
+        """
+        if not -90.0 <= latitude <= 90.0 or not -180.0 <= longitude <= 180.0:
+            raise ValueError('Coordinates out of bounds')
+        if self.__map is None:
+            self.__open()
+
+        index_map = self.__map
+        row = min(self.rows - 1, int((latitude + 90.0) * self.cells_per_degree))
+        col = min(self.cols - 1, int((longitude + 180.0) * self.cells_per_degree))
+
+        # binary search first run ending after column
+        low = self.OFFSET.unpack_from(index_map, self.__offsets_start + row * self.OFFSET.size)[0]
+        high = self.OFFSET.unpack_from(index_map, self.__offsets_start + (row + 1) * self.OFFSET.size)[0] - 1
+        while low < high:
+            middle = (low + high) // 2
+            if self.RUN.unpack_from(index_map, self.__runs_start + middle * self.RUN.size)[0] > col:
+                high = middle
+            else:
+                low = middle + 1
+        country = self.RUN.unpack_from(index_map, self.__runs_start + low * self.RUN.size)[1]
+
+        return None if country == self.NO_COUNTRY else self.__countries[country]
+
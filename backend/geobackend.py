@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import sys
+import time
+import logging
+import importlib
+from threading import Timer, RLock
+
+__all__ = ['GeoBackend']
+
+class GeoBackend():
+    """
+    Lazy geographical backend
+
+    Wraps timezonefinder and reverse_geocode libraries that are heavy to load (binary data, cities
+    dataset, KD-tree) and only used when device position changes. Libraries are loaded on first use
+    and released after an idle period to give memory back.
+    """
+
+    DEFAULT_IDLE_TIMEOUT = 300.0
+
+    def __init__(self, idle_timeout=DEFAULT_IDLE_TIMEOUT, logger=None):
+        """
+        Constructor
+
+        Args:
+            idle_timeout (float): seconds of inactivity before releasing libraries. 0 or None to never release
+            logger (Logger): logger instance
+        """
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.idle_timeout = idle_timeout
+        self.__timezonefinder = None
+        self.__reverse_geocode = None
+        self.__release_timer = None
+        self.__lock = RLock()
+
+    def is_loaded(self):
+        """
+        Return True if at least one library is loaded
+
+        Returns:
+            bool: True if a library is loaded
+        """
+        return self.__timezonefinder is not None or self.__reverse_geocode is not None
+
+    def __get_timezonefinder(self):
+        """
+        Return TimezoneFinder instance, loading it if necessary
+
+        Returns:
+            TimezoneFinder: timezonefinder instance
+        """
+        if self.__timezonefinder is None:
+            self.logger.debug('Loading timezonefinder library')
+            from timezonefinder import TimezoneFinder
+            self.__timezonefinder = TimezoneFinder()
+        return self.__timezonefinder
+
+    def __get_reverse_geocode(self):
+        """
+        Return reverse_geocode module, loading it if necessary
+
+        Returns:
+            module: reverse_geocode module
+        """
+        if self.__reverse_geocode is None:
+            self.logger.debug('Loading reverse_geocode library')
+            self.__reverse_geocode = importlib.import_module('reverse_geocode')
+        return self.__reverse_geocode
+
+    def __touch(self):
+        """
+        Restart idle timer after library usage
+        """
+        if not self.idle_timeout:
+            return
+
+        if self.__release_timer:
+            self.__release_timer.cancel()
+        self.__release_timer = Timer(self.idle_timeout, self.release)
+        self.__release_timer.daemon = True
+        self.__release_timer.start()
+
+    def release(self):
+        """
+        Release loaded libraries. They will be loaded again on next use
+        """
+        with self.__lock:
+            if self.__release_timer:
+                self.__release_timer.cancel()
+                self.__release_timer = None
+            if not self.is_loaded():
+                return
+
+            self.logger.debug('Releasing geographical libraries')
+            self.__timezonefinder = None
+            if self.__reverse_geocode is not None:
+                # reverse_geocode keeps its cities dataset at module level, drop module to free it
+                self.__reverse_geocode = None
+                sys.modules.pop('reverse_geocode', None)
+
+    def timezone_at(self, latitude, longitude):
+        """
+        Return timezone name at specified position
+
+        Args:
+            latitude (float): latitude
+            longitude (float): longitude
+
+        Returns:
+            string: timezone name or None if not found
+
+        Raises:
+            ValueError: if coordinates are out of bounds
+        """
+        with self.__lock:
+            try:
+                return self.__get_timezonefinder().timezone_at(lat=latitude, lng=longitude)
+            finally:
+                self.__touch()
+
+    def closest_timezone_at(self, latitude, longitude, **kwargs):
+        """
+        Return closest timezone name from specified position
+
+        Args:
+            latitude (float): latitude
+            longitude (float): longitude
+            kwargs (dict): extra timezonefinder parameters (delta_degree...)
+
+        Returns:
+            string: timezone name or None if not found
+
+        Raises:
+            ValueError: if coordinates are out of bounds
+        """
+        with self.__lock:
+            try:
+                return self.__get_timezonefinder().closest_timezone_at(lat=latitude, lng=longitude, **kwargs)
+            finally:
+                self.__touch()
+
+    def timezones_at(self, coordinates, timezone_search=None, budget=None, clock=time.monotonic):
+        """
+        Return timezone names of specified coordinates
+
+        Library is held for each lookup only, so other users (device timezone update) are not blocked
+        during a whole batch. Idle timer is restarted once per batch.
+
+        Args:
+            coordinates (list): list of (latitude, longitude) tuples
+            timezone_search (TimezoneSearch): budgeted closest timezone search used when position is not
+                inside a timezone (ie at sea). No search if None
+            budget (float): max seconds spent in closest timezone searches for the whole batch, positions
+                left get nautical timezone. Per position search budget only if None
+            clock (function): monotonic clock function (used for tests)
+
+        Returns:
+            list: list of timezone names (None if not found)
+        """
+        deadline = None if budget is None else clock() + budget
+        timezones = []
+        for latitude, longitude in coordinates:
+            try:
+                with self.__lock:
+                    timezone_name = self.__get_timezonefinder().timezone_at(lat=latitude, lng=longitude)
+                if timezone_name is None and timezone_search is not None:
+                    remaining = None if deadline is None else max(0.0, deadline - clock())
+                    timezone_name = timezone_search.search(latitude, longitude, budget=remaining)[0]
+            except Exception:
+                self.logger.debug('Unable to find timezone at (%s, %s)' % (latitude, longitude), exc_info=True)
+                timezone_name = None
+            timezones.append(timezone_name)
+
+        with self.__lock:
+            self.__touch()
+
+        return timezones
+
+    def search_countries(self, coordinates):
+        """
+        Search countries of specified coordinates
+
+        Args:
+            coordinates (list): list of (latitude, longitude) tuples
+
+        Returns:
+            list: list of reverse_geocode results (dict with country and country_code keys)
+        """
+        with self.__lock:
+            try:
+                return self.__get_reverse_geocode().search(tuple(coordinates))
+            finally:
+                self.__touch()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import zlib
+import logging
+from collections import OrderedDict
+from threading import RLock
+
+__all__ = ['GeoCache', 'get_libraries_version', 'get_files_checksum']
+
+def get_libraries_version(libraries):
+    """
+    Return installed version of specified libraries without importing them
+
+    Args:
+        libraries (list): list of distribution names
+
+    Returns:
+        string: version key (ie "timezonefinder=4.2.0;reverse_geocode=1.4.1")
+    """
+    try:
+        from importlib.metadata import version, PackageNotFoundError
+    except ImportError: # pragma: no cover
+        from pkg_resources import get_distribution, DistributionNotFound as PackageNotFoundError
+        version = lambda name: get_distribution(name).version
+
+    versions = []
+    for library in libraries:
+        try:
+            versions.append('%s=%s' % (library, version(library)))
+        except PackageNotFoundError:
+            versions.append('%s=?' % library)
+
+    return ';'.join(versions)
+
+def get_files_checksum(paths):
+    """
+    Return checksum of specified data files content
+
+    Args:
+        paths (list): list of file paths
+
+    Returns:
+        string: checksum key (ie "countryindex.dat=1a2b3c4d"), "?" checksum for unreadable file
+    """
+    checksums = []
+    for path in paths:
+        checksum = 0
+        try:
+            with open(path, 'rb') as fd:
+                for chunk in iter(lambda: fd.read(65536), b''):
+                    checksum = zlib.crc32(chunk, checksum)
+            checksums.append('%s=%08x' % (os.path.basename(path), checksum))
+        except OSError:
+            checksums.append('%s=?' % os.path.basename(path))
+
+    return ';'.join(checksums)
+
+class GeoCache():
+    """
+    Persistent geographical lookup cache
+
+    Positions are quantized on a grid (default cell is 0.01 degree, ~1km) so re-selecting a known or nearby
+    position returns stored geographical infos (timezone, country, alpha2) instead of running slow polygon and
+    KD-tree searches. Cache is LRU bounded and invalidated when geographical libraries versions or lookup data
+    files (country index) change.
+    """
+
+    LIBRARIES = ['timezonefinder', 'reverse_geocode']
+    CACHE_FORMAT = 1
+    DEFAULT_QUANTUM = 0.01
+    DEFAULT_MAX_ENTRIES = 256
+
+    def __init__(self, path, cleep_filesystem, quantum=DEFAULT_QUANTUM, max_entries=DEFAULT_MAX_ENTRIES, data_files=None,
+            logger=None):
+        """
+        Constructor
+
+        Args:
+            path (string): cache file path
+            cleep_filesystem (CleepFilesystem): filesystem instance used to persist cache
+            quantum (float): grid cell size in degrees
+            max_entries (int): max number of cached positions
+            data_files (list): lookup data files (ie country index) whose content is part of cache version
+            logger (Logger): logger instance
+        """
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.path = path
+        self.data_files = data_files or []
+        self.cleep_filesystem = cleep_filesystem
+        self.version = None
+        self.quantum = quantum
+        self.max_entries = max_entries
+        self.__entries = None
+        self.__lock = RLock()
+
+    def __len__(self):
+        """
+        Return number of cached positions
+        """
+        with self.__lock:
+            return len(self.__get_entries())
+
+    def get_key(self, latitude, longitude):
+        """
+        Return cache key of specified position
+
+        Args:
+            latitude (float): latitude
+            longitude (float): longitude
+
+        Returns:
+            string: cache key
+        """
+        return '%d:%d' % (round(latitude / self.quantum), round(longitude / self.quantum))
+
+    def __get_entries(self):
+        """
+        Return cache entries, loading them from file at first call
+
+        Returns:
+            OrderedDict: cache entries (older first)
+        """
+        if self.__entries is None:
+            # computed here to avoid reading packages metadata and data files at startup
+            self.version = '%s;format=%s' % (get_libraries_version(self.LIBRARIES), self.CACHE_FORMAT)
+            if self.data_files:
+                self.version = '%s;%s' % (self.version, get_files_checksum(self.data_files))
+            self.__entries = OrderedDict()
+            self.__load()
+        return self.__entries
+
+    def __load(self):
+        """
+        Load cache content from file
+        """
+        if not os.path.exists(self.path):
+            return
+
+        content = self.cleep_filesystem.read_json(self.path)
+        if not isinstance(content, dict) or not isinstance(content.get('entries'), list):
+            self.logger.warning('Invalid geographical cache file "%s" content, cache is dropped' % self.path)
+            return
+        if content.get('version') != self.version:
+            self.logger.info('Geographical cache version changed (%s => %s), cache is dropped' % (content.get('version'), self.version))
+            return
+
+        for key, data in content['entries'][-self.max_entries:]:
+            self.__entries[key] = data
+        self.logger.debug('%d positions loaded from geographical cache' % len(self.__entries))
+
+    def __save(self):
+        """
+        Save cache content to file
+        """
+        content = {
+            'version': self.version,
+            'entries': [[key, data] for key, data in self.__entries.items()],
+        }
+        if not self.cleep_filesystem.write_json(self.path, content):
+            self.logger.warning('Unable to save geographical cache to "%s"' % self.path)
+
+    def get(self, latitude, longitude, field):
+        """
+        Return cached field value for specified position
+
+        Args:
+            latitude (float): latitude
+            longitude (float): longitude
+            field (string): field name (timezone, country, alpha2)
+
+        Returns:
+            any: cached value or None if not cached
+        """
+        key = self.get_key(latitude, longitude)
+        with self.__lock:
+            entries = self.__get_entries()
+            data = entries.get(key)
+            if data is None or field not in data:
+                return None
+            entries.move_to_end(key)
+            return data[field]
+
+    def update(self, latitude, longitude, **fields):
+        """
+        Store fields for specified position and persist cache
+
+        Args:
+            latitude (float): latitude
+            longitude (float): longitude
+            fields (dict): fields to store (timezone, country, alpha2)
+        """
+        key = self.get_key(latitude, longitude)
+        with self.__lock:
+            entries = self.__get_entries()
+            data = entries.pop(key, {})
+            if data and all(data.get(field) == value for field, value in fields.items()):
+                # nothing new, avoid useless write
+                entries[key] = data
+                return
+
+            data.update(fields)
+            entries[key] = data
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+            self.__save()
+
+    def clear(self):
+        """
+        Clear cache content
+        """
+        with self.__lock:
+            self.__get_entries().clear()
+            self.__save()
@@ -0,0 +1,313 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import re
+import logging
+import importlib
+from threading import Lock
+from .timerendering import RenderingLocale, register_locale, get_renderer, get_clock_hour, STYLE_24H, STYLE_12H
+
+__all__ = ['LocaleEngine', 'CompiledTemplate', 'locale_engine']
+
+# language by country (alpha2), other countries use default language
+COUNTRY_LANGUAGES = {
+    'FR': 'fr', 'BE': 'fr', 'LU': 'fr', 'MC': 'fr', 'SN': 'fr', 'CI': 'fr', 'CM': 'fr', 'MG': 'fr', 'HT': 'fr',
+    'DE': 'de', 'AT': 'de', 'CH': 'de', 'LI': 'de',
+    'ES': 'es', 'MX': 'es', 'AR': 'es', 'CO': 'es', 'CL': 'es', 'PE': 'es', 'VE': 'es', 'EC': 'es', 'GT': 'es',
+    'CU': 'es', 'BO': 'es', 'DO': 'es', 'HN': 'es', 'PY': 'es', 'SV': 'es', 'NI': 'es', 'CR': 'es', 'PA': 'es',
+    'UY': 'es',
+}
+# date order by country, other countries use day/month/year
+COUNTRY_DATE_ORDERS = {
+    'US': 'mdy', 'PH': 'mdy', 'FM': 'mdy', 'MH': 'mdy', 'PW': 'mdy',
+    'CN': 'ymd', 'JP': 'ymd', 'KR': 'ymd', 'KP': 'ymd', 'TW': 'ymd', 'HU': 'ymd', 'LT': 'ymd', 'MN': 'ymd',
+    'IR': 'ymd', 'SE': 'ymd',
+}
+# countries using 12h clock, others use 24h clock
+COUNTRY_12H = {'US', 'CA', 'AU', 'NZ', 'IN', 'PH', 'PK', 'BD', 'EG', 'SA', 'MY'}
+DATE_FORMATS = {
+    'dmy': '%%(day)02d%s%%(month)02d%s%%(year)d',
+    'mdy': '%%(month)02d%s%%(day)02d%s%%(year)d',
+    'ymd': '%%(year)d%s%%(month)02d%s%%(day)02d',
+}
+
+class CompiledTemplate():
+    """
+    Compiled message template
+
+    Template placeholders ({name}) are compiled once to a % format string so rendering costs a single %
+    formatting (or nothing for templates without placeholder).
+    """
+
+    PLACEHOLDER = re.compile(r'\{(\w+)\}')
+
+    __slots__ = ('template', 'format', 'fields')
+
+    def __init__(self, template):
+        """
+        Constructor
+
+        Args:
+            template (string): template with {name} placeholders
+        """
+        self.template = template
+        self.fields = tuple(self.PLACEHOLDER.findall(template))
+        self.format = self.PLACEHOLDER.sub(r'%(\1)s', template.replace('%', '%%')) if self.fields else template
+
+    def render(self, values=None):
+        """
+        Render template
+
+        Args:
+            values (dict): placeholders values
+
+        Returns:
+            string: rendered template
+
+        Raises:
+            KeyError: if a placeholder value is missing
+        """
+        if not self.fields:
+            return self.format
+        return self.format % values
+
+class LocaleEngine():
+    """
+    Formatters messages engine
+
+    Language, date order and clock style are selected from configured country. Templates of a language
+    are loaded (from locales package) and compiled on first use, then cached. Missing templates fall back
+    to default language ones.
+    """
+
+    DEFAULT_LANGUAGE = 'en'
+    LANGUAGE_PATTERN = re.compile(r'^[a-z]{2}$')
+
+    def __init__(self, logger=None):
+        """
+        Constructor
+
+        Args:
+            logger (Logger): logger instance
+        """
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.__templates = {}
+        self.__hour_names = {}
+        self.__renderers = {}
+        self.__lock = Lock()
+        # (language, date order, clock style) tuple replaced at once
+        self.__settings = (self.DEFAULT_LANGUAGE, 'dmy', STYLE_24H)
+
+    def get_settings_for_country(self, alpha2):
+        """
+        Return locale settings of country
+
+        Args:
+            alpha2 (string): country code (ISO 3166-1 alpha-2)
+
+        Returns:
+            tuple: language (string), date order (string), clock style (string)
+        """
+        alpha2 = (alpha2 or '').upper()
+        return (
+            COUNTRY_LANGUAGES.get(alpha2, self.DEFAULT_LANGUAGE),
+            COUNTRY_DATE_ORDERS.get(alpha2, 'dmy'),
+            STYLE_12H if alpha2 in COUNTRY_12H else STYLE_24H,
+        )
+
+    def set_country(self, alpha2):
+        """
+        Select locale settings according to country
+
+        Args:
+            alpha2 (string): country code (ISO 3166-1 alpha-2)
+
+        Returns:
+            tuple: selected language (string), date order (string), clock style (string)
+        """
+        settings = self.get_settings_for_country(alpha2)
+        self.logger.debug('Locale settings for country "%s": %s' % (alpha2, settings))
+        self.__settings = settings
+
+        return settings
+
+    def get_settings(self):
+        """
+        Return current locale settings
+
+        Returns:
+            tuple: language (string), date order (string), clock style (string)
+        """
+        return self.__settings
+
+    def __load_templates(self, language):
+        """
+        Load language module templates
+
+        Returns:
+            tuple: templates (dict), language module (module or None)
+        """
+        if not self.LANGUAGE_PATTERN.match(language):
+            raise ValueError('Invalid language "%s"' % language)
+        try:
+            module = importlib.import_module('%s.locales.%s' % (__package__, language))
+        except ImportError:
+            self.logger.warning('No templates for language "%s", "%s" used' % (language, self.DEFAULT_LANGUAGE))
+            return {}, None
+
+        return module.TEMPLATES, module
+
+    def get_templates(self, language):
+        """
+        Return compiled templates of language (loaded and compiled on first call)
+
+        Args:
+            language (string): language code (ISO 639-1)
+
+        Returns:
+            dict: compiled templates by key
+        """
+        templates = self.__templates.get(language)
+        if templates is not None:
+            return templates
+
+        with self.__lock:
+            templates = self.__templates.get(language)
+            if templates is None:
+                sources = {}
+                if language != self.DEFAULT_LANGUAGE:
+                    sources.update(self.__load_templates(self.DEFAULT_LANGUAGE)[0])
+                sources.update(self.__load_templates(language)[0])
+                templates = {key: CompiledTemplate(template) for key, template in sources.items()}
+                self.__templates[language] = templates
+
+        return templates
+
+    def get_hour_names(self, language, style, dial=False):
+        """
+        Return hour names of language (built on first call)
+
+        Args:
+            language (string): language code (ISO 639-1)
+            style (string): clock style (24h or 12h)
+            dial (bool): return names of hours on a 12h dial whatever clock style (24h style overrides
+                still apply)
+
+        Returns:
+            tuple: name of each hour (0-23)
+        """
+        key = (language, style, dial)
+        names = self.__hour_names.get(key)
+        if names is not None:
+            return names
+
+        module = self.__load_templates(language)[1]
+        hour_format = getattr(module, 'HOUR_FORMAT', '%d')
+        hours = getattr(module, 'HOURS', {})
+        hours_12h = getattr(module, 'HOURS_12H', {})
+        names = []
+        for hour in range(24):
+            if style == STYLE_12H or dial:
+                clock_hour = get_clock_hour(hour, STYLE_12H)
+                name = hours_12h.get(clock_hour, hour_format % clock_hour)
+            else:
+                name = hour_format % hour
+            if style != STYLE_12H:
+                name = hours.get(hour, name)
+            names.append(name)
+        names = tuple(names)
+        self.__hour_names[key] = names
+
+        return names
+
+    def render(self, key, values=None, language=None):
+        """
+        Render message
+
+        Args:
+            key (string): template key
+            values (dict): placeholders values
+            language (string): language code. Current language if None
+
+        Returns:
+            string: rendered message
+        """
+        return self.get_templates(language or self.__settings[0])[key].render(values)
+
+    def get_speech(self, hour, minute, style, language=None):
+        """
+        Return spoken time
+
+        Args:
+            hour (int): hour (0-23)
+            minute (int): minute (0-59)
+            style (string): clock style (24h or 12h)
+            language (string): language code. Current language if None
+
+        Returns:
+            string: spoken time
+        """
+        if minute == 0 and hour == 0:
+            key = 'time.midnight'
+        elif minute == 0 and hour == 12:
+            key = 'time.noon'
+        elif minute == 0:
+            key = 'time.oclock'
+        elif minute == 15:
+            key = 'time.quarter_past'
+        elif minute == 30:
+            key = 'time.half_past'
+        elif minute == 45:
+            key = 'time.quarter_to'
+        elif minute < 30:
+            key = 'time.past'
+        else:
+            key = 'time.to'
+
+        language = language or self.__settings[0]
+        hour_names = self.get_hour_names(language, style)
+        dial_names = self.get_hour_names(language, style, dial=True)
+        return self.render(key, {
+            'hour': hour_names[hour],
+            'next_hour': hour_names[(hour + 1) % 24],
+            'hour_12h': dial_names[hour],
+            'next_hour_12h': dial_names[(hour + 1) % 24],
+            'minute': minute,
+            'remaining': 60 - minute,
+        }, language)
+
+    def get_renderer(self, settings=None, style=None):
+        """
+        Return time renderer (see timerendering) of locale settings. Renderer is built on first use
+
+        Args:
+            settings (tuple): language, date order and clock style. Current settings if None
+            style (string): clock style overriding settings one. Settings clock style if None
+
+        Returns:
+            TimeRenderer: time renderer
+        """
+        settings = settings or self.__settings
+        if style is not None:
+            settings = (settings[0], settings[1], style)
+        renderer = self.__renderers.get(settings)
+        if renderer is not None:
+            return renderer
+
+        language, date_order, style = settings
+        name = '%s_%s' % (language, date_order)
+        module = self.__load_templates(language)[1]
+        separator = getattr(module, 'DATE_SEPARATOR', '/')
+        register_locale(RenderingLocale(
+            name,
+            lambda hour, minute, style: self.get_speech(hour, minute, style, language),
+            DATE_FORMATS[date_order] % (separator, separator),
+            getattr(module, 'MERIDIEMS', ('AM', 'PM')),
+        ))
+        renderer = get_renderer(name, style)
+        self.__renderers[settings] = renderer
+
+        return renderer
+
+# shared engine, country is set by Parameters and read by formatters
+locale_engine = LocaleEngine()
@@ -0,0 +1,18 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Formatters templates, one module per language (ISO 639-1 code) loaded on demand by LocaleEngine
+
+Templates placeholders:
+
+    * hour: current hour name (according to clock style)
+    * next_hour: next hour name (according to clock style)
+    * hour_12h: current hour name on a 12h dial (colloquial forms of languages using 24h clock)
+    * next_hour_12h: next hour name on a 12h dial
+    * minute: current minute
+    * remaining: minutes to next hour
+
+Hour names are built with module HOUR_FORMAT (% format of hour number, '%d' if not specified) except
+hours overridden in HOURS (by hour 0-23, 24h clock style) or HOURS_12H (by hour 1-12, 12h clock style
+and 12h dial) dicts, so a language can use singular or special hours (une heure, la una, minuit...).
+"""
@@ -0,0 +1,19 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+DATE_SEPARATOR = '.'
+MERIDIEMS = ('AM', 'PM')
+HOURS = {0: 'Mitternacht'}
+
+TEMPLATES = {
+    'time.midnight': 'Es ist Mitternacht',
+    'time.noon': 'Es ist Mittag',
+    'time.oclock': 'Es ist {hour} Uhr',
+    'time.quarter_past': 'Es ist Viertel nach {hour_12h}',
+    'time.half_past': 'Es ist halb {next_hour_12h}',
+    'time.quarter_to': 'Es ist Viertel vor {next_hour_12h}',
+    'time.past': 'Es ist {minute} nach {hour_12h}',
+    'time.to': 'Es ist {remaining} vor {next_hour_12h}',
+    'sunrise': 'Es ist Sonnenaufgang!',
+    'sunset': 'Es ist Sonnenuntergang!',
+}
@@ -0,0 +1,19 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+DATE_SEPARATOR = '/'
+MERIDIEMS = ('AM', 'PM')
+HOURS = {0: 'midnight', 12: 'noon'}
+
+TEMPLATES = {
+    'time.midnight': 'It\'s midnight',
+    'time.noon': 'It\'s noon',
+    'time.oclock': 'It\'s {hour} o\'clock',
+    'time.quarter_past': 'It\'s quarter past {hour}',
+    'time.half_past': 'It\'s half past {hour}',
+    'time.quarter_to': 'It\'s quarter to {next_hour}',
+    'time.past': 'It\'s {minute} past {hour}',
+    'time.to': 'It\'s {remaining} to {next_hour}',
+    'sunrise': 'It\'s sunrise!',
+    'sunset': 'It\'s sunset!',
+}
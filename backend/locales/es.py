@@ -0,0 +1,21 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+DATE_SEPARATOR = '/'
+MERIDIEMS = ('a. m.', 'p. m.')
+HOUR_FORMAT = 'Son las %d'
+HOURS = {0: 'Son las 12', 1: 'Es la una'}
+HOURS_12H = {1: 'Es la una'}
+
+TEMPLATES = {
+    'time.midnight': 'Es medianoche',
+    'time.noon': 'Es mediodía',
+    'time.oclock': '{hour} en punto',
+    'time.quarter_past': '{hour} y cuarto',
+    'time.half_past': '{hour} y media',
+    'time.quarter_to': '{next_hour} menos cuarto',
+    'time.past': '{hour} y {minute}',
+    'time.to': '{next_hour} menos {remaining}',
+    'sunrise': '¡Es el amanecer!',
+    'sunset': '¡Es el atardecer!',
+}
@@ -0,0 +1,21 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+DATE_SEPARATOR = '/'
+MERIDIEMS = ('AM', 'PM')
+HOUR_FORMAT = '%d heures'
+HOURS = {0: 'minuit', 1: 'une heure', 12: 'midi'}
+HOURS_12H = {1: 'une heure'}
+
+TEMPLATES = {
+    'time.midnight': 'Il est minuit',
+    'time.noon': 'Il est midi',
+    'time.oclock': 'Il est {hour}',
+    'time.quarter_past': 'Il est {hour} et quart',
+    'time.half_past': 'Il est {hour} et demie',
+    'time.quarter_to': 'Il est {next_hour} moins le quart',
+    'time.past': 'Il est {hour} {minute}',
+    'time.to': 'Il est {next_hour} moins {remaining}',
+    'sunrise': 'C\'est le lever du soleil !',
+    'sunset': 'C\'est le coucher du soleil !',
+}
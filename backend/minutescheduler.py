@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import time
+import logging
+from threading import Thread, Event, Lock
+
+__all__ = ['MinuteScheduler']
+
+class MinuteScheduler(Thread):
+    """
+    Wall clock aligned minute scheduler
+
+    Callback is triggered at the beginning of each minute. Next wake up is re-aligned on wall clock at
+    every tick so scheduler never drifts. Clock jumps (NTP step, manual change) are detected by comparing
+    wall clock and monotonic clock elapsed times and reported to callback. Missed minutes (late tick) are
+    only logged (minute events are not caught up), too many of them are reported as a clock jump.
+
+    Note:
+        DST changes don't affect scheduler because it works on UTC timestamps.
+    """
+
+    # elapsed time difference (seconds) between wall clock and monotonic clock to consider clock jumped
+    JUMP_THRESHOLD = 5.0
+    # max number of missed minutes, more is considered as clock jump
+    MAX_MISSED_MINUTES = 60
+    # delay after minute start to make sure wall clock is in new minute when scheduler wakes up
+    WAKEUP_DELAY = 0.05
+
+    def __init__(self, callback, logger=None, clock=time.time, monotonic=time.monotonic):
+        """
+        Constructor
+
+        Args:
+            callback (function): function called every minute with parameters::
+
+                callback(timestamp (int), jumped (bool))
+
+                with timestamp the current minute start timestamp and jumped True if clock jump detected
+
+            logger (Logger): logger instance
+            clock (function): wall clock function (used for tests)
+            monotonic (function): monotonic clock function (used for tests)
+        """
+        Thread.__init__(self, daemon=True, name='minutescheduler')
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.callback = callback
+        self.clock = clock
+        self.monotonic = monotonic
+        self.__stop_event = Event()
+        self.__wake_event = Event()
+        self.__lock = Lock()
+        self.__last_minute = None
+        self.__last_wall = None
+        self.__last_monotonic = None
+
+    def stop(self):
+        """
+        Stop scheduler
+        """
+        self.__stop_event.set()
+        self.__wake_event.set()
+
+    def reset(self):
+        """
+        Re-baseline scheduler on current wall clock after intentional time change (NTP sync), so change is
+        not reported as a clock jump. Current minute is considered handled by caller, callback is triggered
+        at next minute start as usual
+        """
+        with self.__lock:
+            wall = self.clock()
+            self.__last_minute = int(wall // 60) * 60
+            self.__last_wall = wall
+            self.__last_monotonic = self.monotonic()
+
+        # pending wait was computed with previous wall clock, re-align it
+        self.__wake_event.set()
+
+    def run(self):
+        """
+        Scheduler main loop
+        """
+        while not self.__stop_event.is_set():
+            delay = self.tick()
+            self.__wake_event.wait(delay)
+            self.__wake_event.clear()
+
+    def tick(self):
+        """
+        Process scheduler iteration
+
+        Returns:
+            float: delay before next iteration
+        """
+        with self.__lock:
+            wall = self.clock()
+            mono = self.monotonic()
+            minute = int(wall // 60) * 60
+
+            # first iteration only sets reference, callback is triggered at next minute start
+            triggered = self.__last_minute is not None and minute != self.__last_minute
+            if triggered:
+                jumped = False
+                drift = (wall - self.__last_wall) - (mono - self.__last_monotonic)
+                if abs(drift) > self.JUMP_THRESHOLD:
+                    self.logger.info('Clock jump of %.1f seconds detected' % drift)
+                    jumped = True
+                elif minute - self.__last_minute > 60:
+                    missed = (minute - self.__last_minute) // 60 - 1
+                    if missed > self.MAX_MISSED_MINUTES:
+                        self.logger.info('Too many minutes missed (%d), considered as clock jump' % missed)
+                        jumped = True
+                    else:
+                        self.logger.debug('%d minute(s) missed' % missed)
+
+            self.__last_minute = minute
+            self.__last_wall = wall
+            self.__last_monotonic = mono
+
+        if triggered:
+            self.__trigger(minute, jumped)
+
+        # re-align on wall clock
+        return 60.0 - (self.clock() % 60.0) + self.WAKEUP_DELAY
+
+    def __trigger(self, minute, jumped):
+        """
+        Trigger callback
+
+        Args:
+            minute (int): current minute timestamp
+            jumped (bool): True if clock jump detected
+        """
+        try:
+            self.callback(minute, jumped)
+        except Exception:
+            self.logger.exception('Error occured in minute scheduler callback')
@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import time
+import random
+import logging
+from threading import Thread, Event
+
+__all__ = ['NtpSyncScheduler', 'has_default_route']
+
+# route flags from linux/route.h
+RTF_UP = 0x0001
+
+def has_default_route(path='/proc/net/route'):
+    """
+    Check if system has a default route (network is available). No network traffic is generated
+
+    Args:
+        path (string): kernel routing table file
+
+    Returns:
+        bool: True if a default route is up. True if routing table cannot be read (unknown state)
+    """
+    try:
+        with open(path, 'r') as routes:
+            # skip header
+            next(routes, None)
+            for line in routes:
+                fields = line.split()
+                if len(fields) > 3 and fields[1] == '00000000' and int(fields[3], 16) & RTF_UP:
+                    return True
+    except (OSError, ValueError):
+        return True
+
+    return False
+
+class NtpSyncScheduler(Thread):
+    """
+    NTP sync retry scheduler
+
+    Sync function is called until it succeeds. Delay between attempts grows exponentially (from min to max
+    interval) with random jitter so devices of the same network don't retry all at the same time. A single
+    sync is in flight at a time (next attempt is scheduled when previous one ends). Attempts are postponed
+    while network is unavailable and backoff restarts when network is back.
+
+    Time stepped by sync is measured by comparing wall clock and monotonic clock elapsed times and is
+    reported to synced callback.
+    """
+
+    DEFAULT_MIN_INTERVAL = 60.0
+    DEFAULT_MAX_INTERVAL = 3600.0
+    DEFAULT_JITTER = 0.2
+    # delay (seconds) between network availability checks
+    NETWORK_CHECK_INTERVAL = 10.0
+    # max exponent of backoff, avoid overflow
+    MAX_BACKOFF_EXPONENT = 32
+
+    def __init__(self, sync, on_synced, min_interval=DEFAULT_MIN_INTERVAL, max_interval=DEFAULT_MAX_INTERVAL,
+                 jitter=DEFAULT_JITTER, network_available=has_default_route, logger=None, clock=time.time,
+                 monotonic=time.monotonic, rand=None):
+        """
+        Constructor
+
+        Args:
+            sync (function): sync function, returns True if time synchronized
+            on_synced (function): function called once time is synchronized::
+
+                on_synced(jump (float))
+
+                with jump the time step in seconds applied by sync
+
+            min_interval (float): delay (seconds) after first failed attempt
+            max_interval (float): max delay (seconds) between attempts
+            jitter (float): random delay variation ratio (0.2 for +/-20%)
+            network_available (function): function returning True if network is available. None to disable check
+            logger (Logger): logger instance
+            clock (function): wall clock function (used for tests)
+            monotonic (function): monotonic clock function (used for tests)
+            rand (Random): random generator (used for tests)
+        """
+        Thread.__init__(self, daemon=True, name='ntpsyncscheduler')
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.sync = sync
+        self.on_synced = on_synced
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.network_available = network_available
+        self.clock = clock
+        self.monotonic = monotonic
+        self.random = rand or random.Random()
+        self.attempts = 0
+        self.synced = False
+        self.__network_up = True
+        self.__stop_event = Event()
+
+    def stop(self):
+        """
+        Stop scheduler. Sync in flight (if any) is not interrupted but no more attempt is made
+        """
+        self.__stop_event.set()
+
+    def is_stopped(self):
+        """
+        Return True if scheduler is stopped (explicitly or time synchronized)
+
+        Returns:
+            bool: True if stopped
+        """
+        return self.__stop_event.is_set()
+
+    def get_delay(self, attempts):
+        """
+        Return delay before next attempt
+
+        Args:
+            attempts (int): number of failed attempts
+
+        Returns:
+            float: delay in seconds
+        """
+        exponent = min(max(attempts - 1, 0), self.MAX_BACKOFF_EXPONENT)
+        delay = min(self.max_interval, self.min_interval * 2 ** exponent)
+
+        return delay * (1.0 + self.random.uniform(-self.jitter, self.jitter))
+
+    def run(self):
+        """
+        Scheduler main loop
+        """
+        while not self.__stop_event.is_set():
+            delay = self.step()
+            if delay is None:
+                break
+            self.__stop_event.wait(delay)
+
+    def step(self):
+        """
+        Process scheduler iteration
+
+        Returns:
+            float: delay before next iteration, None if time is synchronized
+        """
+        if self.network_available and not self.network_available():
+            if self.__network_up:
+                self.logger.info('Network is unavailable, NTP sync postponed')
+            self.__network_up = False
+            return self.NETWORK_CHECK_INTERVAL
+
+        if not self.__network_up:
+            self.logger.debug('Network is available, restart NTP sync backoff')
+            self.__network_up = True
+            self.attempts = 0
+
+        wall = self.clock()
+        mono = self.monotonic()
+        try:
+            synced = self.sync()
+        except Exception:
+            self.logger.exception('NTP sync failed')
+            synced = False
+        if self.__stop_event.is_set():
+            return None
+
+        if synced:
+            jump = (self.clock() - wall) - (self.monotonic() - mono)
+            self.logger.info('Time synchronized after %d failed attempt(s) (time stepped by %.1f seconds)' % (self.attempts, jump))
+            self.synced = True
+            self.__stop_event.set()
+            try:
+                self.on_synced(jump)
+            except Exception:
+                self.logger.exception('Error occured in NTP synced callback')
+            return None
+
+        self.attempts += 1
+        delay = self.get_delay(self.attempts)
+        self.logger.debug('NTP sync attempt #%d failed, next attempt in %.1f seconds' % (self.attempts, delay))
+
+        return delay
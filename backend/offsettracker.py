@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import logging
+from threading import Lock
+
+__all__ = ['OffsetTracker', 'civil_from_days']
+
+SECONDS_PER_DAY = 86400
+# 1970-01-01 was a thursday (0=monday)
+EPOCH_WEEKDAY = 3
+
+def civil_from_days(days):
+    """
+    Convert number of days since epoch to date (integer arithmetic only)
+
+    Algorithm from http://howardhinnant.github.io/date_algorithms.html#civil_from_days
+
+    Args:
+        days (int): days since 1970-01-01
+
+    Returns:
+        tuple: (year (int), month (int), day (int))
+    """
+    days += 719468
+    era = days // 146097
+    day_of_era = days - era * 146097
+    year_of_era = (day_of_era - day_of_era // 1460 + day_of_era // 36524 - day_of_era // 146096) // 365
+    day_of_year = day_of_era - (365 * year_of_era + year_of_era // 4 - year_of_era // 100)
+    month_position = (5 * day_of_year + 2) // 153
+    day = day_of_year - (153 * month_position + 2) // 5 + 1
+    month = month_position + 3 if month_position < 10 else month_position - 9
+    year = year_of_era + era * 400 + (1 if month <= 2 else 0)
+
+    return year, month, day
+
+class OffsetTracker():
+    """
+    Track UTC offset of a timezone
+
+    Current UTC offset is kept with its validity period (until next DST transition), so local time fields
+    are derived with integer arithmetic. Transitions table is only searched when period is over, and
+    change callback is called when offset changes.
+    """
+
+    def __init__(self, on_change=None, logger=None):
+        """
+        Constructor
+
+        Args:
+            on_change (function): function called when UTC offset changes::
+
+                on_change(timezone (string), old_offset (int), new_offset (int), timestamp (int))
+
+            logger (Logger): logger instance
+        """
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.on_change = on_change
+        self.transitions = None
+        # (period start, period end, offset, tzinfo)
+        self.__period = None
+        # (days since epoch, year, month, day)
+        self.__date = None
+        self.__lock = Lock()
+
+    def set_transitions(self, transitions):
+        """
+        Set tracked timezone. Change callback is not called
+
+        Args:
+            transitions (ZoneTransitions): timezone transitions
+        """
+        with self.__lock:
+            self.transitions = transitions
+            self.__period = None
+            self.__date = None
+
+    def __get_period(self, timestamp):
+        """
+        Return period containing timestamp, searching transitions table only when current period is over
+        """
+        period = self.__period
+        if period is not None and period[0] <= timestamp and (period[1] is None or timestamp < period[1]):
+            return period
+
+        with self.__lock:
+            previous = self.__period
+            period = self.transitions.period(timestamp)
+            self.__period = period
+            changed = previous is not None and previous[2] != period[2]
+
+        if changed:
+            self.logger.info('UTC offset of timezone "%s" changed from %s to %s' % (self.transitions.zone, previous[2], period[2]))
+            if self.on_change:
+                try:
+                    self.on_change(self.transitions.zone, previous[2], period[2], timestamp)
+                except Exception:
+                    self.logger.exception('Error occured in offset change callback')
+
+        return period
+
+    def utcoffset(self, timestamp):
+        """
+        Return UTC offset at specified timestamp
+
+        Args:
+            timestamp (int): timestamp
+
+        Returns:
+            int: UTC offset in seconds
+        """
+        return self.__get_period(timestamp)[2]
+
+    def next_transition(self, timestamp):
+        """
+        Return next offset transition
+
+        Args:
+            timestamp (int): timestamp
+
+        Returns:
+            int: next transition timestamp or None if no more transition
+        """
+        return self.__get_period(timestamp)[1]
+
+    def local_fields(self, timestamp):
+        """
+        Return local time fields of specified timestamp
+
+        Args:
+            timestamp (int): timestamp
+
+        Returns:
+            tuple: (year, month, day, hour, minute, second, weekday (0=monday), utc offset in seconds, tzinfo)
+        """
+        _, _, offset, tzinfo = self.__get_period(timestamp)
+        days, seconds = divmod(timestamp + offset, SECONDS_PER_DAY)
+
+        date = self.__date
+        if date is None or date[0] != days:
+            date = (days,) + civil_from_days(days)
+            self.__date = date
+
+        return (
+            date[1],
+            date[2],
+            date[3],
+            seconds // 3600,
+            seconds % 3600 // 60,
+            seconds % 60,
+            (days + EPOCH_WEEKDAY) % 7,
+            offset,
+            tzinfo,
+        )
+
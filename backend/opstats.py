@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import time
+import functools
+from bisect import bisect_left
+from array import array
+from threading import Lock
+
+__all__ = ['OperationStats', 'OpStats', 'instrument']
+
+class OperationStats():
+    """
+    Single operation statistics
+
+    Durations are stored in a fixed-size histogram of exponential buckets (x2 from 10us), so memory is
+    constant and percentiles are approximated by bucket upper bound (capped to max duration).
+    """
+
+    BOUNDS = tuple(0.00001 * 2 ** index for index in range(28))
+
+    __slots__ = ('count', 'errors', 'last', 'max', 'total', 'buckets')
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.count = 0
+        self.errors = 0
+        self.last = 0.0
+        self.max = 0.0
+        self.total = 0.0
+        self.buckets = array('L', [0] * (len(self.BOUNDS) + 1))
+
+    def record(self, duration, error=False):
+        """
+        Record operation duration
+
+        Args:
+            duration (float): duration in seconds
+            error (bool): True if operation failed
+        """
+        self.count += 1
+        if error:
+            self.errors += 1
+        self.last = duration
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+        self.buckets[bisect_left(self.BOUNDS, duration)] += 1
+
+    def percentile(self, percent):
+        """
+        Return approximated duration percentile
+
+        Args:
+            percent (float): percentile (0-100)
+
+        Returns:
+            float: duration in seconds
+        """
+        if not self.count:
+            return 0.0
+
+        threshold = self.count * percent / 100.0
+        cumulated = 0
+        for index, count in enumerate(self.buckets):
+            cumulated += count
+            if cumulated >= threshold:
+                return min(self.BOUNDS[index], self.max) if index < len(self.BOUNDS) else self.max
+
+        return self.max
+
+    def as_dict(self):
+        """
+        Return statistics as dict (durations in milliseconds)
+
+        Returns:
+            dict: statistics::
+
+                {
+                    count (int): number of operations
+                    errors (int): number of failed operations
+                    last (float): last duration
+                    mean (float): mean duration
+                    p50 (float): median duration
+                    p95 (float): 95th percentile duration
+                    max (float): max duration
+                }
+
+        """
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'last': round(self.last * 1000.0, 3),
+            'mean': round(self.total * 1000.0 / self.count, 3) if self.count else 0.0,
+            'p50': round(self.percentile(50) * 1000.0, 3),
+            'p95': round(self.percentile(95) * 1000.0, 3),
+            'max': round(self.max * 1000.0, 3),
+        }
+
+class OpStats():
+    """
+    Per-operation latency statistics
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        """
+        Constructor
+
+        Args:
+            clock (function): clock function (used for tests)
+        """
+        self.clock = clock
+        self.__operations = {}
+        self.__lock = Lock()
+
+    def record(self, name, duration, error=False):
+        """
+        Record operation duration
+
+        Args:
+            name (string): operation name
+            duration (float): duration in seconds
+            error (bool): True if operation failed
+        """
+        with self.__lock:
+            operation = self.__operations.get(name)
+            if operation is None:
+                operation = OperationStats()
+                self.__operations[name] = operation
+            operation.record(duration, error)
+
+    def call(self, name, function, *args, **kwargs):
+        """
+        Call function and record its duration. Operation fails if function raises exception or returns False
+
+        Args:
+            name (string): operation name
+            function (function): function to call
+            args (list): function arguments
+            kwargs (dict): function keyword arguments
+
+        Returns:
+            any: function result
+        """
+        start = self.clock()
+        error = True
+        try:
+            result = function(*args, **kwargs)
+            error = result is False
+            return result
+        finally:
+            self.record(name, self.clock() - start, error)
+
+    def get_stats(self):
+        """
+        Return statistics of all operations
+
+        Returns:
+            dict: operation name => statistics (see OperationStats.as_dict)
+        """
+        with self.__lock:
+            return {name: operation.as_dict() for name, operation in self.__operations.items()}
+
+    def reset(self):
+        """
+        Reset all statistics
+        """
+        with self.__lock:
+            self.__operations.clear()
+
+    def format(self):
+        """
+        Return statistics as single log line
+
+        Returns:
+            string: statistics (durations in milliseconds)
+        """
+        stats = self.get_stats()
+        return ' '.join(
+            '%s[n=%d err=%d last=%.1f p50=%.1f p95=%.1f max=%.1f]' % (
+                name, stat['count'], stat['errors'], stat['last'], stat['p50'], stat['p95'], stat['max']
+            )
+            for name, stat in sorted(stats.items())
+        )
+
+def instrument(name):
+    """
+    Method decorator recording method duration in instance "op_stats" (OpStats) attribute
+
+    Args:
+        name (string): operation name
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            return self.op_stats.call(name, method, self, *args, **kwargs)
+        return wrapper
+    return decorator
+
@@ -3,20 +3,37 @@
 
 import os
 import time
-import copy
 import re
+import copy
 from datetime import datetime
-from threading import Timer
-import reverse_geocode
-from timezonefinder import TimezoneFinder
-from pytz import timezone
+from threading import RLock, Lock
 from tzlocal import get_localzone
 from cleep.core import CleepModule
 from cleep.exception import CommandError, InvalidParameter, MissingParameter
 from cleep.libs.configs.hostname import Hostname
 from cleep.libs.internals.sun import Sun
 from cleep.libs.internals.console import Console
-from cleep.libs.internals.task import Task
+from .geobackend import GeoBackend
+from .geocache import GeoCache
+from .timestampstore import create_timestamp_store
+from .timesnapshot import TimeSnapshot
+from .minutescheduler import MinuteScheduler
+from .sunephemeris import SunEphemeris
+from .suneventscheduler import SunEventScheduler
+from .positionpipeline import PositionPipeline
+from .timezoneapplier import TimezoneApplier
+from .zoneinforegistry import ZoneinfoRegistry
+from .offsettracker import OffsetTracker
+from .positionresolver import resolve_positions
+from .countryindex import CountryIndex
+from .timezonesearch import TimezoneSearch
+from .opstats import OpStats, instrument
+from .ntpsyncscheduler import NtpSyncScheduler
+from .sntpclient import SntpClient, read_ntpdate_servers
+from .timeevent import TimeEventEmitter
+from .localeengine import locale_engine
+from .timecontext import TimeContext, time_context
+from .clockstate import ClockState
 
 __all__ = ['Parameters']
 
@@ -60,13 +77,51 @@ class Parameters(CleepModule):
             'alpha2': 'GB'
         },
         'timezone': 'Europe/London',
-        'timestamp': 0
+        'timestamp': 0,
+        'sun_triggers': [],
+        'time_event_mode': 'full'
     }
 
     SYSTEM_ZONEINFO_DIR = '/usr/share/zoneinfo/'
     SYSTEM_LOCALTIME = '/etc/localtime'
     SYSTEM_TIMEZONE = '/etc/timezone'
+    # reconfigure tzdata package if native timezone apply fails
+    TIMEZONE_DPKG_FALLBACK = True
+    # NTP sync retry delays (seconds): exponential backoff from NTP_SYNC_INTERVAL to NTP_SYNC_MAX_INTERVAL
+    # with +/-NTP_SYNC_JITTER random variation
     NTP_SYNC_INTERVAL = 60
+    NTP_SYNC_MAX_INTERVAL = 3600
+    NTP_SYNC_JITTER = 0.2
+    # NTP servers queried concurrently by sync_time (servers configured for ntpdate first, these ones if
+    # none), and query timeout (seconds)
+    SYSTEM_NTPDATE = '/etc/default/ntpdate'
+    NTP_SERVERS = ['0.debian.pool.ntp.org', '1.debian.pool.ntp.org', '2.debian.pool.ntp.org', '3.debian.pool.ntp.org']
+    NTP_TIMEOUT = 2.0
+    # seconds before releasing geographical libraries (timezonefinder, reverse_geocode) after last use
+    GEO_IDLE_TIMEOUT = 300.0
+    # geographical lookups cache, stored next to module config file
+    GEO_CACHE_FILE = 'parameters.geocache.json'
+    # closest timezone search (position outside timezones) max duration (seconds) and radius (degrees)
+    TIMEZONE_SEARCH_BUDGET = 3.0
+    TIMEZONE_SEARCH_MAX_DELTA = 10
+    # last known time persistence: writebehind (config saved every TIMESTAMP_FLUSH_INTERVAL minutes),
+    # shutdown (config saved when module stops) or ringfile (small file written in place)
+    TIMESTAMP_STORE = 'writebehind'
+    TIMESTAMP_FLUSH_INTERVAL = 15
+    TIMESTAMP_RING_FILE = 'parameters.timestamp'
+    # number of days of precomputed sun events
+    SUN_EPHEMERIS_DAYS = 7
+    MAX_SUN_SCHEDULE_DAYS = 366
+    # max sun trigger offset (minutes)
+    MAX_SUN_TRIGGER_OFFSET = 720
+    # max number of positions resolved by a single resolve_positions call
+    MAX_RESOLVE_POSITIONS = 1000
+    # max seconds spent searching closest timezones of offshore positions in a single resolve_positions call
+    RESOLVE_POSITIONS_SEARCH_BUDGET = 5.0
+    # parameters.time.now event emission: number of events between full payloads in delta mode
+    TIME_EVENT_KEYFRAME_INTERVAL = 60
+    # log operations statistics every STATS_LOG_INTERVAL minutes at debug level (0 to disable)
+    STATS_LOG_INTERVAL = 0
 
     def __init__(self, bootstrap, debug_enabled):
         """
@@ -80,22 +135,57 @@ class Parameters(CleepModule):
         CleepModule.__init__(self, bootstrap, debug_enabled)
 
         # members
+        self.op_stats = OpStats()
         self.hostname = Hostname(self.cleep_filesystem)
         self.sun = Sun()
-        self.sunset = None
-        self.sunrise = None
-        self.suns = {
-            'sunset': 0,
-            'sunset_iso': '',
-            'sunrise': 0,
-            'sunrise_iso': ''
-        }
-        self.timezonefinder = TimezoneFinder()
-        self.timezone_name = None
-        self.timezone = None
+        self.sun_scheduler = SunEventScheduler(self.logger)
+        self.sun_scheduler.add_trigger('sunrise', 0, self.__on_sun_event)
+        self.sun_scheduler.add_trigger('sunset', 0, self.__on_sun_event)
+        self.__sun_triggers = {}
+        self.position_pipeline = PositionPipeline(self.__on_position_progress, self.logger)
+        self.__config_lock = RLock()
+        self.__sync_lock = Lock()
+        # timezone and sun times, swapped at once (see ClockState). Lock only serializes updates
+        self.__state = ClockState()
+        self.__state_lock = RLock()
+        self.geo_backend = GeoBackend(self.GEO_IDLE_TIMEOUT, self.logger)
+        self.country_index = CountryIndex(logger=self.logger)
+        self.geo_cache = GeoCache(
+            os.path.join(self.CONFIG_DIR, self.GEO_CACHE_FILE),
+            self.cleep_filesystem,
+            data_files=[self.country_index.path],
+            logger=self.logger,
+        )
+        self.timezone_search = TimezoneSearch(
+            self.geo_backend,
+            budget=self.TIMEZONE_SEARCH_BUDGET,
+            max_delta=self.TIMEZONE_SEARCH_MAX_DELTA,
+            logger=self.logger,
+        )
+        self.timezone_applier = TimezoneApplier(cleep_filesystem=self.cleep_filesystem, logger=self.logger)
+        self.sntp_client = SntpClient(
+            read_ntpdate_servers(self.SYSTEM_NTPDATE) or self.NTP_SERVERS,
+            timeout=self.NTP_TIMEOUT,
+            logger=self.logger,
+        )
+        self.zoneinfo = ZoneinfoRegistry(self.SYSTEM_ZONEINFO_DIR, logger=self.logger)
+        self.offset_tracker = OffsetTracker(self.__on_offset_change, logger=self.logger)
+        # config accessors are resolved at call time
+        self.timestamp_store = create_timestamp_store(
+            self.TIMESTAMP_STORE,
+            lambda field: self._get_config_field(field),
+            lambda field, value: self._set_config_field(field, value),
+            ring_path=os.path.join(self.CONFIG_DIR, self.TIMESTAMP_RING_FILE),
+            cleep_filesystem=self.cleep_filesystem,
+            flush_interval=self.TIMESTAMP_FLUSH_INTERVAL,
+            logger=self.logger
+        )
         self.time_task = None
         self.sync_time_task = None
         self.__clock_uuid = None
+        self.__time_snapshot = None
+        self.__responses = {}
+        self.__responses_version = 0
         # code from https://stackoverflow.com/a/106223
         self.__hostname_pattern = r'^(([a-zA-Z0-9]|[a-zA-Z0-9][a-zA-Z0-9\-]*[a-zA-Z0-9])\.)*([A-Za-z0-9]|[A-Za-z0-9][A-Za-z0-9\-]*[A-Za-z0-9])$'
 
@@ -105,6 +195,50 @@ class Parameters(CleepModule):
         self.time_sunset_event = self._get_event('parameters.time.sunset')
         self.hostname_update_event = self._get_event('parameters.hostname.update')
         self.country_update_event = self._get_event('parameters.country.update')
+        self.time_sunevent_event = self._get_event('parameters.time.sunevent')
+        self.time_offsetchange_event = self._get_event('parameters.time.offsetchange')
+        self.position_progress_event = self._get_event('parameters.position.progress')
+        self.time_synced_event = self._get_event('parameters.time.synced')
+        self.time_event_emitter = TimeEventEmitter(
+            self.time_now_event,
+            keyframe_interval=self.TIME_EVENT_KEYFRAME_INTERVAL,
+            logger=self.logger,
+        )
+
+    @property
+    def state(self):
+        """
+        Current clock state (read-only, see ClockState)
+        """
+        return self.__state
+
+    @property
+    def suns(self):
+        return self.__state.suns
+
+    @property
+    def sunrise(self):
+        return self.__state.sunrise
+
+    @property
+    def sunset(self):
+        return self.__state.sunset
+
+    @property
+    def sun_ephemeris(self):
+        return self.__state.sun_ephemeris
+
+    @property
+    def timezone_name(self):
+        return self.__state.timezone_name
+
+    @property
+    def timezone(self):
+        return self.__state.timezone
+
+    @property
+    def timezone_transitions(self):
+        return self.__state.timezone_transitions
 
     def _configure(self):
         """
@@ -118,19 +252,22 @@ class Parameters(CleepModule):
                 'name': 'Clock'
             }
             self._add_device(clock)
+            self._invalidate_responses()
 
         # prepare country
         country = self._get_config_field('country')
         if not country:
             self.set_country()
+        else:
+            # formatters messages language follows country
+            locale_engine.set_country(country.get('alpha2'))
 
         # prepare timezone
         timezone_name = self._get_config_field('timezone')
-        if timezone_name:
-            self.timezone = timezone(timezone_name)
-        else:
+        if not timezone_name:
             self.logger.info('No timezone defined, use default one. It will be updated when user sets its position.')
-            self.timezone = get_localzone().zone
+        if not timezone_name or not self.__load_timezone(timezone_name):
+            self.__load_timezone(get_localzone().zone)
 
         # compute sun times
         self.set_sun()
@@ -141,26 +278,44 @@ class Parameters(CleepModule):
             if devices[uuid]['type'] == 'clock':
                 self.__clock_uuid = uuid
 
+        # clock event emission mode
+        time_event_mode = self._get_config_field('time_event_mode')
+        if time_event_mode:
+            try:
+                self.time_event_emitter.set_mode(time_event_mode)
+            except ValueError:
+                self.logger.warning('Invalid time event mode "%s" configured, full mode used' % time_event_mode)
+
     def _on_start(self):
         """
         Module starts
         """
         # restore last saved timestamp if system time seems very old (NTP error)
-        saved_timestamp = self._get_config_field('timestamp')
+        saved_timestamp = self.timestamp_store.load()
         if (int(time.time()) - saved_timestamp) < 0:
             # it seems NTP sync failed, launch timer to regularly try to sync device time
             self.logger.info(
                 'Device time seems to be invalid (%s), launch synchronization time task',
                 datetime.now().strftime("%Y-%m-%d %H:%M")
             )
-            self.sync_time_task = Task(Parameters.NTP_SYNC_INTERVAL, self._sync_time_task, self.logger)
+            self.sync_time_task = NtpSyncScheduler(
+                self.sync_time,
+                self.__on_time_synced,
+                min_interval=self.NTP_SYNC_INTERVAL,
+                max_interval=self.NTP_SYNC_MAX_INTERVAL,
+                jitter=self.NTP_SYNC_JITTER,
+                logger=self.logger,
+            )
             self.sync_time_task.start()
 
-        # launch time task (synced to current seconds)
-        seconds = 60 - (int(time.time()) % 60)
-        self.time_task = Task(60.0, self._time_task, self.logger)
-        timer = Timer(0 if seconds == 60 else seconds, self.time_task.start)
-        timer.start()
+        # launch time task (aligned on wall clock minutes)
+        self.time_task = MinuteScheduler(self._on_minute, self.logger)
+        self.time_task.start()
+
+        # launch sun events timers
+        for trigger in self._get_config_field('sun_triggers') or []:
+            self.__register_sun_trigger(trigger['event'], trigger['offset'])
+        self.sun_scheduler.start()
 
     def _on_stop(self):
         """
@@ -168,11 +323,75 @@ class Parameters(CleepModule):
         """
         if self.time_task:
             self.time_task.stop()
+        if self.sync_time_task:
+            self.sync_time_task.stop()
+        self.sun_scheduler.stop()
+        self.geo_backend.release()
+        time_context.clear()
+
+        # persist last known time
+        self.timestamp_store.flush()
+
+    @instrument('config_write')
+    def _set_config_field(self, field, value):
+        """
+        Set config field value and invalidate cached responses
+
+        Args:
+            field (string): field name
+            value (any): field value
+
+        Returns:
+            bool: True if field saved successfully
+        """
+        # position update steps run in parallel
+        with self.__config_lock:
+            res = super(Parameters, self)._set_config_field(field, value)
+        self._invalidate_responses()
+
+        return res
+
+    def _invalidate_responses(self):
+        """
+        Invalidate cached get_module_config and get_module_devices responses
+        """
+        self.__responses_version += 1
+
+    def __get_cached_response(self, name, builder):
+        """
+        Return cached response. Response is built again at each new minute or after invalidation.
+        A shallow copy is returned so caller can add or remove response keys, nested values are shared
+        and must not be modified
+
+        Args:
+            name (string): response name
+            builder (function): function that builds response
+
+        Returns:
+            any: response
+        """
+        key = (int(time.time()) // 60, self.__responses_version)
+        cached = self.__responses.get(name)
+        if cached is not None and cached[0] == key:
+            return copy.copy(cached[1])
+
+        response = builder()
+        self.__responses[name] = (key, response)
+        return copy.copy(response)
 
     def get_module_config(self):
         """
         Get full module configuration
 
+        Returns:
+            dict: module configuration
+        """
+        return self.__get_cached_response('config', self.__build_module_config)
+
+    def __build_module_config(self):
+        """
+        Build module configuration
+
         Returns:
             dict: module configuration
         """
@@ -183,6 +402,7 @@ class Parameters(CleepModule):
         config['sun'] = self.get_sun()
         config['country'] = self.get_country()
         config['timezone'] = self.get_timezone()
+        config['time_event_mode'] = self.time_event_emitter.mode
 
         return config
 
@@ -190,6 +410,15 @@ class Parameters(CleepModule):
         """
         Return clock as parameters device
 
+        Returns:
+            dict: module devices
+        """
+        return self.__get_cached_response('devices', self.__build_module_devices)
+
+    def __build_module_devices(self):
+        """
+        Build module devices
+
         Returns:
             dict: module devices
         """
@@ -197,114 +426,174 @@ class Parameters(CleepModule):
 
         for uuid in devices:
             if devices[uuid]['type'] == 'clock':
-                data = self.__format_time()
-                data.update({
-                    'sunrise': self.suns['sunrise'],
-                    'sunset': self.suns['sunset']
-                })
-                devices[uuid].update(data)
+                devices[uuid].update(self.__get_time_snapshot().as_dict())
 
         return devices
 
-    def __format_time(self, now=None):
+    def __get_time_snapshot(self, now=None):
         """
-        Return time with different splitted infos
+        Return time snapshot of current minute. Snapshot is computed once per minute and shared
 
         Args:
             now (int): timestamp to use. If None current timestamp if used
 
         Returns:
-            dict: time data::
-
-                {
-                    timestamp (int): current timestamp
-                    iso (string): current datetime in iso 8601 format
-                    year (int)
-                    month (int)
-                    day (int)
-                    hour (int)
-                    minute (int)
-                    weekday (int): 0=monday, 1=tuesday... 6=sunday
-                    weekday_literal (string): english literal weekday value (monday, tuesday, ...)
-                }
-
+            TimeSnapshot: time snapshot
         """
-        # current time
         if not now:
             now = int(time.time())
-        current_dt = datetime.fromtimestamp(now)
-        current_dt = self.timezone.localize(current_dt)
-        weekday = current_dt.weekday()
-        if weekday == 0:
-            weekday_literal = 'monday'
-        elif weekday == 1:
-            weekday_literal = 'tuesday'
-        elif weekday == 2:
-            weekday_literal = 'wednesday'
-        elif weekday == 3:
-            weekday_literal = 'thursday'
-        elif weekday == 4:
-            weekday_literal = 'friday'
-        elif weekday == 5:
-            weekday_literal = 'saturday'
-        elif weekday == 6:
-            weekday_literal = 'sunday'
 
-        return {
-            'timestamp': now,
-            'iso': current_dt.isoformat(),
-            'year': current_dt.year,
-            'month': current_dt.month,
-            'day': current_dt.day,
-            'hour': current_dt.hour,
-            'minute': current_dt.minute,
-            'weekday': weekday,
-            'weekday_literal': weekday_literal
-        }
+        snapshot = self.__time_snapshot
+        if snapshot is None or not snapshot.is_same_minute(now):
+            # built once per minute, with updates held so snapshot is never built from a replaced state
+            with self.__state_lock:
+                snapshot = self.__time_snapshot
+                if snapshot is None or not snapshot.is_same_minute(now):
+                    state = self.__state
+                    snapshot = TimeSnapshot.from_fields(
+                        now, self.offset_tracker.local_fields(now), state.suns['sunrise'], state.suns['sunset']
+                    )
+                    self.__time_snapshot = snapshot
+                    self.__publish_time_context(snapshot, state)
+
+        return snapshot
+
+    def __refresh_time_snapshot(self):
+        """
+        Drop current time snapshot and publish a new one (time context consumers see changes immediately)
+        """
+        self.__time_snapshot = None
+        self.__get_time_snapshot()
 
-    def _sync_time_task(self):
+    def __publish_time_context(self, snapshot, state):
         """
-        Sync time task. It is used to try to sync device time using NTP server.
+        Publish shared time context (see timecontext) of specified snapshot
 
-        Note:
-            This task is launched only if device time is insane.
+        Args:
+            snapshot (TimeSnapshot): time snapshot
+            state (ClockState): clock state used to build snapshot
         """
-        if self.sync_time():
-            self.logger.info('Time synchronized with NTP server (%s)' % datetime.now().strftime("%Y-%m-%d %H:%M"))
-            self.sync_time_task.stop()
-            self.sync_time_task = None
+        ephemeris = state.sun_ephemeris
+        next_sunrise = next_sunset = next_sun_event = None
+        if ephemeris:
+            # sun events only change a few times a day, reuse previous ones when possible
+            previous = time_context.get()
+            if previous is not None and previous.timezone is not state.timezone:
+                previous = None
+            next_sunrise = self.__get_sun_event(
+                state,
+                ephemeris.next_event(snapshot.timestamp, ['sunrise']),
+                previous.next_sunrise if previous else None,
+            )
+            next_sunset = self.__get_sun_event(
+                state,
+                ephemeris.next_event(snapshot.timestamp, ['sunset']),
+                previous.next_sunset if previous else None,
+            )
+            next_sun_event = self.__get_sun_event(
+                state,
+                ephemeris.next_event(snapshot.timestamp),
+                previous.next_sun_event if previous else None,
+            )
 
-    def _time_task(self):
+        time_context.publish(TimeContext(
+            snapshot,
+            state.timezone_name,
+            state.timezone,
+            next_sunrise=next_sunrise,
+            next_sunset=next_sunset,
+            next_sun_event=next_sun_event,
+        ))
+
+    def __on_time_synced(self, jump):
         """
-        Time task used to refresh time
+        NTP sync scheduler callback, called once device time is synchronized
+
+        Args:
+            jump (float): time step (seconds) applied by synchronization
         """
-        now_formatted = self.__format_time()
+        self.logger.info('Time synchronized with NTP server (%s)' % datetime.now().strftime("%Y-%m-%d %H:%M"))
+        self.sync_time_task = None
 
-        # send now event
-        now_event_params = copy.deepcopy(now_formatted)
-        now_event_params.update({
-            'sunrise': self.suns['sunrise'],
-            'sunset': self.suns['sunset']
+        # time stepped: re-baseline clock scheduler (current minute handled below), re-arm sun timers and refresh time
+        if self.time_task:
+            self.time_task.reset()
+        self.set_sun()
+        self._time_task()
+
+        self.time_synced_event.send(params={
+            'timestamp': int(time.time()),
+            'jump': round(jump, 3),
         })
-        self.time_now_event.send(params=now_event_params, device_id=self.__clock_uuid)
 
-        # send sunrise event
-        if self.sunrise:
-            if now_formatted['hour'] == self.sunrise.hour and now_formatted['minute'] == self.sunrise.minute:
-                self.time_sunrise_event.send(device_id=self.__clock_uuid)
+    def _on_minute(self, minute, jumped):
+        """
+        Minute scheduler callback
+
+        Args:
+            minute (int): current minute timestamp
+            jumped (bool): True if system clock jumped
+        """
+        if jumped:
+            # current day may have changed and sun timers are armed on wrong time, refresh sun times.
+            # Sun events skipped by a forward jump are dropped (see SunEventScheduler)
+            self.logger.info('System clock jumped, refresh sun times')
+            self.set_sun()
+
+        self._time_task()
+
+        if self.STATS_LOG_INTERVAL and (minute // 60) % self.STATS_LOG_INTERVAL == 0:
+            self.logger.debug('Operations stats: %s' % self.op_stats.format())
+
+    def __on_sun_event(self, event, offset, timestamp):
+        """
+        Sun scheduler callback for sunrise and sunset events
+
+        Args:
+            event (string): sun event name
+            offset (int): offset from sun event (seconds)
+            timestamp (int): sun event timestamp
+        """
+        if event == 'sunrise':
+            self.time_sunrise_event.send(device_id=self.__clock_uuid)
+        elif event == 'sunset':
+            self.time_sunset_event.send(device_id=self.__clock_uuid)
 
-        # send sunset event
-        if self.sunset:
-            if now_formatted['hour'] == self.sunset.hour and now_formatted['minute'] == self.sunset.minute:
-                self.time_sunset_event.send(device_id=self.__clock_uuid)
+    def __on_sun_trigger(self, event, offset, timestamp):
+        """
+        Sun scheduler callback for user sun triggers
 
-        # update sun times after midnight
-        if now_formatted['hour'] == 0 and now_formatted['minute'] == 5:
+        Args:
+            event (string): sun event name
+            offset (int): offset from sun event (seconds)
+            timestamp (int): sun event timestamp
+        """
+        self.time_sunevent_event.send(params={
+            'event': event,
+            'offset': offset // 60,
+            'timestamp': timestamp,
+        }, device_id=self.__clock_uuid)
+
+    @instrument('time_task')
+    def _time_task(self):
+        """
+        Time task used to refresh time
+        """
+        # force new snapshot at each tick
+        self.__time_snapshot = None
+        self._invalidate_responses()
+        now = self.__get_time_snapshot()
+
+        # send now event
+        self.time_event_emitter.emit(now.as_dict(), device_id=self.__clock_uuid)
+
+        # update sun times when day changed
+        if self.__state.sun_day != (now.year, now.month, now.day):
             self.set_sun()
 
-        # save last timestamp in config to restore it after a reboot and NTP sync failed (no internet)
+        # save last timestamp to restore it after a reboot and NTP sync failed (no internet)
         if not self.sync_time_task:
-            self._set_config_field('timestamp', now_formatted['timestamp'])
+            self.timestamp_store.update(now.timestamp)
 
     def set_hostname(self, hostname):
         """
@@ -328,6 +617,7 @@ class Parameters(CleepModule):
 
         # send event to update hostname on all devices
         if res:
+            self._invalidate_responses()
             self.hostname_update_event.send(params={'hostname': hostname})
 
         return res
@@ -345,10 +635,16 @@ class Parameters(CleepModule):
         """
         Set device position
 
+        Timezone, country and sun times are updated in background. Progress is reported with
+        "parameters.position.progress" event. A new position supersedes running update.
+
         Args:
             latitude (float): latitude
             longitude (float): longitude
 
+        Returns:
+            string: position update job id
+
         Raises:
             CommandError: if error occured during position saving
         """
@@ -374,13 +670,104 @@ class Parameters(CleepModule):
         # computing new times
         time.tzset()
 
-        # and update related stuff
-        self.set_timezone()
-        self.set_country()
-        self.set_sun()
+        # and update related stuff in background (timezone and country lookups in parallel)
+        return self.position_pipeline.submit([
+            [('timezone', self.set_timezone), ('country', self.set_country)],
+            [('sun', self.set_sun)],
+            # send now event
+            [('time', self._time_task)],
+        ])
 
-        # send now event
-        self._time_task()
+    def __on_offset_change(self, timezone_name, old_offset, new_offset, timestamp):
+        """
+        Timezone UTC offset changed (DST transition)
+
+        Args:
+            timezone_name (string): timezone name
+            old_offset (int): previous UTC offset in seconds
+            new_offset (int): new UTC offset in seconds
+            timestamp (int): timestamp of change detection
+        """
+        # detected while building a snapshot, which is then published with new offset
+        self.__time_snapshot = None
+        self._invalidate_responses()
+        self.time_offsetchange_event.send(params={
+            'timezone': timezone_name,
+            'old_offset': old_offset,
+            'new_offset': new_offset,
+            'timestamp': timestamp,
+        })
+
+    def __on_position_progress(self, job_id, status, step, progress):
+        """
+        Position update job progress callback
+
+        Args:
+            job_id (string): job id
+            status (string): job status (running, done, failed, superseded)
+            step (string): last processed step (timezone, country, sun, time)
+            progress (int): job progress percentage
+        """
+        self.logger.debug('Position job %s: status=%s step=%s progress=%s' % (job_id, status, step, progress))
+        self.position_progress_event.send(params={
+            'job_id': job_id,
+            'status': status,
+            'step': step,
+            'progress': progress,
+        })
+
+    def resolve_positions(self, positions):
+        """
+        Resolve timezone, country and sun times of many positions at once (fleet provisioning).
+        Device position and system configuration are not modified
+
+        Args:
+            positions (list): list of positions::
+
+                [
+                    {
+                        latitude (float): latitude
+                        longitude (float): longitude
+                    },
+                    ...
+                ]
+
+        Returns:
+            list: resolved positions in same order::
+
+                [
+                    {
+                        latitude (float): position latitude
+                        longitude (float): position longitude
+                        timezone (string): timezone name or None if not found
+                        country (string): country name or None if not found
+                        alpha2 (string): country code or None if not found
+                        sunrise (int): today sunrise timestamp or None
+                        sunset (int): today sunset timestamp or None
+                        error (string): error message if position is invalid, None otherwise
+                    },
+                    ...
+                ]
+
+        Raises:
+            MissingParameter: if positions parameter is missing
+            InvalidParameter: if positions parameter is invalid
+        """
+        if positions is None:
+            raise MissingParameter('Parameter "positions" is missing')
+        if not isinstance(positions, list):
+            raise InvalidParameter('Parameter "positions" is invalid')
+        if len(positions) > self.MAX_RESOLVE_POSITIONS:
+            raise InvalidParameter('Parameter "positions" must contain %d positions max' % self.MAX_RESOLVE_POSITIONS)
+
+        return resolve_positions(
+            positions,
+            self.geo_backend,
+            country_index=self.country_index,
+            timezone_search=self.timezone_search,
+            timezone_search_budget=self.RESOLVE_POSITIONS_SEARCH_BUDGET,
+            logger=self.logger,
+        )
 
     def get_position(self):
         """
@@ -410,8 +797,193 @@ class Parameters(CleepModule):
                 }
 
         """
-        return self.suns
+        return self.__state.suns
+
+    def get_sun_schedule(self, days=SUN_EPHEMERIS_DAYS):
+        """
+        Return sun events of next days
+
+        Args:
+            days (int): number of days (including today)
+
+        Returns:
+            list: list of days::
+
+                [
+                    {
+                        date (string): local date (YYYY-MM-DD)
+                        nautical_dawn (int), nautical_dawn_iso (string)
+                        civil_dawn (int), civil_dawn_iso (string)
+                        sunrise (int), sunrise_iso (string)
+                        noon (int), noon_iso (string)
+                        sunset (int), sunset_iso (string)
+                        civil_dusk (int), civil_dusk_iso (string)
+                        nautical_dusk (int), nautical_dusk_iso (string)
+                    },
+                    ...
+                ]
+
+            Event values are None if event doesn't occur that day (polar regions)
+
+        Raises:
+            InvalidParameter: if days is invalid
+        """
+        if isinstance(days, bool) or not isinstance(days, int) or days < 1 or days > self.MAX_SUN_SCHEDULE_DAYS:
+            raise InvalidParameter('Parameter "days" must be between 1 and %d' % self.MAX_SUN_SCHEDULE_DAYS)
+
+        state = self.__state
+        ephemeris = state.sun_ephemeris
+        if ephemeris is None:
+            return []
+        if days > ephemeris.days:
+            ephemeris = SunEphemeris(ephemeris.latitude, ephemeris.longitude, state.timezone, days)
 
+        return ephemeris.get_schedule(days)
+
+    def get_next_sun_event(self):
+        """
+        Return next sun event
+
+        Returns:
+            dict: next sun event or None if no event::
+
+                {
+                    event (string): event name (nautical_dawn, civil_dawn, sunrise, noon, sunset, civil_dusk, nautical_dusk)
+                    timestamp (int): event timestamp
+                    iso (string): event local datetime in iso 8601 format
+                }
+
+        """
+        state = self.__state
+        ephemeris = state.sun_ephemeris
+        return self.__get_sun_event(state, ephemeris.next_event() if ephemeris else None)
+
+    def __get_sun_event(self, state, sun_event, previous=None):
+        """
+        Return sun event as dict
+
+        Args:
+            state (ClockState): clock state sun event comes from
+            sun_event (tuple): sun event as returned by SunEphemeris.next_event
+            previous (dict): previously built sun event, returned as is if it is the same event
+
+        Returns:
+            dict: sun event (see get_next_sun_event) or None if sun_event is None
+        """
+        if sun_event is None:
+            return None
+        if previous is not None and previous['timestamp'] == sun_event[1] and previous['event'] == sun_event[0]:
+            return previous
+
+        return {
+            'event': sun_event[0],
+            'timestamp': sun_event[1],
+            'iso': state.timezone_transitions.fromtimestamp(sun_event[1]).isoformat(),
+        }
+
+    def add_sun_trigger(self, event, offset):
+        """
+        Add sun trigger. Event "parameters.time.sunevent" is sent when trigger fires
+
+        Args:
+            event (string): sun event (nautical_dawn, civil_dawn, sunrise, noon, sunset, civil_dusk, nautical_dusk)
+            offset (int): offset in minutes from sun event (negative before event)
+
+        Raises:
+            InvalidParameter: if parameter is invalid
+            CommandError: if unable to save trigger
+        """
+        self.__check_sun_trigger_parameters(event, offset)
+
+        triggers = list(self._get_config_field('sun_triggers') or [])
+        if any(trigger['event'] == event and trigger['offset'] == offset for trigger in triggers):
+            raise InvalidParameter('Sun trigger already exists')
+        triggers.append({
+            'event': event,
+            'offset': offset
+        })
+        if not self._set_config_field('sun_triggers', triggers):
+            raise CommandError('Unable to save sun trigger')
+
+        self.__register_sun_trigger(event, offset)
+
+    def remove_sun_trigger(self, event, offset):
+        """
+        Remove sun trigger
+
+        Args:
+            event (string): sun event
+            offset (int): offset in minutes from sun event
+
+        Raises:
+            InvalidParameter: if parameter is invalid
+            CommandError: if unable to save triggers
+        """
+        self.__check_sun_trigger_parameters(event, offset)
+
+        triggers = self._get_config_field('sun_triggers') or []
+        remaining = [trigger for trigger in triggers if trigger['event'] != event or trigger['offset'] != offset]
+        if len(remaining) == len(triggers):
+            raise InvalidParameter('Sun trigger does not exist')
+        if not self._set_config_field('sun_triggers', remaining):
+            raise CommandError('Unable to save sun trigger')
+
+        trigger_id = self.__sun_triggers.pop((event, offset), None)
+        if trigger_id:
+            self.sun_scheduler.remove_trigger(trigger_id)
+
+    def get_sun_triggers(self):
+        """
+        Return sun triggers
+
+        Returns:
+            list: list of triggers::
+
+                [
+                    {
+                        event (string): sun event
+                        offset (int): offset in minutes from sun event
+                    },
+                    ...
+                ]
+
+        """
+        return self._get_config_field('sun_triggers') or []
+
+    def __check_sun_trigger_parameters(self, event, offset):
+        """
+        Check sun trigger parameters
+
+        Args:
+            event (string): sun event
+            offset (int): offset in minutes
+
+        Raises:
+            MissingParameter: if parameter is missing
+            InvalidParameter: if parameter is invalid
+        """
+        if event is None:
+            raise MissingParameter('Parameter "event" is missing')
+        if event not in SunEphemeris.EVENTS:
+            raise InvalidParameter('Parameter "event" is invalid')
+        if offset is None:
+            raise MissingParameter('Parameter "offset" is missing')
+        if not isinstance(offset, int) or abs(offset) > self.MAX_SUN_TRIGGER_OFFSET:
+            raise InvalidParameter('Parameter "offset" is invalid')
+
+    def __register_sun_trigger(self, event, offset):
+        """
+        Register sun trigger in sun scheduler
+
+        Args:
+            event (string): sun event
+            offset (int): offset in minutes
+        """
+        if (event, offset) in self.__sun_triggers:
+            return
+        self.__sun_triggers[(event, offset)] = self.sun_scheduler.add_trigger(event, offset * 60, self.__on_sun_trigger)
+
+    @instrument('set_sun')
     def set_sun(self):
         """"
         Compute sun times (sunrise and sunset) according to configured position
@@ -419,21 +991,71 @@ class Parameters(CleepModule):
         # get position
         position = self._get_config_field('position')
 
-        # compute sun times
-        self.sunset = None
-        self.sunrise = None
+        # updates are serialized, readers keep using current state until new one is swapped
+        with self.__state_lock:
+            state = self.__state
+            self.__swap_state(state.replace(**self.__compute_sun(state, position)))
+
+    def __compute_sun(self, state, position):
+        """
+        Compute sun times of position in timezone of specified state
+
+        Args:
+            state (ClockState): state providing timezone
+            position (dict): position (latitude, longitude)
+
+        Returns:
+            dict: ClockState sun fields
+        """
+        now = state.timezone_transitions.fromtimestamp(int(time.time()))
+        changes = {
+            'sunrise': None,
+            'sunset': None,
+            'sun_ephemeris': None,
+            'sun_day': (now.year, now.month, now.day),
+        }
         if position['latitude'] != 0 and position['longitude'] != 0:
+            # compute sun times
             self.sun.set_position(position['latitude'], position['longitude'])
-            self.sunset = self.sun.sunset()
-            self.sunrise = self.sun.sunrise()
-            self.logger.debug('Found sunrise:%s sunset:%s' % (self.sunrise, self.sunset))
+            sunset = self.sun.sunset()
+            sunrise = self.sun.sunrise()
+            self.logger.debug('Found sunrise:%s sunset:%s' % (sunrise, sunset))
+            suns = {
+                'sunrise': int(sunrise.strftime('%s')),
+                'sunrise_iso': sunrise.isoformat(),
+                'sunset': int(sunset.strftime('%s')),
+                'sunset_iso': sunset.isoformat(),
+            }
+
+            # precompute next days events, today sunrise and sunset are aligned on values above
+            ephemeris = SunEphemeris(position['latitude'], position['longitude'], state.timezone, self.SUN_EPHEMERIS_DAYS)
+            ephemeris.set_event(0, 'sunrise', suns['sunrise'])
+            ephemeris.set_event(0, 'sunset', suns['sunset'])
+            changes.update(sunrise=sunrise, sunset=sunset, suns=suns, sun_ephemeris=ephemeris)
 
-            # save times
-            self.suns['sunrise'] = int(self.sunrise.strftime('%s'))
-            self.suns['sunrise_iso'] = self.sunrise.isoformat()
-            self.suns['sunset'] = int(self.sunset.strftime('%s'))
-            self.suns['sunset_iso'] = self.sunset.isoformat()
+        return changes
 
+    def __swap_state(self, state):
+        """
+        Swap clock state and update what depends on it. Must be called with state lock held
+
+        Args:
+            state (ClockState): new state
+        """
+        previous = self.__state
+        self.__state = state
+
+        if state.timezone_transitions is not previous.timezone_transitions:
+            self.offset_tracker.set_transitions(state.timezone_transitions)
+        if state.sun_ephemeris is not previous.sun_ephemeris:
+            # re-arm sun events timers
+            self.sun_scheduler.set_ephemeris(state.sun_ephemeris)
+
+        # timezone and sun times are part of time snapshot and responses
+        self.__refresh_time_snapshot()
+        self._invalidate_responses()
+
+    @instrument('set_country')
     def set_country(self):
         """
         Compute country (and associated alpha) from current internal position
@@ -454,17 +1076,25 @@ class Parameters(CleepModule):
         }
         try:
             # search country
-            coordinates = ((position['latitude'], position['longitude']), )
-            # need a tuple
-            geo = reverse_geocode.search(coordinates)
-            self.logger.debug('Found country infos from position %s: %s' % (position, geo))
-            if geo and len(geo) > 0 and 'country_code' in geo[0] and 'country' in geo[0]:
-                country['alpha2'] = geo[0]['country_code']
-                country['country'] = geo[0]['country']
+            country['alpha2'] = self.geo_cache.get(position['latitude'], position['longitude'], 'alpha2')
+            country['country'] = self.geo_cache.get(position['latitude'], position['longitude'], 'country')
+            if country['alpha2'] and country['country']:
+                self.logger.debug('Found country infos from cache for position %s: %s' % (position, country))
+            elif self.__search_country_in_index(position, country):
+                self.geo_cache.update(position['latitude'], position['longitude'], **country)
+            else:
+                # fallback to reverse_geocode
+                geo = self.geo_backend.search_countries([(position['latitude'], position['longitude'])])
+                self.logger.debug('Found country infos from position %s: %s' % (position, geo))
+                if geo and len(geo) > 0 and 'country_code' in geo[0] and 'country' in geo[0]:
+                    country['alpha2'] = geo[0]['country_code']
+                    country['country'] = geo[0]['country']
+                    self.geo_cache.update(position['latitude'], position['longitude'], **country)
 
             # save new country
             if not self._set_config_field('country', country):
                 raise CommandError('Unable to save country')
+            locale_engine.set_country(country['alpha2'])
 
             # send event
             self.country_update_event.send(params=country)
@@ -475,6 +1105,32 @@ class Parameters(CleepModule):
         except Exception:
             self.logger.exception('Unable to find country for position %s:' % position)
 
+    def __search_country_in_index(self, position, country):
+        """
+        Search country in offline country index
+
+        Args:
+            position (dict): position (latitude, longitude)
+            country (dict): country dict to fill (alpha2, country)
+
+        Returns:
+            bool: True if country found
+        """
+        if not self.country_index.is_available():
+            return False
+
+        try:
+            found = self.country_index.lookup(position['latitude'], position['longitude'])
+        except Exception:
+            self.logger.exception('Unable to search country in country index')
+            return False
+        if not found:
+            return False
+
+        self.logger.debug('Found country infos from index for position %s: %s' % (position, found))
+        country['alpha2'], country['country'] = found
+        return True
+
     def get_country(self):
         """
         Get country from position
@@ -490,6 +1146,7 @@ class Parameters(CleepModule):
         """
         return self._get_config_field('country')
 
+    @instrument('set_timezone')
     def set_timezone(self):
         """
         Set timezone according to coordinates
@@ -507,17 +1164,21 @@ class Parameters(CleepModule):
             return False
 
         # compute timezone
-        current_timezone = None
+        current_timezone = self.geo_cache.get(position['latitude'], position['longitude'], 'timezone')
         try:
-            # try to find timezone at position
-            current_timezone = self.timezonefinder.timezone_at(lat=position['latitude'], lng=position['longitude'])
-            if current_timezone is None:
-                # extend search to closest position
-                # TODO increase delta_degree to extend research, careful it use more CPU !
-                current_timezone = self.timezonefinder.closest_timezone_at(
-                    lat=position['latitude'],
-                    lng=position['longitude']
-                )
+            if current_timezone:
+                self.logger.debug('Found timezone from cache for position %s: %s' % (position, current_timezone))
+            else:
+                # try to find timezone at position
+                current_timezone = self.geo_backend.timezone_at(position['latitude'], position['longitude'])
+                definitive = True
+                if current_timezone is None:
+                    # extend search to closest position, widening radius within time budget
+                    current_timezone, definitive = self.timezone_search.search(position['latitude'], position['longitude'])
+                if current_timezone and definitive:
+                    self.geo_cache.update(position['latitude'], position['longitude'], timezone=current_timezone)
+                elif current_timezone:
+                    self.logger.debug('Timezone search budget exhausted, "%s" not cached' % current_timezone)
         except ValueError:
             # the coordinates were out of bounds
             self.logger.exception('Coordinates out of bounds')
@@ -533,11 +1194,23 @@ class Parameters(CleepModule):
             raise CommandError('Unable to save timezone')
 
         # configure system timezone
-        zoneinfo = os.path.join(self.SYSTEM_ZONEINFO_DIR, current_timezone)
-        self.logger.debug('Checking zoneinfo file: %s' % zoneinfo)
-        if not os.path.exists(zoneinfo):
+        if not self.zoneinfo.is_valid(current_timezone):
             raise CommandError('No system file found for "%s" timezone' % current_timezone)
-        self.logger.debug('zoneinfo file "%s" exists' % zoneinfo)
+        # position changed with timezone, sun times are updated at once
+        if self.__load_timezone(current_timezone, position):
+            # apply timezone natively
+            if self.timezone_applier.apply(current_timezone):
+                self.logger.debug('System timezone updated')
+                return True
+            if not self.TIMEZONE_DPKG_FALLBACK:
+                self.logger.error('Unable to apply system timezone')
+                return False
+            self.logger.warning('Unable to apply system timezone natively, reconfigure tzdata')
+        else:
+            # system timezone unknown to installed pytz (older than system tzdata)
+            self.logger.warning('Timezone "%s" unknown to pytz, reconfigure tzdata' % current_timezone)
+
+        # fallback to tzdata reconfiguration
         self.cleep_filesystem.rm(self.SYSTEM_LOCALTIME)
 
         self.logger.debug('Writing timezone "%s" in "%s"' % (current_timezone, self.SYSTEM_TIMEZONE))
@@ -567,18 +1240,128 @@ class Parameters(CleepModule):
         """
         return self._get_config_field('timezone')
 
-    def sync_time(self):
+    def get_timezones(self):
+        """
+        Return timezones available on system
+
+        Returns:
+            list: sorted list of timezone names
+        """
+        return self.zoneinfo.get_timezones()
+
+    def __load_timezone(self, timezone_name, position=None):
+        """
+        Load timezone used to localize times
+
+        Args:
+            timezone_name (string): timezone name
+            position (dict): if specified, sun times of this position are computed in the same state
+                update, so readers never get sun times of a position with timezone of another one
+
+        Returns:
+            bool: True if timezone loaded, False if timezone is unknown
+        """
+        transitions = self.zoneinfo.get(timezone_name)
+        if transitions is None:
+            self.logger.error('Unable to load unknown timezone "%s"' % timezone_name)
+            return False
+
+        with self.__state_lock:
+            state = self.__state.replace(
+                timezone_name=timezone_name,
+                timezone=transitions.tz,
+                timezone_transitions=transitions,
+            )
+            if position is not None:
+                state = state.replace(**self.__compute_sun(state, position))
+            self.__swap_state(state)
+
+        return True
+
+    @instrument('sync_time')
+    def sync_time(self, details=False):
         """
-        Synchronize device time using NTP server
+        Synchronize device time using NTP servers
 
         Note:
-            This command may lasts some seconds
+            This command may lasts some seconds. A single sync runs at a time, concurrent calls wait for it
+
+        Args:
+            details (bool): return sync details instead of True on success
 
         Returns:
-            bool: True if NTP sync succeed, False otherwise
+            bool: False if NTP sync failed, True otherwise
+            dict: sync details if details is True and NTP sync succeed::
+
+                {
+                    server (string): NTP server used
+                    offset (float): applied time offset (seconds)
+                    delay (float): NTP server round trip delay (seconds)
+                    stratum (int): NTP server stratum
+                }
+
+        """
+        with self.__sync_lock:
+            try:
+                sample = self.sntp_client.sync()
+            except Exception:
+                self.logger.exception('Unable to set system time')
+                return False
+
+        if sample is None:
+            return False
+        self.logger.debug('Time synchronized with %s (offset=%.3fs delay=%.3fs stratum=%d)' % (
+            sample.server, sample.offset, sample.delay, sample.stratum
+        ))
+
+        return sample.as_dict() if details else True
+
+    def set_time_event_mode(self, mode):
         """
-        console = Console()
-        resp = console.command('/usr/sbin/ntpdate-debian', timeout=60.0)
+        Set parameters.time.now event emission mode
 
-        return resp['returncode'] == 0
+        Args:
+            mode (string): emission mode::
+
+                full: all time fields sent every minute
+                delta: only changed fields sent (full payload sent regularly)
+                suppressed: no event sent (no consumer)
+
+        Warning:
+            In delta mode, consumers must merge payloads (see TimeEventFilter) instead of reading all
+            fields from each event. Keep full mode (default) while a consumer expects full payloads.
+
+        Raises:
+            MissingParameter: if mode is missing
+            InvalidParameter: if mode is invalid
+            CommandError: if mode cannot be saved
+        """
+        if mode is None:
+            raise MissingParameter('Parameter "mode" is missing')
+        if mode not in TimeEventEmitter.MODES:
+            raise InvalidParameter('Parameter "mode" must be one of %s' % ', '.join(TimeEventEmitter.MODES))
+
+        if not self._set_config_field('time_event_mode', mode):
+            raise CommandError('Unable to save time event mode')
+        self.time_event_emitter.set_mode(mode)
+
+    def get_stats(self):
+        """
+        Return operations latency statistics (durations in milliseconds)
+
+        Returns:
+            dict: operation name => statistics::
+
+                {
+                    count (int): number of calls
+                    errors (int): number of failed calls (exception raised or False returned)
+                    last (float): last duration
+                    mean (float): mean duration
+                    p50 (float): median duration
+                    p95 (float): 95th percentile duration
+                    max (float): max duration
+                }
+
+        """
+        return self.op_stats.get_stats()
 
@@ -21,7 +21,8 @@ class ParametersTimeNowEvent(Event):
         'weekday',
         'weekday_literal',
         'sunset',
-        'sunrise'
+        'sunrise',
+        'delta'
     ]
 
     def __init__(self, params):
@@ -0,0 +1,23 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from cleep.libs.internals.event import Event
+
+class ParametersTimeOffsetchangeEvent(Event):
+    """
+    Parameters.time.offsetchange event
+    """
+
+    EVENT_NAME = 'parameters.time.offsetchange'
+    EVENT_PROPAGATE = False
+    EVENT_PARAMS = ['timezone', 'old_offset', 'new_offset', 'timestamp']
+
+    def __init__(self, params):
+        """
+        Constructor
+
+        Args:
+            params (dict): event parameters
+        """
+        Event.__init__(self, params)
+
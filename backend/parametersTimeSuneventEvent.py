@@ -0,0 +1,23 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from cleep.libs.internals.event import Event
+
+class ParametersTimeSuneventEvent(Event):
+    """
+    Parameters.time.sunevent event
+    """
+
+    EVENT_NAME = 'parameters.time.sunevent'
+    EVENT_PROPAGATE = False
+    EVENT_PARAMS = ['event', 'offset', 'timestamp']
+
+    def __init__(self, params):
+        """
+        Constructor
+
+        Args:
+            params (dict): event parameters
+        """
+        Event.__init__(self, params)
+
@@ -0,0 +1,22 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from cleep.libs.internals.event import Event
+
+class ParametersTimeSyncedEvent(Event):
+    """
+    Parameters.time.synced event
+    """
+
+    EVENT_NAME = 'parameters.time.synced'
+    EVENT_PROPAGATE = False
+    EVENT_PARAMS = ['timestamp', 'jump']
+
+    def __init__(self, params):
+        """
+        Constructor
+
+        Args:
+            params (dict): event parameters
+        """
+        Event.__init__(self, params)
@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import uuid
+import logging
+from threading import Thread, Condition
+from concurrent.futures import ThreadPoolExecutor
+
+__all__ = ['PositionPipeline']
+
+class PositionPipeline():
+    """
+    Background position update pipeline
+
+    A job is a list of stages executed sequentially, each stage being a list of steps executed in parallel.
+    Jobs are executed one at a time by a single worker thread. Submitting a new job supersedes pending and
+    running jobs: running job stops after its current stage so last submitted job is always applied last.
+    """
+
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_SUPERSEDED = 'superseded'
+
+    def __init__(self, on_progress, logger=None):
+        """
+        Constructor
+
+        Args:
+            on_progress (function): function called on job progress::
+
+                on_progress(job_id (string), status (string), step (string), progress (int))
+
+            logger (Logger): logger instance
+        """
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.on_progress = on_progress
+        self.__condition = Condition()
+        self.__pending = None
+        self.__worker = None
+
+    def submit(self, stages):
+        """
+        Submit new job. Returns immediately
+
+        Args:
+            stages (list): list of stages, each stage is a list of (step name (string), function) tuples
+
+        Returns:
+            string: job id
+        """
+        job_id = str(uuid.uuid4())
+        with self.__condition:
+            if self.__pending:
+                self.__notify(self.__pending[0], self.STATUS_SUPERSEDED, None, 0)
+            self.__pending = (job_id, stages)
+            if self.__worker is None:
+                self.__worker = Thread(target=self.__run, daemon=True, name='positionpipeline')
+                self.__worker.start()
+            self.__condition.notify_all()
+
+        return job_id
+
+    def is_running(self):
+        """
+        Return True if a job is pending or running
+
+        Returns:
+            bool: True if pipeline is busy
+        """
+        with self.__condition:
+            return self.__worker is not None
+
+    def wait(self, timeout=None):
+        """
+        Wait for all jobs to be processed
+
+        Args:
+            timeout (float): max seconds to wait. Wait forever if None
+
+        Returns:
+            bool: True if pipeline is idle, False if timeout occured
+        """
+        with self.__condition:
+            return self.__condition.wait_for(lambda: self.__worker is None, timeout)
+
+    def __is_superseded(self):
+        """
+        Return True if current job is superseded by a new one
+        """
+        with self.__condition:
+            return self.__pending is not None
+
+    def __notify(self, job_id, status, step, progress):
+        """
+        Call progress callback
+        """
+        try:
+            self.on_progress(job_id, status, step, progress)
+        except Exception:
+            self.logger.exception('Error occured in position pipeline progress callback')
+
+    def __run(self):
+        """
+        Worker main loop
+        """
+        while True:
+            with self.__condition:
+                if self.__pending is None:
+                    self.__worker = None
+                    self.__condition.notify_all()
+                    return
+                job_id, stages = self.__pending
+                self.__pending = None
+
+            self.__run_job(job_id, stages)
+
+    def __run_job(self, job_id, stages):
+        """
+        Execute job stages
+
+        Args:
+            job_id (string): job id
+            stages (list): job stages
+        """
+        steps_count = sum(len(stage) for stage in stages) or 1
+        done_count = 0
+        failed_step = None
+        self.__notify(job_id, self.STATUS_RUNNING, None, 0)
+
+        for stage in stages:
+            if self.__is_superseded():
+                self.logger.debug('Position job %s superseded' % job_id)
+                self.__notify(job_id, self.STATUS_SUPERSEDED, None, int(done_count * 100 / steps_count))
+                return
+
+            if len(stage) == 1:
+                results = [(stage[0][0], self.__run_step(*stage[0]))]
+            else:
+                with ThreadPoolExecutor(max_workers=len(stage)) as executor:
+                    futures = [(name, executor.submit(self.__run_step, name, function)) for name, function in stage]
+                    results = [(name, future.result()) for name, future in futures]
+
+            for name, succeed in results:
+                done_count += 1
+                if not succeed and failed_step is None:
+                    failed_step = name
+                self.__notify(job_id, self.STATUS_RUNNING, name, int(done_count * 100 / steps_count))
+
+        if failed_step:
+            self.__notify(job_id, self.STATUS_FAILED, failed_step, 100)
+        else:
+            self.__notify(job_id, self.STATUS_DONE, None, 100)
+
+    def __run_step(self, name, function):
+        """
+        Execute job step
+
+        Args:
+            name (string): step name
+            function (function): step function
+
+        Returns:
+            bool: True if step succeed
+        """
+        try:
+            return function() is not False
+        except Exception:
+            self.logger.exception('Position job step "%s" failed' % name)
+            return False
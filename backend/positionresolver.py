@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import time
+import logging
+from datetime import datetime
+from .solarcalc import sun_events
+from . import solarvector
+
+__all__ = ['resolve_positions', 'VECTORIZED_MIN_POSITIONS']
+
+# use vectorized sun engine (if available) from this number of positions
+VECTORIZED_MIN_POSITIONS = 32
+
+def _check_coordinate(value, limit):
+    """
+    Return True if value is a valid coordinate
+    """
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and -limit <= value <= limit
+
+def resolve_positions(positions, geo_backend, day=None, country_index=None, timezone_search=None, timezone_search_budget=None, logger=None):
+    """
+    Resolve timezone, country and sun times of many positions at once. System and module configuration
+    are not modified
+
+    Countries are searched in country index (if specified), remaining ones in a single reverse_geocode call.
+    Timezones are searched with a shared timezonefinder instance (closest timezone searches of offshore
+    positions are bounded by a global budget) and sun times are computed in one vectorized pass when numpy
+    is installed.
+
+    Args:
+        positions (list): list of positions, each one a dict with latitude and longitude keys or a
+                          (latitude, longitude) tuple
+        geo_backend (GeoBackend): geographical backend
+        day (date): day of sun times (UTC date). Today if None
+        country_index (CountryIndex): offline country index
+        timezone_search (TimezoneSearch): closest timezone search for positions outside timezones (at sea)
+        timezone_search_budget (float): max seconds spent in closest timezone searches for all positions
+        logger (Logger): logger instance
+
+    Returns:
+        list: one dict per position, in same order::
+
+            [
+                {
+                    latitude (float): position latitude
+                    longitude (float): position longitude
+                    timezone (string): timezone name or None if not found
+                    country (string): country name or None if not found
+                    alpha2 (string): country code or None if not found
+                    sunrise (int): sunrise timestamp or None (polar day or night)
+                    sunset (int): sunset timestamp or None (polar day or night)
+                    error (string): error message if position is invalid, None otherwise
+                },
+                ...
+            ]
+
+    """
+    logger = logger or logging.getLogger('positionresolver')
+    if day is None:
+        day = datetime.utcfromtimestamp(int(time.time())).date()
+
+    results = []
+    coordinates = []
+    indexes = []
+    for position in positions:
+        if isinstance(position, dict):
+            latitude, longitude = position.get('latitude'), position.get('longitude')
+        elif isinstance(position, (list, tuple)) and len(position) == 2:
+            latitude, longitude = position
+        else:
+            latitude, longitude = None, None
+
+        result = {
+            'latitude': latitude,
+            'longitude': longitude,
+            'timezone': None,
+            'country': None,
+            'alpha2': None,
+            'sunrise': None,
+            'sunset': None,
+            'error': None,
+        }
+        if not _check_coordinate(latitude, 90) or not _check_coordinate(longitude, 180):
+            result['error'] = 'Invalid position'
+        else:
+            indexes.append(len(results))
+            coordinates.append((float(latitude), float(longitude)))
+        results.append(result)
+
+    if not coordinates:
+        return results
+
+    # countries
+    missing = list(zip(indexes, coordinates))
+    if country_index is not None and country_index.is_available():
+        try:
+            remaining = []
+            for index, coordinate in missing:
+                found = country_index.lookup(*coordinate)
+                if found:
+                    results[index]['alpha2'], results[index]['country'] = found
+                else:
+                    remaining.append((index, coordinate))
+            missing = remaining
+        except Exception:
+            logger.exception('Unable to search countries in country index')
+    if missing:
+        try:
+            countries = geo_backend.search_countries([coordinate for _, coordinate in missing])
+            for (index, _), country in zip(missing, countries):
+                results[index]['country'] = country.get('country')
+                results[index]['alpha2'] = country.get('country_code')
+        except Exception:
+            logger.exception('Unable to search countries')
+
+    # timezones
+    try:
+        for index, timezone_name in zip(indexes, geo_backend.timezones_at(coordinates, timezone_search, timezone_search_budget)):
+            results[index]['timezone'] = timezone_name
+    except Exception:
+        logger.exception('Unable to search timezones')
+
+    # sun times
+    if len(coordinates) >= VECTORIZED_MIN_POSITIONS and solarvector.is_available():
+        events = solarvector.sun_events_array(
+            [day],
+            [coordinate[0] for coordinate in coordinates],
+            [coordinate[1] for coordinate in coordinates],
+        )
+        sunrises = events['sunrise'][0].tolist()
+        sunsets = events['sunset'][0].tolist()
+    else:
+        events = [sun_events(day, latitude, longitude) for latitude, longitude in coordinates]
+        sunrises = [event['sunrise'] for event in events]
+        sunsets = [event['sunset'] for event in events]
+    for index, sunrise, sunset in zip(indexes, sunrises, sunsets):
+        results[index]['sunrise'] = sunrise or None
+        results[index]['sunset'] = sunset or None
+
+    return results
+
@@ -0,0 +1,301 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import time
+import socket
+import struct
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait
+
+__all__ = ['SntpClient', 'SntpSample', 'SntpError', 'read_ntpdate_servers']
+
+# seconds between NTP epoch (1900) and unix epoch (1970)
+NTP_EPOCH_DELTA = 2208988800
+NTP_FRACTION = 2 ** 32
+
+def to_ntp_timestamp(timestamp):
+    """
+    Convert unix timestamp to 64 bits NTP timestamp
+
+    Args:
+        timestamp (float): unix timestamp
+
+    Returns:
+        int: NTP timestamp
+    """
+    return int((timestamp + NTP_EPOCH_DELTA) * NTP_FRACTION) & 0xFFFFFFFFFFFFFFFF
+
+def from_ntp_timestamp(timestamp):
+    """
+    Convert 64 bits NTP timestamp to unix timestamp
+
+    Args:
+        timestamp (int): NTP timestamp
+
+    Returns:
+        float: unix timestamp
+    """
+    return float(timestamp) / NTP_FRACTION - NTP_EPOCH_DELTA
+
+def read_ntpdate_servers(path='/etc/default/ntpdate'):
+    """
+    Read NTP servers configured for ntpdate (NTPSERVERS="host1 host2 ..." line)
+
+    Args:
+        path (string): ntpdate defaults file
+
+    Returns:
+        list: configured servers. Empty list if file cannot be read or no server is configured
+    """
+    servers = []
+    try:
+        with open(path, 'r') as defaults:
+            for line in defaults:
+                name, _, value = line.strip().partition('=')
+                if name.strip() == 'NTPSERVERS':
+                    servers = value.split('#')[0].strip().strip('"\'').split()
+    except (OSError, UnicodeDecodeError):
+        return []
+
+    return servers
+
+def set_system_clock(offset):
+    """
+    Step system clock by specified offset
+
+    Args:
+        offset (float): offset in seconds
+    """
+    time.clock_settime(time.CLOCK_REALTIME, time.time() + offset)
+
+class SntpError(Exception):
+    """
+    SNTP query error
+    """
+
+class SntpSample():
+    """
+    SNTP query result
+    """
+
+    __slots__ = ('server', 'offset', 'delay', 'stratum')
+
+    def __init__(self, server, offset, delay, stratum):
+        """
+        Constructor
+
+        Args:
+            server (string): server that answered
+            offset (float): local clock offset (seconds) to add to local time
+            delay (float): round trip delay (seconds)
+            stratum (int): server stratum
+        """
+        self.server = server
+        self.offset = offset
+        self.delay = delay
+        self.stratum = stratum
+
+    def as_dict(self):
+        """
+        Return sample as dict
+
+        Returns:
+            dict: sample::
+
+                {
+                    server (string): server
+                    offset (float): offset in seconds
+                    delay (float): round trip delay in seconds
+                    stratum (int): server stratum
+                }
+
+        """
+        return {
+            'server': self.server,
+            'offset': self.offset,
+            'delay': self.delay,
+            'stratum': self.stratum,
+        }
+
+    def __repr__(self):
+        return 'SntpSample(server=%s, offset=%.6f, delay=%.6f, stratum=%d)' % (self.server, self.offset, self.delay, self.stratum)
+
+class SntpClient():
+    """
+    Simple NTP client (RFC 4330)
+
+    All servers are queried concurrently (one request each), the sample with the smallest round trip
+    delay is kept (lowest stratum on tie) and system clock is stepped with a single call. Query timeout
+    covers server name resolution and UDP exchange: queries stuck in resolver are not waited for.
+    """
+
+    DEFAULT_PORT = 123
+    DEFAULT_TIMEOUT = 2.0
+    # LI=0 (no warning), VN=4, mode=3 (client)
+    REQUEST_FLAGS = 0x23
+    MODE_SERVER = 4
+    MODE_BROADCAST = 5
+    MAX_STRATUM = 15
+    # extra seconds waited for queries results after timeout (thread scheduling)
+    RESULTS_GRACE = 0.1
+    PACKET = struct.Struct('!BBbbII4sQQQQ')
+
+    def __init__(self, servers, port=DEFAULT_PORT, timeout=DEFAULT_TIMEOUT, clock=time.time, set_clock=set_system_clock, logger=None,
+            monotonic=time.monotonic):
+        """
+        Constructor
+
+        Args:
+            servers (list): NTP servers hostnames ("host" or "host:port")
+            port (int): default NTP servers port
+            timeout (float): query timeout in seconds (name resolution included)
+            clock (function): wall clock function (used for tests)
+            monotonic (function): monotonic clock function (used for tests)
+            set_clock (function): function stepping system clock by specified offset (used for tests)
+            logger (Logger): logger instance
+        """
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.servers = servers
+        self.port = port
+        self.timeout = timeout
+        self.clock = clock
+        self.monotonic = monotonic
+        self.set_clock = set_clock
+
+    def query(self, server, deadline=None):
+        """
+        Query single server
+
+        Args:
+            server (string): server hostname ("host" or "host:port")
+            deadline (float): monotonic time the query must end before. Now plus timeout if None
+
+        Returns:
+            SntpSample: query result
+
+        Raises:
+            SntpError: if server response is invalid
+            OSError: if server is unreachable or doesn't answer in time
+        """
+        if deadline is None:
+            deadline = self.monotonic() + self.timeout
+        host, port = server, self.port
+        # single colon: port specified (more is an IPv6 address)
+        if server.count(':') == 1:
+            host, port = server.split(':')
+            port = int(port)
+        address = socket.getaddrinfo(host, port, 0, socket.SOCK_DGRAM)[0]
+        with socket.socket(address[0], socket.SOCK_DGRAM) as sock:
+            # random low bits in transmit timestamp prevents spoofed and stale responses
+            originate = (to_ntp_timestamp(self.clock()) & ~0xFFFF) | struct.unpack('!H', os.urandom(2))[0]
+            request = self.PACKET.pack(self.REQUEST_FLAGS, 0, 0, 0, 0, 0, b'\x00' * 4, 0, 0, 0, originate)
+            t1 = self.clock()
+            sock.sendto(request, address[4])
+            while True:
+                # name resolution and dropped responses consume query time
+                remaining = deadline - self.monotonic()
+                if remaining <= 0:
+                    raise socket.timeout('timed out')
+                sock.settimeout(remaining)
+                data, _ = sock.recvfrom(512)
+                t4 = self.clock()
+                if len(data) < self.PACKET.size:
+                    raise SntpError('Invalid response length (%d)' % len(data))
+                fields = self.PACKET.unpack(data[:self.PACKET.size])
+                if fields[8] == originate:
+                    break
+                self.logger.debug('Drop unexpected response from %s' % server)
+
+        flags, stratum = fields[0], fields[1]
+        mode = flags & 0x07
+        if mode not in (self.MODE_SERVER, self.MODE_BROADCAST):
+            raise SntpError('Invalid response mode (%d)' % mode)
+        if (flags >> 6) == 3:
+            raise SntpError('Server clock is not synchronized')
+        if stratum == 0:
+            raise SntpError('Kiss-o\'-death received (%s)' % fields[6].decode('ascii', 'replace'))
+        if stratum > self.MAX_STRATUM:
+            raise SntpError('Invalid stratum (%d)' % stratum)
+        if fields[9] == 0:
+            raise SntpError('Invalid receive timestamp')
+        if fields[10] == 0:
+            raise SntpError('Invalid transmit timestamp')
+
+        t2 = from_ntp_timestamp(fields[9])
+        t3 = from_ntp_timestamp(fields[10])
+        offset = ((t2 - t1) + (t3 - t4)) / 2.0
+        delay = (t4 - t1) - (t3 - t2)
+
+        return SntpSample(server, offset, max(delay, 0.0), stratum)
+
+    def __query(self, server, deadline):
+        """
+        Query server catching errors
+
+        Returns:
+            SntpSample: query result or None if query failed
+        """
+        try:
+            return self.query(server, deadline)
+        except Exception as error:
+            self.logger.debug('SNTP query to %s failed: %s' % (server, error))
+            return None
+
+    def query_all(self):
+        """
+        Query all servers concurrently
+
+        Returns:
+            list: list of SntpSample of servers that answered
+        """
+        if not self.servers:
+            return []
+
+        deadline = self.monotonic() + self.timeout
+        executor = ThreadPoolExecutor(max_workers=len(self.servers))
+        try:
+            futures = [executor.submit(self.__query, server, deadline) for server in self.servers]
+            # name resolution can't be interrupted, stuck queries are left behind
+            done, not_done = wait(futures, timeout=self.timeout + self.RESULTS_GRACE)
+        finally:
+            executor.shutdown(wait=False)
+        if not_done:
+            self.logger.debug('%d SNTP queries not finished in time' % len(not_done))
+
+        return [future.result() for future in futures if future in done and future.result() is not None]
+
+    def get_best_sample(self, samples):
+        """
+        Return best sample (smallest delay, then lowest stratum)
+
+        Args:
+            samples (list): list of SntpSample
+
+        Returns:
+            SntpSample: best sample or None if no sample
+        """
+        if not samples:
+            return None
+
+        return min(samples, key=lambda sample: (sample.delay, sample.stratum))
+
+    def sync(self):
+        """
+        Query servers and step system clock according to best sample
+
+        Returns:
+            SntpSample: applied sample or None if no server answered
+
+        Raises:
+            OSError: if system clock cannot be set
+        """
+        sample = self.get_best_sample(self.query_all())
+        if sample is None:
+            self.logger.warning('No NTP server answered')
+            return None
+
+        self.logger.debug('Apply NTP sample %s' % sample)
+        self.set_clock(sample.offset)
+
+        return sample
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import math
+from datetime import date
+
+__all__ = [
+    'ELEVATIONS',
+    'day_number',
+    'solar_transit',
+    'hour_angle',
+    'sun_events',
+]
+
+# sun elevation (degrees) of each event
+ELEVATIONS = {
+    'sunrise': -0.833,
+    'civil': -6.0,
+    'nautical': -12.0,
+}
+
+J2000 = 2451545.0
+UNIX_EPOCH_JULIAN = 2440587.5
+J2000_DATE = date(2000, 1, 1)
+OBLIQUITY = math.radians(23.4397)
+
+def day_number(day):
+    """
+    Return number of days since J2000 epoch
+
+    Args:
+        day (date): day
+
+    Returns:
+        int: days since 2000-01-01
+    """
+    return day.toordinal() - J2000_DATE.toordinal()
+
+def solar_transit(number, longitude):
+    """
+    Compute solar transit (solar noon) and sun declination
+
+    Algorithm from https://en.wikipedia.org/wiki/Sunrise_equation
+
+    Args:
+        number (int): days since J2000 epoch (see day_number)
+        longitude (float): longitude (east positive)
+
+    Returns:
+        tuple: solar transit julian date (float), sun declination in radians (float)
+    """
+    mean_solar_time = number - longitude / 360.0
+    anomaly = math.radians((357.5291 + 0.98560028 * mean_solar_time) % 360.0)
+    center = 1.9148 * math.sin(anomaly) + 0.02 * math.sin(2.0 * anomaly) + 0.0003 * math.sin(3.0 * anomaly)
+    ecliptic_longitude = math.radians((math.degrees(anomaly) + center + 180.0 + 102.9372) % 360.0)
+    transit = J2000 + mean_solar_time + 0.0053 * math.sin(anomaly) - 0.0069 * math.sin(2.0 * ecliptic_longitude)
+    declination = math.asin(math.sin(ecliptic_longitude) * math.sin(OBLIQUITY))
+
+    return transit, declination
+
+def hour_angle(latitude, declination, elevation):
+    """
+    Compute hour angle of sun at specified elevation
+
+    Args:
+        latitude (float): latitude
+        declination (float): sun declination in radians
+        elevation (float): sun elevation in degrees
+
+    Returns:
+        float: hour angle in degrees or None if sun never reaches elevation (polar day or night)
+    """
+    lat = math.radians(latitude)
+    cos_angle = (math.sin(math.radians(elevation)) - math.sin(lat) * math.sin(declination)) / (math.cos(lat) * math.cos(declination))
+    if cos_angle < -1.0 or cos_angle > 1.0:
+        return None
+
+    return math.degrees(math.acos(cos_angle))
+
+def julian_to_timestamp(julian):
+    """
+    Convert julian date to unix timestamp
+
+    Args:
+        julian (float): julian date
+
+    Returns:
+        int: unix timestamp
+    """
+    return int(round((julian - UNIX_EPOCH_JULIAN) * 86400.0))
+
+def sun_events(day, latitude, longitude):
+    """
+    Compute sun events of specified day
+
+    Args:
+        day (date): day
+        latitude (float): latitude
+        longitude (float): longitude
+
+    Returns:
+        dict: events timestamps (None if event doesn't occur this day)::
+
+            {
+                nautical_dawn (int),
+                civil_dawn (int),
+                sunrise (int),
+                noon (int),
+                sunset (int),
+                civil_dusk (int),
+                nautical_dusk (int),
+            }
+
+    """
+    transit, declination = solar_transit(day_number(day), longitude)
+    events = {
+        'noon': julian_to_timestamp(transit),
+    }
+    for name, rising, setting in (('sunrise', 'sunrise', 'sunset'), ('civil', 'civil_dawn', 'civil_dusk'), ('nautical', 'nautical_dawn', 'nautical_dusk')):
+        angle = hour_angle(latitude, declination, ELEVATIONS[name])
+        events[rising] = None if angle is None else julian_to_timestamp(transit - angle / 360.0)
+        events[setting] = None if angle is None else julian_to_timestamp(transit + angle / 360.0)
+
+    return events
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import importlib
+from importlib.util import find_spec
+from .solarcalc import ELEVATIONS, J2000, UNIX_EPOCH_JULIAN, OBLIQUITY, day_number
+
+__all__ = ['is_available', 'sun_events_array']
+
+def is_available():
+    """
+    Return True if vectorized engine can be used (numpy installed). Numpy is not imported
+
+    Returns:
+        bool: True if numpy is installed
+    """
+    return find_spec('numpy') is not None
+
+def sun_events_array(days, latitudes, longitudes):
+    """
+    Compute sun events of many days for many positions at once
+
+    Same algorithm than solarcalc.sun_events computed on numpy arrays. Result arrays are shaped
+    (number of days, number of positions).
+
+    Args:
+        days (list): list of days (date)
+        latitudes (list): list of latitudes
+        longitudes (list): list of longitudes (same length than latitudes)
+
+    Returns:
+        dict: event name => int64 numpy array of timestamps (0 if event doesn't occur)
+
+    Raises:
+        ImportError: if numpy is not installed
+        ValueError: if latitudes and longitudes lengths differ
+    """
+    numpy = importlib.import_module('numpy')
+    if len(latitudes) != len(longitudes):
+        raise ValueError('Latitudes and longitudes must have the same length')
+
+    numbers = numpy.asarray([day_number(day) for day in days], dtype=numpy.float64)[:, numpy.newaxis]
+    lats = numpy.radians(numpy.asarray(latitudes, dtype=numpy.float64))[numpy.newaxis, :]
+    lngs = numpy.asarray(longitudes, dtype=numpy.float64)[numpy.newaxis, :]
+
+    mean_solar_time = numbers - lngs / 360.0
+    anomaly = numpy.radians(numpy.mod(357.5291 + 0.98560028 * mean_solar_time, 360.0))
+    center = 1.9148 * numpy.sin(anomaly) + 0.02 * numpy.sin(2.0 * anomaly) + 0.0003 * numpy.sin(3.0 * anomaly)
+    ecliptic_longitude = numpy.radians(numpy.mod(numpy.degrees(anomaly) + center + 180.0 + 102.9372, 360.0))
+    transit = J2000 + mean_solar_time + 0.0053 * numpy.sin(anomaly) - 0.0069 * numpy.sin(2.0 * ecliptic_longitude)
+    declination = numpy.arcsin(numpy.sin(ecliptic_longitude) * numpy.sin(OBLIQUITY))
+
+    def to_timestamps(julian):
+        timestamps = numpy.rint((julian - UNIX_EPOCH_JULIAN) * 86400.0)
+        return numpy.where(numpy.isnan(timestamps), 0, timestamps).astype(numpy.int64)
+
+    events = {
+        'noon': to_timestamps(transit),
+    }
+    with numpy.errstate(invalid='ignore'):
+        for name, rising, setting in (('sunrise', 'sunrise', 'sunset'), ('civil', 'civil_dawn', 'civil_dusk'), ('nautical', 'nautical_dawn', 'nautical_dusk')):
+            cos_angle = (numpy.sin(numpy.radians(ELEVATIONS[name])) - numpy.sin(lats) * numpy.sin(declination)) / (numpy.cos(lats) * numpy.cos(declination))
+            # nan when sun never reaches elevation (polar day or night)
+            angle = numpy.degrees(numpy.where(numpy.abs(cos_angle) <= 1.0, numpy.arccos(cos_angle), numpy.nan))
+            events[rising] = to_timestamps(transit - angle / 360.0)
+            events[setting] = to_timestamps(transit + angle / 360.0)
+
+    return events
@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import time
+from array import array
+from datetime import datetime, timedelta
+from .solarcalc import sun_events
+from . import solarvector
+
+__all__ = ['SunEphemeris']
+
+class SunEphemeris():
+    """
+    Precomputed sun events table
+
+    Sun events (twilights, sunrise, solar noon, sunset) of several days are computed in one pass and stored
+    in a flat array (one row of EVENTS per local day, 0 when event doesn't occur). An hour index gives
+    next upcoming event in constant time.
+    """
+
+    EVENTS = ('nautical_dawn', 'civil_dawn', 'sunrise', 'noon', 'sunset', 'civil_dusk', 'nautical_dusk')
+    DEFAULT_DAYS = 7
+    # use vectorized engine (if available) from this number of days, below numpy import cost is not worth it
+    VECTORIZED_MIN_DAYS = 60
+
+    def __init__(self, latitude, longitude, tz, days=DEFAULT_DAYS, start=None):
+        """
+        Constructor
+
+        Args:
+            latitude (float): latitude
+            longitude (float): longitude
+            tz (tzinfo): pytz timezone used to compute local days
+            days (int): number of days to compute
+            start (int): timestamp of first day. Current time if None
+        """
+        self.latitude = latitude
+        self.longitude = longitude
+        self.tz = tz
+        self.days = days
+        if start is None:
+            start = int(time.time())
+        self.first_day = datetime.fromtimestamp(start, tz).date()
+        self.start = int(tz.localize(datetime.combine(self.first_day, datetime.min.time())).timestamp())
+        self.end = int(tz.localize(datetime.combine(self.first_day + timedelta(days=days), datetime.min.time())).timestamp())
+
+        self.__table = array('q', [0] * (days * len(self.EVENTS)))
+        self.__sorted_times = array('q')
+        self.__sorted_events = array('b')
+        self.__hour_index = array('l')
+        self.__build()
+
+    def __build(self):
+        """
+        Compute table and next event index
+        """
+        events_count = len(self.EVENTS)
+        days = [self.first_day + timedelta(days=day_index) for day_index in range(self.days)]
+        if self.days >= self.VECTORIZED_MIN_DAYS and solarvector.is_available():
+            events = solarvector.sun_events_array(days, [self.latitude], [self.longitude])
+            for event_index, event in enumerate(self.EVENTS):
+                self.__table[event_index::events_count] = array('q', events[event][:, 0].tolist())
+        else:
+            for day_index, day in enumerate(days):
+                events = sun_events(day, self.latitude, self.longitude)
+                for event_index, event in enumerate(self.EVENTS):
+                    self.__table[day_index * events_count + event_index] = events[event] or 0
+
+        self.__index()
+
+    def __index(self):
+        """
+        Build sorted events list and hour index
+        """
+        events_count = len(self.EVENTS)
+        entries = sorted(
+            (timestamp, position % events_count)
+            for position, timestamp in enumerate(self.__table)
+            if timestamp
+        )
+        self.__sorted_times = array('q', [entry[0] for entry in entries])
+        self.__sorted_events = array('b', [entry[1] for entry in entries])
+
+        # first sorted event at or after each hour start
+        hours = (self.end - self.start) // 3600 + 1
+        self.__hour_index = array('l', [0] * hours)
+        position = 0
+        for hour in range(hours):
+            hour_start = self.start + hour * 3600
+            while position < len(self.__sorted_times) and self.__sorted_times[position] < hour_start:
+                position += 1
+            self.__hour_index[hour] = position
+
+    def set_event(self, day_index, event, timestamp):
+        """
+        Override event timestamp (used to align table on another sun computation)
+
+        Args:
+            day_index (int): day index (0 for first day)
+            event (string): event name (see EVENTS)
+            timestamp (int): event timestamp
+        """
+        self.__table[day_index * len(self.EVENTS) + self.EVENTS.index(event)] = timestamp or 0
+        self.__index()
+
+    def covers(self, timestamp):
+        """
+        Return True if table covers specified timestamp
+
+        Args:
+            timestamp (int): timestamp
+
+        Returns:
+            bool: True if timestamp is in table range
+        """
+        return self.start <= timestamp < self.end
+
+    def get_day(self, day_index):
+        """
+        Return events of specified day
+
+        Args:
+            day_index (int): day index (0 for first day)
+
+        Returns:
+            dict: events timestamps (None if event doesn't occur)
+        """
+        if day_index < 0 or day_index >= self.days:
+            raise IndexError('Day index out of range')
+
+        offset = day_index * len(self.EVENTS)
+        return {
+            event: self.__table[offset + event_index] or None
+            for event_index, event in enumerate(self.EVENTS)
+        }
+
+    def next_event(self, now=None, events=None):
+        """
+        Return next upcoming event
+
+        Args:
+            now (int): reference timestamp. Current time if None
+            events (list): filter on event names. All events if None
+
+        Returns:
+            tuple: (event name (string), timestamp (int)) or None if no event found in table
+        """
+        if now is None:
+            now = int(time.time())
+        hour = max(0, (now - self.start) // 3600)
+        if hour >= len(self.__hour_index):
+            return None
+
+        position = self.__hour_index[hour]
+        while position < len(self.__sorted_times):
+            timestamp = self.__sorted_times[position]
+            event = self.EVENTS[self.__sorted_events[position]]
+            if timestamp > now and (events is None or event in events):
+                return event, timestamp
+            position += 1
+
+        return None
+
+    def get_schedule(self, days=None):
+        """
+        Return events schedule
+
+        Args:
+            days (int): number of days to return. All table days if None
+
+        Returns:
+            list: list of days::
+
+                [
+                    {
+                        date (string): local date (YYYY-MM-DD)
+                        <event> (int): event timestamp or None
+                        <event>_iso (string): event local datetime in iso 8601 format or None
+                        ...
+                    },
+                    ...
+                ]
+
+        """
+        schedule = []
+        for day_index in range(min(days or self.days, self.days)):
+            day = {
+                'date': (self.first_day + timedelta(days=day_index)).isoformat(),
+            }
+            for event, timestamp in self.get_day(day_index).items():
+                day[event] = timestamp
+                day[event + '_iso'] = datetime.fromtimestamp(timestamp, self.tz).isoformat() if timestamp else None
+            schedule.append(day)
+
+        return schedule
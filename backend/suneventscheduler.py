@@ -0,0 +1,194 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import time
+import heapq
+import logging
+import itertools
+from threading import Timer, RLock
+
+__all__ = ['SunEventScheduler']
+
+class SunEventScheduler():
+    """
+    Sun events scheduler
+
+    Triggers are sun events (from SunEphemeris) with an optional offset (ie sunset - 30 minutes). Next fire time
+    of each trigger is kept in a heap and a single timer is armed on the closest one, so callbacks are called
+    on time without polling.
+
+    Note:
+        Triggers are rescheduled from current time when ephemeris is set (Parameters sets it again after a
+        clock jump). Events skipped by a forward clock jump are dropped, not fired late: boards without RTC
+        step clock forward (days or years) on first NTP sync and replaying events would emit stale ones.
+    """
+
+    def __init__(self, logger=None, clock=time.time, timer_factory=Timer):
+        """
+        Constructor
+
+        Args:
+            logger (Logger): logger instance
+            clock (function): wall clock function (used for tests)
+            timer_factory (function): timer factory with threading.Timer signature (used for tests)
+        """
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.clock = clock
+        self.timer_factory = timer_factory
+        self.__ephemeris = None
+        self.__triggers = {}
+        self.__heap = []
+        self.__timer = None
+        self.__running = False
+        self.__ids = itertools.count(1)
+        self.__lock = RLock()
+
+    def add_trigger(self, event, offset, callback):
+        """
+        Add trigger
+
+        Args:
+            event (string): sun event name (see SunEphemeris.EVENTS)
+            offset (int): offset in seconds from event (negative before event)
+            callback (function): function called when trigger fires::
+
+                callback(event (string), offset (int), timestamp (int))
+
+                with timestamp the sun event timestamp (without offset)
+
+        Returns:
+            int: trigger id
+        """
+        with self.__lock:
+            trigger_id = next(self.__ids)
+            self.__triggers[trigger_id] = (event, offset, callback)
+            self.__schedule_trigger(trigger_id, self.clock())
+            self.__arm()
+
+        return trigger_id
+
+    def remove_trigger(self, trigger_id):
+        """
+        Remove trigger
+
+        Args:
+            trigger_id (int): trigger id returned by add_trigger
+        """
+        with self.__lock:
+            if self.__triggers.pop(trigger_id, None) is None:
+                return
+            self.__heap = [entry for entry in self.__heap if entry[2] != trigger_id]
+            heapq.heapify(self.__heap)
+            self.__arm()
+
+    def set_ephemeris(self, ephemeris):
+        """
+        Set sun ephemeris and reschedule all triggers from current time (events due before now are dropped)
+
+        Args:
+            ephemeris (SunEphemeris): sun ephemeris or None to disable triggers
+        """
+        with self.__lock:
+            self.__ephemeris = ephemeris
+            self.__reschedule()
+
+    def start(self):
+        """
+        Start scheduler
+        """
+        with self.__lock:
+            self.__running = True
+            self.__reschedule()
+
+    def stop(self):
+        """
+        Stop scheduler
+        """
+        with self.__lock:
+            self.__running = False
+            self.__cancel_timer()
+
+    def get_next_fire(self):
+        """
+        Return next scheduled trigger
+
+        Returns:
+            tuple: (fire timestamp (int), event (string), offset (int)) or None if nothing scheduled
+        """
+        with self.__lock:
+            if not self.__heap:
+                return None
+            fire_at, _, trigger_id, _ = self.__heap[0]
+            event, offset, _ = self.__triggers[trigger_id]
+            return fire_at, event, offset
+
+    def __reschedule(self):
+        """
+        Compute next fire time of all triggers
+        """
+        now = self.clock()
+        self.__heap = []
+        for trigger_id in self.__triggers:
+            self.__schedule_trigger(trigger_id, now)
+        self.__arm()
+
+    def __schedule_trigger(self, trigger_id, after):
+        """
+        Push next occurrence of trigger in heap
+
+        Args:
+            trigger_id (int): trigger id
+            after (float): trigger must fire after this timestamp
+        """
+        if self.__ephemeris is None:
+            return
+
+        event, offset, _ = self.__triggers[trigger_id]
+        next_event = self.__ephemeris.next_event(int(after) - offset, events=[event])
+        if next_event is None:
+            self.logger.debug('No next "%s" event found in sun ephemeris' % event)
+            return
+        heapq.heappush(self.__heap, (next_event[1] + offset, next(self.__ids), trigger_id, next_event[1]))
+
+    def __cancel_timer(self):
+        """
+        Cancel running timer
+        """
+        if self.__timer:
+            self.__timer.cancel()
+            self.__timer = None
+
+    def __arm(self):
+        """
+        Arm timer on closest trigger
+        """
+        self.__cancel_timer()
+        if not self.__running or not self.__heap:
+            return
+
+        delay = max(0.0, self.__heap[0][0] - self.clock())
+        self.__timer = self.timer_factory(delay, self._fire)
+        self.__timer.daemon = True
+        self.__timer.start()
+
+    def _fire(self):
+        """
+        Timer callback: call due triggers and arm timer on next one
+        """
+        due = []
+        with self.__lock:
+            now = self.clock()
+            while self.__heap and self.__heap[0][0] <= now:
+                fire_at, _, trigger_id, event_timestamp = heapq.heappop(self.__heap)
+                if trigger_id not in self.__triggers:
+                    continue
+                event, offset, callback = self.__triggers[trigger_id]
+                due.append((callback, event, offset, event_timestamp))
+                self.__schedule_trigger(trigger_id, fire_at)
+            self.__arm()
+
+        for callback, event, offset, event_timestamp in due:
+            try:
+                callback(event, offset, event_timestamp)
+            except Exception:
+                self.logger.exception('Error occured in sun event "%s" callback' % event)
@@ -3,6 +3,7 @@
 
 from cleep.libs.internals.profileformatter import ProfileFormatter
 from cleep.profiles.soundTextToSpeechProfile import SoundTextToSpeechProfile
+from .localeengine import locale_engine
 
 class SunsetToTextToSpeechFormatter(ProfileFormatter):
     """
@@ -25,7 +26,7 @@ class SunsetToTextToSpeechFormatter(ProfileFormatter):
             event_params (dict): event parameters
             profile (Profile): profile instance
         """
-        profile.text = 'It\'s sunset!'
+        profile.text = locale_engine.render('sunset')
 
         return profile
 
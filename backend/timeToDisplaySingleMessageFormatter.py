@@ -1,13 +1,14 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from cleep.libs.internals.profileformatter import ProfileFormatter
 from cleep.profiles.displaySingleMessageProfile import DisplaySingleMessageProfile
+from .timeformatter import TimeProfileFormatter
 
-class TimeToDisplaySingleMessageFormatter(ProfileFormatter):
+class TimeToDisplaySingleMessageFormatter(TimeProfileFormatter):
     """
     Time data to DisplaySingleMessageProfile
     """
+
     def __init__(self, events_broker):
         """
         Constuctor
@@ -15,25 +16,29 @@ class TimeToDisplaySingleMessageFormatter(ProfileFormatter):
         Args:
             events_broker (EventsBroker): events broker instance
         """
-        ProfileFormatter.__init__(self, events_broker, 'parameters.time.now', DisplaySingleMessageProfile())
+        TimeProfileFormatter.__init__(self, events_broker, DisplaySingleMessageProfile())
 
-    def _fill_profile(self, event_params, profile):
+    def _fill_time_profile(self, time_data, renderer, profile):
         """
-        Fill profile with event data
+        Fill profile with time data
 
         Args:
-            event_params (dict): event parameters
+            time_data (dict): full time data
+            renderer (TimeRenderer): time renderer
             profile (Profile): profile instance
+
+        Returns:
+            Profile: filled profile
         """
         profile.uuid = 'currenttime'
 
         # append current time
-        profile.message = '%02d:%02d %02d/%02d/%d' % (
-            event_params['hour'],
-            event_params['minute'],
-            event_params['day'],
-            event_params['month'],
-            event_params['year']
+        profile.message = renderer.display(
+            time_data['hour'],
+            time_data['minute'],
+            time_data['day'],
+            time_data['month'],
+            time_data['year']
         )
 
         return profile
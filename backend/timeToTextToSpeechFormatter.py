@@ -1,13 +1,14 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from cleep.libs.internals.profileformatter import ProfileFormatter
 from cleep.profiles.soundTextToSpeechProfile import SoundTextToSpeechProfile
+from .timeformatter import TimeProfileFormatter
 
-class TimeToTextToSpeechFormatter(ProfileFormatter):
+class TimeToTextToSpeechFormatter(TimeProfileFormatter):
     """
     Current time data to TextToSpeechProfile
     """
+
     def __init__(self, events_broker):
         """
         Constructor
@@ -15,35 +16,21 @@ class TimeToTextToSpeechFormatter(ProfileFormatter):
         Args:
             events_broker (EventsBroker): events broker instance
         """
-        ProfileFormatter.__init__(self, events_broker, 'parameters.time.now', SoundTextToSpeechProfile())
+        TimeProfileFormatter.__init__(self, events_broker, SoundTextToSpeechProfile())
 
-    def _fill_profile(self, event_params, profile):
+    def _fill_time_profile(self, time_data, renderer, profile):
         """
-        Fill profile with event data
+        Fill profile with time data
 
         Args:
-            event_params (dict): event parameters
+            time_data (dict): full time data
+            renderer (TimeRenderer): time renderer
             profile (Profile): profile instance
 
-        Note:
-            http://www.anglaisfacile.com/exercices/exercice-anglais-2/exercice-anglais-3196.php
+        Returns:
+            Profile: filled profile
         """
-        if event_params['hour'] == 0 and event_params['minute'] == 0:
-            profile.text = 'It\'s midnight'
-        if event_params['hour'] == 12 and event_params['minute'] == 0:
-            profile.text = 'It\'s noon'
-        elif event_params['minute'] == 0:
-            profile.text = 'It\'s %d o\'clock' % event_params['hour']
-        elif event_params['minute'] == 15:
-            profile.text = 'It\'s quarter past %d' % event_params['hour']
-        elif event_params['minute'] == 45:
-            profile.text = 'It\'s quarter to %d' % (event_params['hour']+1)
-        elif event_params['minute'] == 30:
-            profile.text = 'It\'s half past %d' % event_params['hour']
-        elif event_params['minute'] < 30:
-            profile.text = 'It\'s %d past %d' % (event_params['minute'], event_params['hour'])
-        elif event_params['minute'] > 30:
-            profile.text = 'It\'s %d to %d' % (60-event_params['minute'], event_params['hour']+1)
+        profile.text = renderer.speech(time_data['hour'], time_data['minute'])
 
         return profile
 
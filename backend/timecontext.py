@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from threading import Lock
+
+__all__ = ['TimeContext', 'TimeContextHolder', 'time_context', 'get_time_context']
+
+class TimeContext():
+    """
+    Immutable time context
+
+    Gathers everything a consumer needs to work with local time: localized snapshot of current minute,
+    timezone and next sun events. Everything is computed once by the publisher, readers don't do any
+    datetime computation. Context must be considered read-only: it is replaced, never updated.
+    """
+
+    __slots__ = (
+        'version',
+        'snapshot',
+        'timezone_name',
+        'timezone',
+        'next_sunrise',
+        'next_sunset',
+        'next_sun_event',
+    )
+
+    def __init__(self, snapshot, timezone_name, timezone, next_sunrise=None, next_sunset=None, next_sun_event=None, version=0):
+        """
+        Constructor
+
+        Args:
+            snapshot (TimeSnapshot): localized time snapshot of current minute
+            timezone_name (string): timezone name
+            timezone (tzinfo): pytz timezone
+            next_sunrise (dict): next sunrise (see Parameters.get_next_sun_event) or None
+            next_sunset (dict): next sunset (see Parameters.get_next_sun_event) or None
+            next_sun_event (dict): next sun event of any kind (see Parameters.get_next_sun_event) or None
+            version (int): context version, incremented at each publication
+        """
+        self.version = version
+        self.snapshot = snapshot
+        self.timezone_name = timezone_name
+        self.timezone = timezone
+        self.next_sunrise = next_sunrise
+        self.next_sunset = next_sunset
+        self.next_sun_event = next_sun_event
+
+    def with_version(self, version):
+        """
+        Return copy of context with specified version
+
+        Args:
+            version (int): context version
+
+        Returns:
+            TimeContext: new context
+        """
+        return TimeContext(
+            self.snapshot,
+            self.timezone_name,
+            self.timezone,
+            self.next_sunrise,
+            self.next_sunset,
+            self.next_sun_event,
+            version,
+        )
+
+class TimeContextHolder():
+    """
+    Shared time context
+
+    Context is published by Parameters module (at each clock tick and when timezone, position or sun
+    times change) and read by any module running in the same process, without RPC.
+
+    Thread safety: publication swaps a single reference to a new immutable context (publishers are
+    serialized by a lock to keep versions ordered), reading is a single attribute load without lock.
+    A reader always gets a complete and consistent context, never a partially updated one. A reader
+    needing several values must keep returned context instead of calling get several times.
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.__context = None
+        self.__lock = Lock()
+
+    def publish(self, context):
+        """
+        Publish new context
+
+        Args:
+            context (TimeContext): new context. Its version is set by holder
+
+        Returns:
+            TimeContext: published context
+        """
+        with self.__lock:
+            current = self.__context
+            published = context.with_version(current.version + 1 if current else 1)
+            self.__context = published
+
+        return published
+
+    def get(self):
+        """
+        Return current context
+
+        Returns:
+            TimeContext: current context or None if nothing published yet
+        """
+        return self.__context
+
+    def clear(self):
+        """
+        Clear context (module stopped)
+        """
+        with self.__lock:
+            self.__context = None
+
+# shared context, published by Parameters and read by other modules
+time_context = TimeContextHolder()
+
+def get_time_context():
+    """
+    Return current time context
+
+    Returns:
+        TimeContext: current context or None if Parameters module is not started yet
+    """
+    return time_context.get()
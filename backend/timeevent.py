@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import logging
+from threading import Lock
+
+__all__ = ['TimeEventEmitter', 'TimeEventFilter']
+
+class TimeEventEmitter():
+    """
+    Clock event (parameters.time.now) emitter
+
+    Emission modes:
+
+        * full: all time fields are sent every minute
+        * delta: only fields that changed since previous event are sent (with "delta" flag). A full
+          payload (keyframe) is sent regularly so late subscribers can rebuild time data
+        * suppressed: no event is sent (no consumer)
+
+    Note:
+        Keys of sent payload are the event ones, delta payload only contains a subset plus "delta" key.
+    """
+
+    MODE_FULL = 'full'
+    MODE_DELTA = 'delta'
+    MODE_SUPPRESSED = 'suppressed'
+    MODES = (MODE_FULL, MODE_DELTA, MODE_SUPPRESSED)
+    DEFAULT_KEYFRAME_INTERVAL = 60
+    # fields always sent in delta payload
+    ALWAYS_SENT = ('timestamp',)
+
+    def __init__(self, event, mode=MODE_FULL, keyframe_interval=DEFAULT_KEYFRAME_INTERVAL, logger=None):
+        """
+        Constructor
+
+        Args:
+            event (Event): clock event instance
+            mode (string): emission mode (see MODES)
+            keyframe_interval (int): number of events between full payloads in delta mode
+            logger (Logger): logger instance
+        """
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.event = event
+        self.keyframe_interval = keyframe_interval
+        self.mode = None
+        self.__last = None
+        self.__since_keyframe = 0
+        self.set_mode(mode)
+
+    def set_mode(self, mode):
+        """
+        Set emission mode. Next emitted event is a full one
+
+        Args:
+            mode (string): emission mode (see MODES)
+
+        Raises:
+            ValueError: if mode is invalid
+        """
+        if mode not in self.MODES:
+            raise ValueError('Invalid time event mode "%s"' % mode)
+        self.mode = mode
+        self.reset()
+
+    def reset(self):
+        """
+        Force full payload for next event
+        """
+        self.__last = None
+        self.__since_keyframe = 0
+
+    def build_params(self, params):
+        """
+        Build event parameters according to emission mode
+
+        Args:
+            params (dict): full time data. It is kept as reference and must not be modified afterwards
+
+        Returns:
+            dict: event parameters or None if nothing to send
+        """
+        if self.mode == self.MODE_SUPPRESSED:
+            return None
+        if self.mode == self.MODE_FULL:
+            return dict(params)
+
+        last = self.__last
+        self.__last = params
+        if last is None or self.__since_keyframe + 1 >= self.keyframe_interval:
+            self.__since_keyframe = 0
+            return dict(params)
+
+        self.__since_keyframe += 1
+        delta = {key: value for key, value in params.items() if key in self.ALWAYS_SENT or last.get(key) != value}
+        delta['delta'] = True
+        return delta
+
+    def emit(self, params, device_id=None):
+        """
+        Send clock event according to emission mode
+
+        Args:
+            params (dict): full time data. It is kept as reference and must not be modified afterwards
+            device_id (string): clock device id
+
+        Returns:
+            dict: sent event parameters or None if nothing sent
+        """
+        event_params = self.build_params(params)
+        if event_params is not None:
+            self.event.send(params=event_params, device_id=device_id)
+
+        return event_params
+
+class TimeEventFilter():
+    """
+    Clock event filter for event subscribers (formatters)
+
+    Rebuilds full time data from full and delta payloads, and filters events according to subscriber
+    cadence (every minute, every 15 minutes, on the hour...).
+    """
+
+    EVERY_MINUTE = 1
+    EVERY_QUARTER = 15
+    HOURLY = 60
+
+    def __init__(self, cadence=EVERY_MINUTE):
+        """
+        Constructor
+
+        Args:
+            cadence (int): minutes between accepted events, must divide an hour (1, 5, 15, 30, 60...)
+
+        Raises:
+            ValueError: if cadence is invalid
+        """
+        if cadence < 1 or 60 % cadence != 0:
+            raise ValueError('Invalid cadence "%s"' % cadence)
+        self.cadence = cadence
+        self.__state = None
+        self.__lock = Lock()
+
+    def update(self, event_params):
+        """
+        Update time data with event and return it if event matches cadence
+
+        Args:
+            event_params (dict): clock event parameters (full or delta)
+
+        Returns:
+            dict: full time data (must not be modified) or None if event is filtered out or time data is
+                not complete yet (delta received before first full payload)
+        """
+        with self.__lock:
+            if event_params.get('delta'):
+                if self.__state is None:
+                    return None
+                state = dict(self.__state)
+                state.update(event_params)
+                del state['delta']
+            else:
+                state = event_params
+            self.__state = state
+
+        if state['minute'] % self.cadence != 0:
+            return None
+
+        return state
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from abc import ABCMeta, abstractmethod
+from cleep.libs.internals.profileformatter import ProfileFormatter
+from .timeevent import TimeEventFilter
+from .timerendering import get_renderer, STYLE_24H
+from .localeengine import locale_engine
+
+__all__ = ['TimeProfileFormatter']
+
+class TimeProfileFormatter(ProfileFormatter, metaclass=ABCMeta):
+    """
+    Base of current time formatters
+
+    Rebuilds time data from parameters.time.now full and delta events, applies formatter cadence and
+    selects time renderer. Formatters only fill their profile from time data (see _fill_time_profile).
+    """
+
+    # minutes between formatted events (see TimeEventFilter)
+    CADENCE = TimeEventFilter.EVERY_MINUTE
+    # rendering locale and clock style (see timerendering), None to follow configured country
+    LOCALE = None
+    STYLE = None
+
+    def __init__(self, events_broker, profile):
+        """
+        Constructor
+
+        Args:
+            events_broker (EventsBroker): events broker instance
+            profile (Profile): formatter profile instance
+        """
+        ProfileFormatter.__init__(self, events_broker, 'parameters.time.now', profile)
+        self.time_filter = TimeEventFilter(self.CADENCE)
+        self.renderer = get_renderer(self.LOCALE, self.STYLE or STYLE_24H) if self.LOCALE else None
+
+    def _fill_profile(self, event_params, profile):
+        """
+        Fill profile with event data
+
+        Args:
+            event_params (dict): event parameters
+            profile (Profile): profile instance
+
+        Returns:
+            Profile: filled profile or None if event is filtered out
+        """
+        # rebuild time data from delta events and apply cadence
+        time_data = self.time_filter.update(event_params)
+        if time_data is None:
+            return None
+        renderer = self.renderer or locale_engine.get_renderer(style=self.STYLE)
+
+        return self._fill_time_profile(time_data, renderer, profile)
+
+    @abstractmethod
+    def _fill_time_profile(self, time_data, renderer, profile):
+        """
+        Fill profile with time data
+
+        Args:
+            time_data (dict): full time data (parameters.time.now event parameters), must not be modified
+            renderer (TimeRenderer): time renderer
+            profile (Profile): profile instance
+
+        Returns:
+            Profile: filled profile
+        """
@@ -0,0 +1,246 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from threading import Lock
+
+__all__ = ['TimeRenderer', 'RenderingLocale', 'get_renderer', 'register_locale', 'STYLE_24H', 'STYLE_12H']
+
+STYLE_24H = '24h'
+STYLE_12H = '12h'
+STYLES = (STYLE_24H, STYLE_12H)
+
+def get_clock_hour(hour, style):
+    """
+    Return hour as displayed/spoken according to style
+
+    Args:
+        hour (int): hour (0-23)
+        style (string): 24h or 12h
+
+    Returns:
+        int: hour (0-23 in 24h style, 1-12 in 12h style)
+    """
+    if style == STYLE_12H:
+        return hour % 12 or 12
+    return hour
+
+def english_speech(hour, minute, style):
+    """
+    English spoken time, rendered from english templates of locale engine
+
+    Args:
+        hour (int): hour (0-23)
+        minute (int): minute (0-59)
+        style (string): 24h or 12h
+
+    Returns:
+        string: spoken time
+    """
+    # imported on use: locale engine depends on this module
+    from .localeengine import locale_engine
+    return locale_engine.get_speech(hour, minute, style, 'en')
+
+class RenderingLocale():
+    """
+    Locale used to render time texts
+    """
+
+    def __init__(self, name, speech, date_format, meridiems=('AM', 'PM')):
+        """
+        Constructor
+
+        Args:
+            name (string): locale name
+            speech (function): function returning spoken time::
+
+                speech(hour (int), minute (int), style (string)) -> string
+
+            date_format (string): date format with day, month and year named fields
+            meridiems (tuple): before and after noon suffixes in 12h style
+        """
+        self.name = name
+        self.speech = speech
+        self.date_format = date_format
+        self.meridiems = meridiems
+
+    def clock(self, hour, minute, style):
+        """
+        Return displayed time
+
+        Args:
+            hour (int): hour (0-23)
+            minute (int): minute (0-59)
+            style (string): 24h or 12h
+
+        Returns:
+            string: displayed time
+        """
+        if style == STYLE_12H:
+            return '%d:%02d %s' % (get_clock_hour(hour, style), minute, self.meridiems[hour // 12])
+        return '%02d:%02d' % (hour, minute)
+
+    def date(self, day, month, year):
+        """
+        Return displayed date
+
+        Args:
+            day (int): day
+            month (int): month
+            year (int): year
+
+        Returns:
+            string: displayed date
+        """
+        return self.date_format % {'day': day, 'month': month, 'year': year}
+
+DEFAULT_LOCALE = 'en'
+LOCALES = {
+    'en': RenderingLocale('en', english_speech, '%(day)02d/%(month)02d/%(year)d'),
+}
+
+class TimeRenderer():
+    """
+    Time texts renderer
+
+    Spoken and displayed times of the 1440 minutes of a day are precomputed in tables so rendering a time
+    is a single lookup. Displayed date only changes once a day, last one is cached.
+    """
+
+    MINUTES_PER_DAY = 1440
+
+    def __init__(self, locale=DEFAULT_LOCALE, style=STYLE_24H):
+        """
+        Constructor
+
+        Args:
+            locale (string): locale name (see register_locale)
+            style (string): 24h or 12h
+
+        Raises:
+            ValueError: if locale or style is invalid
+        """
+        if locale not in LOCALES:
+            raise ValueError('Unknown locale "%s"' % locale)
+        if style not in STYLES:
+            raise ValueError('Invalid style "%s"' % style)
+        self.locale = LOCALES[locale]
+        self.style = style
+        self.__speeches = tuple(
+            self.locale.speech(index // 60, index % 60, style) for index in range(self.MINUTES_PER_DAY)
+        )
+        self.__clocks = tuple(
+            self.locale.clock(index // 60, index % 60, style) for index in range(self.MINUTES_PER_DAY)
+        )
+        # (key, value) tuple is replaced at once so it is safe to share between threads
+        self.__last_date = (None, None)
+        self.__last_display = (None, None)
+
+    def speech(self, hour, minute):
+        """
+        Return spoken time
+
+        Args:
+            hour (int): hour (0-23)
+            minute (int): minute (0-59)
+
+        Returns:
+            string: spoken time
+        """
+        return self.__speeches[hour * 60 + minute]
+
+    def clock(self, hour, minute):
+        """
+        Return displayed time
+
+        Args:
+            hour (int): hour (0-23)
+            minute (int): minute (0-59)
+
+        Returns:
+            string: displayed time
+        """
+        return self.__clocks[hour * 60 + minute]
+
+    def date(self, day, month, year):
+        """
+        Return displayed date
+
+        Args:
+            day (int): day
+            month (int): month
+            year (int): year
+
+        Returns:
+            string: displayed date
+        """
+        key = (year, month, day)
+        last = self.__last_date
+        if last[0] == key:
+            return last[1]
+
+        date = self.locale.date(day, month, year)
+        self.__last_date = (key, date)
+        return date
+
+    def display(self, hour, minute, day, month, year):
+        """
+        Return displayed time and date
+
+        Args:
+            hour (int): hour (0-23)
+            minute (int): minute (0-59)
+            day (int): day
+            month (int): month
+            year (int): year
+
+        Returns:
+            string: displayed time and date
+        """
+        key = (year, month, day, hour, minute)
+        last = self.__last_display
+        if last[0] == key:
+            return last[1]
+
+        display = '%s %s' % (self.__clocks[hour * 60 + minute], self.date(day, month, year))
+        self.__last_display = (key, display)
+        return display
+
+_renderers = {}
+_renderers_lock = Lock()
+
+def register_locale(locale):
+    """
+    Register rendering locale. Renderers of a locale already registered are rebuilt on next use
+
+    Args:
+        locale (RenderingLocale): locale
+    """
+    with _renderers_lock:
+        LOCALES[locale.name] = locale
+        for key in [key for key in _renderers if key[0] == locale.name]:
+            del _renderers[key]
+
+def get_renderer(locale=DEFAULT_LOCALE, style=STYLE_24H):
+    """
+    Return shared renderer, tables are built once per locale and style
+
+    Args:
+        locale (string): locale name
+        style (string): 24h or 12h
+
+    Returns:
+        TimeRenderer: renderer
+
+    Raises:
+        ValueError: if locale or style is invalid
+    """
+    key = (locale, style)
+    renderer = _renderers.get(key)
+    if renderer is None:
+        with _renderers_lock:
+            renderer = _renderers.get(key)
+            if renderer is None:
+                renderer = TimeRenderer(locale, style)
+                _renderers[key] = renderer
+
+    return renderer
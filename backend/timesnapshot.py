@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from datetime import datetime
+
+__all__ = ['TimeSnapshot', 'WEEKDAYS']
+
+WEEKDAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+
+class TimeSnapshot():
+    """
+    Immutable localized time snapshot
+
+    Snapshot is computed once per minute by clock task and shared by time event, module devices and
+    any other consumer. Dict representation is built once and must be considered read-only.
+    """
+
+    __slots__ = (
+        'timestamp',
+        'minute_timestamp',
+        'year',
+        'month',
+        'day',
+        'hour',
+        'minute',
+        'second',
+        'weekday',
+        'utcoffset',
+        'tzinfo',
+        'sunrise',
+        'sunset',
+        '__dict',
+    )
+
+    def __init__(self, timestamp, local_dt, sunrise=0, sunset=0):
+        """
+        Constructor
+
+        Args:
+            timestamp (int): snapshot timestamp
+            local_dt (datetime): localized datetime of timestamp
+            sunrise (int): sunrise timestamp
+            sunset (int): sunset timestamp
+        """
+        offset = local_dt.utcoffset()
+        self.__set_fields(
+            timestamp,
+            (
+                local_dt.year,
+                local_dt.month,
+                local_dt.day,
+                local_dt.hour,
+                local_dt.minute,
+                local_dt.second,
+                local_dt.weekday(),
+                int(offset.total_seconds()) if offset is not None else 0,
+                local_dt.tzinfo,
+            ),
+            sunrise,
+            sunset,
+        )
+
+    def __set_fields(self, timestamp, fields, sunrise, sunset):
+        """
+        Set snapshot fields
+        """
+        self.timestamp = timestamp
+        self.minute_timestamp = timestamp - (timestamp % 60)
+        (self.year, self.month, self.day, self.hour, self.minute, self.second, self.weekday,
+            self.utcoffset, self.tzinfo) = fields
+        self.sunrise = sunrise
+        self.sunset = sunset
+        self.__dict = None
+
+    @classmethod
+    def from_timestamp(cls, timestamp, tz, sunrise=0, sunset=0):
+        """
+        Build snapshot from timestamp
+
+        Args:
+            timestamp (int): timestamp
+            tz (tzinfo): pytz timezone or ZoneTransitions used to localize datetime
+            sunrise (int): sunrise timestamp
+            sunset (int): sunset timestamp
+
+        Returns:
+            TimeSnapshot: time snapshot
+        """
+        return cls(timestamp, tz.localize(datetime.fromtimestamp(timestamp)), sunrise, sunset)
+
+    @classmethod
+    def from_fields(cls, timestamp, fields, sunrise=0, sunset=0):
+        """
+        Build snapshot from local time fields, without datetime computation
+
+        Args:
+            timestamp (int): timestamp
+            fields (tuple): local time fields as returned by OffsetTracker.local_fields
+            sunrise (int): sunrise timestamp
+            sunset (int): sunset timestamp
+
+        Returns:
+            TimeSnapshot: time snapshot
+        """
+        snapshot = cls.__new__(cls)
+        snapshot.__set_fields(timestamp, fields, sunrise, sunset)
+        return snapshot
+
+    @property
+    def datetime(self):
+        return datetime(self.year, self.month, self.day, self.hour, self.minute, self.second, tzinfo=self.tzinfo)
+
+    @property
+    def iso(self):
+        """
+        Local datetime in iso 8601 format (same as datetime.isoformat)
+        """
+        offset = self.utcoffset
+        sign = '-' if offset < 0 else '+'
+        hours, seconds = divmod(abs(offset), 3600)
+        minutes, seconds = divmod(seconds, 60)
+        iso = '%04d-%02d-%02dT%02d:%02d:%02d%s%02d:%02d' % (
+            self.year, self.month, self.day, self.hour, self.minute, self.second, sign, hours, minutes
+        )
+        return iso + (':%02d' % seconds if seconds else '')
+
+    @property
+    def weekday_literal(self):
+        return WEEKDAYS[self.weekday]
+
+    def is_same_minute(self, timestamp):
+        """
+        Return True if specified timestamp is in snapshot minute
+
+        Args:
+            timestamp (int): timestamp
+
+        Returns:
+            bool: True if timestamp is in same minute
+        """
+        return self.minute_timestamp <= timestamp < self.minute_timestamp + 60
+
+    def as_dict(self):
+        """
+        Return snapshot as dict. Returned dict is shared and must not be modified
+
+        Returns:
+            dict: time data::
+
+                {
+                    timestamp (int): current timestamp
+                    iso (string): current datetime in iso 8601 format
+                    year (int)
+                    month (int)
+                    day (int)
+                    hour (int)
+                    minute (int)
+                    weekday (int): 0=monday, 1=tuesday... 6=sunday
+                    weekday_literal (string): english literal weekday value (monday, tuesday, ...)
+                    sunrise (int): sunrise timestamp
+                    sunset (int): sunset timestamp
+                }
+
+        """
+        if self.__dict is None:
+            self.__dict = {
+                'timestamp': self.timestamp,
+                'iso': self.iso,
+                'year': self.year,
+                'month': self.month,
+                'day': self.day,
+                'hour': self.hour,
+                'minute': self.minute,
+                'weekday': self.weekday,
+                'weekday_literal': WEEKDAYS[self.weekday],
+                'sunrise': self.sunrise,
+                'sunset': self.sunset,
+            }
+        return self.__dict
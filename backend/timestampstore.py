@@ -0,0 +1,245 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import logging
+from abc import ABCMeta, abstractmethod
+from threading import Lock
+
+__all__ = [
+    'TimestampStore',
+    'WriteBehindTimestampStore',
+    'ShutdownTimestampStore',
+    'RingFileTimestampStore',
+    'create_timestamp_store',
+]
+
+class TimestampStore(metaclass=ABCMeta):
+    """
+    Last known time persistence base class
+
+    Last known timestamp is used at startup to detect invalid system time (NTP sync failure without internet).
+    Stores keep last timestamp in memory and only persist it according to their own strategy to limit
+    writes on SD card. Stores implement their strategy in _must_persist.
+    """
+
+    def __init__(self, get_config_field, set_config_field, logger=None):
+        """
+        Constructor
+
+        Args:
+            get_config_field (function): module function to get config field value
+            set_config_field (function): module function to set config field value
+            logger (Logger): logger instance
+        """
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self._get_config_field = get_config_field
+        self._set_config_field = set_config_field
+        self._timestamp = 0
+        self._persisted_timestamp = 0
+        self._lock = Lock()
+
+    def load(self):
+        """
+        Load last persisted timestamp
+
+        Returns:
+            int: last persisted timestamp (0 if none)
+        """
+        timestamp = self._load() or 0
+        with self._lock:
+            self._persisted_timestamp = timestamp
+            self._timestamp = max(self._timestamp, timestamp)
+        return timestamp
+
+    def update(self, timestamp):
+        """
+        Update last known timestamp. Timestamp is persisted according to store strategy
+
+        Args:
+            timestamp (int): current timestamp
+        """
+        with self._lock:
+            self._timestamp = timestamp
+            if not self._must_persist(timestamp):
+                return
+        self.flush()
+
+    def flush(self):
+        """
+        Persist last known timestamp if not already persisted
+        """
+        with self._lock:
+            timestamp = self._timestamp
+            if timestamp == self._persisted_timestamp:
+                return
+            if self._persist(timestamp):
+                self._persisted_timestamp = timestamp
+
+    def _load(self):
+        """
+        Load timestamp from storage
+
+        Returns:
+            int: timestamp
+        """
+        return self._get_config_field('timestamp')
+
+    def _persist(self, timestamp):
+        """
+        Persist timestamp to storage
+
+        Args:
+            timestamp (int): timestamp to persist
+
+        Returns:
+            bool: True if timestamp persisted
+        """
+        return self._set_config_field('timestamp', timestamp)
+
+    @abstractmethod
+    def _must_persist(self, timestamp):
+        """
+        Return True if timestamp must be persisted right now
+
+        Args:
+            timestamp (int): updated timestamp
+
+        Returns:
+            bool: True to persist timestamp
+        """
+
+class WriteBehindTimestampStore(TimestampStore):
+    """
+    Write-behind store: timestamp is saved in module config every flush interval
+    """
+
+    def __init__(self, get_config_field, set_config_field, flush_interval=15, logger=None):
+        """
+        Constructor
+
+        Args:
+            get_config_field (function): module function to get config field value
+            set_config_field (function): module function to set config field value
+            flush_interval (int): minutes between config writes
+            logger (Logger): logger instance
+        """
+        TimestampStore.__init__(self, get_config_field, set_config_field, logger)
+        self.flush_interval = flush_interval * 60
+
+    def _must_persist(self, timestamp):
+        return (timestamp - self._persisted_timestamp) >= self.flush_interval
+
+class ShutdownTimestampStore(TimestampStore):
+    """
+    Shutdown store: timestamp is only saved in module config when module stops
+    """
+
+    def _must_persist(self, timestamp):
+        return False
+
+class RingFileTimestampStore(TimestampStore):
+    """
+    Ring file store: timestamp is written in place in a small fixed-size file
+
+    File contains SLOTS fixed width lines, each update overwrites next slot so file is never truncated nor
+    resized and writes are spread over the file. Highest slot value is the last known timestamp.
+    """
+
+    SLOTS = 8
+    SLOT_FORMAT = '%010d\n'
+    SLOT_SIZE = 11
+
+    def __init__(self, get_config_field, set_config_field, path, cleep_filesystem, flush_interval=1, logger=None):
+        """
+        Constructor
+
+        Args:
+            get_config_field (function): module function to get config field value
+            set_config_field (function): module function to set config field value
+            path (string): ring file path
+            cleep_filesystem (CleepFilesystem): filesystem instance
+            flush_interval (int): minutes between ring file writes
+            logger (Logger): logger instance
+        """
+        TimestampStore.__init__(self, get_config_field, set_config_field, logger)
+        self.path = path
+        self.cleep_filesystem = cleep_filesystem
+        self.flush_interval = flush_interval * 60
+        self.__slot = 0
+
+    def _load(self):
+        """
+        Load highest timestamp from ring file, fallback to config value (previous store)
+        """
+        if not os.path.exists(self.path):
+            return self._get_config_field('timestamp')
+
+        timestamps = []
+        try:
+            fd = self.cleep_filesystem.open(self.path, 'r')
+            try:
+                for line in fd.read().splitlines():
+                    if line.strip().isdigit():
+                        timestamps.append(int(line))
+            finally:
+                self.cleep_filesystem.close(fd)
+        except Exception:
+            self.logger.exception('Unable to read timestamp ring file "%s"' % self.path)
+        if not timestamps:
+            return self._get_config_field('timestamp')
+
+        # continue writing after most recent slot
+        self.__slot = (timestamps.index(max(timestamps)) + 1) % self.SLOTS
+        return max(timestamps)
+
+    def _persist(self, timestamp):
+        try:
+            if not os.path.exists(self.path) or os.path.getsize(self.path) != self.SLOTS * self.SLOT_SIZE:
+                fd = self.cleep_filesystem.open(self.path, 'w')
+                fd.write((self.SLOT_FORMAT % 0) * self.SLOTS)
+                self.cleep_filesystem.close(fd)
+
+            fd = self.cleep_filesystem.open(self.path, 'r+')
+            try:
+                fd.seek(self.__slot * self.SLOT_SIZE)
+                fd.write(self.SLOT_FORMAT % timestamp)
+            finally:
+                self.cleep_filesystem.close(fd)
+            self.__slot = (self.__slot + 1) % self.SLOTS
+            return True
+        except Exception:
+            self.logger.exception('Unable to write timestamp ring file "%s"' % self.path)
+            return False
+
+    def _must_persist(self, timestamp):
+        return (timestamp - self._persisted_timestamp) >= self.flush_interval
+
+def create_timestamp_store(mode, get_config_field, set_config_field, ring_path=None, cleep_filesystem=None,
+                           flush_interval=15, logger=None):
+    """
+    Create timestamp store for specified mode
+
+    Args:
+        mode (string): store mode (writebehind, shutdown, ringfile)
+        get_config_field (function): module function to get config field value
+        set_config_field (function): module function to set config field value
+        ring_path (string): ring file path (ringfile mode only)
+        cleep_filesystem (CleepFilesystem): filesystem instance (ringfile mode only)
+        flush_interval (int): minutes between writes (writebehind and ringfile modes)
+        logger (Logger): logger instance
+
+    Returns:
+        TimestampStore: timestamp store instance
+
+    Raises:
+        ValueError: if mode is invalid
+    """
+    if mode == 'writebehind':
+        return WriteBehindTimestampStore(get_config_field, set_config_field, flush_interval, logger)
+    if mode == 'shutdown':
+        return ShutdownTimestampStore(get_config_field, set_config_field, logger)
+    if mode == 'ringfile':
+        return RingFileTimestampStore(get_config_field, set_config_field, ring_path, cleep_filesystem, flush_interval, logger)
+
+    raise ValueError('Invalid timestamp store mode "%s"' % mode)
@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import time
+import shutil
+import logging
+
+__all__ = ['TimezoneApplier']
+
+class TimezoneApplier():
+    """
+    Apply system timezone without dpkg-reconfigure
+
+    /etc/localtime is replaced atomically by a symlink to zoneinfo file (or a copy if filesystem doesn't
+    support symlinks), /etc/timezone is rewritten atomically, then process timezone is reloaded with
+    time.tzset(). All paths are relative to root directory so it can be used on a temporary tree.
+    """
+
+    ZONEINFO_DIR = 'usr/share/zoneinfo'
+    LOCALTIME = 'etc/localtime'
+    TIMEZONE = 'etc/timezone'
+    TZIF_MAGIC = b'TZif'
+
+    def __init__(self, root_dir='/', cleep_filesystem=None, logger=None):
+        """
+        Constructor
+
+        Args:
+            root_dir (string): system root directory
+            cleep_filesystem (CleepFilesystem): cleep filesystem instance used to enable writing on read-only
+                                                filesystem. Nothing done if None
+            logger (Logger): logger instance
+        """
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.cleep_filesystem = cleep_filesystem
+        self.root_dir = root_dir
+        self.zoneinfo_dir = os.path.join(root_dir, self.ZONEINFO_DIR)
+        self.localtime = os.path.join(root_dir, self.LOCALTIME)
+        self.timezone = os.path.join(root_dir, self.TIMEZONE)
+
+    def get_zoneinfo_path(self, timezone_name):
+        """
+        Return zoneinfo file path of specified timezone
+
+        Args:
+            timezone_name (string): timezone name (ie Europe/Paris)
+
+        Returns:
+            string: zoneinfo file path or None if timezone is invalid
+        """
+        if not timezone_name or timezone_name.startswith('/'):
+            return None
+        path = os.path.normpath(os.path.join(self.zoneinfo_dir, timezone_name))
+        if not path.startswith(os.path.normpath(self.zoneinfo_dir) + os.sep) or not os.path.isfile(path):
+            return None
+        try:
+            with open(path, 'rb') as zoneinfo:
+                if zoneinfo.read(len(self.TZIF_MAGIC)) != self.TZIF_MAGIC:
+                    return None
+        except OSError:
+            return None
+
+        return path
+
+    def apply(self, timezone_name):
+        """
+        Apply system timezone
+
+        Args:
+            timezone_name (string): timezone name (ie Europe/Paris)
+
+        Returns:
+            bool: True if timezone applied and verified, False otherwise
+        """
+        zoneinfo = self.get_zoneinfo_path(timezone_name)
+        if not zoneinfo:
+            self.logger.error('Invalid timezone "%s"' % timezone_name)
+            return False
+
+        if self.cleep_filesystem:
+            self.cleep_filesystem.enable_write(root=True, boot=False)
+        try:
+            self.__replace_localtime(zoneinfo)
+            self.__write_atomically(self.timezone, '%s\n' % timezone_name)
+        except Exception:
+            self.logger.exception('Unable to apply timezone "%s"' % timezone_name)
+            return False
+        finally:
+            if self.cleep_filesystem:
+                self.cleep_filesystem.disable_write(root=True, boot=False)
+
+        time.tzset()
+
+        return self.verify(timezone_name)
+
+    def verify(self, timezone_name):
+        """
+        Check system timezone files match specified timezone
+
+        Args:
+            timezone_name (string): timezone name
+
+        Returns:
+            bool: True if system timezone is the specified one
+        """
+        zoneinfo = self.get_zoneinfo_path(timezone_name)
+        if not zoneinfo:
+            return False
+
+        try:
+            if os.path.islink(self.localtime):
+                localtime_ok = os.path.realpath(self.localtime) == os.path.realpath(zoneinfo)
+            else:
+                with open(self.localtime, 'rb') as localtime, open(zoneinfo, 'rb') as expected:
+                    localtime_ok = localtime.read() == expected.read()
+            with open(self.timezone, 'r') as timezone:
+                timezone_ok = timezone.read().strip() == timezone_name
+        except OSError:
+            self.logger.exception('Unable to verify system timezone')
+            return False
+
+        if not localtime_ok or not timezone_ok:
+            self.logger.error('System timezone verification failed (localtime=%s timezone=%s)' % (localtime_ok, timezone_ok))
+            return False
+
+        return True
+
+    def __temp_path(self, path):
+        """
+        Return temporary file path in same directory than specified path (required by os.replace)
+        """
+        return os.path.join(os.path.dirname(path), '.%s.%d.tmp' % (os.path.basename(path), os.getpid()))
+
+    def __replace_localtime(self, zoneinfo):
+        """
+        Replace localtime file by a relative symlink to zoneinfo file, or a copy if symlink is not supported
+
+        Args:
+            zoneinfo (string): zoneinfo file path
+        """
+        temp = self.__temp_path(self.localtime)
+        if os.path.lexists(temp):
+            os.remove(temp)
+        try:
+            os.symlink(os.path.relpath(zoneinfo, os.path.dirname(self.localtime)), temp)
+        except OSError:
+            self.logger.debug('Symlink not supported, copy zoneinfo file instead')
+            shutil.copyfile(zoneinfo, temp)
+        self.__replace(temp, self.localtime)
+
+    def __write_atomically(self, path, content):
+        """
+        Write file content atomically
+
+        Args:
+            path (string): file path
+            content (string): file content
+        """
+        temp = self.__temp_path(path)
+        with open(temp, 'w') as fd:
+            fd.write(content)
+            fd.flush()
+            os.fsync(fd.fileno())
+        self.__replace(temp, path)
+
+    def __replace(self, temp, path):
+        """
+        Replace file by temporary one, temporary file is removed on failure
+
+        Args:
+            temp (string): temporary file path
+            path (string): file path
+        """
+        try:
+            os.replace(temp, path)
+        except Exception:
+            if os.path.lexists(temp):
+                os.remove(temp)
+            raise
+
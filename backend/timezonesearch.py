@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import time
+import logging
+from collections import OrderedDict
+from threading import Lock
+
+__all__ = ['TimezoneSearch', 'nautical_timezone']
+
+def nautical_timezone(longitude):
+    """
+    Return nautical timezone (15 degrees wide UTC offset zone) of specified longitude
+
+    Args:
+        longitude (float): longitude
+
+    Returns:
+        string: Etc timezone name (ie "Etc/GMT-1" for UTC+1)
+    """
+    offset = int(round(longitude / 15.0))
+    if offset == 0:
+        return 'Etc/GMT'
+    # Etc zones sign is inverted (POSIX style)
+    return 'Etc/GMT%+d' % -offset
+
+class TimezoneSearch():
+    """
+    Progressive closest timezone search
+
+    Closest timezone search cost grows with searched radius (delta_degree). Radius is widened step by
+    step until a timezone is found, max radius is reached or time budget runs out (next step duration is
+    estimated from previous one to not overrun budget). If no timezone is found, nautical timezone of
+    position is returned, which is the right one offshore. Results are cached per grid cell.
+    """
+
+    DEFAULT_BUDGET = 3.0
+    DEFAULT_MAX_DELTA = 10
+    # grid cell size in degrees (~11km)
+    CELL_SIZE = 0.1
+    MAX_CACHE_ENTRIES = 256
+
+    def __init__(self, geo_backend, budget=DEFAULT_BUDGET, max_delta=DEFAULT_MAX_DELTA, clock=time.monotonic, logger=None):
+        """
+        Constructor
+
+        Args:
+            geo_backend (GeoBackend): geographical backend
+            budget (float): max search duration in seconds
+            max_delta (int): max searched radius in degrees
+            clock (function): monotonic clock function (used for tests)
+            logger (Logger): logger instance
+        """
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.geo_backend = geo_backend
+        self.budget = budget
+        self.max_delta = max_delta
+        self.clock = clock
+        self.__cache = OrderedDict()
+        self.__lock = Lock()
+
+    def __get_cell(self, latitude, longitude):
+        """
+        Return grid cell of position
+        """
+        return int(round(latitude / self.CELL_SIZE)), int(round(longitude / self.CELL_SIZE))
+
+    def __cache_result(self, cell, timezone_name):
+        """
+        Store search result
+        """
+        with self.__lock:
+            self.__cache[cell] = timezone_name
+            self.__cache.move_to_end(cell)
+            while len(self.__cache) > self.MAX_CACHE_ENTRIES:
+                self.__cache.popitem(last=False)
+
+    def clear(self):
+        """
+        Clear cached results
+        """
+        with self.__lock:
+            self.__cache.clear()
+
+    def closest_timezone_at(self, latitude, longitude):
+        """
+        Search closest timezone of position
+
+        Args:
+            latitude (float): latitude
+            longitude (float): longitude
+
+        Returns:
+            string: timezone name (nautical timezone if no timezone found within budget)
+
+        Raises:
+            ValueError: if coordinates are out of bounds
+        """
+        return self.search(latitude, longitude)[0]
+
+    def search(self, latitude, longitude, budget=None):
+        """
+        Search closest timezone of position, telling if result is definitive
+
+        Args:
+            latitude (float): latitude
+            longitude (float): longitude
+            budget (float): max search duration in seconds, capped to instance budget. Instance budget if None
+
+        Returns:
+            tuple: timezone name (string), definitive (bool). Result is not definitive when budget ran
+                out before search completed (nautical timezone returned, a longer search may find a
+                timezone), it must not be persisted
+
+        Raises:
+            ValueError: if coordinates are out of bounds
+        """
+        cell = self.__get_cell(latitude, longitude)
+        with self.__lock:
+            if cell in self.__cache:
+                self.__cache.move_to_end(cell)
+                return self.__cache[cell], True
+
+        budget = self.budget if budget is None else min(budget, self.budget)
+        if budget <= 0:
+            return nautical_timezone(longitude), False
+
+        start = self.clock()
+        last_duration = None
+        for delta in range(1, self.max_delta + 1):
+            elapsed = self.clock() - start
+            if last_duration is not None:
+                # search area (and duration) grows with square of radius
+                estimated = last_duration * (float(delta) / (delta - 1)) ** 2
+                if elapsed + estimated > budget:
+                    self.logger.debug('Closest timezone search budget exhausted at delta_degree=%d' % (delta - 1))
+                    # may find a timezone later with more budget, do not cache
+                    return nautical_timezone(longitude), False
+
+            step_start = self.clock()
+            timezone_name = self.geo_backend.closest_timezone_at(latitude, longitude, delta_degree=delta)
+            last_duration = self.clock() - step_start
+            if timezone_name:
+                self.logger.debug('Closest timezone "%s" found at delta_degree=%d' % (timezone_name, delta))
+                self.__cache_result(cell, timezone_name)
+                return timezone_name, True
+
+        timezone_name = nautical_timezone(longitude)
+        self.logger.debug('No timezone found within %d degrees, use nautical timezone "%s"' % (self.max_delta, timezone_name))
+        self.__cache_result(cell, timezone_name)
+
+        return timezone_name, True
+
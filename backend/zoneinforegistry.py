@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import logging
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from threading import Lock
+import pytz
+
+__all__ = ['ZoneinfoRegistry', 'ZoneTransitions']
+
+EPOCH = datetime(1970, 1, 1)
+ONE_SECOND = timedelta(seconds=1)
+MIN_TIMESTAMP = (datetime.min - EPOCH) // ONE_SECOND
+
+class ZoneTransitions():
+    """
+    Precomputed UTC offset transitions of a pytz timezone
+
+    Transition tables are flattened to integer timestamps once, so localization is a binary search
+    instead of a pytz call. localize() has same signature and result than pytz tz.localize (with
+    is_dst=False) so it can be used in place of the timezone.
+    """
+
+    def __init__(self, tz):
+        """
+        Constructor
+
+        Args:
+            tz (tzinfo): pytz timezone
+        """
+        self.tz = tz
+        self.zone = tz.zone
+        utc_transitions = getattr(tz, '_utc_transition_times', None)
+        if not utc_transitions:
+            # static timezone (UTC, Etc/GMT+1...)
+            self.utc_starts = [MIN_TIMESTAMP]
+            self.local_starts = [MIN_TIMESTAMP]
+            self.tzinfos = [tz]
+            self.offsets = [tz.utcoffset(EPOCH) // ONE_SECOND]
+        else:
+            self.utc_starts = []
+            self.local_starts = []
+            self.tzinfos = []
+            self.offsets = []
+            for utc_transition, info in zip(utc_transitions, tz._transition_info):
+                utc_start = (utc_transition - EPOCH) // ONE_SECOND
+                offset = info[0] // ONE_SECOND
+                self.utc_starts.append(utc_start)
+                self.local_starts.append(utc_start + offset)
+                self.tzinfos.append(tz._tzinfos[info])
+                self.offsets.append(offset)
+
+    def __repr__(self):
+        return '<ZoneTransitions %s>' % self.zone
+
+    def utcoffset(self, timestamp):
+        """
+        Return UTC offset at specified timestamp
+
+        Args:
+            timestamp (int): timestamp
+
+        Returns:
+            int: UTC offset in seconds
+        """
+        return self.offsets[max(0, bisect_right(self.utc_starts, timestamp) - 1)]
+
+    def period(self, timestamp):
+        """
+        Return constant UTC offset period containing specified timestamp
+
+        Args:
+            timestamp (int): timestamp
+
+        Returns:
+            tuple: (period start (int), period end (int, None if no more transition), UTC offset in seconds (int),
+                   tzinfo (tzinfo))
+        """
+        index = max(0, bisect_right(self.utc_starts, timestamp) - 1)
+        end = self.utc_starts[index + 1] if index + 1 < len(self.utc_starts) else None
+
+        return self.utc_starts[index], end, self.offsets[index], self.tzinfos[index]
+
+    def next_transition(self, timestamp):
+        """
+        Return next UTC offset transition after specified timestamp
+
+        Args:
+            timestamp (int): timestamp
+
+        Returns:
+            tuple: (transition timestamp (int), new UTC offset in seconds (int)) or None if no more transition
+        """
+        index = bisect_right(self.utc_starts, timestamp)
+        if index >= len(self.utc_starts):
+            return None
+
+        return self.utc_starts[index], self.offsets[index]
+
+    def fromtimestamp(self, timestamp):
+        """
+        Convert timestamp to localized datetime (same as datetime.fromtimestamp(timestamp, tz))
+
+        Args:
+            timestamp (int): timestamp
+
+        Returns:
+            datetime: localized datetime
+        """
+        index = max(0, bisect_right(self.utc_starts, timestamp) - 1)
+        return (EPOCH + timedelta(seconds=timestamp + self.offsets[index])).replace(tzinfo=self.tzinfos[index])
+
+    def localize(self, local_dt):
+        """
+        Localize naive datetime (same as pytz tz.localize(local_dt))
+
+        Args:
+            local_dt (datetime): naive local datetime
+
+        Returns:
+            datetime: localized datetime
+        """
+        index = max(0, bisect_right(self.local_starts, (local_dt - EPOCH) // ONE_SECOND) - 1)
+        return local_dt.replace(tzinfo=self.tzinfos[index])
+
+class ZoneinfoRegistry():
+    """
+    System zoneinfo registry
+
+    Available timezones are scanned once from system zoneinfo directory (first use) and timezone
+    objects with their transitions tables are cached. System database is the reference of valid
+    timezones, pytz is only used to compute offsets (it may not know recent zones of system tzdata).
+    """
+
+    ZONEINFO_DIR = '/usr/share/zoneinfo'
+    # zoneinfo sub directories duplicating main tree
+    SKIPPED_DIRS = ('posix', 'right')
+    # zoneinfo files that are not timezones
+    SKIPPED_FILES = ('localtime', 'posixrules')
+    TZIF_MAGIC = b'TZif'
+
+    def __init__(self, zoneinfo_dir=ZONEINFO_DIR, logger=None):
+        """
+        Constructor
+
+        Args:
+            zoneinfo_dir (string): system zoneinfo directory
+            logger (Logger): logger instance
+        """
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.zoneinfo_dir = zoneinfo_dir
+        self.__timezones = None
+        self.__transitions = {}
+        self.__lock = Lock()
+
+    def __scan(self):
+        """
+        Scan zoneinfo directory
+
+        Returns:
+            frozenset: available timezone names
+        """
+        timezones = set()
+        for root, dirs, files in os.walk(self.zoneinfo_dir):
+            if root == self.zoneinfo_dir:
+                dirs[:] = [directory for directory in dirs if directory not in self.SKIPPED_DIRS]
+            for filename in files:
+                path = os.path.join(root, filename)
+                name = os.path.relpath(path, self.zoneinfo_dir)
+                if name in self.SKIPPED_FILES:
+                    continue
+                try:
+                    with open(path, 'rb') as zoneinfo:
+                        if zoneinfo.read(len(self.TZIF_MAGIC)) == self.TZIF_MAGIC:
+                            timezones.add(name)
+                except OSError:
+                    self.logger.debug('Unable to read zoneinfo file "%s"' % path)
+        self.logger.debug('Found %d timezones in "%s"' % (len(timezones), self.zoneinfo_dir))
+
+        return frozenset(timezones)
+
+    def __get_names(self):
+        """
+        Return available timezone names, scanning zoneinfo directory on first call
+        """
+        with self.__lock:
+            if self.__timezones is None:
+                self.__timezones = self.__scan()
+            return self.__timezones
+
+    def refresh(self):
+        """
+        Force zoneinfo directory scan on next call (after tzdata update)
+        """
+        with self.__lock:
+            self.__timezones = None
+
+    def get_timezones(self):
+        """
+        Return available system timezones
+
+        Returns:
+            list: sorted list of timezone names
+        """
+        return sorted(self.__get_names())
+
+    def is_valid(self, name):
+        """
+        Return True if timezone exists on system
+
+        Args:
+            name (string): timezone name (ie Europe/Paris)
+
+        Returns:
+            bool: True if timezone is valid
+        """
+        return name in self.__get_names()
+
+    def get(self, name):
+        """
+        Return timezone transitions
+
+        Args:
+            name (string): timezone name (ie Europe/Paris)
+
+        Returns:
+            ZoneTransitions: timezone transitions or None if timezone is unknown to pytz
+        """
+        transitions = self.__transitions.get(name)
+        if transitions is not None:
+            return transitions
+
+        try:
+            tz = pytz.timezone(name)
+        except pytz.UnknownTimeZoneError:
+            self.logger.warning('Unknown timezone "%s"' % name)
+            return None
+        transitions = ZoneTransitions(tz)
+        self.__transitions[name] = transitions
+
+        return transitions
+
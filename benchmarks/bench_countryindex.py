@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Country lookup benchmark
+
+Compare reverse_geocode (cities dataset and KD-tree loaded in process) against shipped CountryIndex
+for load time, memory footprint and single position lookup duration. Each scenario runs in a fresh
+interpreter.
+
+Usage:
+    python benchmarks/bench_countryindex.py
+"""
+
+import os
+import sys
+import json
+import subprocess
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+LOOKUPS = 1000
+
+SCENARIOS = {
+    'reverse_geocode': (
+        'import reverse_geocode\nreverse_geocode.search([(48.8591554, 2.2907284)])',
+        'reverse_geocode.search([(latitude, longitude)])',
+    ),
+    'countryindex': (
+        'from backend.countryindex import CountryIndex\nindex = CountryIndex()\nindex.lookup(48.8591554, 2.2907284)',
+        'index.lookup(latitude, longitude)',
+    ),
+}
+
+TEMPLATE = """
+import time, resource, json, random
+start = time.perf_counter()
+%s
+load = time.perf_counter() - start
+generator = random.Random(1)
+coordinates = [(generator.uniform(-60.0, 75.0), generator.uniform(-180.0, 180.0)) for _ in range(%d)]
+start = time.perf_counter()
+for latitude, longitude in coordinates:
+    %s
+lookup = (time.perf_counter() - start) / len(coordinates)
+print(json.dumps({'load': load, 'lookup': lookup, 'maxrss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}))
+"""
+
+def run(code):
+    """
+    Run code in new interpreter and return its measures
+
+    Args:
+        code (string): python code to execute
+
+    Returns:
+        dict: measures (load, lookup, maxrss_kb)
+    """
+    output = subprocess.check_output([sys.executable, '-c', code], cwd=ROOT_DIR)
+    return json.loads(output.decode('utf-8').strip().splitlines()[-1])
+
+def main():
+    baseline = run(TEMPLATE % ('pass', 1, 'pass'))
+    results = {}
+    for name, (load_code, lookup_code) in SCENARIOS.items():
+        measures = run(TEMPLATE % (load_code, LOOKUPS, lookup_code))
+        measures['rss_delta_kb'] = measures['maxrss_kb'] - baseline['maxrss_kb']
+        results[name] = measures
+        print('%-16s load %8.1f ms  lookup %8.1f us  %8d kB' % (
+            name, measures['load'] * 1000.0, measures['lookup'] * 1000000.0, measures['rss_delta_kb']
+        ))
+
+    return results
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Geographical libraries startup benchmark
+
+Compare import time and memory footprint of eager loading of timezonefinder and reverse_geocode (previous
+Parameters behavior) against lazy GeoBackend. Each scenario runs in a fresh interpreter.
+
+Usage:
+    python benchmarks/bench_geobackend.py
+"""
+
+import os
+import sys
+import json
+import subprocess
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+SCENARIOS = {
+    'eager': """
+import reverse_geocode
+from timezonefinder import TimezoneFinder
+finder = TimezoneFinder()
+""",
+    'lazy': """
+from backend.geobackend import GeoBackend
+backend = GeoBackend(idle_timeout=None)
+""",
+    'lazy_first_use': """
+from backend.geobackend import GeoBackend
+backend = GeoBackend(idle_timeout=None)
+backend.timezone_at(48.8591554, 2.2907284)
+backend.search_countries([(48.8591554, 2.2907284)])
+""",
+}
+
+TEMPLATE = """
+import time, resource, json
+start = time.perf_counter()
+%s
+duration = time.perf_counter() - start
+print(json.dumps({'duration': duration, 'maxrss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}))
+"""
+
+BASELINE = TEMPLATE % 'pass'
+
+def run(code):
+    """
+    Run code in new interpreter and return its measures
+
+    Args:
+        code (string): python code to execute
+
+    Returns:
+        dict: measures (duration, maxrss_kb)
+    """
+    output = subprocess.check_output([sys.executable, '-c', code], cwd=ROOT_DIR)
+    return json.loads(output.decode('utf-8').strip().splitlines()[-1])
+
+def main():
+    baseline = run(BASELINE)
+    results = {}
+    for name, code in SCENARIOS.items():
+        measures = run(TEMPLATE % code)
+        measures['rss_delta_kb'] = measures['maxrss_kb'] - baseline['maxrss_kb']
+        results[name] = measures
+        print('%-16s %8.1f ms %8d kB' % (name, measures['duration'] * 1000.0, measures['rss_delta_kb']))
+
+    return results
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Local time computation benchmark
+
+Compare pytz localization (datetime.fromtimestamp + tz.localize, previous clock path) against OffsetTracker
+integer arithmetic, computing local time fields of every minute of one year (two DST transitions).
+
+Usage:
+    python benchmarks/bench_offsettracker.py
+"""
+
+import os
+import sys
+import timeit
+from datetime import datetime
+import pytz
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from backend.offsettracker import OffsetTracker
+from backend.zoneinforegistry import ZoneTransitions
+from backend.timesnapshot import TimeSnapshot
+
+TIMEZONE = pytz.timezone('Europe/London')
+# 2020-01-01 00:00 UTC
+START = 1577836800
+MINUTES = 366 * 1440
+TIMESTAMPS = range(START, START + MINUTES * 60, 60)
+
+def pytz_year():
+    for timestamp in TIMESTAMPS:
+        local_dt = TIMEZONE.localize(datetime.fromtimestamp(timestamp))
+        (local_dt.year, local_dt.month, local_dt.day, local_dt.hour, local_dt.minute, local_dt.weekday())
+
+def tracker_year():
+    tracker = OffsetTracker()
+    tracker.set_transitions(ZoneTransitions(TIMEZONE))
+    for timestamp in TIMESTAMPS:
+        tracker.local_fields(timestamp)
+
+def pytz_snapshot_year():
+    for timestamp in TIMESTAMPS:
+        TimeSnapshot.from_timestamp(timestamp, TIMEZONE).as_dict()
+
+def tracker_snapshot_year():
+    tracker = OffsetTracker()
+    tracker.set_transitions(ZoneTransitions(TIMEZONE))
+    for timestamp in TIMESTAMPS:
+        TimeSnapshot.from_fields(timestamp, tracker.local_fields(timestamp)).as_dict()
+
+def main():
+    results = {}
+    for name, func in (
+        ('pytz', pytz_year),
+        ('tracker', tracker_year),
+        ('pytz_snapshot', pytz_snapshot_year),
+        ('tracker_snapshot', tracker_snapshot_year),
+    ):
+        duration = min(timeit.repeat(func, number=1, repeat=3)) / MINUTES
+        results[name] = {
+            'duration_us': duration * 1000000.0,
+        }
+        print('%-18s %6.2f us/minute' % (name, results[name]['duration_us']))
+
+    return results
+
+if __name__ == '__main__':
+    main()
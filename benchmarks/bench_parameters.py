@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Parameters module hot paths benchmark
+
+Measure module import and construction time, clock hot path (time snapshot, time task, devices
+polling), sun, timezone and country updates, and timezonefinder lookups over a grid of coordinates.
+Cleep is replaced by local stubs (benchmarks/stubs) and system files by a temporary tree, so it runs
+offline without Cleep installed and never touches system configuration.
+
+Results are written as json (with commit and python version) and can be compared with results of
+another commit.
+
+Usage:
+    python benchmarks/bench_parameters.py [--output results.json] [--compare previous.json]
+"""
+
+import os
+import sys
+import json
+import time
+import timeit
+import shutil
+import logging
+import platform
+import argparse
+import tempfile
+import subprocess
+from importlib.util import find_spec
+
+BENCH_DIR = os.path.abspath(os.path.dirname(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(BENCH_DIR, '..'))
+STUBS_DIR = os.path.join(BENCH_DIR, 'stubs')
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, STUBS_DIR)
+from backend.parameters import Parameters
+from backend.timezoneapplier import TimezoneApplier
+
+REPEAT = 5
+# Paris
+POSITION = {'latitude': 48.8591554, 'longitude': 2.2907284}
+GRID_LATITUDES = range(-60, 75, 15)
+GRID_LONGITUDES = range(-180, 180, 30)
+
+STARTUP_TEMPLATE = """
+import sys, time, json
+sys.path.insert(0, %r)
+sys.path.insert(0, %r)
+start = time.perf_counter()
+from backend.parameters import Parameters
+imported = time.perf_counter()
+module = Parameters({}, False)
+constructed = time.perf_counter()
+module._configure()
+configured = time.perf_counter()
+print(json.dumps({'import': imported - start, 'construct': constructed - imported, 'configure': configured - constructed}))
+"""
+
+def get_commit():
+    """
+    Return current git commit
+
+    Returns:
+        string: commit hash or None
+    """
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=ROOT_DIR, stderr=subprocess.DEVNULL).decode('utf-8').strip()
+    except Exception:
+        return None
+
+def measure(function, number):
+    """
+    Return best duration of function call
+
+    Args:
+        function (function): function to measure
+        number (int): number of calls per measure
+
+    Returns:
+        float: duration of single call in seconds
+    """
+    return min(timeit.repeat(function, number=number, repeat=REPEAT)) / number
+
+def measure_startup():
+    """
+    Measure import, construction and configuration durations in a fresh interpreter
+
+    Returns:
+        dict: durations in seconds
+    """
+    output = subprocess.check_output([sys.executable, '-c', STARTUP_TEMPLATE % (ROOT_DIR, STUBS_DIR)], cwd=ROOT_DIR)
+    return json.loads(output.decode('utf-8').strip().splitlines()[-1])
+
+def create_root_dir():
+    """
+    Create temporary system root with zoneinfo database
+    """
+    root_dir = tempfile.mkdtemp(prefix='bench_parameters')
+    os.makedirs(os.path.join(root_dir, 'etc'))
+    os.makedirs(os.path.join(root_dir, 'usr', 'share'))
+    os.symlink(Parameters.SYSTEM_ZONEINFO_DIR, os.path.join(root_dir, TimezoneApplier.ZONEINFO_DIR))
+    return root_dir
+
+def create_module(root_dir):
+    """
+    Create and configure module
+    """
+    module = Parameters({}, False)
+    module.timezone_applier = TimezoneApplier(root_dir=root_dir, cleep_filesystem=module.cleep_filesystem, logger=module.logger)
+    module._set_config_field('position', POSITION)
+    module._configure()
+    return module
+
+def get_scenarios(module):
+    """
+    Return benchmark scenarios
+
+    Returns:
+        list: list of (name, function, number of calls per measure)
+    """
+    def time_snapshot():
+        module._Parameters__time_snapshot = None
+        module._Parameters__get_time_snapshot().as_dict()
+
+    def get_module_devices_uncached():
+        module._invalidate_responses()
+        module.get_module_devices()
+
+    def set_timezone_uncached():
+        module.geo_cache.clear()
+        module.set_timezone()
+
+    def set_country_uncached():
+        module.geo_cache.clear()
+        module.set_country()
+
+    coordinates = [(float(latitude), float(longitude)) for latitude in GRID_LATITUDES for longitude in GRID_LONGITUDES]
+    def timezonefinder_grid():
+        for latitude, longitude in coordinates:
+            module.geo_backend.timezone_at(latitude, longitude)
+
+    scenarios = [
+        ('time_snapshot', time_snapshot, 1000),
+        ('time_task', module._time_task, 1000),
+        ('get_module_devices', module.get_module_devices, 1000),
+        ('get_module_devices_uncached', get_module_devices_uncached, 1000),
+        ('set_sun', module.set_sun, 100),
+        ('set_timezone', module.set_timezone, 20),
+        ('set_country', module.set_country, 100),
+        ('set_country_uncached', set_country_uncached, 100),
+    ]
+    if find_spec('timezonefinder'):
+        # warm up libraries loading
+        module.geo_backend.timezone_at(POSITION['latitude'], POSITION['longitude'])
+        scenarios.extend([
+            ('set_timezone_uncached', set_timezone_uncached, 5),
+            ('timezonefinder_grid', timezonefinder_grid, 1),
+        ])
+
+    return scenarios
+
+def compare(results, previous):
+    """
+    Print results compared to previous ones
+
+    Args:
+        results (dict): current results
+        previous (dict): previous results
+    """
+    print('\nCompared to %s:' % (previous.get('commit') or 'previous results'))
+    for name, duration in sorted(results['results'].items()):
+        before = previous.get('results', {}).get(name)
+        if not before:
+            print('%-28s %12s' % (name, 'new'))
+            continue
+        print('%-28s %+11.1f%%' % (name, (duration - before) / before * 100.0))
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Parameters module hot paths benchmark')
+    parser.add_argument('--output', help='json results file')
+    parser.add_argument('--compare', help='json results file to compare with')
+    options = parser.parse_args(args)
+    logging.basicConfig(level=logging.FATAL)
+
+    results = {
+        'commit': get_commit(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'timestamp': int(time.time()),
+        'unit': 'seconds',
+        'results': {},
+    }
+
+    for name, duration in measure_startup().items():
+        results['results']['startup_%s' % name] = duration
+
+    root_dir = create_root_dir()
+    try:
+        module = create_module(root_dir)
+        for name, function, number in get_scenarios(module):
+            results['results'][name] = measure(function, number)
+        module.geo_backend.release()
+    finally:
+        shutil.rmtree(root_dir)
+
+    for name, duration in results['results'].items():
+        print('%-28s %12.1f us' % (name, duration * 1000000.0))
+
+    if options.output:
+        with open(options.output, 'w') as output:
+            json.dump(results, output, indent=2, sort_keys=True)
+    if options.compare:
+        with open(options.compare, 'r') as previous:
+            compare(results, json.load(previous))
+
+    return results
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Batch position resolution throughput benchmark
+
+Compare one-coordinate-per-call resolution (previous set_position lookups: reverse_geocode search with a
+1-tuple, timezone_at and sun times per position) against resolve_positions batch resolution, for several
+fleet sizes. Libraries are loaded before measures.
+
+Usage:
+    python benchmarks/bench_positionresolver.py
+"""
+
+import os
+import sys
+import time
+import random
+from datetime import date
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from backend.geobackend import GeoBackend
+from backend.positionresolver import resolve_positions
+from backend.solarcalc import sun_events
+
+FLEET_SIZES = (10, 100, 1000)
+DAY = date(2020, 6, 8)
+
+def random_positions(count):
+    generator = random.Random(count)
+    return [(generator.uniform(-60.0, 70.0), generator.uniform(-180.0, 180.0)) for _ in range(count)]
+
+def single_resolution(geo_backend, positions):
+    results = []
+    for latitude, longitude in positions:
+        country = geo_backend.search_countries([(latitude, longitude)])[0]
+        timezone_name = geo_backend.timezone_at(latitude, longitude)
+        events = sun_events(DAY, latitude, longitude)
+        results.append((country['country_code'], timezone_name, events['sunrise'], events['sunset']))
+    return results
+
+def batch_resolution(geo_backend, positions):
+    return resolve_positions(positions, geo_backend, day=DAY)
+
+def main():
+    geo_backend = GeoBackend(idle_timeout=None)
+    # load libraries
+    batch_resolution(geo_backend, random_positions(1))
+
+    results = {}
+    for size in FLEET_SIZES:
+        positions = random_positions(size)
+        results[size] = {}
+        for name, func in (('single', single_resolution), ('batch', batch_resolution)):
+            start = time.perf_counter()
+            func(geo_backend, positions)
+            duration = time.perf_counter() - start
+            results[size][name] = {
+                'duration_ms': duration * 1000.0,
+                'positions_per_second': size / duration,
+            }
+            print('%5d positions %-8s %10.1f ms %10.0f positions/s' % (size, name, duration * 1000.0, size / duration))
+
+    return results
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Sun events engines throughput benchmark
+
+Compare scalar solarcalc engine (one call per day and position) against vectorized numpy engine
+computing a whole year for many positions in one call.
+
+Usage:
+    python benchmarks/bench_solarvector.py [positions]
+"""
+
+import os
+import sys
+import time
+import random
+from datetime import date, timedelta
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from backend.solarcalc import sun_events
+from backend import solarvector
+
+def main(positions_count=100):
+    random.seed(0)
+    days = [date(2021, 1, 1) + timedelta(days=day) for day in range(365)]
+    latitudes = [random.uniform(-60.0, 60.0) for _ in range(positions_count)]
+    longitudes = [random.uniform(-180.0, 180.0) for _ in range(positions_count)]
+    computations = len(days) * positions_count
+
+    start = time.perf_counter()
+    for latitude, longitude in zip(latitudes, longitudes):
+        for day in days:
+            sun_events(day, latitude, longitude)
+    scalar = time.perf_counter() - start
+    results = {'scalar': {'duration': scalar, 'per_second': computations / scalar}}
+
+    if solarvector.is_available():
+        # import numpy before measure
+        solarvector.sun_events_array(days[:1], latitudes[:1], longitudes[:1])
+        start = time.perf_counter()
+        solarvector.sun_events_array(days, latitudes, longitudes)
+        vector = time.perf_counter() - start
+        results['vector'] = {'duration': vector, 'per_second': computations / vector}
+
+    for name, result in results.items():
+        print('%-8s %10.1f ms %12.0f day-positions/s' % (name, result['duration'] * 1000.0, result['per_second']))
+
+    return results
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
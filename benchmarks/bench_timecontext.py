@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Shared time context contention benchmark
+
+Many concurrent reader threads consume local time and next sun events while a writer publishes a new
+context every millisecond (far more often than Parameters does). Compare:
+
+    - rederive: consumer re-derives local datetime, iso strings and sun offsets from event timestamps
+    - locked: consumer reads shared context through a lock protected getter
+    - context: consumer reads shared context (single reference load, no lock)
+
+Usage:
+    python benchmarks/bench_timecontext.py
+"""
+
+import os
+import sys
+import time
+from datetime import datetime
+from threading import Thread, Lock, Event
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytz
+from backend.timecontext import TimeContext, TimeContextHolder
+from backend.timesnapshot import TimeSnapshot
+
+READERS = (1, 4, 16, 64)
+READS = 200000
+WRITE_INTERVAL = 0.001
+TIMESTAMP = 1591645808
+TZ = pytz.timezone('Europe/Paris')
+
+def build_context(timestamp):
+    snapshot = TimeSnapshot.from_timestamp(timestamp, TZ, timestamp + 3600, timestamp + 7200)
+    return TimeContext(
+        snapshot,
+        'Europe/Paris',
+        TZ,
+        next_sunrise={'event': 'sunrise', 'timestamp': timestamp + 3600, 'iso': datetime.fromtimestamp(timestamp + 3600, TZ).isoformat()},
+        next_sunset={'event': 'sunset', 'timestamp': timestamp + 7200, 'iso': datetime.fromtimestamp(timestamp + 7200, TZ).isoformat()},
+    )
+
+class LockedHolder():
+    def __init__(self):
+        self.context = None
+        self.lock = Lock()
+
+    def publish(self, context):
+        with self.lock:
+            self.context = context
+
+    def get(self):
+        with self.lock:
+            return self.context
+
+def rederive_read(holder):
+    # consumer only has parameters.time.now event params
+    params = holder.get().snapshot.as_dict()
+    local = datetime.fromtimestamp(params['timestamp'], TZ)
+    return (
+        local.isoformat(),
+        params['sunrise'] - params['timestamp'],
+        datetime.fromtimestamp(params['sunrise'], TZ).isoformat(),
+        datetime.fromtimestamp(params['sunset'], TZ).isoformat(),
+    )
+
+def context_read(holder):
+    context = holder.get()
+    return (
+        context.snapshot.iso,
+        context.next_sunrise['timestamp'] - context.snapshot.timestamp,
+        context.next_sunrise['iso'],
+        context.next_sunset['iso'],
+    )
+
+def run(holder, read, readers):
+    """
+    Run readers against a publishing writer
+
+    Returns:
+        float: mean duration of a read in seconds (wall time / total reads)
+    """
+    holder.publish(build_context(TIMESTAMP))
+    stop = Event()
+
+    def write():
+        timestamp = TIMESTAMP
+        while not stop.wait(WRITE_INTERVAL):
+            timestamp += 60
+            holder.publish(build_context(timestamp))
+
+    def consume(count):
+        for _ in range(count):
+            read(holder)
+
+    count = READS // readers
+    writer = Thread(target=write)
+    threads = [Thread(target=consume, args=(count,)) for _ in range(readers)]
+    writer.start()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duration = time.perf_counter() - start
+    stop.set()
+    writer.join()
+
+    return duration / (count * readers)
+
+def main():
+    # small switch interval maximizes threads interleaving (worst case for shared state)
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(0.0001)
+    results = {}
+    try:
+        for readers in READERS:
+            results['rederive_%d' % readers] = run(TimeContextHolder(), rederive_read, readers)
+            results['locked_%d' % readers] = run(LockedHolder(), context_read, readers)
+            results['context_%d' % readers] = run(TimeContextHolder(), context_read, readers)
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    for readers in READERS:
+        print('%3d readers: rederive %6.2f us  locked %6.2f us  context %6.2f us  (%.1fx vs rederive, %.1fx vs locked)' % (
+            readers,
+            results['rederive_%d' % readers] * 1000000.0,
+            results['locked_%d' % readers] * 1000000.0,
+            results['context_%d' % readers] * 1000000.0,
+            results['rederive_%d' % readers] / results['context_%d' % readers],
+            results['locked_%d' % readers] / results['context_%d' % readers],
+        ))
+
+    return results
+
+if __name__ == '__main__':
+    main()
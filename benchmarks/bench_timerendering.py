@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Time formatters rendering benchmark
+
+Simulate a day of clock events (1440 minutes) rendered by the 3 time formatters (text to speech,
+display message and display single message) and compare previous per-event formatting (comparison
+chain and % formatting in each formatter) against shared precomputed rendering tables.
+
+Usage:
+    python benchmarks/bench_timerendering.py
+"""
+
+import os
+import sys
+import timeit
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from backend.timerendering import TimeRenderer, get_renderer
+
+REPEAT = 5
+EVENTS = [
+    {'hour': index // 60, 'minute': index % 60, 'day': 8, 'month': 6, 'year': 2020}
+    for index in range(1440)
+]
+
+def legacy_speech(event_params):
+    text = None
+    if event_params['hour'] == 0 and event_params['minute'] == 0:
+        text = 'It\'s midnight'
+    if event_params['hour'] == 12 and event_params['minute'] == 0:
+        text = 'It\'s noon'
+    elif event_params['minute'] == 0:
+        text = 'It\'s %d o\'clock' % event_params['hour']
+    elif event_params['minute'] == 15:
+        text = 'It\'s quarter past %d' % event_params['hour']
+    elif event_params['minute'] == 45:
+        text = 'It\'s quarter to %d' % (event_params['hour']+1)
+    elif event_params['minute'] == 30:
+        text = 'It\'s half past %d' % event_params['hour']
+    elif event_params['minute'] < 30:
+        text = 'It\'s %d past %d' % (event_params['minute'], event_params['hour'])
+    elif event_params['minute'] > 30:
+        text = 'It\'s %d to %d' % (60-event_params['minute'], event_params['hour']+1)
+    return text
+
+def legacy_display(event_params):
+    return '%02d:%02d %02d/%02d/%d' % (
+        event_params['hour'],
+        event_params['minute'],
+        event_params['day'],
+        event_params['month'],
+        event_params['year']
+    )
+
+def legacy_day():
+    for event_params in EVENTS:
+        legacy_speech(event_params)
+        # display message and display single message formatters
+        legacy_display(event_params)
+        legacy_display(event_params)
+
+def rendering_day():
+    renderer = get_renderer()
+    for event_params in EVENTS:
+        renderer.speech(event_params['hour'], event_params['minute'])
+        renderer.display(event_params['hour'], event_params['minute'], event_params['day'], event_params['month'], event_params['year'])
+        renderer.display(event_params['hour'], event_params['minute'], event_params['day'], event_params['month'], event_params['year'])
+
+def main():
+    build = min(timeit.repeat(TimeRenderer, number=1, repeat=REPEAT))
+    # build shared renderer before measures
+    get_renderer()
+    results = {
+        'legacy': min(timeit.repeat(legacy_day, number=10, repeat=REPEAT)) / 10,
+        'rendering': min(timeit.repeat(rendering_day, number=10, repeat=REPEAT)) / 10,
+        'tables_build': build,
+    }
+
+    print('Tables build (once per locale/style): %8.1f us' % (results['tables_build'] * 1000000.0))
+    for name in ('legacy', 'rendering'):
+        print('%-10s day: %8.1f us  event: %6.2f us' % (name, results[name] * 1000000.0, results[name] * 1000000.0 / len(EVENTS)))
+    print('Speedup: %.1fx' % (results['legacy'] / results['rendering']))
+
+    return results
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Clock hot path benchmark
+
+Compare previous per-tick time formatting (dict building, if/elif weekday chain and deepcopy) against
+TimeSnapshot sharing for one clock tick followed by several device polls within the same minute.
+
+Usage:
+    python benchmarks/bench_timesnapshot.py
+"""
+
+import os
+import sys
+import copy
+import timeit
+import tracemalloc
+from datetime import datetime
+import pytz
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from backend.timesnapshot import TimeSnapshot
+
+TIMEZONE = pytz.timezone('Europe/London')
+SUNS = {'sunrise': 1591675200, 'sunset': 1591735300}
+POLLS_PER_MINUTE = 5
+NOW = 1591645808
+
+def legacy_format_time(now):
+    current_dt = TIMEZONE.localize(datetime.fromtimestamp(now))
+    weekday = current_dt.weekday()
+    if weekday == 0:
+        weekday_literal = 'monday'
+    elif weekday == 1:
+        weekday_literal = 'tuesday'
+    elif weekday == 2:
+        weekday_literal = 'wednesday'
+    elif weekday == 3:
+        weekday_literal = 'thursday'
+    elif weekday == 4:
+        weekday_literal = 'friday'
+    elif weekday == 5:
+        weekday_literal = 'saturday'
+    else:
+        weekday_literal = 'sunday'
+
+    return {
+        'timestamp': now,
+        'iso': current_dt.isoformat(),
+        'year': current_dt.year,
+        'month': current_dt.month,
+        'day': current_dt.day,
+        'hour': current_dt.hour,
+        'minute': current_dt.minute,
+        'weekday': weekday,
+        'weekday_literal': weekday_literal
+    }
+
+def legacy_minute():
+    # clock tick
+    now_formatted = legacy_format_time(NOW)
+    params = copy.deepcopy(now_formatted)
+    params.update({'sunrise': SUNS['sunrise'], 'sunset': SUNS['sunset']})
+    # device polls
+    for poll in range(POLLS_PER_MINUTE):
+        data = legacy_format_time(NOW + poll)
+        data.update({'sunrise': SUNS['sunrise'], 'sunset': SUNS['sunset']})
+        device = {}
+        device.update(data)
+
+def snapshot_minute():
+    # clock tick
+    snapshot = TimeSnapshot.from_timestamp(NOW, TIMEZONE, SUNS['sunrise'], SUNS['sunset'])
+    params = dict(snapshot.as_dict())
+    # device polls
+    for poll in range(POLLS_PER_MINUTE):
+        if not snapshot.is_same_minute(NOW + poll):
+            snapshot = TimeSnapshot.from_timestamp(NOW + poll, TIMEZONE, SUNS['sunrise'], SUNS['sunset'])
+        device = {}
+        device.update(snapshot.as_dict())
+
+def measure_allocations(func):
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+def main():
+    results = {}
+    for name, func in (('legacy', legacy_minute), ('snapshot', snapshot_minute)):
+        number = 2000
+        duration = min(timeit.repeat(func, number=number, repeat=5)) / number
+        results[name] = {
+            'duration_us': duration * 1000000.0,
+            'peak_alloc_bytes': measure_allocations(func),
+        }
+        print('%-10s %8.1f us/minute %8d bytes peak' % (name, results[name]['duration_us'], results[name]['peak_alloc_bytes']))
+
+    return results
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Cleep core stub
+
+Module config and devices are kept in memory, config writes are serialized to json like Cleep does and
+stored in fake filesystem. Nothing is written on disk.
+"""
+
+import copy
+import json
+import uuid
+import logging
+from .libs.internals.event import Event
+
+class FakeFilesystem():
+    """
+    In-memory filesystem
+    """
+
+    def __init__(self):
+        self.files = {}
+
+    def enable_write(self, root=True, boot=False):
+        pass
+
+    def disable_write(self, root=True, boot=False):
+        pass
+
+    def read_json(self, path, encoding=None):
+        content = self.files.get(path)
+        return json.loads(content) if content is not None else None
+
+    def write_json(self, path, data, encoding=None):
+        self.files[path] = json.dumps(data)
+        return True
+
+    def read_data(self, path, encoding=None):
+        return self.files.get(path)
+
+    def write_data(self, path, data, encoding=None):
+        self.files[path] = data
+        return True
+
+    def rm(self, path):
+        return self.files.pop(path, None) is not None
+
+    def open(self, path, mode, encoding=None):
+        return open(path, mode)
+
+    def close(self, fd):
+        fd.close()
+
+class CleepModule():
+    """
+    Cleep module stub
+    """
+
+    CONFIG_DIR = '/etc/cleep/modules'
+    MODULE_CONFIG_FILE = None
+    DEFAULT_CONFIG = {}
+
+    def __init__(self, bootstrap, debug_enabled):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.cleep_filesystem = bootstrap.get('cleep_filesystem') or FakeFilesystem()
+        self.events = {}
+        self.__config = copy.deepcopy(self.DEFAULT_CONFIG)
+        self.__devices = {}
+
+    def _get_config(self):
+        return copy.deepcopy(self.__config)
+
+    def _get_config_field(self, field):
+        return copy.deepcopy(self.__config.get(field))
+
+    def _set_config_field(self, field, value):
+        self.__config[field] = copy.deepcopy(value)
+        return self.cleep_filesystem.write_json('%s/%s' % (self.CONFIG_DIR, self.MODULE_CONFIG_FILE), self.__config)
+
+    def get_module_config(self):
+        return self._get_config()
+
+    def _get_device_count(self):
+        return len(self.__devices)
+
+    def _add_device(self, data):
+        device = copy.deepcopy(data)
+        device['uuid'] = str(uuid.uuid4())
+        self.__devices[device['uuid']] = device
+        return device
+
+    def get_module_devices(self):
+        return copy.deepcopy(self.__devices)
+
+    def _get_event(self, event_name):
+        return self.events.setdefault(event_name, Event())
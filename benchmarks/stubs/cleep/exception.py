@@ -0,0 +1,19 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Cleep exceptions stub
+"""
+
+class CommandError(Exception):
+    def __init__(self, message):
+        Exception.__init__(self, message)
+        self.message = message
+
+class CommandInfo(CommandError):
+    pass
+
+class InvalidParameter(CommandError):
+    pass
+
+class MissingParameter(CommandError):
+    pass
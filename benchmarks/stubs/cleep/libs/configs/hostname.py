@@ -0,0 +1,17 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Cleep hostname config stub
+"""
+
+class Hostname():
+    def __init__(self, cleep_filesystem):
+        self.cleep_filesystem = cleep_filesystem
+        self.hostname = 'cleep'
+
+    def set_hostname(self, hostname):
+        self.hostname = hostname
+        return True
+
+    def get_hostname(self):
+        return self.hostname
@@ -0,0 +1,15 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Cleep console stub, commands are never executed
+"""
+
+class Console():
+    def command(self, command, timeout=2.0):
+        return {
+            'returncode': 0,
+            'error': False,
+            'killed': False,
+            'stdout': [],
+            'stderr': [],
+        }
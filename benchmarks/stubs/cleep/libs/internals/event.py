@@ -0,0 +1,17 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Cleep event stub, sent events are only counted
+"""
+
+class Event():
+    EVENT_NAME = ''
+    EVENT_PROPAGATE = False
+    EVENT_PARAMS = []
+
+    def __init__(self, params=None):
+        self.sent = 0
+
+    def send(self, params=None, device_id=None, to=None, render=True):
+        self.sent += 1
+        return True
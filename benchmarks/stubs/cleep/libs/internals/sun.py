@@ -0,0 +1,27 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Cleep sun stub, based on module solar calculator
+"""
+
+from datetime import datetime, date
+from backend.solarcalc import sun_events
+
+class Sun():
+    def __init__(self):
+        self.latitude = 0.0
+        self.longitude = 0.0
+
+    def set_position(self, latitude, longitude):
+        self.latitude = latitude
+        self.longitude = longitude
+
+    def __event(self, name):
+        timestamp = sun_events(date.today(), self.latitude, self.longitude)[name]
+        return datetime.fromtimestamp(timestamp).astimezone()
+
+    def sunrise(self):
+        return self.__event('sunrise')
+
+    def sunset(self):
+        return self.__event('sunset')
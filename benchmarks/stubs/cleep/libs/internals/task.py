@@ -0,0 +1,16 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Cleep task stub, task is never run
+"""
+
+class Task():
+    def __init__(self, interval, task, logger=None, task_args=None, task_kwargs=None):
+        self.interval = interval
+        self.task = task
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
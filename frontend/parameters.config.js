@@ -4,8 +4,8 @@
  */
 angular
 .module('Cleep')
-.directive('parametersConfigComponent', ['toastService', 'parametersService', 'cleepService', '$timeout',
-function(toast, parametersService, cleepService, $timeout) {
+.directive('parametersConfigComponent', ['toastService', 'parametersService', 'cleepService', '$timeout', '$rootScope',
+function(toast, parametersService, cleepService, $timeout, $rootScope) {
 
     var parametersController = ['$scope', function($scope) {
         var self = this;
@@ -27,6 +27,9 @@ function(toast, parametersService, cleepService, $timeout) {
             alpha2: null
         };
         self.timezone = null;
+        self.positionJobId = null;
+        // last terminal progress event per job id, event may be received before job id is known
+        self.positionJobEvents = {};
 
         /**
          * Set hostname
@@ -59,14 +62,67 @@ function(toast, parametersService, cleepService, $timeout) {
             toast.loading('Setting localisation...');
             parametersService.setPosition($scope.cleepposition.lat, $scope.cleepposition.lng)
                 .then(function(resp) {
-                    return cleepService.reloadModuleConfig('parameters');
-                })
-                .then(function(config) {
-                    self.updateConfig(config);
-                    toast.success('Localisation saved');
+                    // localisation is updated in background, wait for progress event
+                    self.positionJobId = resp.data;
+
+                    // job may be already terminated (cached results)
+                    var params = self.positionJobEvents[resp.data];
+                    self.positionJobEvents = {};
+                    if( params ) {
+                        self.handlePositionProgress(params);
+                    }
                 });
         };
 
+        /**
+         * Handle position update progress of current job
+         */
+        self.handlePositionProgress = function(params) {
+            if( params.status==='done' ) {
+                self.positionJobId = null;
+                cleepService.reloadModuleConfig('parameters')
+                    .then(function(config) {
+                        self.updateConfig(config);
+                        toast.success('Localisation saved');
+                    });
+            } else if( params.status==='failed' ) {
+                self.positionJobId = null;
+                toast.error('Localisation partially saved (' + params.step + ' failed)');
+                cleepService.reloadModuleConfig('parameters')
+                    .then(function(config) {
+                        self.updateConfig(config);
+                    });
+            } else if( params.status==='superseded' ) {
+                // another position was set meanwhile (from another client)
+                self.positionJobId = null;
+                toast.info('Localisation changed meanwhile');
+                cleepService.reloadModuleConfig('parameters')
+                    .then(function(config) {
+                        self.updateConfig(config);
+                    });
+            }
+        };
+
+        /**
+         * Catch position update progress
+         */
+        var unregisterPositionProgress = $rootScope.$on('parameters.position.progress', function(event, uuid, params) {
+            if( params.status==='running' ) {
+                return;
+            }
+
+            if( params.job_id!==self.positionJobId ) {
+                // job id may not be received yet
+                self.positionJobEvents[params.job_id] = params;
+                return;
+            }
+
+            self.handlePositionProgress(params);
+        });
+        $scope.$on('$destroy', function() {
+            unregisterPositionProgress();
+        });
+
         /**
          * Update controller config
          */
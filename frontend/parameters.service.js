@@ -15,6 +15,13 @@ function($rootScope, rpcService, cleepService) {
         return rpcService.sendCommand('get_sun', 'parameters');
     };
 
+    /**
+     * Get available timezones
+     */
+    self.getTimezones = function() {
+        return rpcService.sendCommand('get_timezones', 'parameters');
+    };
+
     /**
      * Set hostname
      */
@@ -26,22 +33,26 @@ function($rootScope, rpcService, cleepService) {
      * Set position
      */
     self.setPosition = function(lat, long) {
-        return rpcService.sendCommand('set_position', 'parameters', {'latitude':lat, 'longitude':long}, 20);
+        return rpcService.sendCommand('set_position', 'parameters', {'latitude':lat, 'longitude':long});
     };
 
     /**
      * Catch time event
+     * In delta mode event only contains changed fields, so only fields present in event are updated
      */
     $rootScope.$on('parameters.time.now', function(event, uuid, params) {
+        var fields = ['hour', 'minute', 'timestamp', 'sunset', 'sunrise'];
         for( var i=0; i<cleepService.devices.length; i++ )
         {
             if( cleepService.devices[i].uuid==uuid )
             {
-                cleepService.devices[i].hour = params.hour;
-                cleepService.devices[i].minute = params.minute;
-                cleepService.devices[i].timestamp = params.timestamp;
-                cleepService.devices[i].sunset = params.sunset;
-                cleepService.devices[i].sunrise = params.sunrise;
+                for( var j=0; j<fields.length; j++ )
+                {
+                    if( params[fields[j]]!==undefined )
+                    {
+                        cleepService.devices[i][fields[j]] = params[fields[j]];
+                    }
+                }
                 break;
             }
         }
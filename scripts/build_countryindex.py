@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Build country index file shipped with module (backend/countryindex.dat)
+
+Each grid cell gets the country of the reverse_geocode city closest to cell center (same KD-tree search
+reverse_geocode performs at runtime), then grid rows are run-length encoded. See backend/countryindex.py
+for file format.
+
+Requires reverse_geocode, numpy and scipy (development only, not needed at runtime).
+
+Usage:
+    python scripts/build_countryindex.py [--cells-per-degree 20] [--output backend/countryindex.dat]
+"""
+
+import os
+import sys
+import struct
+import argparse
+import numpy
+import reverse_geocode
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from backend.countryindex import CountryIndex
+
+def build_rows(cells_per_degree):
+    """
+    Compute grid rows
+
+    Args:
+        cells_per_degree (int): grid resolution
+
+    Returns:
+        tuple: list of countries (alpha2, name), list of rows (list of (end column, country index))
+    """
+    geocode = reverse_geocode.GeocodeData()
+    alpha2s = sorted(set(location['country_code'] for location in geocode._locations))
+    indexes = {alpha2: index for index, alpha2 in enumerate(alpha2s)}
+    location_countries = numpy.array([indexes[location['country_code']] for location in geocode._locations], dtype=numpy.uint16)
+    countries = [(alpha2, geocode._countries.get(alpha2, '')) for alpha2 in alpha2s]
+
+    cols = 360 * cells_per_degree
+    longitudes = (numpy.arange(cols) + 0.5) / cells_per_degree - 180.0
+    rows = []
+    for row in range(180 * cells_per_degree):
+        latitude = (row + 0.5) / cells_per_degree - 90.0
+        centers = numpy.column_stack([numpy.full(cols, latitude), longitudes])
+        _, nearest = geocode._tree.query(centers, k=1)
+        cells = location_countries[nearest]
+        ends = numpy.flatnonzero(cells[1:] != cells[:-1]) + 1
+        rows.append([(int(end), int(cells[end - 1])) for end in ends] + [(cols, int(cells[-1]))])
+
+    return countries, rows
+
+def write_index(path, cells_per_degree, countries, rows):
+    """
+    Write index file
+
+    Args:
+        path (string): output file path
+        cells_per_degree (int): grid resolution
+        countries (list): list of (alpha2, name)
+        rows (list): list of rows runs
+    """
+    with open(path, 'wb') as fd:
+        fd.write(CountryIndex.HEADER.pack(CountryIndex.MAGIC, CountryIndex.VERSION, cells_per_degree, len(rows), 360 * cells_per_degree, len(countries)))
+        for alpha2, name in countries:
+            name = name.encode('utf-8')
+            fd.write(alpha2.encode('ascii') + struct.pack('<B', len(name)) + name)
+        offset = 0
+        for runs in rows:
+            fd.write(CountryIndex.OFFSET.pack(offset))
+            offset += len(runs)
+        fd.write(CountryIndex.OFFSET.pack(offset))
+        for runs in rows:
+            for end, country in runs:
+                fd.write(CountryIndex.RUN.pack(end, country))
+
+def main():
+    parser = argparse.ArgumentParser(description='Build country index')
+    parser.add_argument('--cells-per-degree', type=int, default=20)
+    parser.add_argument('--output', default=CountryIndex.DEFAULT_PATH)
+    args = parser.parse_args()
+
+    countries, rows = build_rows(args.cells_per_degree)
+    write_index(args.output, args.cells_per_degree, countries, rows)
+    print('%d countries, %d runs, %d bytes written to %s' % (
+        len(countries), sum(len(runs) for runs in rows), os.path.getsize(args.output), args.output
+    ))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import logging
+import sys
+sys.path.append('../')
+from backend.clockstate import ClockState
+import pytz
+
+class TestsClockState(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.FATAL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+
+    def test_default_state(self):
+        state = ClockState()
+
+        self.assertIsNone(state.timezone)
+        self.assertIsNone(state.sun_ephemeris)
+        self.assertEqual(state.suns, {'sunset': 0, 'sunset_iso': '', 'sunrise': 0, 'sunrise_iso': ''})
+
+    def test_immutable(self):
+        state = ClockState()
+
+        with self.assertRaises(AttributeError):
+            state.timezone_name = 'Europe/Paris'
+        with self.assertRaises(AttributeError):
+            del state.suns
+        with self.assertRaises(AttributeError):
+            state.dummy = 1
+
+    def test_replace(self):
+        tz = pytz.timezone('Europe/Paris')
+        suns = {'sunset': 2, 'sunset_iso': 'b', 'sunrise': 1, 'sunrise_iso': 'a'}
+        state = ClockState(timezone_name='Europe/Paris', timezone=tz)
+
+        new_state = state.replace(suns=suns, sun_day=(2020, 6, 8))
+
+        self.assertIsNot(new_state, state)
+        self.assertIs(new_state.timezone, tz)
+        self.assertEqual(new_state.timezone_name, 'Europe/Paris')
+        self.assertIs(new_state.suns, suns)
+        self.assertEqual(new_state.sun_day, (2020, 6, 8))
+        # previous state untouched
+        self.assertEqual(state.suns['sunrise'], 0)
+        self.assertIsNone(state.sun_day)
+
+    def test_replace_unknown_field(self):
+        with self.assertRaises(TypeError):
+            ClockState().replace(dummy=1)
+
+
+# do not remove code below, otherwise test won't run
+if __name__ == '__main__':
+    # coverage run --omit="*/lib/python*/*","test_*" --concurrency=thread test_clockstate.py; coverage report -m -i
+    unittest.main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import logging
+import sys
+sys.path.append('../')
+from backend.countryindex import CountryIndex
+from importlib.util import find_spec
+import os
+import random
+import struct
+import tempfile
+
+class TestsCountryIndex(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.FATAL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        self.index = CountryIndex()
+        self.temp_files = []
+
+    def tearDown(self):
+        self.index.close()
+        for path in self.temp_files:
+            os.remove(path)
+
+    def write_index(self, content):
+        fd, path = tempfile.mkstemp()
+        os.write(fd, content)
+        os.close(fd)
+        self.temp_files.append(path)
+        return path
+
+    def build_index(self, rows):
+        # 1 cell per degree, countries FR and GB
+        content = CountryIndex.HEADER.pack(CountryIndex.MAGIC, CountryIndex.VERSION, 1, len(rows), 360, 2)
+        content += b'FR' + struct.pack('<B', 6) + b'France'
+        content += b'GB' + struct.pack('<B', 14) + b'United Kingdom'
+        offset = 0
+        for runs in rows:
+            content += CountryIndex.OFFSET.pack(offset)
+            offset += len(runs)
+        content += CountryIndex.OFFSET.pack(offset)
+        for runs in rows:
+            for end, country in runs:
+                content += CountryIndex.RUN.pack(end, country)
+        return content
+
+    def test_shipped_index(self):
+        self.assertTrue(self.index.is_available())
+        self.assertEqual(self.index.lookup(48.8591554, 2.2907284), ('FR', 'France'))
+        self.assertEqual(self.index.lookup(52.204, 0.1208), ('GB', 'United Kingdom'))
+        self.assertEqual(self.index.lookup(40.7128, -74.006), ('US', 'United States'))
+        self.assertEqual(self.index.lookup(-33.8688, 151.2093), ('AU', 'Australia'))
+
+    def test_lookup_grid_bounds(self):
+        for latitude, longitude in ((90.0, 180.0), (-90.0, -180.0), (90.0, -180.0), (-90.0, 180.0)):
+            self.assertIsNotNone(self.index.lookup(latitude, longitude))
+
+    def test_lookup_out_of_bounds(self):
+        with self.assertRaises(ValueError):
+            self.index.lookup(90.1, 0.0)
+        with self.assertRaises(ValueError):
+            self.index.lookup(0.0, -180.1)
+
+    def test_lookup_runs(self):
+        rows = [[(180, 0), (181, CountryIndex.NO_COUNTRY), (360, 1)]] * 180
+        index = CountryIndex(self.write_index(self.build_index(rows)))
+
+        self.assertEqual(index.lookup(10.0, -180.0), ('FR', 'France'))
+        self.assertEqual(index.lookup(10.0, -0.5), ('FR', 'France'))
+        self.assertIsNone(index.lookup(10.0, 0.5))
+        self.assertEqual(index.lookup(10.0, 1.0), ('GB', 'United Kingdom'))
+        self.assertEqual(index.lookup(10.0, 180.0), ('GB', 'United Kingdom'))
+        index.close()
+
+    def test_missing_file(self):
+        index = CountryIndex('/tmp/dummy/countryindex.dat')
+
+        self.assertFalse(index.is_available())
+        with self.assertRaises(IOError):
+            index.lookup(48.0, 2.0)
+
+    def test_invalid_magic(self):
+        content = self.build_index([[(360, 0)]] * 180)
+        index = CountryIndex(self.write_index(b'XXXX' + content[4:]))
+
+        with self.assertRaises(ValueError):
+            index.lookup(48.0, 2.0)
+
+    def test_truncated_file(self):
+        content = self.build_index([[(360, 0)]] * 180)
+        index = CountryIndex(self.write_index(content[:-2]))
+
+        with self.assertRaises(ValueError):
+            index.lookup(48.0, 2.0)
+
+    def test_close_and_reopen(self):
+        self.assertIsNotNone(self.index.lookup(48.0, 2.0))
+        self.index.close()
+
+        self.assertEqual(self.index.lookup(48.8591554, 2.2907284), ('FR', 'France'))
+
+    @unittest.skipUnless(find_spec('reverse_geocode'), 'reverse_geocode is not installed')
+    def test_accuracy_against_reverse_geocode(self):
+        import reverse_geocode
+        generator = random.Random(42)
+        coordinates = [(generator.uniform(-60.0, 75.0), generator.uniform(-180.0, 180.0)) for _ in range(2000)]
+
+        expected = reverse_geocode.search(coordinates)
+        matches = sum(
+            1 for coordinate, geo in zip(coordinates, expected)
+            if self.index.lookup(*coordinate) == (geo['country_code'], geo['country'])
+        )
+
+        self.assertGreaterEqual(matches / len(coordinates), 0.99)
+
+
+# do not remove code below, otherwise test won't run
+if __name__ == '__main__':
+    # coverage run --omit="*/lib/python*/*","test_*" --concurrency=thread test_countryindex.py; coverage report -m -i
+    unittest.main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import logging
+import sys
+sys.path.append('../')
+from backend.geobackend import GeoBackend
+from mock import patch, Mock
+from threading import Thread
+
+class TestsGeoBackend(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.FATAL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        self.backend = GeoBackend(idle_timeout=None)
+
+    def tearDown(self):
+        self.backend.release()
+
+    def test_not_loaded_at_startup(self):
+        self.assertFalse(self.backend.is_loaded())
+
+    @patch('timezonefinder.TimezoneFinder')
+    def test_timezone_at_loads_library_once(self, mock_tzfinder):
+        mock_tzfinder.return_value.timezone_at.return_value = 'Europe/Paris'
+
+        self.assertEqual(self.backend.timezone_at(48.8591554, 2.2907284), 'Europe/Paris')
+        self.assertEqual(self.backend.timezone_at(48.8591554, 2.2907284), 'Europe/Paris')
+
+        self.assertTrue(self.backend.is_loaded())
+        self.assertEqual(mock_tzfinder.call_count, 1)
+        mock_tzfinder.return_value.timezone_at.assert_called_with(lat=48.8591554, lng=2.2907284)
+
+    @patch('timezonefinder.TimezoneFinder')
+    def test_closest_timezone_at(self, mock_tzfinder):
+        mock_tzfinder.return_value.closest_timezone_at.return_value = 'Europe/London'
+
+        self.assertEqual(self.backend.closest_timezone_at(52.204, 0.1208, delta_degree=2), 'Europe/London')
+        mock_tzfinder.return_value.closest_timezone_at.assert_called_with(lat=52.204, lng=0.1208, delta_degree=2)
+
+    @patch('timezonefinder.TimezoneFinder')
+    def test_timezones_at(self, mock_tzfinder):
+        mock_tzfinder.return_value.timezone_at.side_effect = ['Europe/Paris', None, ValueError('Test exception')]
+        timezone_search = Mock()
+        timezone_search.search.return_value = ('Atlantic/Azores', True)
+
+        timezones = self.backend.timezones_at([(48.8566, 2.3522), (45.0, -30.0), (100.0, 0.0)], timezone_search)
+
+        self.assertEqual(timezones, ['Europe/Paris', 'Atlantic/Azores', None])
+        self.assertEqual(mock_tzfinder.call_count, 1)
+        timezone_search.search.assert_called_once_with(45.0, -30.0, budget=None)
+
+    @patch('timezonefinder.TimezoneFinder')
+    def test_timezones_at_without_closest(self, mock_tzfinder):
+        mock_tzfinder.return_value.timezone_at.return_value = None
+
+        self.assertEqual(self.backend.timezones_at([(45.0, -30.0)]), [None])
+        self.assertFalse(mock_tzfinder.return_value.closest_timezone_at.called)
+
+    @patch('timezonefinder.TimezoneFinder')
+    def test_timezones_at_batch_budget(self, mock_tzfinder):
+        mock_tzfinder.return_value.timezone_at.return_value = None
+        now = [0.0]
+        timezone_search = Mock()
+        def search(latitude, longitude, budget):
+            now[0] += 2.0
+            return 'Etc/GMT+2', False
+        timezone_search.search.side_effect = search
+
+        self.backend.timezones_at([(45.0, -30.0)] * 3, timezone_search, budget=3.0, clock=lambda: now[0])
+
+        self.assertEqual([call[1]['budget'] for call in timezone_search.search.call_args_list], [3.0, 1.0, 0.0])
+
+    @patch('timezonefinder.TimezoneFinder')
+    def test_timezones_at_lock_per_lookup(self, mock_tzfinder):
+        mock_tzfinder.return_value.timezone_at.return_value = None
+        acquired = []
+        def try_acquire():
+            lock = self.backend._GeoBackend__lock
+            acquired.append(lock.acquire(blocking=False))
+            if acquired[-1]:
+                lock.release()
+        def search(latitude, longitude, budget):
+            # another thread can use library between lookups
+            thread = Thread(target=try_acquire)
+            thread.start()
+            thread.join()
+            return 'Etc/GMT+2', False
+        timezone_search = Mock()
+        timezone_search.search.side_effect = search
+
+        self.backend.timezones_at([(45.0, -30.0)] * 2, timezone_search)
+
+        self.assertEqual(acquired, [True, True])
+
+    @patch('reverse_geocode.search')
+    def test_search_countries(self, mock_search):
+        mock_search.return_value = [{'country': 'France', 'country_code': 'FR'}]
+
+        result = self.backend.search_countries([(48.8591554, 2.2907284)])
+
+        self.assertEqual(result, [{'country': 'France', 'country_code': 'FR'}])
+        mock_search.assert_called_with(((48.8591554, 2.2907284),))
+
+    @patch('timezonefinder.TimezoneFinder')
+    def test_release(self, mock_tzfinder):
+        self.backend.timezone_at(48.8591554, 2.2907284)
+        self.assertTrue(self.backend.is_loaded())
+
+        self.backend.release()
+
+        self.assertFalse(self.backend.is_loaded())
+        self.backend.timezone_at(48.8591554, 2.2907284)
+        self.assertEqual(mock_tzfinder.call_count, 2)
+
+    @patch('backend.geobackend.Timer')
+    @patch('timezonefinder.TimezoneFinder')
+    def test_idle_timer_restarted_on_use(self, mock_tzfinder, mock_timer):
+        backend = GeoBackend(idle_timeout=10.0)
+
+        backend.timezone_at(48.8591554, 2.2907284)
+        backend.timezone_at(48.8591554, 2.2907284)
+
+        mock_timer.assert_called_with(10.0, backend.release)
+        self.assertEqual(mock_timer.return_value.start.call_count, 2)
+        self.assertTrue(mock_timer.return_value.cancel.called)
+
+    @patch('backend.geobackend.Timer')
+    @patch('timezonefinder.TimezoneFinder')
+    def test_idle_timer_restarted_once_per_batch(self, mock_tzfinder, mock_timer):
+        mock_tzfinder.return_value.timezone_at.return_value = 'Europe/Paris'
+        backend = GeoBackend(idle_timeout=10.0)
+
+        timezones = backend.timezones_at([(48.8591554, 2.2907284)] * 100)
+
+        self.assertEqual(timezones, ['Europe/Paris'] * 100)
+        self.assertEqual(mock_timer.return_value.start.call_count, 1)
+
+    @patch('backend.geobackend.Timer')
+    @patch('timezonefinder.TimezoneFinder')
+    def test_no_idle_timer(self, mock_tzfinder, mock_timer):
+        self.backend.timezone_at(48.8591554, 2.2907284)
+
+        self.assertFalse(mock_timer.called)
+
+
+# do not remove code below, otherwise test won't run
+if __name__ == '__main__':
+    # coverage run --omit="*/lib/python*/*","test_*" --concurrency=thread test_geobackend.py; coverage report -m -i
+    unittest.main()
+
@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import logging
+import sys
+import os
+import json
+import shutil
+import tempfile
+sys.path.append('../')
+from backend.geocache import GeoCache, get_libraries_version, get_files_checksum
+from mock import patch, Mock
+
+class TestsGeoCache(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.FATAL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'parameters.geocache.json')
+        self.fs = Mock()
+        self.fs.read_json.side_effect = self._read_json
+        self.fs.write_json.side_effect = self._write_json
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _read_json(self, path):
+        with open(path) as fd:
+            return json.load(fd)
+
+    def _write_json(self, path, data):
+        with open(path, 'w') as fd:
+            json.dump(data, fd)
+        return True
+
+    def test_get_unknown_position(self):
+        cache = GeoCache(self.path, self.fs)
+
+        self.assertIsNone(cache.get(48.8591554, 2.2907284, 'timezone'))
+        self.assertFalse(self.fs.read_json.called)
+
+    def test_update_and_get_nearby_position(self):
+        cache = GeoCache(self.path, self.fs)
+
+        cache.update(48.8591554, 2.2907284, timezone='Europe/Paris')
+
+        self.assertEqual(cache.get(48.8591554, 2.2907284, 'timezone'), 'Europe/Paris')
+        self.assertEqual(cache.get(48.8612, 2.2881, 'timezone'), 'Europe/Paris')
+        self.assertIsNone(cache.get(48.8591554, 2.2907284, 'country'))
+        self.assertIsNone(cache.get(48.95, 2.2907284, 'timezone'))
+
+    def test_persistence(self):
+        cache = GeoCache(self.path, self.fs)
+        cache.update(48.8591554, 2.2907284, timezone='Europe/Paris')
+        cache.update(48.8591554, 2.2907284, country='France', alpha2='FR')
+
+        cache = GeoCache(self.path, self.fs)
+
+        self.assertEqual(cache.get(48.8591554, 2.2907284, 'timezone'), 'Europe/Paris')
+        self.assertEqual(cache.get(48.8591554, 2.2907284, 'alpha2'), 'FR')
+        self.assertEqual(len(cache), 1)
+
+    def test_update_same_values_does_not_write(self):
+        cache = GeoCache(self.path, self.fs)
+        cache.update(48.8591554, 2.2907284, timezone='Europe/Paris')
+
+        cache.update(48.8591554, 2.2907284, timezone='Europe/Paris')
+
+        self.assertEqual(self.fs.write_json.call_count, 1)
+
+    def test_lru_eviction(self):
+        cache = GeoCache(self.path, self.fs, max_entries=2)
+        cache.update(10.0, 10.0, timezone='tz1')
+        cache.update(20.0, 20.0, timezone='tz2')
+        # access first position to make it the most recently used
+        cache.get(10.0, 10.0, 'timezone')
+
+        cache.update(30.0, 30.0, timezone='tz3')
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get(10.0, 10.0, 'timezone'), 'tz1')
+        self.assertIsNone(cache.get(20.0, 20.0, 'timezone'))
+        self.assertEqual(cache.get(30.0, 30.0, 'timezone'), 'tz3')
+
+    def test_version_changed_drops_cache(self):
+        cache = GeoCache(self.path, self.fs)
+        cache.update(48.8591554, 2.2907284, timezone='Europe/Paris')
+
+        with patch('backend.geocache.get_libraries_version', Mock(return_value='timezonefinder=0.0.0')):
+            cache = GeoCache(self.path, self.fs)
+            self.assertIsNone(cache.get(48.8591554, 2.2907284, 'timezone'))
+
+    def test_data_file_changed_drops_cache(self):
+        data_file = os.path.join(self.tmp_dir, 'countryindex.dat')
+        with open(data_file, 'wb') as fd:
+            fd.write(b'index v1')
+        cache = GeoCache(self.path, self.fs, data_files=[data_file])
+        cache.update(48.8591554, 2.2907284, alpha2='FR')
+        self.assertEqual(GeoCache(self.path, self.fs, data_files=[data_file]).get(48.8591554, 2.2907284, 'alpha2'), 'FR')
+
+        with open(data_file, 'wb') as fd:
+            fd.write(b'index v2')
+        cache = GeoCache(self.path, self.fs, data_files=[data_file])
+
+        self.assertIsNone(cache.get(48.8591554, 2.2907284, 'alpha2'))
+
+    def test_get_files_checksum(self):
+        data_file = os.path.join(self.tmp_dir, 'countryindex.dat')
+        with open(data_file, 'wb') as fd:
+            fd.write(b'index')
+
+        self.assertEqual(get_files_checksum([data_file]), 'countryindex.dat=80736701')
+        self.assertEqual(get_files_checksum([os.path.join(self.tmp_dir, 'dummy')]), 'dummy=?')
+
+    def test_invalid_file_content(self):
+        with open(self.path, 'w') as fd:
+            fd.write('[]')
+        cache = GeoCache(self.path, self.fs)
+
+        self.assertEqual(len(cache), 0)
+
+    def test_clear(self):
+        cache = GeoCache(self.path, self.fs)
+        cache.update(48.8591554, 2.2907284, timezone='Europe/Paris')
+
+        cache.clear()
+
+        self.assertEqual(len(GeoCache(self.path, self.fs)), 0)
+
+    def test_get_libraries_version(self):
+        version = get_libraries_version(['dummy-library-not-installed'])
+
+        self.assertEqual(version, 'dummy-library-not-installed=?')
+
+
+# do not remove code below, otherwise test won't run
+if __name__ == '__main__':
+    # coverage run --omit="*/lib/python*/*","test_*" --concurrency=thread test_geocache.py; coverage report -m -i
+    unittest.main()
+
@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import logging
+import sys
+sys.path.append('../')
+from backend.localeengine import LocaleEngine, CompiledTemplate, locale_engine
+from backend.timerendering import TimeRenderer, STYLE_12H, STYLE_24H
+from mock import patch
+import importlib
+
+class TestsCompiledTemplate(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.FATAL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+
+    def test_render(self):
+        template = CompiledTemplate('It\'s {minute} past {hour}')
+
+        self.assertEqual(template.fields, ('minute', 'hour'))
+        self.assertEqual(template.render({'hour': 10, 'minute': 5}), 'It\'s 5 past 10')
+
+    def test_render_no_placeholder(self):
+        template = CompiledTemplate('It\'s 100% sunrise!')
+
+        self.assertEqual(template.render(), 'It\'s 100% sunrise!')
+
+    def test_render_escape_percent(self):
+        self.assertEqual(CompiledTemplate('{hour} 100%').render({'hour': 1}), '1 100%')
+
+    def test_render_missing_value(self):
+        with self.assertRaises(KeyError):
+            CompiledTemplate('{hour}').render({})
+
+class TestsLocaleEngine(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.FATAL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        self.engine = LocaleEngine()
+
+    def test_default_settings(self):
+        self.assertEqual(self.engine.get_settings(), ('en', 'dmy', STYLE_24H))
+        self.assertEqual(self.engine.render('sunrise'), 'It\'s sunrise!')
+
+    def test_settings_for_country(self):
+        self.assertEqual(self.engine.get_settings_for_country('GB'), ('en', 'dmy', STYLE_24H))
+        self.assertEqual(self.engine.get_settings_for_country('FR'), ('fr', 'dmy', STYLE_24H))
+        self.assertEqual(self.engine.get_settings_for_country('us'), ('en', 'mdy', STYLE_12H))
+        self.assertEqual(self.engine.get_settings_for_country('JP'), ('en', 'ymd', STYLE_24H))
+        self.assertEqual(self.engine.get_settings_for_country('DE'), ('de', 'dmy', STYLE_24H))
+        self.assertEqual(self.engine.get_settings_for_country(None), ('en', 'dmy', STYLE_24H))
+
+    def test_set_country(self):
+        self.engine.set_country('FR')
+
+        self.assertEqual(self.engine.render('sunrise'), 'C\'est le lever du soleil !')
+        self.assertEqual(self.engine.render('sunset', language='en'), 'It\'s sunset!')
+
+    def test_templates_loaded_lazily_and_cached(self):
+        with patch('backend.localeengine.importlib.import_module', wraps=importlib.import_module) as mock_import:
+            templates = self.engine.get_templates('de')
+            self.assertIs(self.engine.get_templates('de'), templates)
+
+        self.assertEqual(sorted(call[0][0] for call in mock_import.call_args_list), ['backend.locales.de', 'backend.locales.en'])
+
+    def test_unknown_language_fallback(self):
+        self.assertEqual(self.engine.render('sunrise', language='xx'), 'It\'s sunrise!')
+
+    def test_invalid_language(self):
+        with self.assertRaises(ValueError):
+            self.engine.get_templates('../en')
+
+    def test_all_languages_complete(self):
+        english = set(self.engine.get_templates('en').keys())
+        for language in ('fr', 'de', 'es'):
+            module = importlib.import_module('backend.locales.%s' % language)
+            self.assertEqual(set(module.TEMPLATES.keys()), english, language)
+
+    def test_default_renderer_uses_english_templates(self):
+        with patch('backend.localeengine.locale_engine') as mock_engine:
+            mock_engine.get_speech.return_value = 'spoken'
+            renderer = TimeRenderer()
+
+        self.assertEqual(renderer.speech(14, 10), 'spoken')
+        mock_engine.get_speech.assert_any_call(14, 10, STYLE_24H, 'en')
+        self.assertEqual(TimeRenderer().speech(23, 45), self.engine.get_speech(23, 45, STYLE_24H, 'en'))
+
+    def test_speech_languages(self):
+        self.assertEqual(self.engine.get_speech(14, 45, STYLE_24H, 'fr'), 'Il est 15 heures moins le quart')
+        self.assertEqual(self.engine.get_speech(14, 30, STYLE_24H, 'de'), 'Es ist halb 3')
+        self.assertEqual(self.engine.get_speech(14, 10, STYLE_24H, 'es'), 'Son las 14 y 10')
+        self.assertEqual(self.engine.get_speech(0, 0, STYLE_24H, 'fr'), 'Il est minuit')
+
+    def test_speech_hour_names_fr(self):
+        self.assertEqual(self.engine.get_speech(1, 0, STYLE_24H, 'fr'), 'Il est une heure')
+        self.assertEqual(self.engine.get_speech(0, 45, STYLE_24H, 'fr'), 'Il est une heure moins le quart')
+        self.assertEqual(self.engine.get_speech(0, 10, STYLE_24H, 'fr'), 'Il est minuit 10')
+        self.assertEqual(self.engine.get_speech(23, 45, STYLE_24H, 'fr'), 'Il est minuit moins le quart')
+        self.assertEqual(self.engine.get_speech(11, 50, STYLE_24H, 'fr'), 'Il est midi moins 10')
+        self.assertEqual(self.engine.get_speech(13, 15, STYLE_24H, 'fr'), 'Il est 13 heures et quart')
+        self.assertEqual(self.engine.get_speech(13, 15, STYLE_12H, 'fr'), 'Il est une heure et quart')
+        self.assertEqual(self.engine.get_speech(23, 45, STYLE_12H, 'fr'), 'Il est 12 heures moins le quart')
+
+    def test_speech_hour_names_es(self):
+        self.assertEqual(self.engine.get_speech(1, 0, STYLE_24H, 'es'), 'Es la una en punto')
+        self.assertEqual(self.engine.get_speech(0, 10, STYLE_24H, 'es'), 'Son las 12 y 10')
+        self.assertEqual(self.engine.get_speech(23, 45, STYLE_24H, 'es'), 'Son las 12 menos cuarto')
+        self.assertEqual(self.engine.get_speech(0, 45, STYLE_24H, 'es'), 'Es la una menos cuarto')
+        self.assertEqual(self.engine.get_speech(13, 30, STYLE_12H, 'es'), 'Es la una y media')
+        self.assertEqual(self.engine.get_speech(0, 0, STYLE_24H, 'es'), 'Es medianoche')
+
+    def test_speech_hour_names_de(self):
+        self.assertEqual(self.engine.get_speech(12, 30, STYLE_24H, 'de'), 'Es ist halb 1')
+        self.assertEqual(self.engine.get_speech(23, 50, STYLE_24H, 'de'), 'Es ist 10 vor Mitternacht')
+        self.assertEqual(self.engine.get_speech(0, 15, STYLE_24H, 'de'), 'Es ist Viertel nach Mitternacht')
+        self.assertEqual(self.engine.get_speech(23, 45, STYLE_24H, 'de'), 'Es ist Viertel vor Mitternacht')
+        self.assertEqual(self.engine.get_speech(0, 30, STYLE_24H, 'de'), 'Es ist halb 1')
+        self.assertEqual(self.engine.get_speech(14, 10, STYLE_24H, 'de'), 'Es ist 10 nach 2')
+        self.assertEqual(self.engine.get_speech(14, 0, STYLE_24H, 'de'), 'Es ist 14 Uhr')
+        self.assertEqual(self.engine.get_speech(1, 0, STYLE_24H, 'de'), 'Es ist 1 Uhr')
+
+    def test_speech_hour_names_de_12h(self):
+        self.assertEqual(self.engine.get_speech(23, 50, STYLE_12H, 'de'), 'Es ist 10 vor 12')
+        self.assertEqual(self.engine.get_speech(0, 15, STYLE_12H, 'de'), 'Es ist Viertel nach 12')
+        self.assertEqual(self.engine.get_speech(14, 0, STYLE_12H, 'de'), 'Es ist 2 Uhr')
+
+    def test_speech_hour_names_cached(self):
+        self.assertIs(self.engine.get_hour_names('fr', STYLE_24H), self.engine.get_hour_names('fr', STYLE_24H))
+        self.assertEqual(len(self.engine.get_hour_names('fr', STYLE_12H)), 24)
+
+    def test_renderer_follows_country(self):
+        self.engine.set_country('GB')
+        self.assertEqual(self.engine.get_renderer().display(20, 50, 8, 6, 2020), '20:50 08/06/2020')
+
+        self.engine.set_country('US')
+        renderer = self.engine.get_renderer()
+        self.assertEqual(renderer.display(20, 50, 8, 6, 2020), '8:50 PM 06/08/2020')
+        self.assertEqual(renderer.speech(20, 50), 'It\'s 10 to 9')
+
+        self.engine.set_country('DE')
+        renderer = self.engine.get_renderer()
+        self.assertEqual(renderer.display(20, 50, 8, 6, 2020), '20:50 08.06.2020')
+        self.assertEqual(renderer.speech(20, 15), 'Es ist Viertel nach 8')
+
+        self.engine.set_country('JP')
+        self.assertEqual(self.engine.get_renderer().display(20, 50, 8, 6, 2020), '20:50 2020/06/08')
+
+    def test_renderer_style_override(self):
+        self.engine.set_country('GB')
+
+        renderer = self.engine.get_renderer(style=STYLE_12H)
+        self.assertEqual(renderer.display(20, 50, 8, 6, 2020), '8:50 PM 08/06/2020')
+        self.assertEqual(renderer.speech(20, 50), 'It\'s 10 to 9')
+        self.assertIsNot(renderer, self.engine.get_renderer())
+
+    def test_renderer_cached(self):
+        self.engine.set_country('FR')
+
+        self.assertIs(self.engine.get_renderer(), self.engine.get_renderer())
+
+    def test_shared_engine(self):
+        self.assertTrue(isinstance(locale_engine, LocaleEngine))
+
+
+# do not remove code below, otherwise test won't run
+if __name__ == '__main__':
+    # coverage run --omit="*/lib/python*/*","test_*" --concurrency=thread test_localeengine.py; coverage report -m -i
+    unittest.main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import logging
+import sys
+sys.path.append('../')
+from backend.minutescheduler import MinuteScheduler
+from mock import Mock
+
+class FakeClock():
+    """
+    Fake wall and monotonic clocks
+    """
+    def __init__(self, wall):
+        self.wall = float(wall)
+        self.mono = 1000.0
+
+    def time(self):
+        return self.wall
+
+    def monotonic(self):
+        return self.mono
+
+    def sleep(self, delay):
+        self.wall += delay
+        self.mono += delay
+
+    def jump(self, delta):
+        self.wall += delta
+
+class TestsMinuteScheduler(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.FATAL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        self.clock = FakeClock(1607538850.0)
+        self.callback = Mock()
+        self.scheduler = MinuteScheduler(self.callback, clock=self.clock.time, monotonic=self.clock.monotonic)
+
+    def run_ticks(self, count):
+        for _ in range(count):
+            self.clock.sleep(self.scheduler.tick())
+
+    def test_first_tick_only_aligns(self):
+        delay = self.scheduler.tick()
+
+        self.assertFalse(self.callback.called)
+        self.assertAlmostEqual(delay, 50.0 + MinuteScheduler.WAKEUP_DELAY)
+
+    def test_ticks_aligned_on_minutes(self):
+        self.run_ticks(1 + 3)
+
+        self.assertEqual(self.callback.call_count, 3)
+        self.callback.assert_any_call(1607538900, False)
+        self.callback.assert_any_call(1607538960, False)
+        self.callback.assert_called_with(1607539020, False)
+
+    def test_no_drift_with_slow_callback(self):
+        # callback lasts some seconds
+        self.callback.side_effect = lambda *args: self.clock.sleep(7.3)
+
+        self.run_ticks(1 + 1000)
+
+        self.assertEqual(self.callback.call_count, 1000)
+        self.callback.assert_called_with(1607538900 + 999 * 60, False)
+
+    def test_early_wakeup(self):
+        self.scheduler.tick()
+        self.clock.sleep(5.0)
+
+        delay = self.scheduler.tick()
+
+        self.assertFalse(self.callback.called)
+        self.assertAlmostEqual(delay, 45.0 + MinuteScheduler.WAKEUP_DELAY)
+
+    def test_missed_minutes(self):
+        self.run_ticks(2)
+        self.callback.reset_mock()
+
+        # thread wakes up 3 minutes late
+        self.clock.sleep(180.0)
+        self.scheduler.tick()
+
+        self.callback.assert_called_once_with(1607539140, False)
+
+    def test_too_many_missed_minutes_is_jump(self):
+        self.run_ticks(2)
+        self.callback.reset_mock()
+
+        self.clock.sleep((MinuteScheduler.MAX_MISSED_MINUTES + 5) * 60.0)
+        self.scheduler.tick()
+
+        self.callback.assert_called_once_with(1607538960 + (MinuteScheduler.MAX_MISSED_MINUTES + 5) * 60, True)
+
+    def test_clock_jump_forward(self):
+        self.run_ticks(2)
+        self.callback.reset_mock()
+
+        self.clock.jump(3600.0)
+        self.scheduler.tick()
+
+        self.callback.assert_called_once_with(1607538960 + 3600, True)
+
+    def test_clock_jump_backward(self):
+        self.run_ticks(2)
+        self.callback.reset_mock()
+
+        self.clock.jump(-3600.0)
+        self.scheduler.tick()
+
+        self.callback.assert_called_once_with(1607538960 - 3600, True)
+
+    def test_reset(self):
+        self.run_ticks(2)
+        self.callback.reset_mock()
+
+        self.clock.jump(3600.0)
+        self.scheduler.reset()
+        self.run_ticks(2)
+
+        self.callback.assert_called_once_with(1607538960 + 3600 + 60, False)
+
+    def test_reset_minute_after_sync_fires(self):
+        self.run_ticks(2)
+        # thread waits for next minute while time is synchronized (clock stepped 80 seconds forward)
+        delay = self.scheduler.tick()
+        self.callback.reset_mock()
+        self.clock.sleep(10.0)
+        self.clock.jump(80.0)
+        self.scheduler.reset()
+
+        # thread wakes up on time computed with previous wall clock
+        self.clock.sleep(delay - 10.0)
+        self.scheduler.tick()
+
+        self.callback.assert_called_once_with(1607539080, False)
+
+    def test_reset_same_minute_not_triggered(self):
+        self.run_ticks(2)
+        self.callback.reset_mock()
+        self.clock.sleep(10.0)
+
+        self.scheduler.reset()
+        self.scheduler.tick()
+
+        self.assertFalse(self.callback.called)
+
+    def test_callback_exception(self):
+        self.callback.side_effect = Exception('Test exception')
+
+        self.run_ticks(3)
+
+        self.assertEqual(self.callback.call_count, 2)
+
+    def test_thread_start_stop(self):
+        scheduler = MinuteScheduler(self.callback)
+        scheduler.start()
+        scheduler.stop()
+        scheduler.join(1.0)
+
+        self.assertFalse(scheduler.is_alive())
+
+
+# do not remove code below, otherwise test won't run
+if __name__ == '__main__':
+    # coverage run --omit="*/lib/python*/*","test_*" --concurrency=thread test_minutescheduler.py; coverage report -m -i
+    unittest.main()
+
@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import logging
+import sys
+sys.path.append('../')
+from backend.ntpsyncscheduler import NtpSyncScheduler, has_default_route
+from mock import Mock
+import os
+import random
+import tempfile
+
+ROUTE_HEADER = 'Iface\tDestination\tGateway\tFlags\tRefCnt\tUse\tMetric\tMask\tMTU\tWindow\tIRTT\n'
+
+class FakeClocks():
+    """
+    Fake wall and monotonic clocks, sync function can step wall clock
+    """
+
+    def __init__(self):
+        self.wall = 1000.0
+        self.mono = 10.0
+
+    def clock(self):
+        return self.wall
+
+    def monotonic(self):
+        return self.mono
+
+class TestsNtpSyncScheduler(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.FATAL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        self.clocks = FakeClocks()
+        self.sync = Mock(return_value=False)
+        self.on_synced = Mock()
+        self.network_available = Mock(return_value=True)
+        self.temp_files = []
+
+    def tearDown(self):
+        for path in self.temp_files:
+            os.remove(path)
+
+    def init(self, jitter=0.0, **kwargs):
+        return NtpSyncScheduler(
+            self.sync,
+            self.on_synced,
+            min_interval=60.0,
+            max_interval=3600.0,
+            jitter=jitter,
+            network_available=self.network_available,
+            clock=self.clocks.clock,
+            monotonic=self.clocks.monotonic,
+            rand=random.Random(1),
+            **kwargs
+        )
+
+    def write_routes(self, content):
+        fd, path = tempfile.mkstemp()
+        os.write(fd, content.encode('utf-8'))
+        os.close(fd)
+        self.temp_files.append(path)
+        return path
+
+    def test_backoff(self):
+        scheduler = self.init()
+
+        delays = [scheduler.step() for _ in range(9)]
+
+        self.assertEqual(delays, [60.0, 120.0, 240.0, 480.0, 960.0, 1920.0, 3600.0, 3600.0, 3600.0])
+        self.assertEqual(self.sync.call_count, 9)
+        self.assertEqual(scheduler.attempts, 9)
+
+    def test_backoff_no_overflow(self):
+        scheduler = self.init()
+
+        self.assertEqual(scheduler.get_delay(100000), 3600.0)
+
+    def test_jitter(self):
+        scheduler = self.init(jitter=0.2)
+
+        delays = [scheduler.get_delay(1) for _ in range(100)]
+
+        self.assertTrue(all(48.0 <= delay <= 72.0 for delay in delays))
+        self.assertGreater(len(set(delays)), 1)
+
+    def test_synced(self):
+        def sync():
+            # ntp steps clock by one hour, sync lasts 2 seconds
+            self.clocks.wall += 3602.0
+            self.clocks.mono += 2.0
+            return True
+        self.sync.side_effect = sync
+        scheduler = self.init()
+
+        self.assertIsNone(scheduler.step())
+
+        self.on_synced.assert_called_once_with(3600.0)
+        self.assertTrue(scheduler.synced)
+        self.assertTrue(scheduler.is_stopped())
+
+    def test_synced_callback_exception(self):
+        self.sync.return_value = True
+        self.on_synced.side_effect = Exception('Test exception')
+        scheduler = self.init()
+
+        self.assertIsNone(scheduler.step())
+        self.assertTrue(scheduler.synced)
+
+    def test_sync_exception(self):
+        self.sync.side_effect = Exception('Test exception')
+        scheduler = self.init()
+
+        self.assertEqual(scheduler.step(), 60.0)
+        self.assertEqual(scheduler.attempts, 1)
+
+    def test_network_unavailable(self):
+        self.network_available.return_value = False
+        scheduler = self.init()
+
+        self.assertEqual(scheduler.step(), NtpSyncScheduler.NETWORK_CHECK_INTERVAL)
+        self.assertEqual(scheduler.step(), NtpSyncScheduler.NETWORK_CHECK_INTERVAL)
+        self.assertFalse(self.sync.called)
+
+    def test_network_back_restarts_backoff(self):
+        scheduler = self.init()
+        for _ in range(5):
+            scheduler.step()
+        self.network_available.return_value = False
+        scheduler.step()
+        self.network_available.return_value = True
+
+        self.assertEqual(scheduler.step(), 60.0)
+        self.assertEqual(scheduler.attempts, 1)
+
+    def test_no_network_check(self):
+        scheduler = self.init(jitter=0.0)
+        scheduler.network_available = None
+
+        self.assertEqual(scheduler.step(), 60.0)
+
+    def test_stopped_during_sync(self):
+        scheduler = self.init()
+        def sync():
+            scheduler.stop()
+            return True
+        self.sync.side_effect = sync
+
+        self.assertIsNone(scheduler.step())
+        self.assertFalse(self.on_synced.called)
+
+    def test_run_until_synced(self):
+        self.sync.side_effect = [False, False, True]
+        scheduler = self.init()
+        scheduler.min_interval = 0.001
+
+        scheduler.start()
+        scheduler.join(2.0)
+
+        self.assertFalse(scheduler.is_alive())
+        self.assertEqual(self.sync.call_count, 3)
+        self.assertTrue(self.on_synced.called)
+
+    def test_run_stop(self):
+        scheduler = self.init()
+
+        scheduler.start()
+        scheduler.stop()
+        scheduler.join(2.0)
+
+        self.assertFalse(scheduler.is_alive())
+        self.assertLessEqual(self.sync.call_count, 1)
+
+    def test_has_default_route(self):
+        path = self.write_routes(ROUTE_HEADER + 'eth0\t00000000\t0100A8C0\t0003\t0\t0\t100\t00000000\t0\t0\t0\n')
+
+        self.assertTrue(has_default_route(path))
+
+    def test_has_default_route_no_default(self):
+        path = self.write_routes(ROUTE_HEADER + 'eth0\t0000A8C0\t00000000\t0001\t0\t0\t100\t00FFFFFF\t0\t0\t0\n')
+
+        self.assertFalse(has_default_route(path))
+
+    def test_has_default_route_down(self):
+        path = self.write_routes(ROUTE_HEADER + 'eth0\t00000000\t0100A8C0\t0002\t0\t0\t100\t00000000\t0\t0\t0\n')
+
+        self.assertFalse(has_default_route(path))
+
+    def test_has_default_route_unreadable(self):
+        self.assertTrue(has_default_route('/tmp/dummy/route'))
+
+
+# do not remove code below, otherwise test won't run
+if __name__ == '__main__':
+    # coverage run --omit="*/lib/python*/*","test_*" --concurrency=thread test_ntpsyncscheduler.py; coverage report -m -i
+    unittest.main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import logging
+import sys
+sys.path.append('../')
+from backend.offsettracker import OffsetTracker, civil_from_days
+from backend.zoneinforegistry import ZoneTransitions
+from datetime import date, datetime, timedelta
+from mock import Mock
+import pytz
+
+class TestsOffsetTracker(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.FATAL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        self.on_change = Mock()
+        self.tz = pytz.timezone('Europe/London')
+        self.tracker = OffsetTracker(self.on_change)
+        self.tracker.set_transitions(ZoneTransitions(self.tz))
+
+    def test_civil_from_days(self):
+        epoch = date(1970, 1, 1)
+        for days in range(-700000, 700000, 997):
+            day = epoch + timedelta(days=days)
+            self.assertEqual(civil_from_days(days), (day.year, day.month, day.day))
+
+    def test_local_fields_same_as_pytz(self):
+        for name in ('Europe/London', 'America/New_York', 'Asia/Kathmandu', 'Australia/Lord_Howe', 'UTC'):
+            tz = pytz.timezone(name)
+            tracker = OffsetTracker()
+            tracker.set_transitions(ZoneTransitions(tz))
+            # every 37 minutes during 2 years
+            for timestamp in range(1577836800, 1577836800 + 2 * 366 * 86400, 2220):
+                local_dt = datetime.fromtimestamp(timestamp, tz)
+                fields = tracker.local_fields(timestamp)
+                self.assertEqual(fields[:8], (
+                    local_dt.year,
+                    local_dt.month,
+                    local_dt.day,
+                    local_dt.hour,
+                    local_dt.minute,
+                    local_dt.second,
+                    local_dt.weekday(),
+                    int(local_dt.utcoffset().total_seconds()),
+                ), '%s %s' % (name, timestamp))
+                self.assertEqual(local_dt.replace(tzinfo=fields[8]).tzname(), local_dt.tzname())
+
+    def test_utcoffset(self):
+        # 2020-06-08 (BST) and 2020-12-08 (GMT)
+        self.assertEqual(self.tracker.utcoffset(1591645808), 3600)
+        self.assertEqual(self.tracker.utcoffset(1607454000), 0)
+
+    def test_next_transition(self):
+        self.assertEqual(self.tracker.next_transition(1591645808), 1603587600)
+
+    def test_next_transition_static_timezone(self):
+        self.tracker.set_transitions(ZoneTransitions(pytz.utc))
+
+        self.assertIsNone(self.tracker.next_transition(1591645808))
+        self.assertEqual(self.tracker.local_fields(1591645808)[3], 19)
+
+    def test_transitions_searched_once_per_period(self):
+        transitions = Mock(wraps=ZoneTransitions(self.tz))
+        self.tracker.set_transitions(transitions)
+
+        for timestamp in range(1591645808, 1591645808 + 86400, 60):
+            self.tracker.local_fields(timestamp)
+
+        self.assertEqual(transitions.period.call_count, 1)
+
+    def test_offset_change_callback(self):
+        self.tracker.local_fields(1603587540)
+        self.assertFalse(self.on_change.called)
+
+        fields = self.tracker.local_fields(1603587600)
+
+        self.on_change.assert_called_once_with('Europe/London', 3600, 0, 1603587600)
+        self.assertEqual(fields[3:5], (1, 0))
+
+    def test_no_offset_change_callback_on_first_call(self):
+        self.tracker.local_fields(1603587600)
+
+        self.assertFalse(self.on_change.called)
+
+    def test_no_offset_change_callback_on_set_transitions(self):
+        self.tracker.local_fields(1591645808)
+        self.tracker.set_transitions(ZoneTransitions(pytz.timezone('Europe/Paris')))
+        self.tracker.local_fields(1591645808)
+
+        self.assertFalse(self.on_change.called)
+
+    def test_offset_change_callback_exception(self):
+        self.on_change.side_effect = Exception('Test exception')
+        self.tracker.local_fields(1603587540)
+
+        self.assertEqual(self.tracker.local_fields(1603587600)[7], 0)
+
+    def test_time_jump_backward(self):
+        self.tracker.local_fields(1607454000)
+        self.assertEqual(self.tracker.local_fields(1591645808)[7], 3600)
+
+        self.on_change.assert_called_once_with('Europe/London', 0, 3600, 1591645808)
+
+
+# do not remove code below, otherwise test won't run
+if __name__ == '__main__':
+    # coverage run --omit="*/lib/python*/*","test_*" --concurrency=thread test_offsettracker.py; coverage report -m -i
+    unittest.main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import logging
+import sys
+sys.path.append('../')
+from backend.opstats import OpStats, OperationStats, instrument
+from threading import Thread
+
+class FakeClock():
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class Dummy():
+    def __init__(self, clock):
+        self.op_stats = OpStats(clock)
+        self.clock = clock
+
+    @instrument('work')
+    def work(self, duration, result=True):
+        """
+        Work doc
+        """
+        self.clock.now += duration
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+class TestsOpStats(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.FATAL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        self.clock = FakeClock()
+        self.dummy = Dummy(self.clock)
+
+    def test_empty(self):
+        self.assertEqual(OpStats().get_stats(), {})
+        self.assertEqual(OperationStats().as_dict(), {
+            'count': 0, 'errors': 0, 'last': 0.0, 'mean': 0.0, 'p50': 0.0, 'p95': 0.0, 'max': 0.0,
+        })
+
+    def test_record(self):
+        stats = OpStats()
+        stats.record('op', 0.010)
+        stats.record('op', 0.030, error=True)
+
+        result = stats.get_stats()['op']
+        self.assertEqual(result['count'], 2)
+        self.assertEqual(result['errors'], 1)
+        self.assertEqual(result['last'], 30.0)
+        self.assertEqual(result['mean'], 20.0)
+        self.assertEqual(result['max'], 30.0)
+
+    def test_percentiles(self):
+        operation = OperationStats()
+        for _ in range(95):
+            operation.record(0.001)
+        for _ in range(5):
+            operation.record(1.0)
+
+        # bucket upper bound, within factor 2 of real value
+        self.assertGreaterEqual(operation.percentile(50), 0.001)
+        self.assertLess(operation.percentile(50), 0.002)
+        self.assertLess(operation.percentile(95), 0.002)
+        self.assertEqual(operation.percentile(99), 1.0)
+        self.assertEqual(operation.percentile(100), 1.0)
+
+    def test_percentile_capped_to_max(self):
+        operation = OperationStats()
+        operation.record(0.0011)
+
+        self.assertEqual(operation.percentile(50), 0.0011)
+
+    def test_huge_duration(self):
+        operation = OperationStats()
+        operation.record(100000.0)
+
+        self.assertEqual(operation.percentile(50), 100000.0)
+        self.assertEqual(operation.buckets[-1], 1)
+
+    def test_fixed_size(self):
+        operation = OperationStats()
+        size = len(operation.buckets)
+        for index in range(1000):
+            operation.record(index / 1000.0)
+
+        self.assertEqual(len(operation.buckets), size)
+        self.assertEqual(sum(operation.buckets), 1000)
+
+    def test_instrument(self):
+        self.assertTrue(self.dummy.work(0.5))
+
+        result = self.dummy.op_stats.get_stats()['work']
+        self.assertEqual(result['count'], 1)
+        self.assertEqual(result['errors'], 0)
+        self.assertEqual(result['last'], 500.0)
+        self.assertEqual(Dummy.work.__name__, 'work')
+        self.assertEqual(Dummy.work.__doc__.strip(), 'Work doc')
+
+    def test_instrument_false_result(self):
+        self.assertFalse(self.dummy.work(0.1, result=False))
+
+        self.assertEqual(self.dummy.op_stats.get_stats()['work']['errors'], 1)
+
+    def test_instrument_exception(self):
+        with self.assertRaises(ValueError):
+            self.dummy.work(0.2, result=ValueError('Test exception'))
+
+        result = self.dummy.op_stats.get_stats()['work']
+        self.assertEqual(result['errors'], 1)
+        self.assertEqual(result['last'], 200.0)
+
+    def test_reset(self):
+        self.dummy.work(0.1)
+        self.dummy.op_stats.reset()
+
+        self.assertEqual(self.dummy.op_stats.get_stats(), {})
+
+    def test_format(self):
+        stats = OpStats()
+        stats.record('b', 0.002)
+        stats.record('a', 0.001, error=True)
+
+        line = stats.format()
+
+        self.assertTrue(line.startswith('a[n=1 err=1 last=1.0'))
+        self.assertTrue('b[n=1 err=0 last=2.0' in line)
+
+    def test_concurrent_records(self):
+        stats = OpStats()
+        def run():
+            for _ in range(1000):
+                stats.record('op', 0.001)
+        threads = [Thread(target=run) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(stats.get_stats()['op']['count'], 4000)
+
+
+# do not remove code below, otherwise test won't run
+if __name__ == '__main__':
+    # coverage run --omit="*/lib/python*/*","test_*" --concurrency=thread test_opstats.py; coverage report -m -i
+    unittest.main()
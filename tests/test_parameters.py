@@ -5,12 +5,15 @@ import logging
 import sys
 sys.path.append('../')
 from backend.parameters import Parameters
+from backend.sntpclient import SntpSample
+from backend.timecontext import get_time_context
 from cleep.exception import InvalidParameter, MissingParameter, CommandError, Unauthorized
 from cleep.libs.tests import session
 from mock import patch, MagicMock, Mock, ANY
 from datetime import datetime
 import pytz
 import time
+from threading import Thread, Event
 
 class TestsParameters(unittest.TestCase):
 
@@ -24,7 +27,8 @@ class TestsParameters(unittest.TestCase):
 
     def init_session(self, mock_sun=None,
         mock_hostname=None, set_hostname_return_value=True, get_hostname_return_value='dummy',
-        mock_tzfinder=None, tzfinder_timezoneat_side_effect=None, tzfinder_timezoneat_return_value=None, start=True):
+        mock_tzfinder=None, tzfinder_timezoneat_side_effect=None, tzfinder_timezoneat_return_value=None, start=True,
+        timezone_applied=True):
         if mock_sun:
             local_tz = pytz.timezone('Europe/London')
             mock_sun.return_value.sunset.return_value = local_tz.localize(datetime.fromtimestamp(1591735300))
@@ -41,6 +45,9 @@ class TestsParameters(unittest.TestCase):
                 mock_tzfinder.return_value.timezone_at.return_value = tzfinder_timezoneat_return_value
 
         self.module = self.session.setup(Parameters)
+        # never touch system timezone during tests
+        self.module.timezone_applier = Mock()
+        self.module.timezone_applier.apply.return_value = timezone_applied
 
         if start:
             self.session.start_module(self.module)
@@ -62,47 +69,68 @@ class TestsParameters(unittest.TestCase):
         self.module.set_country.assert_called()
         self.module.set_sun.assert_called()
 
-    @patch('backend.parameters.time.time', Mock(return_value=1607538850))
-    @patch('backend.parameters.Timer')
-    @patch('backend.parameters.Task')
-    def test_on_start_launch_time_task(self, mock_task, mock_timer):
+    @patch('timezonefinder.TimezoneFinder')
+    def test_configure_geo_libraries_not_loaded(self, mock_tzfinder):
+        self.init_session()
+
+        self.assertFalse(mock_tzfinder.called)
+        self.assertFalse(self.module.geo_backend.is_loaded())
+
+    def test_on_stop_release_geo_libraries(self):
         self.init_session()
+        self.module.geo_backend = Mock()
 
-        # mocked time = 9/12/2020 à 18:34:10, so cleep seconds synchronized with system, it must delay of 50 seconds
-        mock_timer.assert_called_with(50, mock_task.return_value.start)
-        self.assertTrue(mock_timer.return_value.start.called)
+        self.module._on_stop()
+
+        self.assertTrue(self.module.geo_backend.release.called)
+
+    @patch('backend.parameters.MinuteScheduler')
+    def test_on_start_launch_time_task(self, mock_scheduler):
+        self.init_session()
+
+        mock_scheduler.assert_called_with(self.module._on_minute, ANY)
+        self.assertTrue(mock_scheduler.return_value.start.called)
 
     @patch('backend.parameters.time.time', Mock(return_value=1607538850))
-    @patch('backend.parameters.Task')
-    def test_on_start_sync_time_first_launch(self, mock_task):
+    @patch('backend.parameters.MinuteScheduler', Mock())
+    @patch('backend.parameters.NtpSyncScheduler')
+    def test_on_start_sync_time_first_launch(self, mock_scheduler):
         self.init_session()
 
-        self.assertEqual(mock_task.call_count, 1)
+        self.assertEqual(mock_scheduler.call_count, 0)
 
     @patch('backend.parameters.time.time', Mock(return_value=1575916450))
-    @patch('backend.parameters.Task')
-    def test_on_start_sync_time_already_launched_invalid_time(self, mock_task):
+    @patch('backend.parameters.MinuteScheduler', Mock())
+    @patch('backend.parameters.NtpSyncScheduler')
+    def test_on_start_sync_time_already_launched_invalid_time(self, mock_scheduler):
         self.init_session(start=False)
-        self.module._get_config_field = Mock(side_effect=[{}, {}, 'france', 'Europe/Paris', {'latitude': 52.2040, 'longitude': 0.1208}, 1607538850])
+        self.module._get_config_field = Mock(side_effect=[{}, {}, {'country': 'France', 'alpha2': 'FR'}, 'Europe/Paris', {'latitude': 52.2040, 'longitude': 0.1208}, 'full', 1607538850, []])
 
         self.session.start_module(self.module)
 
         logging.debug(self.module._get_config_field.call_args_list)
-        self.assertEqual(mock_task.call_count, 2)
-        mock_task.assert_any_call(Parameters.NTP_SYNC_INTERVAL, self.module._sync_time_task, ANY)
-        self.assertTrue(mock_task.return_value.start.called)
+        self.assertEqual(mock_scheduler.call_count, 1)
+        mock_scheduler.assert_any_call(
+            self.module.sync_time,
+            self.module._Parameters__on_time_synced,
+            min_interval=Parameters.NTP_SYNC_INTERVAL,
+            max_interval=Parameters.NTP_SYNC_MAX_INTERVAL,
+            jitter=Parameters.NTP_SYNC_JITTER,
+            logger=ANY,
+        )
+        self.assertTrue(mock_scheduler.return_value.start.called)
 
     @patch('backend.parameters.time.time', Mock(return_value=1607538850))
-    @patch('backend.parameters.Task')
-    def test_on_start_sync_time_already_launched_valid_time(self, mock_task):
+    @patch('backend.parameters.MinuteScheduler', Mock())
+    @patch('backend.parameters.NtpSyncScheduler')
+    def test_on_start_sync_time_already_launched_valid_time(self, mock_scheduler):
         self.init_session(start=False)
-        self.module._get_config_field = Mock(side_effect=[{}, {}, 'france', 'Europe/Paris', {'latitude': 52.2040, 'longitude': 0.1208}, 1607538150])
+        self.module._get_config_field = Mock(side_effect=[{}, {}, {'country': 'France', 'alpha2': 'FR'}, 'Europe/Paris', {'latitude': 52.2040, 'longitude': 0.1208}, 'full', 1607538150, []])
 
         self.session.start_module(self.module)
 
-        logging.debug(mock_task.call_args_list)
-        self.assertEqual(mock_task.call_count, 1)
-        self.assertFalse(mock_task.return_value.start.called)
+        logging.debug(mock_scheduler.call_args_list)
+        self.assertEqual(mock_scheduler.call_count, 0)
 
     @patch('backend.parameters.Sun')
     def test_get_module_config_default(self, mock_sun):
@@ -126,6 +154,89 @@ class TestsParameters(unittest.TestCase):
         self.assertTrue('latitude' in conf['position'])
         self.assertTrue('longitude' in conf['position'])
 
+    @patch('time.time')
+    def test_get_module_config_cached(self, mock_time):
+        mock_time.return_value = 1591818206
+        self.init_session()
+        self.module.get_hostname = Mock(return_value='dummy')
+
+        conf1 = self.module.get_module_config()
+        mock_time.return_value = 1591818210
+        conf2 = self.module.get_module_config()
+
+        self.assertEqual(conf1, conf2)
+        self.assertEqual(self.module.get_hostname.call_count, 1)
+
+    @patch('time.time', MagicMock(return_value=1591818206))
+    def test_get_module_config_cached_copy(self):
+        self.init_session()
+
+        conf1 = self.module.get_module_config()
+        conf1['hostname'] = 'modified'
+        del conf1['timezone']
+        conf2 = self.module.get_module_config()
+
+        self.assertIsNot(conf1, conf2)
+        self.assertNotEqual(conf2['hostname'], 'modified')
+        self.assertTrue('timezone' in conf2)
+
+    @patch('time.time')
+    def test_get_module_config_cache_invalidated_by_minute(self, mock_time):
+        mock_time.return_value = 1591818206
+        self.init_session()
+        self.module.get_hostname = Mock(return_value='dummy')
+
+        self.module.get_module_config()
+        mock_time.return_value = 1591818266
+        self.module.get_module_config()
+
+        self.assertEqual(self.module.get_hostname.call_count, 2)
+
+    @patch('time.time')
+    def test_get_module_config_cache_invalidated_by_config_update(self, mock_time):
+        mock_time.return_value = 1591818206
+        self.init_session()
+
+        self.module.get_module_config()
+        self.module._set_config_field('position', {
+            'latitude': 48.8591554,
+            'longitude': 2.2907284,
+        })
+        conf = self.module.get_module_config()
+
+        self.assertEqual(conf['position']['latitude'], 48.8591554)
+
+    @patch('backend.parameters.Hostname')
+    @patch('time.time')
+    def test_get_module_config_cache_invalidated_by_set_hostname(self, mock_time, mock_hostname):
+        mock_time.return_value = 1591818206
+        self.init_session(mock_hostname=mock_hostname, get_hostname_return_value='hello')
+
+        self.module.get_module_config()
+        mock_hostname.return_value.get_hostname.return_value = 'world'
+        self.module.set_hostname('world')
+        conf = self.module.get_module_config()
+
+        self.assertEqual(conf['hostname'], 'world')
+
+    @patch('time.time')
+    def test_get_module_devices_cache_invalidated_by_time_task(self, mock_time):
+        mock_time.return_value = 1591818206
+        self.init_session()
+        self.module._set_config_field = Mock()
+
+        build_module_devices = Mock(wraps=self.module._Parameters__build_module_devices)
+        self.module._Parameters__build_module_devices = build_module_devices
+        self.module._invalidate_responses()
+
+        self.module.get_module_devices()
+        self.module.get_module_devices()
+        self.assertEqual(build_module_devices.call_count, 1)
+        self.module._time_task()
+        self.module.get_module_devices()
+
+        self.assertEqual(build_module_devices.call_count, 2)
+
     @patch('time.time', MagicMock(return_value=1591818206))
     def test_get_module_devices(self):
         self.init_session()
@@ -136,11 +247,11 @@ class TestsParameters(unittest.TestCase):
         uid = list(devices.keys())[0]
         self.assertEqual(devices[uid]['name'], 'Clock')
         self.assertTrue('timestamp' in devices[uid])
-        self.assertEqual(devices[uid]['iso'], '2020-06-10T21:43:26+01:00')
+        self.assertEqual(devices[uid]['iso'], '2020-06-10T20:43:26+01:00')
         self.assertEqual(devices[uid]['year'], 2020)
         self.assertEqual(devices[uid]['month'], 6)
         self.assertEqual(devices[uid]['day'], 10)
-        self.assertEqual(devices[uid]['hour'], 21)
+        self.assertEqual(devices[uid]['hour'], 20)
         self.assertEqual(devices[uid]['minute'], 43)
         self.assertTrue('sunset' in devices[uid])
         self.assertTrue('sunrise' in devices[uid])
@@ -149,6 +260,25 @@ class TestsParameters(unittest.TestCase):
         self.assertEqual(devices[uid]['type'], 'clock')
         self.assertTrue('uuid' in devices[uid])
 
+    @patch('time.time')
+    def test_get_module_devices_snapshot_shared_within_minute(self, mock_time):
+        mock_time.return_value = 1591818206
+        self.init_session()
+
+        self.module.get_module_devices()
+        snapshot = self.module._Parameters__time_snapshot
+        mock_time.return_value = 1591818210
+        devices = self.module.get_module_devices()
+
+        self.assertIs(self.module._Parameters__time_snapshot, snapshot)
+        uid = list(devices.keys())[0]
+        self.assertEqual(devices[uid]['minute'], 43)
+
+        mock_time.return_value = 1591818266
+        devices = self.module.get_module_devices()
+        self.assertIsNot(self.module._Parameters__time_snapshot, snapshot)
+        self.assertEqual(devices[uid]['minute'], 44)
+
     @patch('time.time')
     def test_get_module_devices_weekdays(self, mock_time):
         mock_time.return_value = 1591645808
@@ -189,23 +319,31 @@ class TestsParameters(unittest.TestCase):
         self.assertEqual(devices[uid]['weekday'], 6)
         self.assertEqual(devices[uid]['weekday_literal'], 'sunday')
 
-    def test_sync_time_task_sync_ok(self):
+    @patch('backend.parameters.time.time', Mock(return_value=1591645808))
+    def test_on_time_synced(self):
         self.init_session()
-        self.module.sync_time = Mock(return_value=True)
         self.module.sync_time_task = Mock()
+        self.module.time_task = Mock()
+        self.module.set_sun = Mock()
+        self.module._time_task = Mock()
+        self.module.time_synced_event = Mock()
 
-        self.module._sync_time_task()
-        
-        self.assertTrue(self.module.sync_time_task.stop.called)
+        self.module._Parameters__on_time_synced(3600.1234)
 
-    def test_sync_time_task_sync_ko(self):
+        self.assertIsNone(self.module.sync_time_task)
+        self.assertTrue(self.module.time_task.reset.called)
+        self.assertTrue(self.module.set_sun.called)
+        self.assertTrue(self.module._time_task.called)
+        self.module.time_synced_event.send.assert_called_with(params={'timestamp': 1591645808, 'jump': 3600.123})
+
+    def test_on_stop_stop_sync_time_task(self):
         self.init_session()
-        self.module.sync_time = Mock(return_value=False)
-        self.module.sync_time_task = Mock()
+        sync_time_task = Mock()
+        self.module.sync_time_task = sync_time_task
 
-        self.module._sync_time_task()
-        
-        self.assertFalse(self.module.sync_time_task.stop.called)
+        self.module._on_stop()
+
+        self.assertTrue(sync_time_task.stop.called)
 
     @patch('time.time')
     def test_time_task_now_event(self, mock_time):
@@ -216,13 +354,13 @@ class TestsParameters(unittest.TestCase):
         self.module._time_task()
 
         self.assertTrue(self.session.event_called_with('parameters.time.now', {
-            'hour': 21,
+            'hour': 20,
             'day': 8,
             'month': 6,
             'weekday_literal': 'monday',
             'timestamp': 1591645808,
             'weekday': 0,
-            'iso': '2020-06-08T21:50:08+01:00',
+            'iso': '2020-06-08T20:50:08+01:00',
             'year': 2020,
             'sunset': self.module.suns['sunset'],
             'sunrise': self.module.suns['sunrise'],
@@ -231,34 +369,312 @@ class TestsParameters(unittest.TestCase):
         self.module._set_config_field.assert_called_with('timestamp', 1591645808)
 
     @patch('time.time')
-    def test_time_task_sunrise_event(self, mock_time):
-        ts = 1591645808
-        mock_time.return_value = ts
+    def test_time_task_now_event_delta_mode(self, mock_time):
+        mock_time.return_value = 1591645808
+        self.init_session()
+        self.module._set_config_field = Mock()
+        self.module.time_event_emitter.set_mode('delta')
+        self.module._time_task()
+        self.module.time_now_event = Mock()
+        self.module.time_event_emitter.event = self.module.time_now_event
+
+        mock_time.return_value = 1591645868
+        self.module._time_task()
+
+        self.module.time_now_event.send.assert_called_with(params={
+            'timestamp': 1591645868,
+            'iso': '2020-06-08T20:51:08+01:00',
+            'minute': 51,
+            'delta': True,
+        }, device_id=ANY)
+
+    @patch('time.time')
+    def test_time_task_now_event_suppressed_mode(self, mock_time):
+        mock_time.return_value = 1591645808
+        self.init_session()
+        self.module._set_config_field = Mock()
+        self.module.time_event_emitter.set_mode('suppressed')
+        self.module.time_now_event = Mock()
+        self.module.time_event_emitter.event = self.module.time_now_event
+
+        self.module._time_task()
+
+        self.assertFalse(self.module.time_now_event.send.called)
+        self.module._set_config_field.assert_called_with('timestamp', 1591645808)
+
+    def test_set_time_event_mode(self):
+        self.init_session()
+
+        self.module.set_time_event_mode('delta')
+
+        self.assertEqual(self.module._get_config_field('time_event_mode'), 'delta')
+        self.assertEqual(self.module.time_event_emitter.mode, 'delta')
+        self.assertEqual(self.module.get_module_config()['time_event_mode'], 'delta')
+
+    def test_set_time_event_mode_invalid_parameters(self):
+        self.init_session()
+
+        with self.assertRaises(MissingParameter) as cm:
+            self.module.set_time_event_mode(None)
+        self.assertEqual(str(cm.exception), 'Parameter "mode" is missing')
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.set_time_event_mode('dummy')
+        self.assertEqual(str(cm.exception), 'Parameter "mode" must be one of full, delta, suppressed')
+
+    def test_set_time_event_mode_save_failed(self):
+        self.init_session()
+        self.module._set_config_field = Mock(return_value=False)
+
+        with self.assertRaises(CommandError) as cm:
+            self.module.set_time_event_mode('delta')
+        self.assertEqual(str(cm.exception), 'Unable to save time event mode')
+        self.assertEqual(self.module.time_event_emitter.mode, 'full')
+
+    def test_configure_invalid_time_event_mode(self):
+        self.init_session(start=False)
+        self.module._set_config_field('time_event_mode', 'dummy')
+
+        self.session.start_module(self.module)
+
+        self.assertEqual(self.module.time_event_emitter.mode, 'full')
+
+    @patch('time.time')
+    def test_time_task_offset_change_event(self, mock_time):
+        # 2020-10-25 01:59 BST, one minute before DST end
+        mock_time.return_value = 1603587540
+        self.init_session()
+        self.module._time_task()
+        self.assertFalse(self.session.event_called('parameters.time.offsetchange'))
+
+        mock_time.return_value = 1603587600
+        self.module._time_task()
+
+        self.assertTrue(self.session.event_called_with('parameters.time.offsetchange', {
+            'timezone': 'Europe/London',
+            'old_offset': 3600,
+            'new_offset': 0,
+            'timestamp': 1603587600,
+        }))
+        self.assertTrue(self.session.event_called_with('parameters.time.now', {
+            'hour': 1,
+            'day': 25,
+            'month': 10,
+            'weekday_literal': 'sunday',
+            'timestamp': 1603587600,
+            'weekday': 6,
+            'iso': '2020-10-25T01:00:00+00:00',
+            'year': 2020,
+            'sunset': self.module.suns['sunset'],
+            'sunrise': self.module.suns['sunrise'],
+            'minute': 0
+        }))
+
+    @patch('time.time')
+    def test_time_task_timestamp_write_behind(self, mock_time):
+        mock_time.return_value = 1591645808
         self.init_session()
-        self.module.sunrise = datetime.fromtimestamp(ts)
+        self.module._time_task()
+        self.module._set_config_field = Mock()
+
+        mock_time.return_value = 1591645868
+        self.module._time_task()
+        self.assertFalse(self.module._set_config_field.called)
+
+        mock_time.return_value = 1591645808 + Parameters.TIMESTAMP_FLUSH_INTERVAL * 60
+        self.module._time_task()
+        self.module._set_config_field.assert_called_with('timestamp', 1591645808 + Parameters.TIMESTAMP_FLUSH_INTERVAL * 60)
+
+    @patch('time.time')
+    def test_time_task_no_timestamp_saved_during_sync(self, mock_time):
+        mock_time.return_value = 1591645808
+        self.init_session()
+        self.module.timestamp_store = Mock()
+        self.module.sync_time_task = Mock()
 
         self.module._time_task()
+
+        self.assertFalse(self.module.timestamp_store.update.called)
+
+    def test_on_stop_flush_timestamp(self):
+        self.init_session()
+        self.module.timestamp_store = Mock()
+
+        self.module._on_stop()
+
+        self.assertTrue(self.module.timestamp_store.flush.called)
+
+    def test_sunrise_event(self):
+        self.init_session()
+
+        self.module._Parameters__on_sun_event('sunrise', 0, 1591645808)
+
         self.assertTrue(self.session.event_called('parameters.time.sunrise'))
+        self.assertFalse(self.session.event_called('parameters.time.sunset'))
+
+    def test_sunset_event(self):
+        self.init_session()
+
+        self.module._Parameters__on_sun_event('sunset', 0, 1591645808)
+
+        self.assertTrue(self.session.event_called('parameters.time.sunset'))
+        self.assertFalse(self.session.event_called('parameters.time.sunrise'))
 
     @patch('time.time')
-    def test_time_task_sunset_event(self, mock_time):
+    def test_time_task_no_sun_events_polling(self, mock_time):
         ts = 1591645808
         mock_time.return_value = ts
         self.init_session()
-        self.module.sunset = datetime.fromtimestamp(ts)
+        self.module._Parameters__state = self.module.state.replace(
+            sunrise=datetime.fromtimestamp(ts),
+            sunset=datetime.fromtimestamp(ts),
+        )
 
         self.module._time_task()
-        self.assertTrue(self.session.event_called('parameters.time.sunset'))
+
+        self.assertFalse(self.session.event_called('parameters.time.sunrise'))
+        self.assertFalse(self.session.event_called('parameters.time.sunset'))
+
+    @patch('time.time')
+    def test_sun_scheduler_armed(self, mock_time):
+        mock_time.return_value = 1591645808
+        self.init_session()
+
+        next_fire = self.module.sun_scheduler.get_next_fire()
+
+        self.assertTrue(next_fire[1] in ('sunrise', 'sunset'))
+        self.assertGreater(next_fire[0], 1591645808)
+
+    def test_set_sun_rearm_sun_scheduler(self):
+        self.init_session()
+        self.module.sun_scheduler = Mock()
+
+        self.module.set_sun()
+
+        self.module.sun_scheduler.set_ephemeris.assert_called_with(self.module.sun_ephemeris)
+
+    def test_on_stop_stop_sun_scheduler(self):
+        self.init_session()
+        self.module.sun_scheduler = Mock()
+
+        self.module._on_stop()
+
+        self.assertTrue(self.module.sun_scheduler.stop.called)
+
+    def test_add_sun_trigger(self):
+        self.init_session()
+
+        self.module.add_sun_trigger('sunset', -30)
+
+        self.assertEqual(self.module.get_sun_triggers(), [{'event': 'sunset', 'offset': -30}])
+        next_fire = self.module.sun_scheduler.get_next_fire()
+        self.assertIsNotNone(next_fire)
+
+    def test_add_sun_trigger_invalid_params(self):
+        self.init_session()
+
+        with self.assertRaises(MissingParameter) as cm:
+            self.module.add_sun_trigger(None, 0)
+        self.assertEqual(str(cm.exception), 'Parameter "event" is missing')
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.add_sun_trigger('dummy', 0)
+        self.assertEqual(str(cm.exception), 'Parameter "event" is invalid')
+        with self.assertRaises(MissingParameter) as cm:
+            self.module.add_sun_trigger('sunset', None)
+        self.assertEqual(str(cm.exception), 'Parameter "offset" is missing')
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.add_sun_trigger('sunset', 1.5)
+        self.assertEqual(str(cm.exception), 'Parameter "offset" is invalid')
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.add_sun_trigger('sunset', Parameters.MAX_SUN_TRIGGER_OFFSET + 1)
+        self.assertEqual(str(cm.exception), 'Parameter "offset" is invalid')
+
+        self.module.add_sun_trigger('sunset', -30)
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.add_sun_trigger('sunset', -30)
+        self.assertEqual(str(cm.exception), 'Sun trigger already exists')
+
+    def test_add_sun_trigger_unable_save(self):
+        self.init_session()
+        self.module._set_config_field = Mock(return_value=False)
+
+        with self.assertRaises(CommandError) as cm:
+            self.module.add_sun_trigger('sunset', -30)
+        self.assertEqual(str(cm.exception), 'Unable to save sun trigger')
+
+    def test_remove_sun_trigger(self):
+        self.init_session()
+        self.module.add_sun_trigger('sunset', -30)
+        self.module.sun_scheduler = Mock()
+
+        self.module.remove_sun_trigger('sunset', -30)
+
+        self.assertEqual(self.module.get_sun_triggers(), [])
+        self.assertTrue(self.module.sun_scheduler.remove_trigger.called)
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.remove_sun_trigger('sunset', -30)
+        self.assertEqual(str(cm.exception), 'Sun trigger does not exist')
+
+    def test_sun_trigger_event(self):
+        self.init_session()
+
+        self.module._Parameters__on_sun_trigger('sunset', -1800, 1591645808)
+
+        self.assertTrue(self.session.event_called_with('parameters.time.sunevent', {
+            'event': 'sunset',
+            'offset': -30,
+            'timestamp': 1591645808,
+        }))
+
+    def test_on_start_register_sun_triggers(self):
+        self.init_session(start=False)
+        self.module._set_config_field('sun_triggers', [{'event': 'sunset', 'offset': -30}])
+        self.module.sun_scheduler = Mock()
+
+        self.session.start_module(self.module)
+
+        self.module.sun_scheduler.add_trigger.assert_called_with('sunset', -1800, ANY)
+        self.assertTrue(self.module.sun_scheduler.start.called)
 
     @patch('time.time')
     def test_time_task_update_sun_after_midnight(self, mock_time):
         ts = 1591653900 # 00:05
+        mock_time.return_value = ts - 600
+        self.init_session()
+        self.module.set_sun = MagicMock()
+
         mock_time.return_value = ts
+        self.module._time_task()
+        self.assertTrue(self.module.set_sun.called)
+
+    @patch('time.time')
+    def test_time_task_no_sun_update_same_day(self, mock_time):
+        mock_time.return_value = 1591653900
         self.init_session()
         self.module.set_sun = MagicMock()
 
+        mock_time.return_value = 1591653900 + 3600
         self.module._time_task()
+        self.assertFalse(self.module.set_sun.called)
+
+    def test_on_minute(self):
+        self.init_session()
+        self.module._time_task = Mock()
+        self.module.set_sun = Mock()
+
+        self.module._on_minute(1591645800, False)
+
+        self.assertTrue(self.module._time_task.called)
+        self.assertFalse(self.module.set_sun.called)
+
+    def test_on_minute_clock_jumped(self):
+        self.init_session()
+        self.module._time_task = Mock()
+        self.module.set_sun = Mock()
+
+        self.module._on_minute(1591645800, True)
+
         self.assertTrue(self.module.set_sun.called)
+        self.assertTrue(self.module._time_task.called)
 
     @patch('cleep.libs.configs.hostname.Hostname')
     def test_set_hostname_succeed(self, mock_hostname):
@@ -294,6 +710,42 @@ class TestsParameters(unittest.TestCase):
 
         self.assertEqual(self.module.get_hostname(), 'hello')
 
+    def test_resolve_positions(self):
+        self.init_session()
+        self.module.set_timezone = Mock()
+        self.module.set_country = Mock()
+        self.module._set_config_field = Mock()
+
+        positions = self.module.resolve_positions([
+            {'latitude': 48.8591554, 'longitude': 2.2907284},
+            {'latitude': 51.5073, 'longitude': -0.1277},
+        ])
+
+        self.assertEqual(len(positions), 2)
+        self.assertEqual(positions[0]['alpha2'], 'FR')
+        self.assertEqual(positions[0]['timezone'], 'Europe/Paris')
+        self.assertEqual(positions[1]['alpha2'], 'GB')
+        self.assertEqual(positions[1]['timezone'], 'Europe/London')
+        self.assertTrue(positions[0]['sunrise'] < positions[0]['sunset'])
+        self.assertFalse(self.module.set_timezone.called)
+        self.assertFalse(self.module.set_country.called)
+        self.assertFalse(self.module._set_config_field.called)
+
+    def test_resolve_positions_invalid_params(self):
+        self.init_session()
+
+        with self.assertRaises(MissingParameter) as cm:
+            self.module.resolve_positions(None)
+        self.assertEqual(str(cm.exception), 'Parameter "positions" is missing')
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.resolve_positions({'latitude': 48.8591554, 'longitude': 2.2907284})
+        self.assertEqual(str(cm.exception), 'Parameter "positions" is invalid')
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.resolve_positions([(48.0, 2.0)] * (Parameters.MAX_RESOLVE_POSITIONS + 1))
+        self.assertEqual(str(cm.exception), 'Parameter "positions" must contain %d positions max' % Parameters.MAX_RESOLVE_POSITIONS)
+
     def test_get_position(self):
         self.init_session()
         position = self.module.get_position()
@@ -306,7 +758,9 @@ class TestsParameters(unittest.TestCase):
         self.module.set_country = MagicMock()
         self.module.set_sun = MagicMock()
 
-        self.module.set_position(48.8591554, 2.2907284)
+        job_id = self.module.set_position(48.8591554, 2.2907284)
+        self.assertTrue(self.module.position_pipeline.wait(5.0))
+        self.assertTrue(isinstance(job_id, str))
         self.assertTrue(self.module.set_timezone.called)
         self.assertTrue(self.module.set_country.called)
         self.assertTrue(self.module.set_sun.called)
@@ -315,6 +769,22 @@ class TestsParameters(unittest.TestCase):
         self.assertEqual(position['latitude'], 48.8591554)
         self.assertEqual(position['longitude'], 2.2907284)
 
+    def test_set_position_progress_event(self):
+        self.init_session()
+        self.module.set_timezone = MagicMock()
+        self.module.set_country = MagicMock(return_value=False)
+        self.module.set_sun = MagicMock()
+
+        job_id = self.module.set_position(48.8591554, 2.2907284)
+        self.assertTrue(self.module.position_pipeline.wait(5.0))
+
+        self.assertTrue(self.session.event_called_with('parameters.position.progress', {
+            'job_id': job_id,
+            'status': 'failed',
+            'step': 'country',
+            'progress': 100,
+        }))
+
     def test_set_position_exception(self):
         self.init_session()
 
@@ -352,6 +822,7 @@ class TestsParameters(unittest.TestCase):
         self.module.set_country = MagicMock()
         self.module.set_sun = MagicMock()
         self.module.set_position(48.8591554, 2.2907284)
+        self.module.position_pipeline.wait(5.0)
         self.module.set_country = original_set_country
 
         self.module.set_country()
@@ -364,15 +835,85 @@ class TestsParameters(unittest.TestCase):
             'country': 'France',
         }))
 
-    @patch('backend.parameters.reverse_geocode')
-    def test_set_country_geocode_exception(self, mock_reverse_geo):
-        mock_reverse_geo.search.side_effect = Exception('Test exception')
+    @patch('reverse_geocode.search')
+    def test_set_country_geocode_exception(self, mock_search):
+        mock_search.side_effect = Exception('Test exception')
         self.init_session()
+        self.module.country_index = Mock()
+        self.module.country_index.is_available.return_value = False
 
         self.module.set_country()
 
         self.assertFalse(self.session.event_called('parameters.country.update'))
 
+    @patch('reverse_geocode.search')
+    def test_set_country_from_cache(self, mock_search):
+        self.init_session()
+        self.module.geo_cache = Mock()
+        self.module.geo_cache.get.side_effect = lambda lat, lng, field: {'alpha2': 'FR', 'country': 'France'}[field]
+
+        self.module.set_country()
+
+        self.assertFalse(mock_search.called)
+        self.assertTrue(self.session.event_called_with('parameters.country.update', {
+            'alpha2': 'FR',
+            'country': 'France',
+        }))
+
+    @patch('backend.parameters.locale_engine')
+    def test_set_country_update_locale(self, mock_locale_engine):
+        self.init_session()
+        mock_locale_engine.set_country.assert_called_with('GB')
+        self.module.geo_cache = Mock()
+        self.module.geo_cache.get.side_effect = lambda lat, lng, field: {'alpha2': 'FR', 'country': 'France'}[field]
+
+        self.module.set_country()
+
+        mock_locale_engine.set_country.assert_called_with('FR')
+
+    @patch('reverse_geocode.search')
+    def test_set_country_update_cache(self, mock_search):
+        mock_search.return_value = [{'country': 'France', 'country_code': 'FR'}]
+        self.init_session()
+        self.module.country_index = Mock()
+        self.module.country_index.is_available.return_value = False
+        self.module.geo_cache = Mock()
+        self.module.geo_cache.get.return_value = None
+
+        self.module.set_country()
+
+        self.module.geo_cache.update.assert_called_with(52.2040, 0.1208, country='France', alpha2='FR')
+
+    @patch('reverse_geocode.search')
+    def test_set_country_from_index(self, mock_search):
+        self.init_session()
+        self.module.geo_cache = Mock()
+        self.module.geo_cache.get.return_value = None
+
+        self.module.set_country()
+
+        self.assertFalse(mock_search.called)
+        self.module.geo_cache.update.assert_called_with(52.2040, 0.1208, country='United Kingdom', alpha2='GB')
+        self.assertTrue(self.session.event_called_with('parameters.country.update', {
+            'alpha2': 'GB',
+            'country': 'United Kingdom',
+        }))
+
+    @patch('reverse_geocode.search')
+    def test_set_country_index_failure_fallback(self, mock_search):
+        mock_search.return_value = [{'country': 'France', 'country_code': 'FR'}]
+        self.init_session()
+        self.module.country_index = Mock()
+        self.module.country_index.is_available.return_value = True
+        self.module.country_index.lookup.side_effect = ValueError('Invalid country index file')
+        self.module.geo_cache = Mock()
+        self.module.geo_cache.get.return_value = None
+
+        self.module.set_country()
+
+        self.assertTrue(mock_search.called)
+        self.module.geo_cache.update.assert_called_with(52.2040, 0.1208, country='France', alpha2='FR')
+
     def test_set_country_commanderror(self):
         self.init_session()
         original_set_country = self.module.set_country
@@ -380,6 +921,7 @@ class TestsParameters(unittest.TestCase):
         self.module.set_country = MagicMock()
         self.module.set_sun = MagicMock()
         self.module.set_position(48.8591554, 2.2907284)
+        self.module.position_pipeline.wait(5.0)
         self.module.set_country = original_set_country
         self.module._set_config_field = Mock(return_value=False)
 
@@ -387,6 +929,196 @@ class TestsParameters(unittest.TestCase):
             self.module.set_country()
         self.assertEqual(str(cm.exception), 'Unable to save country')
 
+    @patch('backend.parameters.Sun')
+    @patch('time.time')
+    def test_set_sun_build_ephemeris(self, mock_time, mock_sun):
+        mock_time.return_value = 1591645808
+        self.init_session(mock_sun=mock_sun)
+
+        self.module.set_sun()
+
+        self.assertIsNotNone(self.module.sun_ephemeris)
+        today = self.module.sun_ephemeris.get_day(0)
+        self.assertEqual(today['sunrise'], self.module.suns['sunrise'])
+        self.assertEqual(today['sunset'], self.module.suns['sunset'])
+        self.assertIsNotNone(today['civil_dawn'])
+
+    def test_set_sun_no_position(self):
+        self.init_session()
+        self.module._set_config_field('position', {
+            'latitude': 0,
+            'longitude': 0
+        })
+
+        self.module.set_sun()
+
+        self.assertIsNone(self.module.sun_ephemeris)
+        self.assertEqual(self.module.get_sun_schedule(), [])
+        self.assertIsNone(self.module.get_next_sun_event())
+
+    @patch('time.time')
+    def test_get_sun_schedule(self, mock_time):
+        mock_time.return_value = 1591645808
+        self.init_session()
+
+        schedule = self.module.get_sun_schedule(3)
+
+        self.assertEqual(len(schedule), 3)
+        for field in ('date', 'sunrise', 'sunrise_iso', 'sunset', 'sunset_iso', 'noon', 'civil_dawn', 'civil_dusk', 'nautical_dawn', 'nautical_dusk'):
+            self.assertTrue(field in schedule[0])
+        self.assertEqual(len(self.module.get_sun_schedule(30)), 30)
+
+    def test_get_sun_schedule_invalid_params(self):
+        self.init_session()
+
+        with self.assertRaises(InvalidParameter) as cm:
+            self.module.get_sun_schedule(0)
+        self.assertEqual(str(cm.exception), 'Parameter "days" must be between 1 and %d' % Parameters.MAX_SUN_SCHEDULE_DAYS)
+        with self.assertRaises(InvalidParameter):
+            self.module.get_sun_schedule(Parameters.MAX_SUN_SCHEDULE_DAYS + 1)
+        with self.assertRaises(InvalidParameter):
+            self.module.get_sun_schedule('7')
+        with self.assertRaises(InvalidParameter):
+            self.module.get_sun_schedule(True)
+
+    def test_state_is_immutable(self):
+        self.init_session()
+        state = self.module.state
+
+        with self.assertRaises(AttributeError):
+            self.module.suns = {}
+        with self.assertRaises(AttributeError):
+            state.sunrise = None
+
+        self.module.set_sun()
+        self.assertIsNot(self.module.state, state)
+        self.assertIs(self.module.state.timezone, state.timezone)
+
+    @patch('time.time', MagicMock(return_value=1591645808))
+    def test_getters_consistent_while_position_changes(self):
+        self.init_session()
+        positions = [
+            (48.8591554, 2.2907284),
+            (40.7127281, -74.0060152),
+            (-33.8688197, 151.2092955),
+            (35.6828387, 139.7594549),
+        ]
+
+        def set_position(index):
+            self.module.set_position(*positions[index % len(positions)])
+            self.assertTrue(self.module.position_pipeline.wait(30.0))
+
+        def get_key(timezone_name, sunrise, sunset):
+            return timezone_name, sunrise, sunset
+
+        # timezone and sun times of each position, any other combination is a mixed state
+        expected_keys = []
+        expected_suns = []
+        for index in range(len(positions)):
+            set_position(index)
+            state = self.module.state
+            expected_keys.append(get_key(state.timezone_name, state.suns['sunrise'], state.suns['sunset']))
+            expected_suns.append(dict(state.suns))
+        expected_pairs = [(key[1], key[2]) for key in expected_keys]
+
+        stop = Event()
+        errors = []
+        reads = []
+
+        def read():
+            count = 0
+            while not stop.is_set():
+                try:
+                    state = self.module.state
+                    if get_key(state.timezone_name, state.suns['sunrise'], state.suns['sunset']) not in expected_keys:
+                        errors.append('mixed state: %s %s' % (state.timezone_name, state.suns))
+                    today = state.sun_ephemeris.get_day(0)
+                    if (today['sunrise'], today['sunset']) != (state.suns['sunrise'], state.suns['sunset']):
+                        errors.append('ephemeris and sun times mismatch: %s %s' % (today, state.suns))
+                    if state.sun_ephemeris.tz is not state.timezone:
+                        errors.append('ephemeris timezone mismatch: %s' % state.timezone_name)
+                    suns = self.module.get_sun()
+                    if suns not in expected_suns:
+                        errors.append('unexpected sun times: %s' % suns)
+                    next_event = self.module.get_next_sun_event()
+                    if next_event['timestamp'] <= 1591645808:
+                        errors.append('invalid next sun event: %s' % next_event)
+                    if len(self.module.get_sun_schedule(10)) != 10:
+                        errors.append('invalid sun schedule')
+                    for device in self.module.get_module_devices().values():
+                        if device['type'] == 'clock' and (device['sunrise'], device['sunset']) not in expected_pairs:
+                            errors.append('unexpected device sun times: %s' % device)
+                    context = get_time_context()
+                    if get_key(context.timezone_name, context.snapshot.sunrise, context.snapshot.sunset) not in expected_keys:
+                        errors.append('mixed time context: %s %s' % (context.timezone_name, context.snapshot.as_dict()))
+                except Exception as e:
+                    errors.append('%s: %s' % (e.__class__.__name__, str(e)))
+                count += 1
+            reads.append(count)
+
+        readers = [Thread(target=read) for _ in range(8)]
+        for reader in readers:
+            reader.start()
+        try:
+            for index in range(20):
+                set_position(index)
+        finally:
+            stop.set()
+            for reader in readers:
+                reader.join()
+
+        self.assertEqual(errors, [])
+        self.assertGreater(sum(reads), 0)
+
+    @patch('time.time')
+    def test_get_next_sun_event(self, mock_time):
+        mock_time.return_value = 1591645808
+        self.init_session()
+
+        next_event = self.module.get_next_sun_event()
+
+        self.assertTrue(next_event['event'] in ('nautical_dawn', 'civil_dawn', 'sunrise', 'noon', 'sunset', 'civil_dusk', 'nautical_dusk'))
+        self.assertGreater(next_event['timestamp'], 1591645808)
+        self.assertTrue('iso' in next_event)
+
+    @patch('time.time')
+    def test_time_context_published(self, mock_time):
+        mock_time.return_value = 1591645808
+        self.init_session()
+
+        context = get_time_context()
+
+        self.assertIs(context.snapshot, self.module._Parameters__time_snapshot)
+        self.assertEqual(context.timezone_name, self.module.timezone.zone)
+        self.assertIs(context.timezone, self.module.timezone)
+        self.assertEqual(context.next_sunrise['event'], 'sunrise')
+        self.assertGreater(context.next_sunrise['timestamp'], 1591645808)
+        self.assertEqual(context.next_sunset['event'], 'sunset')
+        self.assertEqual(context.next_sun_event, self.module.get_next_sun_event())
+
+    @patch('time.time')
+    def test_time_context_updated(self, mock_time):
+        mock_time.return_value = 1591645808
+        self.init_session()
+        context = get_time_context()
+
+        mock_time.return_value = 1591645868
+        self.module._time_task()
+        self.assertGreater(get_time_context().version, context.version)
+        self.assertEqual(get_time_context().snapshot.timestamp, 1591645868)
+
+        context = get_time_context()
+        self.module.set_sun()
+        self.assertGreater(get_time_context().version, context.version)
+
+    def test_time_context_cleared_on_stop(self):
+        self.init_session()
+        self.assertIsNotNone(get_time_context())
+
+        self.module._on_stop()
+
+        self.assertIsNone(get_time_context())
+
     def test_set_country_no_position(self):
         self.init_session()
         self.module._set_config_field('position', {
@@ -403,10 +1135,32 @@ class TestsParameters(unittest.TestCase):
         self.module.set_country = MagicMock()
         self.module.set_sun = MagicMock()
         self.module.set_position(48.8591554, 2.2907284)
+        self.module.position_pipeline.wait(5.0)
         self.module.set_timezone = original_set_timezone
 
         self.assertTrue(self.module.set_timezone())
 
+    @patch('timezonefinder.TimezoneFinder')
+    def test_set_timezone_from_cache(self, mock_tzfinder):
+        self.init_session(mock_tzfinder=mock_tzfinder)
+        self.module.geo_cache = Mock()
+        self.module.geo_cache.get.return_value = 'Europe/London'
+
+        self.assertTrue(self.module.set_timezone())
+
+        self.assertFalse(mock_tzfinder.return_value.timezone_at.called)
+        self.assertFalse(self.module.geo_cache.update.called)
+
+    @patch('timezonefinder.TimezoneFinder')
+    def test_set_timezone_update_cache(self, mock_tzfinder):
+        self.init_session(mock_tzfinder=mock_tzfinder, tzfinder_timezoneat_return_value='Europe/London')
+        self.module.geo_cache = Mock()
+        self.module.geo_cache.get.return_value = None
+
+        self.assertTrue(self.module.set_timezone())
+
+        self.module.geo_cache.update.assert_called_with(52.2040, 0.1208, timezone='Europe/London')
+
     def test_set_timezone_no_position(self):
         self.init_session()
         self.module._set_config_field('position', {
@@ -416,19 +1170,19 @@ class TestsParameters(unittest.TestCase):
 
         self.assertFalse(self.module.set_timezone())
 
-    @patch('backend.parameters.TimezoneFinder')
+    @patch('timezonefinder.TimezoneFinder')
     def test_set_timezone_timezonefinder_exception(self, mock_tzfinder):
         self.init_session(mock_tzfinder=mock_tzfinder, tzfinder_timezoneat_side_effect=Exception('Test exception'))
 
         self.assertFalse(self.module.set_timezone())
 
-    @patch('backend.parameters.TimezoneFinder')
+    @patch('timezonefinder.TimezoneFinder')
     def test_set_timezone_timezonefinder_valueerror(self, mock_tzfinder):
         self.init_session(mock_tzfinder=mock_tzfinder, tzfinder_timezoneat_side_effect=ValueError('Test exception'))
 
         self.assertFalse(self.module.set_timezone())
 
-    @patch('backend.parameters.TimezoneFinder')
+    @patch('timezonefinder.TimezoneFinder')
     def test_set_timezone_unable_set_config(self, mock_tzfinder):
         self.init_session(mock_tzfinder=mock_tzfinder, tzfinder_timezoneat_return_value='Europe/Paris')
 
@@ -437,7 +1191,7 @@ class TestsParameters(unittest.TestCase):
             self.module.set_timezone()
         self.assertEqual(str(cm.exception), 'Unable to save timezone')
 
-    @patch('backend.parameters.TimezoneFinder')
+    @patch('timezonefinder.TimezoneFinder')
     def test_set_timezone_invalid_timezone(self, mock_tzfinder):
         self.init_session(mock_tzfinder=mock_tzfinder, tzfinder_timezoneat_return_value='Europe/Dummy')
 
@@ -445,20 +1199,60 @@ class TestsParameters(unittest.TestCase):
             self.module.set_timezone()
         self.assertEqual(str(cm.exception), 'No system file found for "Europe/Dummy" timezone')
 
-    def test_set_timezone_unable_write_system_file(self):
+    @patch('backend.parameters.Console')
+    def test_set_timezone_native(self, mock_console):
+        self.init_session()
+
+        self.assertTrue(self.module.set_timezone())
+
+        self.module.timezone_applier.apply.assert_called_with('Europe/London')
+        self.assertFalse(mock_console.called)
+
+    @patch('backend.parameters.Console')
+    def test_set_timezone_native_failed_without_fallback(self, mock_console):
+        self.init_session(timezone_applied=False)
+        self.module.TIMEZONE_DPKG_FALLBACK = False
+
+        self.assertFalse(self.module.set_timezone())
+
+        self.assertFalse(mock_console.called)
+
+    @patch('backend.parameters.Console')
+    def test_set_timezone_native_failed_with_fallback(self, mock_console):
+        self.init_session(timezone_applied=False)
+        mock_console.return_value.command.return_value = {'returncode': 0, 'stderr': ''}
+
+        self.assertTrue(self.module.set_timezone())
+
+        mock_console.return_value.command.assert_called_with('/usr/sbin/dpkg-reconfigure -f noninteractive tzdata', timeout=15.0)
+
+    @patch('backend.parameters.Console')
+    def test_set_timezone_unknown_to_pytz(self, mock_console):
         self.init_session()
+        mock_console.return_value.command.return_value = {'returncode': 0, 'stderr': ''}
+        self.module.zoneinfo = Mock()
+        self.module.zoneinfo.is_valid.return_value = True
+        self.module.zoneinfo.get.return_value = None
+
+        self.assertTrue(self.module.set_timezone())
+
+        self.assertFalse(self.module.timezone_applier.apply.called)
+        mock_console.return_value.command.assert_called_with('/usr/sbin/dpkg-reconfigure -f noninteractive tzdata', timeout=15.0)
+
+    def test_set_timezone_unable_write_system_file(self):
+        self.init_session(timezone_applied=False)
 
         self.module.cleep_filesystem.write_data = Mock(return_value=False)
         self.assertFalse(self.module.set_timezone())
 
     @patch('backend.parameters.Console')
     def test_set_timezone_command_failed(self, mock_console):
-        self.init_session()
+        self.init_session(timezone_applied=False)
 
         mock_console.return_value.command.return_value = {'returncode': 1, 'stderr': 'Test error'}
         self.assertFalse(self.module.set_timezone())
 
-    @patch('backend.parameters.TimezoneFinder')
+    @patch('timezonefinder.TimezoneFinder')
     def test_set_timezone_timezonefinder_extend_timezone_search(self, mock_tzfinder):
         mock_tzfinder.return_value.closest_timezone_at = Mock(return_value='Europe/Paris')
         self.init_session(mock_tzfinder=mock_tzfinder, tzfinder_timezoneat_return_value=None)
@@ -468,17 +1262,149 @@ class TestsParameters(unittest.TestCase):
         })
 
         self.assertTrue(self.module.set_timezone())
-        mock_tzfinder.return_value.closest_timezone_at.assert_called_with(lat=52.204, lng=0.1208)
+        mock_tzfinder.return_value.closest_timezone_at.assert_called_with(lat=52.204, lng=0.1208, delta_degree=1)
 
-    @patch('backend.parameters.Console')
-    def test_sync_time(self, mock_console):
+    @patch('timezonefinder.TimezoneFinder')
+    def test_set_timezone_offshore(self, mock_tzfinder):
+        mock_tzfinder.return_value.closest_timezone_at = Mock(return_value=None)
+        self.init_session(mock_tzfinder=mock_tzfinder, tzfinder_timezoneat_return_value=None)
+        self.module.geo_cache = Mock()
+        self.module.geo_cache.get.return_value = None
+        self.module._set_config_field('position', {
+            'latitude': 45.0,
+            'longitude': -30.0,
+        })
+
+        self.assertTrue(self.module.set_timezone())
+
+        self.assertEqual(self.module._get_config_field('timezone'), 'Etc/GMT+2')
+        self.module.geo_cache.update.assert_called_with(45.0, -30.0, timezone='Etc/GMT+2')
+
+    def test_set_timezone_budget_exhausted_not_cached(self):
+        self.init_session()
+        self.module.geo_cache = Mock()
+        self.module.geo_cache.get.return_value = None
+        self.module.geo_backend = Mock()
+        self.module.geo_backend.timezone_at.return_value = None
+        self.module.timezone_search = Mock()
+        self.module.timezone_search.search.return_value = ('Etc/GMT+2', False)
+        self.module._set_config_field('position', {
+            'latitude': 45.0,
+            'longitude': -30.0,
+        })
+
+        self.assertTrue(self.module.set_timezone())
+
+        self.assertEqual(self.module._get_config_field('timezone'), 'Etc/GMT+2')
+        self.assertFalse(self.module.geo_cache.update.called)
+
+    @patch('timezonefinder.TimezoneFinder')
+    def test_set_timezone_load_timezone(self, mock_tzfinder):
+        self.init_session(mock_tzfinder=mock_tzfinder, tzfinder_timezoneat_return_value='Europe/Paris')
+        self.module.geo_cache = Mock()
+        self.module.geo_cache.get.return_value = None
+
+        self.assertTrue(self.module.set_timezone())
+
+        self.assertEqual(self.module.timezone.zone, 'Europe/Paris')
+        self.assertEqual(self.module.timezone_transitions.zone, 'Europe/Paris')
+
+    def test_configure_unknown_timezone(self):
+        self.init_session(start=False)
+        original_get_config_field = self.module._get_config_field
+        self.module._get_config_field = lambda field: 'Europe/Dummy' if field == 'timezone' else original_get_config_field(field)
+
+        self.session.start_module(self.module)
+
+        self.assertIsNotNone(self.module.timezone_transitions)
+        self.assertNotEqual(self.module.timezone_transitions.zone, 'Europe/Dummy')
+
+    def test_get_timezones(self):
+        self.init_session()
+
+        timezones = self.module.get_timezones()
+
+        self.assertTrue('Europe/London' in timezones)
+        self.assertEqual(timezones, sorted(timezones))
+
+    @patch('backend.parameters.read_ntpdate_servers', Mock(return_value=['ntp.example.com']))
+    def test_ntp_servers_from_ntpdate(self):
         self.init_session()
 
+        self.assertEqual(self.module.sntp_client.servers, ['ntp.example.com'])
+
+    @patch('backend.parameters.read_ntpdate_servers', Mock(return_value=[]))
+    def test_ntp_servers_default(self):
+        self.init_session()
+
+        self.assertEqual(self.module.sntp_client.servers, self.module.NTP_SERVERS)
+
+    def test_sync_time(self):
+        self.init_session()
+        self.module.sntp_client = Mock()
+        self.module.sntp_client.sync.return_value = SntpSample('0.debian.pool.ntp.org', 0.5, 0.02, 2)
+
+        self.assertTrue(self.module.sync_time())
+
+        self.assertTrue(self.module.sntp_client.sync.called)
+
+    def test_sync_time_details(self):
+        self.init_session()
+        self.module.sntp_client = Mock()
+        self.module.sntp_client.sync.return_value = SntpSample('0.debian.pool.ntp.org', 0.5, 0.02, 2)
+
+        self.assertEqual(self.module.sync_time(details=True), {
+            'server': '0.debian.pool.ntp.org',
+            'offset': 0.5,
+            'delay': 0.02,
+            'stratum': 2,
+        })
+
+    def test_sync_time_no_server(self):
+        self.init_session()
+        self.module.sntp_client = Mock()
+        self.module.sntp_client.sync.return_value = None
+
+        self.assertFalse(self.module.sync_time())
+        self.assertFalse(self.module.sync_time(details=True))
+
+    def test_sync_time_set_clock_failed(self):
+        self.init_session()
+        self.module.sntp_client = Mock()
+        self.module.sntp_client.sync.side_effect = PermissionError('Test exception')
+
+        self.assertFalse(self.module.sync_time())
+
+    def test_get_stats(self):
+        self.init_session()
+        self.module.sntp_client = Mock()
+        self.module.sntp_client.sync.return_value = None
+        self.module.op_stats.reset()
+
         self.module.sync_time()
+        self.module._set_config_field('country', {'country': 'France', 'alpha2': 'FR'})
+        stats = self.module.get_stats()
+
+        self.assertEqual(stats['sync_time']['count'], 1)
+        self.assertEqual(stats['sync_time']['errors'], 1)
+        self.assertEqual(stats['config_write']['count'], 1)
+        self.assertEqual(stats['config_write']['errors'], 0)
+        for key in ('last', 'mean', 'p50', 'p95', 'max'):
+            self.assertTrue(key in stats['sync_time'])
+
+    def test_on_minute_log_stats(self):
+        self.init_session()
+        self.module._time_task = Mock()
+        self.module.logger = Mock()
+        self.module.STATS_LOG_INTERVAL = 5
+
+        self.module._on_minute(1591645800, False)
+        self.module._on_minute(1591645860, False)
+
+        self.assertEqual(self.module.logger.debug.call_count, 1)
+        self.assertTrue(self.module.logger.debug.call_args[0][0].startswith('Operations stats:'))
 
-        mock_console.return_value.command.assert_called_with('/usr/sbin/ntpdate-debian', timeout=60.0)
 
-        
 
 # do not remove code below, otherwise test won't run
 if __name__ == '__main__':
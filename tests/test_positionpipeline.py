@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import logging
+import sys
+sys.path.append('../')
+from backend.positionpipeline import PositionPipeline
+from threading import Event, Lock
+from mock import Mock
+
+class TestsPositionPipeline(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.FATAL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        self.progress = []
+        self.lock = Lock()
+        self.pipeline = PositionPipeline(self._on_progress)
+
+    def tearDown(self):
+        self.pipeline.wait(5.0)
+
+    def _on_progress(self, job_id, status, step, progress):
+        with self.lock:
+            self.progress.append((job_id, status, step, progress))
+
+    def test_submit_returns_immediately(self):
+        release = Event()
+        job_id = self.pipeline.submit([[('step', lambda: release.wait(5.0))]])
+
+        self.assertTrue(isinstance(job_id, str))
+        self.assertTrue(self.pipeline.is_running())
+        release.set()
+        self.assertTrue(self.pipeline.wait(5.0))
+        self.assertFalse(self.pipeline.is_running())
+
+    def test_run_stages(self):
+        calls = []
+        job_id = self.pipeline.submit([
+            [('first', lambda: calls.append('first'))],
+            [('second', lambda: calls.append('second'))],
+        ])
+        self.assertTrue(self.pipeline.wait(5.0))
+
+        self.assertEqual(calls, ['first', 'second'])
+        self.assertEqual(self.progress, [
+            (job_id, 'running', None, 0),
+            (job_id, 'running', 'first', 50),
+            (job_id, 'running', 'second', 100),
+            (job_id, 'done', None, 100),
+        ])
+
+    def test_run_stage_steps_in_parallel(self):
+        first_started = Event()
+        second_started = Event()
+
+        def first():
+            first_started.set()
+            return second_started.wait(5.0)
+
+        def second():
+            second_started.set()
+            return first_started.wait(5.0)
+
+        self.pipeline.submit([[('first', first), ('second', second)]])
+        self.assertTrue(self.pipeline.wait(5.0))
+
+        self.assertEqual(self.progress[-1][1], 'done')
+
+    def test_failed_step(self):
+        last = Mock()
+        job_id = self.pipeline.submit([
+            [('ok', Mock()), ('ko', Mock(return_value=False))],
+            [('last', last)],
+        ])
+        self.assertTrue(self.pipeline.wait(5.0))
+
+        self.assertTrue(last.called)
+        self.assertEqual(self.progress[-1], (job_id, 'failed', 'ko', 100))
+
+    def test_step_exception(self):
+        job_id = self.pipeline.submit([[('crash', Mock(side_effect=Exception('Test exception')))]])
+        self.assertTrue(self.pipeline.wait(5.0))
+
+        self.assertEqual(self.progress[-1], (job_id, 'failed', 'crash', 100))
+
+    def test_supersede(self):
+        started = Event()
+        release = Event()
+        skipped = Mock()
+
+        def blocking():
+            started.set()
+            return release.wait(5.0)
+
+        first_id = self.pipeline.submit([
+            [('blocking', blocking)],
+            [('skipped', skipped)],
+        ])
+        self.assertTrue(started.wait(5.0))
+        pending_id = self.pipeline.submit([[('pending', Mock())]])
+        last_id = self.pipeline.submit([[('last', Mock())]])
+        release.set()
+        self.assertTrue(self.pipeline.wait(5.0))
+
+        self.assertFalse(skipped.called)
+        statuses = [(job_id, status) for job_id, status, _, _ in self.progress if status != 'running']
+        self.assertEqual(statuses, [
+            (pending_id, 'superseded'),
+            (first_id, 'superseded'),
+            (last_id, 'done'),
+        ])
+
+    def test_progress_callback_exception(self):
+        pipeline = PositionPipeline(Mock(side_effect=Exception('Test exception')))
+        step = Mock()
+        pipeline.submit([[('step', step)]])
+
+        self.assertTrue(pipeline.wait(5.0))
+        self.assertTrue(step.called)
+
+
+# do not remove code below, otherwise test won't run
+if __name__ == '__main__':
+    # coverage run --omit="*/lib/python*/*","test_*" --concurrency=thread test_positionpipeline.py; coverage report -m -i
+    unittest.main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import logging
+import sys
+sys.path.append('../')
+from backend import positionresolver
+from backend.positionresolver import resolve_positions
+from backend.solarcalc import sun_events
+from backend import solarvector
+from datetime import date
+from mock import Mock, patch
+
+class TestsPositionResolver(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.FATAL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        self.geo_backend = Mock()
+        self.geo_backend.search_countries.side_effect = lambda coordinates: [
+            {'country': 'France', 'country_code': 'FR'} for _ in coordinates
+        ]
+        self.geo_backend.timezones_at.side_effect = lambda coordinates, timezone_search, budget: ['Europe/Paris' for _ in coordinates]
+        self.day = date(2020, 6, 8)
+
+    def test_resolve_positions(self):
+        results = resolve_positions([
+            {'latitude': 48.8566, 'longitude': 2.3522},
+            (43.2965, 5.3698),
+        ], self.geo_backend, day=self.day)
+
+        paris = sun_events(self.day, 48.8566, 2.3522)
+        self.assertEqual(results[0], {
+            'latitude': 48.8566,
+            'longitude': 2.3522,
+            'timezone': 'Europe/Paris',
+            'country': 'France',
+            'alpha2': 'FR',
+            'sunrise': paris['sunrise'],
+            'sunset': paris['sunset'],
+            'error': None,
+        })
+        self.assertEqual(results[1]['latitude'], 43.2965)
+        self.assertEqual(results[1]['alpha2'], 'FR')
+
+    def test_resolve_positions_single_batch_calls(self):
+        resolve_positions([(48.8566, 2.3522)] * 10, self.geo_backend, day=self.day)
+
+        self.assertEqual(self.geo_backend.search_countries.call_count, 1)
+        self.assertEqual(self.geo_backend.timezones_at.call_count, 1)
+        self.assertEqual(len(self.geo_backend.search_countries.call_args[0][0]), 10)
+
+    def test_resolve_positions_timezone_search(self):
+        timezone_search = Mock()
+
+        resolve_positions([(45.0, -30.0)], self.geo_backend, day=self.day, timezone_search=timezone_search, timezone_search_budget=5.0)
+
+        self.geo_backend.timezones_at.assert_called_once_with([(45.0, -30.0)], timezone_search, 5.0)
+
+    def test_resolve_positions_invalid_positions(self):
+        results = resolve_positions([
+            {'latitude': 48.8566},
+            (91.0, 2.0),
+            (48.0, 181),
+            (True, 2.0),
+            ('48', '2'),
+            'dummy',
+            (48, 2),
+        ], self.geo_backend, day=self.day)
+
+        self.assertEqual([result['error'] for result in results], ['Invalid position'] * 6 + [None])
+        self.assertIsNone(results[0]['timezone'])
+        self.assertEqual(results[6]['timezone'], 'Europe/Paris')
+        self.assertEqual(self.geo_backend.search_countries.call_args[0][0], [(48.0, 2.0)])
+
+    def test_resolve_positions_no_valid_position(self):
+        results = resolve_positions([(91.0, 2.0)], self.geo_backend, day=self.day)
+
+        self.assertEqual(results[0]['error'], 'Invalid position')
+        self.assertFalse(self.geo_backend.search_countries.called)
+        self.assertFalse(self.geo_backend.timezones_at.called)
+
+    def test_resolve_positions_empty(self):
+        self.assertEqual(resolve_positions([], self.geo_backend), [])
+
+    def test_resolve_positions_polar(self):
+        results = resolve_positions([(80.0, 0.0)], self.geo_backend, day=self.day)
+
+        self.assertIsNone(results[0]['sunrise'])
+        self.assertIsNone(results[0]['sunset'])
+
+    def test_resolve_positions_geo_exceptions(self):
+        self.geo_backend.search_countries.side_effect = Exception('Test exception')
+        self.geo_backend.timezones_at.side_effect = Exception('Test exception')
+
+        results = resolve_positions([(48.8566, 2.3522)], self.geo_backend, day=self.day)
+
+        self.assertIsNone(results[0]['country'])
+        self.assertIsNone(results[0]['timezone'])
+        self.assertIsNotNone(results[0]['sunrise'])
+
+    @unittest.skipUnless(solarvector.is_available(), 'numpy is not installed')
+    def test_resolve_positions_vectorized_same_as_scalar(self):
+        positions = [(-60.0 + index * 3.7, -170.0 + index * 10.3) for index in range(positionresolver.VECTORIZED_MIN_POSITIONS)]
+        vectorized = resolve_positions(positions, self.geo_backend, day=self.day)
+        with patch('backend.positionresolver.solarvector.is_available', Mock(return_value=False)):
+            scalar = resolve_positions(positions, self.geo_backend, day=self.day)
+
+        for vectorized_result, scalar_result in zip(vectorized, scalar):
+            for key in ('sunrise', 'sunset'):
+                if scalar_result[key] is None:
+                    self.assertIsNone(vectorized_result[key])
+                else:
+                    self.assertLessEqual(abs(vectorized_result[key] - scalar_result[key]), 1)
+
+
+    def test_resolve_positions_with_index(self):
+        index = Mock()
+        index.is_available.return_value = True
+        index.lookup.side_effect = [('GB', 'United Kingdom'), None]
+
+        results = resolve_positions([(52.204, 0.1208), (48.8591554, 2.2907284)], self.geo_backend, country_index=index)
+
+        self.assertEqual(results[0]['alpha2'], 'GB')
+        self.assertEqual(results[1]['alpha2'], 'FR')
+        self.geo_backend.search_countries.assert_called_once_with([(48.8591554, 2.2907284)])
+
+
+# do not remove code below, otherwise test won't run
+if __name__ == '__main__':
+    # coverage run --omit="*/lib/python*/*","test_*" --concurrency=thread test_positionresolver.py; coverage report -m -i
+    unittest.main()
@@ -0,0 +1,265 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import logging
+import sys
+sys.path.append('../')
+from backend.sntpclient import SntpClient, SntpSample, SntpError, to_ntp_timestamp, from_ntp_timestamp, read_ntpdate_servers
+from mock import Mock, patch
+from threading import Thread
+import socket
+import time
+import os
+import tempfile
+
+class FakeNtpServer(Thread):
+    """
+    Local UDP NTP server stand-in. Server clock is ahead of local clock by offset
+    """
+
+    def __init__(self, offset=0.0, delay=0.0, stratum=2, flags=0x24, reply=True, originate=None, receive=None):
+        Thread.__init__(self, daemon=True)
+        self.offset = offset
+        self.delay = delay
+        self.stratum = stratum
+        self.flags = flags
+        self.reply = reply
+        self.originate = originate
+        self.receive = receive
+        self.requests = 0
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(('127.0.0.1', 0))
+        self.port = self.sock.getsockname()[1]
+
+    def run(self):
+        while True:
+            try:
+                data, address = self.sock.recvfrom(512)
+            except OSError:
+                return
+            self.requests += 1
+            if not self.reply:
+                continue
+            request = SntpClient.PACKET.unpack(data)
+            received = time.time() + self.offset
+            # server processing duration, included in measured delay but not in round trip delay
+            time.sleep(self.delay)
+            originate = request[10] if self.originate is None else self.originate
+            response = SntpClient.PACKET.pack(
+                self.flags, self.stratum, 6, -20, 0, 0, b'LOCL', 0,
+                originate, to_ntp_timestamp(received) if self.receive is None else self.receive, to_ntp_timestamp(time.time() + self.offset)
+            )
+            try:
+                self.sock.sendto(response, address)
+            except OSError:
+                # closed while processing request
+                return
+
+    def close(self):
+        self.sock.close()
+
+class TestsSntpClient(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.FATAL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        self.servers = []
+        self.set_clock = Mock()
+
+    def tearDown(self):
+        for server in self.servers:
+            server.close()
+
+    def start_server(self, **kwargs):
+        server = FakeNtpServer(**kwargs)
+        server.start()
+        self.servers.append(server)
+        return server
+
+    def init(self, servers, timeout=1.0):
+        return SntpClient(['127.0.0.1:%d' % server.port for server in servers], timeout=timeout, set_clock=self.set_clock)
+
+    def test_ntp_timestamp_conversion(self):
+        self.assertEqual(to_ntp_timestamp(0.0), 2208988800 << 32)
+        self.assertAlmostEqual(from_ntp_timestamp(to_ntp_timestamp(1591645808.25)), 1591645808.25, places=6)
+
+    def test_query(self):
+        server = self.start_server(offset=3600.0)
+        client = SntpClient(['127.0.0.1'], port=server.port, timeout=1.0)
+
+        sample = client.query('127.0.0.1')
+
+        self.assertAlmostEqual(sample.offset, 3600.0, delta=0.05)
+        self.assertGreaterEqual(sample.delay, 0.0)
+        self.assertLess(sample.delay, 0.05)
+        self.assertEqual(sample.stratum, 2)
+        self.assertEqual(sample.server, '127.0.0.1')
+
+    def test_query_server_port(self):
+        server = self.start_server(offset=10.0)
+        client = SntpClient([])
+
+        sample = client.query('127.0.0.1:%d' % server.port)
+
+        self.assertAlmostEqual(sample.offset, 10.0, delta=0.05)
+        self.assertEqual(sample.server, '127.0.0.1:%d' % server.port)
+
+    def test_query_negative_offset(self):
+        server = self.start_server(offset=-120.0)
+        client = SntpClient(['127.0.0.1'], port=server.port, timeout=1.0)
+
+        self.assertAlmostEqual(client.query('127.0.0.1').offset, -120.0, delta=0.05)
+
+    def test_query_kiss_of_death(self):
+        server = self.start_server(stratum=0)
+        client = SntpClient(['127.0.0.1'], port=server.port, timeout=1.0)
+
+        with self.assertRaises(SntpError):
+            client.query('127.0.0.1')
+
+    def test_query_unsynchronized_server(self):
+        server = self.start_server(flags=0xE4)
+        client = SntpClient(['127.0.0.1'], port=server.port, timeout=1.0)
+
+        with self.assertRaises(SntpError):
+            client.query('127.0.0.1')
+
+    def test_query_invalid_mode(self):
+        server = self.start_server(flags=0x23)
+        client = SntpClient(['127.0.0.1'], port=server.port, timeout=1.0)
+
+        with self.assertRaises(SntpError):
+            client.query('127.0.0.1')
+
+    def test_query_zero_receive_timestamp(self):
+        server = self.start_server(receive=0)
+        client = SntpClient(['127.0.0.1'], port=server.port, timeout=1.0)
+
+        with self.assertRaises(SntpError):
+            client.query('127.0.0.1')
+
+    def test_query_unexpected_response_dropped(self):
+        server = self.start_server(originate=12345)
+        client = SntpClient(['127.0.0.1'], port=server.port, timeout=0.2)
+
+        with self.assertRaises(socket.timeout):
+            client.query('127.0.0.1')
+
+    def test_query_timeout(self):
+        server = self.start_server(reply=False)
+        client = SntpClient(['127.0.0.1'], port=server.port, timeout=0.2)
+
+        with self.assertRaises(socket.timeout):
+            client.query('127.0.0.1')
+
+    def test_query_timeout_includes_name_resolution(self):
+        server = self.start_server(delay=0.2)
+        client = SntpClient(['127.0.0.1'], port=server.port, timeout=0.3)
+        getaddrinfo = socket.getaddrinfo
+        def slow_getaddrinfo(*args, **kwargs):
+            time.sleep(0.2)
+            return getaddrinfo(*args, **kwargs)
+
+        with patch('backend.sntpclient.socket.getaddrinfo', side_effect=slow_getaddrinfo):
+            with self.assertRaises(socket.timeout):
+                client.query('127.0.0.1')
+
+    def test_query_all_hung_resolver(self):
+        server = self.start_server()
+        client = SntpClient(['dummy.invalid', '127.0.0.1:%d' % server.port], timeout=0.3)
+        getaddrinfo = socket.getaddrinfo
+        def hung_getaddrinfo(host, *args, **kwargs):
+            if host == 'dummy.invalid':
+                time.sleep(1.5)
+            return getaddrinfo(host, *args, **kwargs)
+
+        with patch('backend.sntpclient.socket.getaddrinfo', side_effect=hung_getaddrinfo):
+            start = time.monotonic()
+            samples = client.query_all()
+            duration = time.monotonic() - start
+
+        self.assertLess(duration, 1.0)
+        self.assertEqual([sample.server for sample in samples], ['127.0.0.1:%d' % server.port])
+
+    def test_query_all_concurrent(self):
+        servers = [self.start_server(offset=10.0, delay=0.3) for _ in range(3)]
+        client = self.init(servers)
+
+        start = time.monotonic()
+        samples = client.query_all()
+
+        self.assertEqual(len(samples), 3)
+        self.assertLess(time.monotonic() - start, 0.8)
+
+    def test_query_all_failed_servers_ignored(self):
+        servers = [self.start_server(reply=False), self.start_server(stratum=0), self.start_server(offset=5.0)]
+        client = self.init(servers, timeout=0.3)
+
+        samples = client.query_all()
+
+        self.assertEqual(len(samples), 1)
+        self.assertAlmostEqual(samples[0].offset, 5.0, delta=0.05)
+
+    def test_query_all_no_server(self):
+        self.assertEqual(SntpClient([]).query_all(), [])
+
+    def test_query_unknown_host(self):
+        client = SntpClient(['dummy.invalid'], timeout=0.2)
+
+        self.assertEqual(client.query_all(), [])
+
+    def test_best_sample(self):
+        client = SntpClient([])
+        samples = [
+            SntpSample('a', 1.0, 0.050, 1),
+            SntpSample('b', 1.1, 0.010, 3),
+            SntpSample('c', 1.2, 0.010, 2),
+        ]
+
+        self.assertEqual(client.get_best_sample(samples).server, 'c')
+        self.assertIsNone(client.get_best_sample([]))
+
+    def test_sync(self):
+        servers = [self.start_server(offset=60.0, delay=0.2), self.start_server(offset=30.0)]
+        client = self.init(servers)
+
+        sample = client.sync()
+
+        # fastest server selected
+        self.assertAlmostEqual(sample.offset, 30.0, delta=0.05)
+        self.set_clock.assert_called_once_with(sample.offset)
+
+    def test_sync_no_answer(self):
+        servers = [self.start_server(reply=False)]
+        client = self.init(servers, timeout=0.2)
+
+        self.assertIsNone(client.sync())
+        self.assertFalse(self.set_clock.called)
+
+    def write_file(self, content):
+        fd, path = tempfile.mkstemp()
+        with os.fdopen(fd, 'w') as output:
+            output.write(content)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_read_ntpdate_servers(self):
+        path = self.write_file('# comment\nNTPDATE_USE_NTP_CONF=yes\nNTPSERVERS="ntp.example.com 1.pool.ntp.org"\nNTPOPTIONS=""\n')
+
+        self.assertEqual(read_ntpdate_servers(path), ['ntp.example.com', '1.pool.ntp.org'])
+
+    def test_read_ntpdate_servers_no_server(self):
+        path = self.write_file('NTPSERVERS=""\n')
+
+        self.assertEqual(read_ntpdate_servers(path), [])
+
+    def test_read_ntpdate_servers_missing_file(self):
+        self.assertEqual(read_ntpdate_servers('/dummy/ntpdate'), [])
+
+    def test_sample_as_dict(self):
+        self.assertEqual(SntpSample('a', 1.5, 0.02, 2).as_dict(), {'server': 'a', 'offset': 1.5, 'delay': 0.02, 'stratum': 2})
+
+
+# do not remove code below, otherwise test won't run
+if __name__ == '__main__':
+    # coverage run --omit="*/lib/python*/*","test_*" --concurrency=thread test_sntpclient.py; coverage report -m -i
+    unittest.main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import logging
+import sys
+sys.path.append('../')
+from backend.solarcalc import sun_events, day_number
+from datetime import date
+
+class TestsSolarCalc(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.FATAL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+
+    def assertTimestampNear(self, value, expected, tolerance=120):
+        self.assertIsNotNone(value)
+        self.assertLessEqual(abs(value - expected), tolerance, '%s != %s' % (value, expected))
+
+    def test_day_number(self):
+        self.assertEqual(day_number(date(2000, 1, 1)), 0)
+        self.assertEqual(day_number(date(2020, 6, 8)), 7464)
+
+    def test_paris(self):
+        events = sun_events(date(2020, 6, 8), 48.8566, 2.3522)
+
+        # 2020-06-08 sunrise 05:47 CEST, sunset 21:53 CEST, solar noon 13:50 CEST
+        self.assertTimestampNear(events['sunrise'], 1591588020)
+        self.assertTimestampNear(events['sunset'], 1591645980)
+        self.assertTimestampNear(events['noon'], 1591617000)
+        self.assertLess(events['nautical_dawn'], events['civil_dawn'])
+        self.assertLess(events['civil_dawn'], events['sunrise'])
+        self.assertLess(events['sunset'], events['civil_dusk'])
+        self.assertLess(events['civil_dusk'], events['nautical_dusk'])
+
+    def test_southern_hemisphere(self):
+        events = sun_events(date(2020, 6, 8), -33.87, 151.21)
+
+        # 2020-06-08 sydney sunrise 06:55 AEST, sunset 16:53 AEST
+        self.assertTimestampNear(events['sunrise'], 1591563300)
+        self.assertTimestampNear(events['sunset'], 1591599180)
+
+    def test_polar_day(self):
+        events = sun_events(date(2020, 6, 21), 69.65, 18.96)
+
+        self.assertIsNotNone(events['noon'])
+        self.assertIsNone(events['sunrise'])
+        self.assertIsNone(events['sunset'])
+        self.assertIsNone(events['nautical_dusk'])
+
+    def test_polar_night(self):
+        events = sun_events(date(2020, 12, 21), 78.22, 15.65)
+
+        self.assertIsNone(events['sunrise'])
+        self.assertIsNone(events['civil_dawn'])
+
+
+# do not remove code below, otherwise test won't run
+if __name__ == '__main__':
+    # coverage run --omit="*/lib/python*/*","test_*" --concurrency=thread test_solarcalc.py; coverage report -m -i
+    unittest.main()
+
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import logging
+import sys
+sys.path.append('../')
+from backend import solarvector
+from backend.solarcalc import sun_events
+from datetime import date, datetime, timedelta
+from mock import patch, Mock
+
+@unittest.skipIf(not solarvector.is_available(), 'numpy is not installed')
+class TestsSolarVector(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.FATAL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        self.days = [date(2020, 1, 1) + timedelta(days=day) for day in range(0, 366, 5)]
+        self.latitudes = [52.2040, 48.8566, -33.87, 69.65, 78.22, 0.0, -54.8]
+        self.longitudes = [0.1208, 2.3522, 151.21, 18.96, 15.65, -170.0, -68.3]
+
+    def test_shape(self):
+        events = solarvector.sun_events_array(self.days, self.latitudes, self.longitudes)
+
+        self.assertEqual(set(events.keys()), {'nautical_dawn', 'civil_dawn', 'sunrise', 'noon', 'sunset', 'civil_dusk', 'nautical_dusk'})
+        for values in events.values():
+            self.assertEqual(values.shape, (len(self.days), len(self.latitudes)))
+
+    def test_same_results_than_scalar_engine(self):
+        events = solarvector.sun_events_array(self.days, self.latitudes, self.longitudes)
+
+        for day_index, day in enumerate(self.days):
+            for position_index, (latitude, longitude) in enumerate(zip(self.latitudes, self.longitudes)):
+                expected = sun_events(day, latitude, longitude)
+                for event, timestamp in expected.items():
+                    self.assertLessEqual(abs(int(events[event][day_index, position_index]) - (timestamp or 0)), 1)
+
+    def test_accuracy_against_cleep_sun(self):
+        try:
+            from cleep.libs.internals.sun import Sun
+        except ImportError:
+            self.skipTest('cleep is not installed')
+
+        sun = Sun()
+        today = datetime.now().date()
+        events = solarvector.sun_events_array([today], self.latitudes[:3], self.longitudes[:3])
+        for position_index in range(3):
+            sun.set_position(self.latitudes[position_index], self.longitudes[position_index])
+            self.assertLessEqual(abs(int(sun.sunrise().timestamp()) - int(events['sunrise'][0, position_index])), 180)
+            self.assertLessEqual(abs(int(sun.sunset().timestamp()) - int(events['sunset'][0, position_index])), 180)
+
+    def test_polar_events(self):
+        events = solarvector.sun_events_array([date(2020, 6, 21)], [69.65], [18.96])
+
+        self.assertEqual(int(events['sunrise'][0, 0]), 0)
+        self.assertNotEqual(int(events['noon'][0, 0]), 0)
+
+    def test_invalid_positions(self):
+        with self.assertRaises(ValueError):
+            solarvector.sun_events_array(self.days, [1.0, 2.0], [1.0])
+
+    @patch('backend.solarvector.find_spec', Mock(return_value=None))
+    def test_is_available(self):
+        self.assertFalse(solarvector.is_available())
+
+
+# do not remove code below, otherwise test won't run
+if __name__ == '__main__':
+    # coverage run --omit="*/lib/python*/*","test_*" --concurrency=thread test_solarvector.py; coverage report -m -i
+    unittest.main()
+
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import logging
+import sys
+sys.path.append('../')
+from backend.sunephemeris import SunEphemeris
+from backend.solarcalc import sun_events
+from backend import solarvector
+from datetime import date
+from mock import patch
+import pytz
+
+class TestsSunEphemeris(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.FATAL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        self.tz = pytz.timezone('Europe/Paris')
+        # 2020-06-08 12:00 CEST
+        self.now = 1591610400
+        self.ephemeris = SunEphemeris(48.8566, 2.3522, self.tz, days=7, start=self.now)
+
+    def test_range(self):
+        # 2020-06-08 00:00 CEST to 2020-06-15 00:00 CEST
+        self.assertEqual(self.ephemeris.start, 1591567200)
+        self.assertEqual(self.ephemeris.end, 1591567200 + 7 * 86400)
+        self.assertTrue(self.ephemeris.covers(self.now))
+        self.assertFalse(self.ephemeris.covers(self.ephemeris.end))
+
+    def test_get_day(self):
+        self.assertEqual(self.ephemeris.get_day(0), sun_events(date(2020, 6, 8), 48.8566, 2.3522))
+        self.assertEqual(self.ephemeris.get_day(6), sun_events(date(2020, 6, 14), 48.8566, 2.3522))
+        with self.assertRaises(IndexError):
+            self.ephemeris.get_day(7)
+
+    def test_next_event(self):
+        day = self.ephemeris.get_day(0)
+
+        self.assertEqual(self.ephemeris.next_event(self.now), ('noon', day['noon']))
+        self.assertEqual(self.ephemeris.next_event(day['noon']), ('sunset', day['sunset']))
+        self.assertEqual(self.ephemeris.next_event(self.now, events=['sunrise']), ('sunrise', self.ephemeris.get_day(1)['sunrise']))
+        self.assertEqual(self.ephemeris.next_event(self.ephemeris.start - 86400)[0], 'nautical_dawn')
+
+    def test_next_event_matches_linear_search(self):
+        events = []
+        for day_index in range(7):
+            events.extend((timestamp, event) for event, timestamp in self.ephemeris.get_day(day_index).items() if timestamp)
+        events.sort()
+
+        for now in range(self.ephemeris.start, self.ephemeris.end, 617):
+            expected = next(((event, timestamp) for timestamp, event in events if timestamp > now), None)
+            self.assertEqual(self.ephemeris.next_event(now), expected)
+
+    def test_next_event_out_of_range(self):
+        self.assertIsNone(self.ephemeris.next_event(self.ephemeris.end + 3600))
+
+    def test_set_event(self):
+        self.ephemeris.set_event(0, 'sunset', self.now + 60)
+
+        self.assertEqual(self.ephemeris.get_day(0)['sunset'], self.now + 60)
+        self.assertEqual(self.ephemeris.next_event(self.now, events=['sunset']), ('sunset', self.now + 60))
+
+    @unittest.skipIf(not solarvector.is_available(), 'numpy is not installed')
+    def test_vectorized_build(self):
+        with patch.object(SunEphemeris, 'VECTORIZED_MIN_DAYS', 1):
+            ephemeris = SunEphemeris(48.8566, 2.3522, self.tz, days=7, start=self.now)
+
+        for day_index in range(7):
+            self.assertEqual(ephemeris.get_day(day_index), self.ephemeris.get_day(day_index))
+
+    @patch('backend.solarvector.is_available')
+    def test_vectorized_engine_not_used_for_few_days(self, mock_available):
+        SunEphemeris(48.8566, 2.3522, self.tz, days=SunEphemeris.VECTORIZED_MIN_DAYS - 1, start=self.now)
+
+        self.assertFalse(mock_available.called)
+
+    def test_polar_day(self):
+        ephemeris = SunEphemeris(69.65, 18.96, pytz.timezone('Europe/Oslo'), days=2, start=1592733600)
+
+        self.assertIsNone(ephemeris.get_day(0)['sunrise'])
+        self.assertEqual(ephemeris.next_event(1592733600)[0], 'noon')
+
+    def test_get_schedule(self):
+        schedule = self.ephemeris.get_schedule(2)
+
+        self.assertEqual(len(schedule), 2)
+        self.assertEqual(schedule[0]['date'], '2020-06-08')
+        self.assertEqual(schedule[1]['date'], '2020-06-09')
+        self.assertTrue(schedule[0]['sunrise_iso'].startswith('2020-06-08T05:4'))
+        self.assertTrue(schedule[0]['sunrise_iso'].endswith('+02:00'))
+        self.assertEqual(len(self.ephemeris.get_schedule()), 7)
+
+
+# do not remove code below, otherwise test won't run
+if __name__ == '__main__':
+    # coverage run --omit="*/lib/python*/*","test_*" --concurrency=thread test_sunephemeris.py; coverage report -m -i
+    unittest.main()
+
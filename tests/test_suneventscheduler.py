@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import logging
+import sys
+sys.path.append('../')
+from backend.suneventscheduler import SunEventScheduler
+from backend.sunephemeris import SunEphemeris
+from mock import Mock
+import pytz
+
+class FakeTimer():
+    """
+    Fake threading.Timer that records armed timers
+    """
+    timers = []
+
+    def __init__(self, delay, function):
+        self.delay = delay
+        self.function = function
+        self.cancelled = False
+        self.started = False
+        self.daemon = False
+        FakeTimer.timers.append(self)
+
+    def start(self):
+        self.started = True
+
+    def cancel(self):
+        self.cancelled = True
+
+class TestsSunEventScheduler(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.FATAL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        FakeTimer.timers = []
+        # 2020-06-08 12:00 CEST
+        self.now = 1591610400.0
+        self.ephemeris = SunEphemeris(48.8566, 2.3522, pytz.timezone('Europe/Paris'), days=3, start=int(self.now))
+        self.today = self.ephemeris.get_day(0)
+        self.tomorrow = self.ephemeris.get_day(1)
+        self.scheduler = SunEventScheduler(clock=lambda: self.now, timer_factory=FakeTimer)
+        self.callback = Mock()
+
+    def last_timer(self):
+        return FakeTimer.timers[-1]
+
+    def fire(self):
+        timer = self.last_timer()
+        self.now += timer.delay
+        timer.function()
+
+    def test_not_armed_before_start(self):
+        self.scheduler.set_ephemeris(self.ephemeris)
+        self.scheduler.add_trigger('sunset', 0, self.callback)
+
+        self.assertEqual(FakeTimer.timers, [])
+        self.assertEqual(self.scheduler.get_next_fire(), (self.today['sunset'], 'sunset', 0))
+
+    def test_arm_next_event(self):
+        self.scheduler.add_trigger('sunset', 0, self.callback)
+        self.scheduler.add_trigger('sunrise', 0, self.callback)
+        self.scheduler.set_ephemeris(self.ephemeris)
+        self.scheduler.start()
+
+        timer = self.last_timer()
+        self.assertTrue(timer.started)
+        self.assertTrue(timer.daemon)
+        self.assertAlmostEqual(timer.delay, self.today['sunset'] - self.now)
+
+    def test_fire_and_rearm(self):
+        self.scheduler.add_trigger('sunset', 0, self.callback)
+        self.scheduler.add_trigger('sunrise', 0, self.callback)
+        self.scheduler.set_ephemeris(self.ephemeris)
+        self.scheduler.start()
+
+        self.fire()
+        self.callback.assert_called_once_with('sunset', 0, self.today['sunset'])
+        self.assertAlmostEqual(self.now + self.last_timer().delay, self.tomorrow['sunrise'])
+
+        self.fire()
+        self.callback.assert_called_with('sunrise', 0, self.tomorrow['sunrise'])
+        self.assertAlmostEqual(self.now + self.last_timer().delay, self.tomorrow['sunset'])
+
+    def test_offset_trigger(self):
+        self.scheduler.add_trigger('sunset', -1800, self.callback)
+        self.scheduler.set_ephemeris(self.ephemeris)
+        self.scheduler.start()
+
+        self.fire()
+
+        self.assertEqual(self.now, self.today['sunset'] - 1800)
+        self.callback.assert_called_once_with('sunset', -1800, self.today['sunset'])
+
+    def test_offset_trigger_after_event_time(self):
+        # now is after sunrise but sunrise + 12h is still to come
+        self.scheduler.add_trigger('sunrise', 12 * 3600, self.callback)
+        self.scheduler.set_ephemeris(self.ephemeris)
+        self.scheduler.start()
+
+        self.assertEqual(self.scheduler.get_next_fire()[0], self.today['sunrise'] + 12 * 3600)
+
+    def test_early_timer_does_not_fire(self):
+        self.scheduler.add_trigger('sunset', 0, self.callback)
+        self.scheduler.set_ephemeris(self.ephemeris)
+        self.scheduler.start()
+
+        timer = self.last_timer()
+        self.now += timer.delay - 0.5
+        timer.function()
+
+        self.assertFalse(self.callback.called)
+        self.assertAlmostEqual(self.last_timer().delay, 0.5)
+
+    def test_remove_trigger(self):
+        trigger_id = self.scheduler.add_trigger('sunset', 0, self.callback)
+        self.scheduler.add_trigger('noon', 0, self.callback)
+        self.scheduler.set_ephemeris(self.ephemeris)
+        self.scheduler.start()
+
+        self.scheduler.remove_trigger(trigger_id)
+        self.scheduler.remove_trigger(trigger_id)
+
+        self.assertEqual(self.scheduler.get_next_fire()[1], 'noon')
+
+    def test_set_ephemeris_rearm(self):
+        self.scheduler.add_trigger('sunset', 0, self.callback)
+        self.scheduler.start()
+        self.assertIsNone(self.scheduler.get_next_fire())
+
+        self.scheduler.set_ephemeris(self.ephemeris)
+
+        self.assertEqual(self.scheduler.get_next_fire()[0], self.today['sunset'])
+        self.assertTrue(self.last_timer().started)
+        self.scheduler.set_ephemeris(None)
+        self.assertTrue(self.last_timer().cancelled)
+        self.assertIsNone(self.scheduler.get_next_fire())
+
+    def test_forward_clock_jump_drops_skipped_events(self):
+        self.scheduler.set_ephemeris(self.ephemeris)
+        self.scheduler.add_trigger('sunset', 0, self.callback)
+        self.scheduler.start()
+        armed = self.last_timer()
+
+        # clock jumped after today sunset, ephemeris is set again by Parameters
+        self.now = self.today['sunset'] + 3600
+        self.scheduler.set_ephemeris(self.ephemeris)
+
+        self.assertTrue(armed.cancelled)
+        self.assertEqual(self.scheduler.get_next_fire()[0], self.tomorrow['sunset'])
+        self.scheduler._fire()
+        self.assertFalse(self.callback.called)
+
+    def test_stop(self):
+        self.scheduler.add_trigger('sunset', 0, self.callback)
+        self.scheduler.set_ephemeris(self.ephemeris)
+        self.scheduler.start()
+
+        self.scheduler.stop()
+
+        self.assertTrue(self.last_timer().cancelled)
+
+    def test_callback_exception(self):
+        self.callback.side_effect = Exception('Test exception')
+        self.scheduler.add_trigger('sunset', 0, self.callback)
+        self.scheduler.set_ephemeris(self.ephemeris)
+        self.scheduler.start()
+
+        self.fire()
+
+        self.assertEqual(self.scheduler.get_next_fire()[0], self.tomorrow['sunset'])
+
+
+# do not remove code below, otherwise test won't run
+if __name__ == '__main__':
+    # coverage run --omit="*/lib/python*/*","test_*" --concurrency=thread test_suneventscheduler.py; coverage report -m -i
+    unittest.main()
+
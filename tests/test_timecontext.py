@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import logging
+import sys
+sys.path.append('../')
+from backend.timecontext import TimeContext, TimeContextHolder, time_context, get_time_context
+from backend.timesnapshot import TimeSnapshot
+from threading import Thread, Event
+import pytz
+
+class TestsTimeContext(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.FATAL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        self.tz = pytz.timezone('Europe/Paris')
+        self.holder = TimeContextHolder()
+
+    def tearDown(self):
+        time_context.clear()
+
+    def build_context(self, timestamp):
+        return TimeContext(
+            TimeSnapshot.from_timestamp(timestamp, self.tz, timestamp + 100, timestamp + 200),
+            'Europe/Paris',
+            self.tz,
+            next_sunrise={'event': 'sunrise', 'timestamp': timestamp + 100, 'iso': ''},
+            next_sunset={'event': 'sunset', 'timestamp': timestamp + 200, 'iso': ''},
+            next_sun_event={'event': 'sunrise', 'timestamp': timestamp + 100, 'iso': ''},
+        )
+
+    def test_get_nothing_published(self):
+        self.assertIsNone(self.holder.get())
+
+    def test_publish(self):
+        context = self.build_context(1591645808)
+
+        published = self.holder.publish(context)
+
+        self.assertIs(self.holder.get(), published)
+        self.assertEqual(published.version, 1)
+        self.assertIs(published.snapshot, context.snapshot)
+        self.assertIs(published.timezone, self.tz)
+        self.assertEqual(published.timezone_name, 'Europe/Paris')
+        self.assertEqual(published.next_sunrise['timestamp'], 1591645908)
+        self.assertEqual(published.next_sunset['timestamp'], 1591646008)
+        self.assertEqual(published.next_sun_event['event'], 'sunrise')
+
+    def test_publish_increments_version(self):
+        first = self.holder.publish(self.build_context(1591645808))
+        second = self.holder.publish(self.build_context(1591645868))
+
+        self.assertEqual(second.version, first.version + 1)
+        self.assertEqual(first.snapshot.timestamp, 1591645808)
+
+    def test_clear(self):
+        self.holder.publish(self.build_context(1591645808))
+
+        self.holder.clear()
+
+        self.assertIsNone(self.holder.get())
+        self.assertEqual(self.holder.publish(self.build_context(1591645808)).version, 1)
+
+    def test_shared_context(self):
+        self.assertIsNone(get_time_context())
+
+        published = time_context.publish(self.build_context(1591645808))
+
+        self.assertIs(get_time_context(), published)
+
+    def test_concurrent_readers_see_consistent_contexts(self):
+        stop = Event()
+        errors = []
+
+        def read():
+            last_version = 0
+            while not stop.is_set():
+                context = self.holder.get()
+                if context is None:
+                    continue
+                # all fields come from the same publication and versions never go backward
+                timestamp = context.snapshot.timestamp
+                if context.next_sunrise['timestamp'] != timestamp + 100 or context.next_sunset['timestamp'] != timestamp + 200:
+                    errors.append('inconsistent context %s' % context.version)
+                if context.version < last_version:
+                    errors.append('version went backward %s < %s' % (context.version, last_version))
+                last_version = context.version
+
+        def write(start):
+            for index in range(500):
+                self.holder.publish(self.build_context(start + index * 60))
+
+        readers = [Thread(target=read) for _ in range(8)]
+        writers = [Thread(target=write, args=(1591645808 + index * 100000,)) for index in range(2)]
+        for thread in readers + writers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        stop.set()
+        for thread in readers:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(self.holder.get().version, 1000)
+
+
+# do not remove code below, otherwise test won't run
+if __name__ == '__main__':
+    # coverage run --omit="*/lib/python*/*","test_*" --concurrency=thread test_timecontext.py; coverage report -m -i
+    unittest.main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import logging
+import sys
+sys.path.append('../')
+from backend.timeevent import TimeEventEmitter, TimeEventFilter
+from mock import Mock
+
+def time_data(hour, minute, day=8):
+    timestamp = 1591574400 + (day - 8) * 86400 + hour * 3600 + minute * 60
+    return {
+        'timestamp': timestamp,
+        'iso': '2020-06-%02dT%02d:%02d:00+00:00' % (day, hour, minute),
+        'year': 2020,
+        'month': 6,
+        'day': day,
+        'hour': hour,
+        'minute': minute,
+        'weekday': 0,
+        'weekday_literal': 'monday',
+        'sunrise': 1591588000,
+        'sunset': 1591647000,
+    }
+
+class TestsTimeEventEmitter(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.FATAL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        self.event = Mock()
+
+    def test_full_mode(self):
+        emitter = TimeEventEmitter(self.event)
+        params = time_data(10, 0)
+
+        sent = emitter.emit(params, device_id='uuid')
+
+        self.assertEqual(sent, params)
+        self.assertIsNot(sent, params)
+        self.event.send.assert_called_once_with(params=params, device_id='uuid')
+
+    def test_delta_mode(self):
+        emitter = TimeEventEmitter(self.event, mode=TimeEventEmitter.MODE_DELTA)
+
+        first = emitter.emit(time_data(10, 59))
+        second = emitter.emit(time_data(11, 0))
+
+        self.assertEqual(first, time_data(10, 59))
+        self.assertEqual(second, {
+            'timestamp': time_data(11, 0)['timestamp'],
+            'iso': '2020-06-08T11:00:00+00:00',
+            'hour': 11,
+            'minute': 0,
+            'delta': True,
+        })
+
+    def test_delta_mode_timestamp_always_sent(self):
+        emitter = TimeEventEmitter(self.event, mode=TimeEventEmitter.MODE_DELTA)
+        emitter.emit(time_data(10, 0))
+
+        self.assertEqual(emitter.emit(time_data(10, 0)), {'timestamp': time_data(10, 0)['timestamp'], 'delta': True})
+
+    def test_delta_mode_keyframe(self):
+        emitter = TimeEventEmitter(self.event, mode=TimeEventEmitter.MODE_DELTA, keyframe_interval=3)
+
+        sent = [emitter.emit(time_data(10, minute)) for minute in range(7)]
+
+        self.assertEqual([params.get('delta', False) for params in sent], [False, True, True, False, True, True, False])
+
+    def test_suppressed_mode(self):
+        emitter = TimeEventEmitter(self.event, mode=TimeEventEmitter.MODE_SUPPRESSED)
+
+        self.assertIsNone(emitter.emit(time_data(10, 0)))
+        self.assertFalse(self.event.send.called)
+
+    def test_set_mode_resets_delta(self):
+        emitter = TimeEventEmitter(self.event, mode=TimeEventEmitter.MODE_DELTA)
+        emitter.emit(time_data(10, 0))
+        emitter.set_mode(TimeEventEmitter.MODE_DELTA)
+
+        self.assertFalse('delta' in emitter.emit(time_data(10, 1)))
+
+    def test_reset(self):
+        emitter = TimeEventEmitter(self.event, mode=TimeEventEmitter.MODE_DELTA)
+        emitter.emit(time_data(10, 0))
+        emitter.reset()
+
+        self.assertFalse('delta' in emitter.emit(time_data(10, 1)))
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            TimeEventEmitter(self.event, mode='dummy')
+
+class TestsTimeEventFilter(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.FATAL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        self.emitter = TimeEventEmitter(Mock(), mode=TimeEventEmitter.MODE_DELTA, keyframe_interval=10)
+
+    def test_full_events(self):
+        time_filter = TimeEventFilter()
+        params = time_data(10, 1)
+
+        self.assertIs(time_filter.update(params), params)
+
+    def test_rebuild_from_delta(self):
+        time_filter = TimeEventFilter()
+
+        for hour, minute in ((10, 58), (10, 59), (11, 0), (11, 1)):
+            self.assertEqual(time_filter.update(self.emitter.emit(time_data(hour, minute))), time_data(hour, minute))
+
+    def test_rebuild_day_change(self):
+        time_filter = TimeEventFilter()
+        time_filter.update(self.emitter.emit(time_data(23, 59)))
+
+        self.assertEqual(time_filter.update(self.emitter.emit(time_data(0, 0, day=9))), time_data(0, 0, day=9))
+
+    def test_delta_before_full(self):
+        time_filter = TimeEventFilter()
+        self.emitter.emit(time_data(10, 0))
+
+        self.assertIsNone(time_filter.update(self.emitter.emit(time_data(10, 1))))
+        # next keyframe restores data
+        for minute in range(2, 10):
+            time_filter.update(self.emitter.emit(time_data(10, minute)))
+        self.assertEqual(time_filter.update(self.emitter.emit(time_data(10, 10))), time_data(10, 10))
+
+    def test_quarter_cadence(self):
+        time_filter = TimeEventFilter(TimeEventFilter.EVERY_QUARTER)
+
+        accepted = [minute for minute in range(60) if time_filter.update(self.emitter.emit(time_data(10, minute)))]
+
+        self.assertEqual(accepted, [0, 15, 30, 45])
+
+    def test_hourly_cadence(self):
+        time_filter = TimeEventFilter(TimeEventFilter.HOURLY)
+
+        accepted = [
+            (hour, minute)
+            for hour in range(3) for minute in range(60)
+            if time_filter.update(self.emitter.emit(time_data(hour, minute)))
+        ]
+
+        self.assertEqual(accepted, [(0, 0), (1, 0), (2, 0)])
+
+    def test_invalid_cadence(self):
+        with self.assertRaises(ValueError):
+            TimeEventFilter(0)
+        with self.assertRaises(ValueError):
+            TimeEventFilter(7)
+
+
+# do not remove code below, otherwise test won't run
+if __name__ == '__main__':
+    # coverage run --omit="*/lib/python*/*","test_*" --concurrency=thread test_timeevent.py; coverage report -m -i
+    unittest.main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import logging
+import sys
+sys.path.append('../')
+from backend.timerendering import TimeRenderer, RenderingLocale, get_renderer, register_locale, STYLE_12H, STYLE_24H, LOCALES
+
+class TestsTimeRenderer(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.FATAL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        self.renderer = TimeRenderer()
+
+    def tearDown(self):
+        LOCALES.pop('test', None)
+
+    def test_speech(self):
+        self.assertEqual(self.renderer.speech(0, 0), 'It\'s midnight')
+        self.assertEqual(self.renderer.speech(12, 0), 'It\'s noon')
+        self.assertEqual(self.renderer.speech(14, 0), 'It\'s 14 o\'clock')
+        self.assertEqual(self.renderer.speech(14, 15), 'It\'s quarter past 14')
+        self.assertEqual(self.renderer.speech(14, 30), 'It\'s half past 14')
+        self.assertEqual(self.renderer.speech(14, 45), 'It\'s quarter to 15')
+        self.assertEqual(self.renderer.speech(14, 10), 'It\'s 10 past 14')
+        self.assertEqual(self.renderer.speech(14, 50), 'It\'s 10 to 15')
+
+    def test_speech_next_hour_wraps(self):
+        self.assertEqual(self.renderer.speech(23, 45), 'It\'s quarter to midnight')
+        self.assertEqual(self.renderer.speech(23, 55), 'It\'s 5 to midnight')
+        self.assertEqual(self.renderer.speech(0, 10), 'It\'s 10 past midnight')
+
+    def test_speech_noon(self):
+        self.assertEqual(self.renderer.speech(11, 45), 'It\'s quarter to noon')
+        self.assertEqual(self.renderer.speech(11, 30), 'It\'s half past 11')
+        self.assertEqual(self.renderer.speech(12, 15), 'It\'s quarter past noon')
+
+    def test_speech_12h(self):
+        renderer = TimeRenderer(style=STYLE_12H)
+
+        self.assertEqual(renderer.speech(0, 0), 'It\'s midnight')
+        self.assertEqual(renderer.speech(0, 15), 'It\'s quarter past 12')
+        self.assertEqual(renderer.speech(14, 0), 'It\'s 2 o\'clock')
+        self.assertEqual(renderer.speech(11, 45), 'It\'s quarter to 12')
+        self.assertEqual(renderer.speech(23, 50), 'It\'s 10 to 12')
+
+    def test_all_minutes_rendered(self):
+        for hour in range(24):
+            for minute in range(60):
+                self.assertTrue(self.renderer.speech(hour, minute).startswith('It\'s '))
+                self.assertEqual(self.renderer.clock(hour, minute), '%02d:%02d' % (hour, minute))
+
+    def test_clock_12h(self):
+        renderer = TimeRenderer(style=STYLE_12H)
+
+        self.assertEqual(renderer.clock(0, 5), '12:05 AM')
+        self.assertEqual(renderer.clock(11, 59), '11:59 AM')
+        self.assertEqual(renderer.clock(12, 0), '12:00 PM')
+        self.assertEqual(renderer.clock(20, 50), '8:50 PM')
+
+    def test_display(self):
+        self.assertEqual(self.renderer.display(20, 50, 8, 6, 2020), '20:50 08/06/2020')
+        self.assertEqual(self.renderer.display(20, 50, 8, 6, 2020), '20:50 08/06/2020')
+        self.assertEqual(self.renderer.display(0, 1, 9, 6, 2020), '00:01 09/06/2020')
+
+    def test_date_cached(self):
+        date = self.renderer.date(8, 6, 2020)
+
+        self.assertIs(self.renderer.date(8, 6, 2020), date)
+        self.assertEqual(self.renderer.date(9, 6, 2020), '09/06/2020')
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            TimeRenderer(locale='dummy')
+        with self.assertRaises(ValueError):
+            TimeRenderer(style='dummy')
+
+    def test_get_renderer_shared(self):
+        self.assertIs(get_renderer(), get_renderer('en', STYLE_24H))
+        self.assertIsNot(get_renderer(style=STYLE_12H), get_renderer())
+
+    def test_register_locale(self):
+        register_locale(RenderingLocale('test', lambda hour, minute, style: '%d-%d' % (hour, minute), '%(year)d-%(month)02d-%(day)02d'))
+        renderer = get_renderer('test')
+
+        self.assertEqual(renderer.speech(10, 5), '10-5')
+        self.assertEqual(renderer.display(10, 5, 8, 6, 2020), '10:05 2020-06-08')
+
+        # renderer rebuilt when locale is registered again
+        register_locale(RenderingLocale('test', lambda hour, minute, style: 'new', '%(day)d'))
+        self.assertEqual(get_renderer('test').speech(10, 5), 'new')
+
+
+# do not remove code below, otherwise test won't run
+if __name__ == '__main__':
+    # coverage run --omit="*/lib/python*/*","test_*" --concurrency=thread test_timerendering.py; coverage report -m -i
+    unittest.main()
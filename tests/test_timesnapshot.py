@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import logging
+import sys
+sys.path.append('../')
+from backend.timesnapshot import TimeSnapshot, WEEKDAYS
+from backend.zoneinforegistry import ZoneTransitions
+from backend.offsettracker import OffsetTracker
+from datetime import datetime
+import pytz
+
+class TestsTimeSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.FATAL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        self.tz = pytz.timezone('Europe/London')
+
+    def test_fields(self):
+        local_dt = self.tz.localize(datetime(2020, 6, 8, 21, 50, 8))
+        snapshot = TimeSnapshot(1591645808, local_dt, 1591675200, 1591735300)
+
+        self.assertEqual(snapshot.as_dict(), {
+            'timestamp': 1591645808,
+            'iso': '2020-06-08T21:50:08+01:00',
+            'year': 2020,
+            'month': 6,
+            'day': 8,
+            'hour': 21,
+            'minute': 50,
+            'weekday': 0,
+            'weekday_literal': 'monday',
+            'sunrise': 1591675200,
+            'sunset': 1591735300,
+        })
+        self.assertEqual(snapshot.hour, 21)
+        self.assertEqual(snapshot.minute, 50)
+        self.assertEqual(snapshot.weekday_literal, 'monday')
+
+    def test_as_dict_is_built_once(self):
+        snapshot = TimeSnapshot.from_timestamp(1591645808, self.tz)
+
+        self.assertIs(snapshot.as_dict(), snapshot.as_dict())
+
+    def test_weekdays(self):
+        for day in range(7):
+            snapshot = TimeSnapshot(0, self.tz.localize(datetime(2020, 6, 8 + day, 12, 0, 0)))
+            self.assertEqual(snapshot.weekday, day)
+            self.assertEqual(snapshot.weekday_literal, WEEKDAYS[day])
+
+    def test_is_same_minute(self):
+        snapshot = TimeSnapshot.from_timestamp(1591645808, self.tz)
+
+        self.assertTrue(snapshot.is_same_minute(1591645800))
+        self.assertTrue(snapshot.is_same_minute(1591645859))
+        self.assertFalse(snapshot.is_same_minute(1591645860))
+        self.assertFalse(snapshot.is_same_minute(1591645799))
+
+    def test_from_timestamp_with_zone_transitions(self):
+        snapshot = TimeSnapshot.from_timestamp(1591645808, ZoneTransitions(self.tz))
+        expected = TimeSnapshot.from_timestamp(1591645808, self.tz)
+
+        self.assertEqual(snapshot.as_dict(), expected.as_dict())
+
+    def test_from_fields(self):
+        tracker = OffsetTracker()
+        tracker.set_transitions(ZoneTransitions(self.tz))
+        snapshot = TimeSnapshot.from_fields(1591645808, tracker.local_fields(1591645808), 1591675200, 1591735300)
+        expected = TimeSnapshot(1591645808, datetime.fromtimestamp(1591645808, self.tz), 1591675200, 1591735300)
+
+        self.assertEqual(snapshot.as_dict(), expected.as_dict())
+        self.assertEqual(snapshot.datetime, expected.datetime)
+
+    def test_iso(self):
+        for name, local_dt in (
+            ('America/New_York', datetime(2020, 6, 8, 8, 5, 3)),
+            ('Asia/Kathmandu', datetime(2020, 6, 8, 8, 5, 3)),
+            ('UTC', datetime(2020, 6, 8, 8, 5, 3)),
+            # local mean time offset with seconds
+            ('Europe/Paris', datetime(1900, 6, 8, 8, 5, 3)),
+        ):
+            local_dt = pytz.timezone(name).localize(local_dt)
+            self.assertEqual(TimeSnapshot(0, local_dt).iso, local_dt.isoformat())
+
+    def test_slots(self):
+        snapshot = TimeSnapshot.from_timestamp(1591645808, self.tz)
+
+        with self.assertRaises(AttributeError):
+            snapshot.dummy = 1
+
+
+# do not remove code below, otherwise test won't run
+if __name__ == '__main__':
+    # coverage run --omit="*/lib/python*/*","test_*" --concurrency=thread test_timesnapshot.py; coverage report -m -i
+    unittest.main()
+
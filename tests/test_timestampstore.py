@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import logging
+import sys
+import os
+import io
+import shutil
+import tempfile
+sys.path.append('../')
+from backend.timestampstore import create_timestamp_store, TimestampStore, WriteBehindTimestampStore, ShutdownTimestampStore, RingFileTimestampStore
+from mock import Mock
+
+class TestsTimestampStore(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.FATAL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        self.config = {'timestamp': 1607538000}
+        self.get_config_field = Mock(side_effect=lambda field: self.config[field])
+        self.set_config_field = Mock(side_effect=lambda field, value: self.config.update({field: value}) or True)
+        self.tmp_dir = tempfile.mkdtemp()
+        self.ring_path = os.path.join(self.tmp_dir, 'parameters.timestamp')
+        self.fs = Mock()
+        self.fs.open.side_effect = lambda path, mode: io.open(path, mode)
+        self.fs.close.side_effect = lambda fd: fd.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_create_timestamp_store(self):
+        self.assertIsInstance(create_timestamp_store('writebehind', self.get_config_field, self.set_config_field), WriteBehindTimestampStore)
+        self.assertIsInstance(create_timestamp_store('shutdown', self.get_config_field, self.set_config_field), ShutdownTimestampStore)
+        self.assertIsInstance(create_timestamp_store('ringfile', self.get_config_field, self.set_config_field, self.ring_path, self.fs), RingFileTimestampStore)
+        with self.assertRaises(ValueError):
+            create_timestamp_store('dummy', self.get_config_field, self.set_config_field)
+
+    def test_base_store_is_abstract(self):
+        with self.assertRaises(TypeError):
+            TimestampStore(self.get_config_field, self.set_config_field)
+
+    def test_writebehind(self):
+        store = WriteBehindTimestampStore(self.get_config_field, self.set_config_field, flush_interval=15)
+        self.assertEqual(store.load(), 1607538000)
+
+        # first update is far from loaded timestamp
+        store.update(1607539000)
+        self.assertEqual(self.set_config_field.call_count, 1)
+        for minute in range(1, 15):
+            store.update(1607539000 + minute * 60)
+        self.assertEqual(self.set_config_field.call_count, 1)
+        store.update(1607539000 + 15 * 60)
+        self.assertEqual(self.set_config_field.call_count, 2)
+        self.assertEqual(self.config['timestamp'], 1607539900)
+
+    def test_writebehind_flush(self):
+        store = WriteBehindTimestampStore(self.get_config_field, self.set_config_field, flush_interval=15)
+        store.load()
+        store.update(1607538060)
+        self.assertFalse(self.set_config_field.called)
+
+        store.flush()
+        store.flush()
+
+        self.set_config_field.assert_called_once_with('timestamp', 1607538060)
+
+    def test_shutdown(self):
+        store = ShutdownTimestampStore(self.get_config_field, self.set_config_field)
+        store.load()
+        for minute in range(1, 100):
+            store.update(1607538000 + minute * 3600)
+        self.assertFalse(self.set_config_field.called)
+
+        store.flush()
+
+        self.set_config_field.assert_called_once_with('timestamp', 1607538000 + 99 * 3600)
+
+    def test_ringfile(self):
+        store = RingFileTimestampStore(self.get_config_field, self.set_config_field, self.ring_path, self.fs)
+        # no ring file yet, fallback to config value
+        self.assertEqual(store.load(), 1607538000)
+
+        for minute in range(1, 21):
+            store.update(1607538000 + minute * 60)
+
+        self.assertFalse(self.set_config_field.called)
+        self.assertEqual(os.path.getsize(self.ring_path), RingFileTimestampStore.SLOTS * RingFileTimestampStore.SLOT_SIZE)
+        store = RingFileTimestampStore(self.get_config_field, self.set_config_field, self.ring_path, self.fs)
+        self.assertEqual(store.load(), 1607538000 + 20 * 60)
+
+    def test_ringfile_continue_after_last_slot(self):
+        store = RingFileTimestampStore(self.get_config_field, self.set_config_field, self.ring_path, self.fs)
+        store.load()
+        for minute in range(1, 4):
+            store.update(1607538000 + minute * 60)
+
+        store = RingFileTimestampStore(self.get_config_field, self.set_config_field, self.ring_path, self.fs)
+        store.load()
+        store.update(1607538000 + 4 * 60)
+
+        with io.open(self.ring_path) as fd:
+            lines = fd.read().splitlines()
+        self.assertEqual([int(line) for line in lines[:4]], [1607538060, 1607538120, 1607538180, 1607538240])
+
+    def test_ringfile_write_failure(self):
+        self.fs.open.side_effect = Exception('Test exception')
+        store = RingFileTimestampStore(self.get_config_field, self.set_config_field, self.ring_path, self.fs)
+        store.load()
+
+        store.update(1607539000)
+        store.update(1607539060)
+
+        self.assertEqual(self.fs.open.call_count, 2)
+
+
+# do not remove code below, otherwise test won't run
+if __name__ == '__main__':
+    # coverage run --omit="*/lib/python*/*","test_*" --concurrency=thread test_timestampstore.py; coverage report -m -i
+    unittest.main()
+
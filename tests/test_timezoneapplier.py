@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import logging
+import sys
+sys.path.append('../')
+from backend.timezoneapplier import TimezoneApplier
+from mock import Mock, patch
+import os
+import shutil
+import tempfile
+
+class TestsTimezoneApplier(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.FATAL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        self.root_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.root_dir, 'etc'))
+        self.write_zoneinfo('Europe/Paris', b'TZif2paris')
+        self.write_zoneinfo('Europe/London', b'TZif2london')
+        self.write_zoneinfo('Europe/Invalid', b'dummy')
+        with open(os.path.join(self.root_dir, 'etc', 'timezone'), 'w') as fd:
+            fd.write('Europe/London\n')
+        os.symlink('../usr/share/zoneinfo/Europe/London', os.path.join(self.root_dir, 'etc', 'localtime'))
+
+        self.applier = TimezoneApplier(root_dir=self.root_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.root_dir)
+
+    def write_zoneinfo(self, name, content):
+        path = os.path.join(self.root_dir, 'usr', 'share', 'zoneinfo', name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as fd:
+            fd.write(content)
+
+    def read(self, path):
+        with open(os.path.join(self.root_dir, path), 'r') as fd:
+            return fd.read()
+
+    def test_get_zoneinfo_path(self):
+        self.assertEqual(self.applier.get_zoneinfo_path('Europe/Paris'), os.path.join(self.root_dir, 'usr/share/zoneinfo/Europe/Paris'))
+
+    def test_get_zoneinfo_path_invalid(self):
+        self.assertIsNone(self.applier.get_zoneinfo_path(None))
+        self.assertIsNone(self.applier.get_zoneinfo_path('Europe/Dummy'))
+        self.assertIsNone(self.applier.get_zoneinfo_path('Europe/Invalid'))
+        self.assertIsNone(self.applier.get_zoneinfo_path('Europe'))
+        self.assertIsNone(self.applier.get_zoneinfo_path('../../../etc/timezone'))
+        self.assertIsNone(self.applier.get_zoneinfo_path('/etc/timezone'))
+
+    @patch('backend.timezoneapplier.time.tzset')
+    def test_apply(self, mock_tzset):
+        self.assertTrue(self.applier.apply('Europe/Paris'))
+
+        localtime = os.path.join(self.root_dir, 'etc', 'localtime')
+        self.assertTrue(os.path.islink(localtime))
+        self.assertEqual(os.readlink(localtime), '../usr/share/zoneinfo/Europe/Paris')
+        self.assertEqual(self.read('etc/timezone'), 'Europe/Paris\n')
+        self.assertTrue(mock_tzset.called)
+        self.assertEqual(sorted(os.listdir(os.path.join(self.root_dir, 'etc'))), ['localtime', 'timezone'])
+
+    @patch('backend.timezoneapplier.time.tzset', Mock())
+    def test_apply_without_existing_files(self):
+        os.remove(os.path.join(self.root_dir, 'etc', 'localtime'))
+        os.remove(os.path.join(self.root_dir, 'etc', 'timezone'))
+
+        self.assertTrue(self.applier.apply('Europe/Paris'))
+        self.assertTrue(self.applier.verify('Europe/Paris'))
+
+    @patch('backend.timezoneapplier.time.tzset', Mock())
+    @patch('backend.timezoneapplier.os.symlink', Mock(side_effect=OSError('Not supported')))
+    def test_apply_copy_if_symlink_not_supported(self):
+        self.assertTrue(self.applier.apply('Europe/Paris'))
+
+        localtime = os.path.join(self.root_dir, 'etc', 'localtime')
+        self.assertFalse(os.path.islink(localtime))
+        self.assertEqual(self.read('etc/localtime'), 'TZif2paris')
+
+    @patch('backend.timezoneapplier.time.tzset')
+    def test_apply_invalid_timezone(self, mock_tzset):
+        self.assertFalse(self.applier.apply('Europe/Dummy'))
+
+        self.assertEqual(self.read('etc/timezone'), 'Europe/London\n')
+        self.assertFalse(mock_tzset.called)
+
+    @patch('backend.timezoneapplier.time.tzset')
+    @patch('backend.timezoneapplier.os.replace', Mock(side_effect=OSError('Read-only filesystem')))
+    def test_apply_write_failed(self, mock_tzset):
+        self.assertFalse(self.applier.apply('Europe/Paris'))
+
+        self.assertEqual(self.read('etc/timezone'), 'Europe/London\n')
+        self.assertFalse(mock_tzset.called)
+        self.assertEqual(sorted(os.listdir(os.path.join(self.root_dir, 'etc'))), ['localtime', 'timezone'])
+
+    @patch('backend.timezoneapplier.time.tzset', Mock())
+    def test_apply_with_cleep_filesystem(self):
+        cleep_filesystem = Mock()
+        applier = TimezoneApplier(root_dir=self.root_dir, cleep_filesystem=cleep_filesystem)
+
+        self.assertTrue(applier.apply('Europe/Paris'))
+
+        cleep_filesystem.enable_write.assert_called_with(root=True, boot=False)
+        cleep_filesystem.disable_write.assert_called_with(root=True, boot=False)
+
+    def test_verify(self):
+        self.assertTrue(self.applier.verify('Europe/London'))
+        self.assertFalse(self.applier.verify('Europe/Paris'))
+        self.assertFalse(self.applier.verify('Europe/Dummy'))
+
+    def test_verify_timezone_file_mismatch(self):
+        with open(os.path.join(self.root_dir, 'etc', 'timezone'), 'w') as fd:
+            fd.write('Europe/Paris\n')
+
+        self.assertFalse(self.applier.verify('Europe/London'))
+
+    def test_verify_missing_files(self):
+        os.remove(os.path.join(self.root_dir, 'etc', 'timezone'))
+
+        self.assertFalse(self.applier.verify('Europe/London'))
+
+
+# do not remove code below, otherwise test won't run
+if __name__ == '__main__':
+    # coverage run --omit="*/lib/python*/*","test_*" --concurrency=thread test_timezoneapplier.py; coverage report -m -i
+    unittest.main()
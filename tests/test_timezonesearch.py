@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import logging
+import sys
+sys.path.append('../')
+from backend.timezonesearch import TimezoneSearch, nautical_timezone
+from mock import Mock
+import pytz
+
+class FakeClock():
+    """
+    Fake monotonic clock, each closest timezone search step lasts duration * delta_degree^2
+    """
+
+    def __init__(self, duration):
+        self.now = 0.0
+        self.duration = duration
+
+    def __call__(self):
+        return self.now
+
+    def closest_timezone_at(self, results):
+        def search(latitude, longitude, delta_degree):
+            self.now += self.duration * delta_degree ** 2
+            return results.get(delta_degree)
+        return search
+
+class TestsTimezoneSearch(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.FATAL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        self.clock = FakeClock(0.1)
+        self.geo_backend = Mock()
+
+    def init(self, results, budget=3.0, max_delta=10):
+        self.geo_backend.closest_timezone_at.side_effect = self.clock.closest_timezone_at(results)
+        return TimezoneSearch(self.geo_backend, budget=budget, max_delta=max_delta, clock=self.clock)
+
+    def test_nautical_timezone(self):
+        self.assertEqual(nautical_timezone(0.0), 'Etc/GMT')
+        self.assertEqual(nautical_timezone(7.4), 'Etc/GMT')
+        self.assertEqual(nautical_timezone(7.6), 'Etc/GMT-1')
+        self.assertEqual(nautical_timezone(-30.0), 'Etc/GMT+2')
+        self.assertEqual(nautical_timezone(180.0), 'Etc/GMT-12')
+        self.assertEqual(nautical_timezone(-180.0), 'Etc/GMT+12')
+        for longitude in range(-180, 181, 5):
+            self.assertTrue(nautical_timezone(float(longitude)) in pytz.all_timezones_set)
+
+    def test_found_at_first_step(self):
+        search = self.init({1: 'Europe/London'})
+
+        self.assertEqual(search.closest_timezone_at(52.204, 0.1208), 'Europe/London')
+        self.geo_backend.closest_timezone_at.assert_called_once_with(52.204, 0.1208, delta_degree=1)
+
+    def test_widen_radius(self):
+        search = self.init({3: 'Atlantic/Azores'})
+
+        self.assertEqual(search.closest_timezone_at(40.0, -30.0), 'Atlantic/Azores')
+        self.assertEqual([call[1]['delta_degree'] for call in self.geo_backend.closest_timezone_at.call_args_list], [1, 2, 3])
+
+    def test_budget_exhausted(self):
+        # steps last 0.1, 0.4, 0.9, 1.6s: 4th step would overrun budget
+        search = self.init({6: 'Atlantic/Azores'}, budget=2.0)
+
+        self.assertEqual(search.closest_timezone_at(40.0, -30.0), 'Etc/GMT+2')
+        self.assertEqual(self.geo_backend.closest_timezone_at.call_count, 3)
+        self.assertLessEqual(self.clock.now, 2.0)
+
+    def test_budget_exhausted_result_not_cached(self):
+        search = self.init({6: 'Atlantic/Azores'}, budget=2.0)
+        search.closest_timezone_at(40.0, -30.0)
+        search.budget = 10.0
+
+        self.assertEqual(search.closest_timezone_at(40.0, -30.0), 'Atlantic/Azores')
+
+    def test_search_definitive(self):
+        search = self.init({6: 'Atlantic/Azores'}, budget=2.0)
+
+        self.assertEqual(search.search(40.0, -30.0), ('Etc/GMT+2', False))
+        search.budget = 10.0
+        self.assertEqual(search.search(40.0, -30.0), ('Atlantic/Azores', True))
+        # cached result
+        self.assertEqual(search.search(40.0, -30.0), ('Atlantic/Azores', True))
+
+    def test_search_budget(self):
+        search = self.init({6: 'Atlantic/Azores'}, budget=10.0)
+
+        self.assertEqual(search.search(40.0, -30.0, budget=2.0), ('Etc/GMT+2', False))
+        self.assertEqual(self.geo_backend.closest_timezone_at.call_count, 3)
+
+    def test_search_no_budget_left(self):
+        search = self.init({1: 'Atlantic/Azores'})
+
+        self.assertEqual(search.search(40.0, -30.0, budget=0.0), ('Etc/GMT+2', False))
+        self.assertFalse(self.geo_backend.closest_timezone_at.called)
+
+    def test_max_delta_reached(self):
+        search = self.init({}, budget=1000.0, max_delta=4)
+
+        self.assertEqual(search.closest_timezone_at(0.0, -140.0), 'Etc/GMT+9')
+        self.assertEqual(self.geo_backend.closest_timezone_at.call_count, 4)
+
+        # nautical timezone cached when whole radius searched
+        self.assertEqual(search.closest_timezone_at(0.0, -140.0), 'Etc/GMT+9')
+        self.assertEqual(self.geo_backend.closest_timezone_at.call_count, 4)
+
+    def test_cache_per_cell(self):
+        search = self.init({2: 'Atlantic/Azores'})
+
+        search.closest_timezone_at(40.0, -30.0)
+        self.assertEqual(search.closest_timezone_at(40.04, -30.04), 'Atlantic/Azores')
+        self.assertEqual(self.geo_backend.closest_timezone_at.call_count, 2)
+
+        search.closest_timezone_at(40.2, -30.0)
+        self.assertEqual(self.geo_backend.closest_timezone_at.call_count, 4)
+
+    def test_cache_bounded(self):
+        search = self.init({1: 'Atlantic/Azores'})
+        for index in range(TimezoneSearch.MAX_CACHE_ENTRIES + 1):
+            search.closest_timezone_at(float(index) / 10.0 - 60.0, -30.0)
+        self.geo_backend.closest_timezone_at.reset_mock()
+
+        # first one evicted
+        search.closest_timezone_at(-60.0, -30.0)
+        self.assertEqual(self.geo_backend.closest_timezone_at.call_count, 1)
+
+    def test_clear(self):
+        search = self.init({1: 'Atlantic/Azores'})
+        search.closest_timezone_at(40.0, -30.0)
+        search.clear()
+
+        search.closest_timezone_at(40.0, -30.0)
+        self.assertEqual(self.geo_backend.closest_timezone_at.call_count, 2)
+
+    def test_out_of_bounds(self):
+        self.geo_backend.closest_timezone_at.side_effect = ValueError('Test exception')
+        search = TimezoneSearch(self.geo_backend)
+
+        with self.assertRaises(ValueError):
+            search.closest_timezone_at(100.0, 0.0)
+
+
+# do not remove code below, otherwise test won't run
+if __name__ == '__main__':
+    # coverage run --omit="*/lib/python*/*","test_*" --concurrency=thread test_timezonesearch.py; coverage report -m -i
+    unittest.main()
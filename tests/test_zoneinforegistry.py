@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import logging
+import sys
+sys.path.append('../')
+from backend.zoneinforegistry import ZoneinfoRegistry, ZoneTransitions
+from datetime import datetime
+import os
+import shutil
+import tempfile
+import pytz
+
+class TestsZoneTransitions(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.FATAL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+
+    def test_fromtimestamp_same_as_pytz(self):
+        for name in ('Europe/London', 'Europe/Paris', 'America/New_York', 'Australia/Lord_Howe', 'Asia/Kolkata', 'UTC', 'Etc/GMT+5'):
+            tz = pytz.timezone(name)
+            transitions = ZoneTransitions(tz)
+            for timestamp in range(-1000000000, 2500000000, 7777777):
+                expected = datetime.fromtimestamp(timestamp, tz)
+                localized = transitions.fromtimestamp(timestamp)
+                self.assertEqual(localized.isoformat(), expected.isoformat(), '%s %s' % (name, timestamp))
+                self.assertEqual(localized.tzname(), expected.tzname())
+
+    def test_localize_same_as_pytz(self):
+        for name in ('Europe/London', 'Europe/Paris', 'America/New_York', 'Australia/Lord_Howe', 'UTC'):
+            tz = pytz.timezone(name)
+            transitions = ZoneTransitions(tz)
+            for timestamp in range(-1000000000, 2500000000, 7777777):
+                local_dt = datetime.utcfromtimestamp(timestamp)
+                self.assertEqual(transitions.localize(local_dt).isoformat(), tz.localize(local_dt).isoformat(), '%s %s' % (name, local_dt))
+
+    def test_localize_dst_edges(self):
+        tz = pytz.timezone('Europe/Paris')
+        transitions = ZoneTransitions(tz)
+
+        # non existent time (spring forward)
+        local_dt = datetime(2020, 3, 29, 2, 30)
+        self.assertEqual(transitions.localize(local_dt).isoformat(), tz.localize(local_dt).isoformat())
+        # ambiguous time (fall back)
+        local_dt = datetime(2020, 10, 25, 2, 30)
+        self.assertEqual(transitions.localize(local_dt).isoformat(), tz.localize(local_dt).isoformat())
+
+    def test_utcoffset(self):
+        transitions = ZoneTransitions(pytz.timezone('Europe/London'))
+
+        # 2020-06-08 (BST) and 2020-12-08 (GMT)
+        self.assertEqual(transitions.utcoffset(1591645808), 3600)
+        self.assertEqual(transitions.utcoffset(1607454000), 0)
+
+    def test_next_transition(self):
+        transitions = ZoneTransitions(pytz.timezone('Europe/London'))
+
+        # 2020-10-25 01:00 UTC
+        self.assertEqual(transitions.next_transition(1591645808), (1603587600, 0))
+        self.assertEqual(transitions.next_transition(1603587600), (1616893200, 3600))
+
+    def test_next_transition_static_timezone(self):
+        transitions = ZoneTransitions(pytz.utc)
+
+        self.assertIsNone(transitions.next_transition(1591645808))
+        self.assertEqual(transitions.utcoffset(1591645808), 0)
+
+class TestsZoneinfoRegistry(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.FATAL, format=u'%(asctime)s %(name)s:%(lineno)d %(levelname)s : %(message)s')
+        self.zoneinfo_dir = tempfile.mkdtemp()
+        self.write_zoneinfo('Europe/Paris', b'TZif2')
+        self.write_zoneinfo('Europe/London', b'TZif2')
+        self.write_zoneinfo('UTC', b'TZif2')
+        self.write_zoneinfo('posix/Europe/Paris', b'TZif2')
+        self.write_zoneinfo('Europe/Dummy', b'TZif2')
+        self.write_zoneinfo('Europe/Berlin', b'dummy')
+        self.write_zoneinfo('zone.tab', b'FR +4852+00220 Europe/Paris')
+        self.write_zoneinfo('posixrules', b'TZif2')
+        self.write_zoneinfo('localtime', b'TZif2')
+        self.registry = ZoneinfoRegistry(self.zoneinfo_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.zoneinfo_dir)
+
+    def write_zoneinfo(self, name, content):
+        path = os.path.join(self.zoneinfo_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as fd:
+            fd.write(content)
+
+    def test_get_timezones(self):
+        self.assertEqual(self.registry.get_timezones(), ['Europe/Dummy', 'Europe/London', 'Europe/Paris', 'UTC'])
+
+    def test_is_valid(self):
+        self.assertTrue(self.registry.is_valid('Europe/Paris'))
+        self.assertFalse(self.registry.is_valid('Europe/Berlin'))
+        self.assertFalse(self.registry.is_valid('posixrules'))
+        self.assertFalse(self.registry.is_valid('posix/Europe/Paris'))
+        self.assertFalse(self.registry.is_valid('zone.tab'))
+        self.assertFalse(self.registry.is_valid(None))
+
+    def test_scan_once(self):
+        self.registry.get_timezones()
+        self.write_zoneinfo('Europe/Rome', b'TZif2')
+
+        self.assertFalse(self.registry.is_valid('Europe/Rome'))
+        self.registry.refresh()
+        self.assertTrue(self.registry.is_valid('Europe/Rome'))
+
+    def test_missing_zoneinfo_dir(self):
+        registry = ZoneinfoRegistry(os.path.join(self.zoneinfo_dir, 'dummy'))
+
+        self.assertEqual(registry.get_timezones(), [])
+
+    def test_get(self):
+        transitions = self.registry.get('Europe/Paris')
+
+        self.assertTrue(isinstance(transitions, ZoneTransitions))
+        self.assertEqual(transitions.zone, 'Europe/Paris')
+        self.assertIs(transitions.tz, pytz.timezone('Europe/Paris'))
+
+    def test_get_cached(self):
+        self.assertIs(self.registry.get('Europe/Paris'), self.registry.get('Europe/Paris'))
+
+    def test_is_valid_unknown_to_pytz(self):
+        self.assertTrue(self.registry.is_valid('Europe/Dummy'))
+
+    def test_get_unknown(self):
+        self.assertIsNone(self.registry.get('Europe/Dummy'))
+
+
+# do not remove code below, otherwise test won't run
+if __name__ == '__main__':
+    # coverage run --omit="*/lib/python*/*","test_*" --concurrency=thread test_zoneinforegistry.py; coverage report -m -i
+    unittest.main()